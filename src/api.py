@@ -0,0 +1,499 @@
+"""
+API HTTP em JSON sobre os controllers, para integrações sem a interface do Streamlit.
+
+Uso (a partir da pasta src):
+    python api.py --porta 8600
+
+Rotas:
+    GET    /clientes?apos=&limite=          GET /clientes/busca?termo=
+    POST   /clientes {"nome"}               PUT /clientes/<codigo>    DELETE /clientes/<codigo>
+    (o mesmo para /produtos, com {"descricao", "preco_centavos"}, e /vendedores, com {"nome"})
+    GET    /ofertas?apos=&limite=
+    POST   /ofertas {"produto_id", "quantidade_levar", "quantidade_pagar"}
+    PUT    /ofertas/<codigo>                DELETE /ofertas/<codigo>
+    GET    /orcamentos?apos=&limite=        GET /orcamentos/<codigo>/itens
+    POST   /orcamentos {"cliente_id", "vendedor_id", "itens": [{"produto_id", "quantidade"}]}
+    DELETE /orcamentos/<codigo>
+    GET    /relatorio?inicio=&fim=&produto=
+    POST   /lotes/orcamentos {"orcamentos": [...]}        (uma única transação)
+    POST   /lotes/produtos {"produtos": [{"descricao", "preco_centavos"}]}  (uma única transação)
+    POST   /carrinho {"itens": [{"produto_id", "quantidade"}]}
+
+Os valores monetários são enviados e retornados em centavos inteiros, e não podem ser negativos;
+as quantidades devem ser positivas (400 caso contrário). As inclusões respondem
+201 com o código criado ({"codigo"}); alterações e remoções respondem 204, ou 404 se o registro
+não existir; restrições do banco violadas (ex: nome repetido, produto inexistente) respondem 422.
+"""
+
+import argparse
+import json
+import logging
+import re
+import sqlite3
+import threading
+from datetime import date
+from http import HTTPStatus
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+from controllers import (
+    ClienteController,
+    OfertasController,
+    OrcamentoController,
+    ProdutoController,
+    VendedorController,
+)
+from services.banco_de_dados import TAMANHO_POOL, criar_banco_de_dados
+from services.log import setup_logging
+from services.precificacao import precificar_carrinho
+
+
+# Requisições atendidas ao mesmo tempo; as demais aguardam até `TEMPO_ESPERA_REQUISICAO`
+# segundos e, depois disso, recebem 503. O padrão acompanha o tamanho do pool de conexões.
+MAXIMO_REQUISICOES_SIMULTANEAS = TAMANHO_POOL
+TEMPO_ESPERA_REQUISICAO = 5.0
+TEMPO_LIMITE_CONEXAO = 30.0
+TAMANHO_MAXIMO_CORPO = 10 * 1024 * 1024
+LIMITE_MAXIMO_PAGINA = 500
+
+_vagas = threading.BoundedSemaphore(MAXIMO_REQUISICOES_SIMULTANEAS)
+
+
+class ErroRequisicao(Exception):
+    """Erro causado pela requisição, respondido com o status informado e a mensagem em JSON."""
+
+    def __init__(self, mensagem: str, status: HTTPStatus = HTTPStatus.BAD_REQUEST):
+        super().__init__(mensagem)
+        self.status = status
+
+
+def _inteiro(valor, campo: str, minimo: int | None = None) -> int:
+    if isinstance(valor, bool) or not isinstance(valor, (int, str)):
+        raise ErroRequisicao(f"O campo '{campo}' deve ser um número inteiro.")
+    try:
+        numero = int(valor)
+    except ValueError:
+        raise ErroRequisicao(f"O campo '{campo}' deve ser um número inteiro.")
+    if minimo is not None and numero < minimo:
+        raise ErroRequisicao(f"O campo '{campo}' deve ser maior ou igual a {minimo}.")
+    return numero
+
+
+def _centavos(valor, campo: str) -> int:
+    # Valores monetários não podem ser negativos.
+    return _inteiro(valor, campo, minimo=0)
+
+
+def _quantidade(valor, campo: str) -> int:
+    # Quantidades de itens e de ofertas devem ser positivas.
+    return _inteiro(valor, campo, minimo=1)
+
+
+def _data(valor, campo: str) -> str:
+    texto = _texto(valor, campo)
+    try:
+        return date.fromisoformat(texto).isoformat()
+    except ValueError:
+        raise ErroRequisicao(
+            f"O campo '{campo}' deve ser uma data no formato AAAA-MM-DD."
+        )
+
+
+def _texto(valor, campo: str) -> str:
+    if not isinstance(valor, str) or not valor.strip():
+        raise ErroRequisicao(f"O campo '{campo}' deve ser um texto não vazio.")
+    return valor.strip()
+
+
+def _campo(corpo: dict, campo: str):
+    if not isinstance(corpo, dict) or campo not in corpo:
+        raise ErroRequisicao(f"O campo '{campo}' é obrigatório.")
+    return corpo[campo]
+
+
+def _lista(corpo: dict, campo: str) -> list:
+    valor = _campo(corpo, campo)
+    if not isinstance(valor, list) or not valor:
+        raise ErroRequisicao(f"O campo '{campo}' deve ser uma lista não vazia.")
+    return valor
+
+
+def _pagina(funcao, consulta: dict, apos_inteiro: bool = False) -> dict:
+    apos = consulta.get("apos")
+    if apos is not None and apos_inteiro:
+        apos = _inteiro(apos, "apos")
+    limite = min(_inteiro(consulta.get("limite", 50), "limite"), LIMITE_MAXIMO_PAGINA)
+    registros, proximo = funcao(apos, max(limite, 1))
+    return {"registros": registros, "proximo": proximo}
+
+
+def _itens_do_carrinho(itens: list) -> list:
+    carrinho = [
+        (
+            _inteiro(_campo(item, "produto_id"), "produto_id"),
+            _quantidade(_campo(item, "quantidade"), "quantidade"),
+        )
+        for item in itens
+    ]
+    try:
+        return precificar_carrinho(carrinho)
+    except ValueError as e:
+        raise ErroRequisicao(str(e))
+
+
+def _orcamento(corpo: dict) -> tuple:
+    return (
+        _inteiro(_campo(corpo, "cliente_id"), "cliente_id"),
+        _inteiro(_campo(corpo, "vendedor_id"), "vendedor_id"),
+        _itens_do_carrinho(_lista(corpo, "itens")),
+    )
+
+
+def _encontrado(linhas: int) -> None:
+    # Alterações e remoções respondem 404 se nenhum registro tiver o código informado.
+    if not linhas:
+        raise ErroRequisicao("Registro não encontrado.", HTTPStatus.NOT_FOUND)
+
+
+def _cadastro(
+    controller,
+    nome: str,
+    singular: str,
+    campos: tuple,
+    conversores: tuple,
+    validar=None,
+) -> list:
+    # Rotas de listagem, busca, inclusão, alteração e remoção de um cadastro simples.
+    def valores(corpo):
+        convertidos = [
+            conversor(_campo(corpo, campo), campo)
+            for campo, conversor in zip(campos, conversores)
+        ]
+        if validar is not None:
+            validar(*convertidos)
+        return convertidos
+
+    rotas = [
+        (
+            "GET",
+            rf"/{nome}",
+            lambda rota, consulta, corpo: _pagina(
+                getattr(controller, f"pagina_de_{nome}"), consulta
+            ),
+        ),
+        (
+            "POST",
+            rf"/{nome}",
+            lambda rota, consulta, corpo: {
+                "codigo": getattr(controller, f"incluir_{singular}")(*valores(corpo))
+            },
+        ),
+        (
+            "PUT",
+            rf"/{nome}/(?P<codigo>\d+)",
+            lambda rota, consulta, corpo: _encontrado(
+                getattr(controller, f"alterar_{singular}")(
+                    int(rota["codigo"]), *valores(corpo)
+                )
+            ),
+        ),
+        (
+            "DELETE",
+            rf"/{nome}/(?P<codigo>\d+)",
+            lambda rota, consulta, corpo: _encontrado(
+                getattr(controller, f"excluir_{singular}")(int(rota["codigo"]))
+            ),
+        ),
+    ]
+    if hasattr(controller, f"buscar_{nome}"):
+        rotas.append(
+            (
+                "GET",
+                rf"/{nome}/busca",
+                lambda rota, consulta, corpo: getattr(controller, f"buscar_{nome}")(
+                    _texto(consulta.get("termo"), "termo")
+                ),
+            )
+        )
+    return rotas
+
+
+def _validar_oferta(
+    produto_id: int, quantidade_levar: int, quantidade_pagar: int
+) -> None:
+    # A mesma regra da página de ofertas: a oferta deve dar ao menos uma unidade de desconto.
+    if quantidade_levar <= quantidade_pagar:
+        raise ErroRequisicao(
+            "O campo 'quantidade_levar' deve ser maior que 'quantidade_pagar'."
+        )
+
+
+def _relatorio(consulta: dict) -> dict:
+    resumo, total_geral = OrcamentoController.ler_resumo_do_relatorio(
+        _data(consulta.get("inicio"), "inicio"),
+        _data(consulta.get("fim"), "fim"),
+        _inteiro(consulta.get("produto", -1), "produto"),
+    )
+    return {"orcamentos": resumo.to_dict("records"), "total_geral": total_geral}
+
+
+def _salvar_produtos(produtos: list) -> dict:
+    quantidade = ProdutoController.gravar_produtos(
+        [
+            (
+                _texto(_campo(produto, "descricao"), "descricao"),
+                _centavos(_campo(produto, "preco_centavos"), "preco_centavos"),
+            )
+            for produto in produtos
+        ]
+    )
+    return {"produtos": quantidade}
+
+
+def _carrinho(itens: list) -> dict:
+    carrinho = _itens_do_carrinho(itens)
+    return {
+        "itens": [item._asdict() for item in carrinho],
+        "total_centavos": sum(item.total_centavos for item in carrinho),
+        "desconto_centavos": sum(item.desconto_centavos for item in carrinho),
+    }
+
+
+ROTAS = [
+    *_cadastro(ClienteController, "clientes", "cliente", ("nome",), (_texto,)),
+    *_cadastro(
+        ProdutoController,
+        "produtos",
+        "produto",
+        ("descricao", "preco_centavos"),
+        (_texto, _centavos),
+    ),
+    *_cadastro(VendedorController, "vendedores", "vendedor", ("nome",), (_texto,)),
+    *_cadastro(
+        OfertasController,
+        "ofertas",
+        "oferta",
+        ("produto_id", "quantidade_levar", "quantidade_pagar"),
+        (_inteiro, _quantidade, _quantidade),
+        _validar_oferta,
+    ),
+    (
+        "GET",
+        r"/orcamentos",
+        lambda rota, consulta, corpo: _pagina(
+            OrcamentoController.pagina_de_orcamentos, consulta, apos_inteiro=True
+        ),
+    ),
+    (
+        "GET",
+        r"/orcamentos/(?P<codigo>\d+)/itens",
+        lambda rota, consulta, corpo: OrcamentoController.itens_do_orcamento(
+            int(rota["codigo"])
+        ),
+    ),
+    (
+        "POST",
+        r"/orcamentos",
+        lambda rota, consulta, corpo: {
+            "codigo": OrcamentoController.gravar_orcamentos([_orcamento(corpo)])[0]
+        },
+    ),
+    (
+        "DELETE",
+        r"/orcamentos/(?P<codigo>\d+)",
+        lambda rota, consulta, corpo: _encontrado(
+            OrcamentoController.excluir_orcamento(int(rota["codigo"]))
+        ),
+    ),
+    (
+        "GET",
+        r"/relatorio",
+        lambda rota, consulta, corpo: _relatorio(consulta),
+    ),
+    (
+        "POST",
+        r"/lotes/orcamentos",
+        lambda rota, consulta, corpo: {
+            "codigos": OrcamentoController.gravar_orcamentos(
+                [_orcamento(orcamento) for orcamento in _lista(corpo, "orcamentos")]
+            )
+        },
+    ),
+    (
+        "POST",
+        r"/lotes/produtos",
+        lambda rota, consulta, corpo: _salvar_produtos(_lista(corpo, "produtos")),
+    ),
+    (
+        "POST",
+        r"/carrinho",
+        lambda rota, consulta, corpo: _carrinho(_lista(corpo, "itens")),
+    ),
+]
+ROTAS = [(metodo, re.compile(padrao), acao) for metodo, padrao, acao in ROTAS]
+
+
+class Atendente(BaseHTTPRequestHandler):
+    """
+    Atende as requisições da API, direcionando cada uma à rota correspondente de `ROTAS`.
+
+    As respostas são sempre JSON. Operações sem retorno (alteração e remoção) respondem
+    204; erros na requisição respondem 4xx com {"erro": mensagem}: 422 para as restrições do
+    banco violadas (sqlite3.IntegrityError) e 500 para os demais erros.
+    """
+
+    server_version = "MinasBrasilAPI/1.0"
+    protocol_version = "HTTP/1.1"
+    timeout = TEMPO_LIMITE_CONEXAO
+
+    def do_GET(self):
+        self._atender("GET")
+
+    def do_POST(self):
+        self._atender("POST")
+
+    def do_PUT(self):
+        self._atender("PUT")
+
+    def do_DELETE(self):
+        self._atender("DELETE")
+
+    def log_message(self, formato, *args):
+        logging.info(f"API {self.address_string()} {formato % args}")
+
+    def _ler_corpo(self):
+        # Um cabeçalho inválido impede saber onde o corpo termina; a conexão é encerrada por
+        # `_atender()` junto com a resposta de erro.
+        try:
+            tamanho = int(self.headers.get("Content-Length") or 0)
+        except ValueError:
+            tamanho = -1
+        if tamanho < 0:
+            raise ErroRequisicao(
+                "O cabeçalho Content-Length deve ser um número inteiro não negativo.",
+                HTTPStatus.BAD_REQUEST,
+            )
+        if tamanho > TAMANHO_MAXIMO_CORPO:
+            raise ErroRequisicao(
+                "Corpo da requisição muito grande.", HTTPStatus.REQUEST_ENTITY_TOO_LARGE
+            )
+        if not tamanho:
+            return None
+        try:
+            return json.loads(self.rfile.read(tamanho))
+        except ValueError:
+            raise ErroRequisicao("O corpo da requisição não é um JSON válido.")
+
+    def _responder(self, status: HTTPStatus, conteudo=None, cabecalhos=None):
+        corpo = b""
+        if conteudo is not None:
+            corpo = json.dumps(conteudo, ensure_ascii=False).encode("utf-8")
+        self.send_response(status)
+        if corpo:
+            self.send_header("Content-Type", "application/json; charset=utf-8")
+        self.send_header("Content-Length", str(len(corpo)))
+        for nome, valor in (cabecalhos or {}).items():
+            self.send_header(nome, valor)
+        self.end_headers()
+        self.wfile.write(corpo)
+
+    def _atender(self, metodo: str):
+        endereco = urlsplit(self.path)
+        caminho = endereco.path.rstrip("/") or "/"
+
+        acao, rota, metodo_permitido = None, None, False
+        for metodo_rota, padrao, acao_rota in ROTAS:
+            correspondencia = padrao.fullmatch(caminho)
+            if correspondencia:
+                metodo_permitido = True
+                if metodo_rota == metodo:
+                    acao, rota = acao_rota, correspondencia.groupdict()
+                    break
+
+        try:
+            corpo = self._ler_corpo()
+        except ErroRequisicao as e:
+            self.close_connection = True
+            self._responder(e.status, {"erro": str(e)})
+            return
+
+        if acao is None:
+            status = (
+                HTTPStatus.METHOD_NOT_ALLOWED
+                if metodo_permitido
+                else HTTPStatus.NOT_FOUND
+            )
+            self._responder(status, {"erro": status.phrase})
+            return
+
+        if not _vagas.acquire(timeout=TEMPO_ESPERA_REQUISICAO):
+            self._responder(
+                HTTPStatus.SERVICE_UNAVAILABLE,
+                {"erro": "Servidor ocupado; tente novamente."},
+                {"Retry-After": "1"},
+            )
+            return
+
+        try:
+            consulta = {
+                chave: valores[-1]
+                for chave, valores in parse_qs(endereco.query).items()
+            }
+            resultado = acao(rota, consulta, corpo)
+        except ErroRequisicao as e:
+            self._responder(e.status, {"erro": str(e)})
+        except sqlite3.IntegrityError as e:
+            self._responder(
+                HTTPStatus.UNPROCESSABLE_ENTITY, {"erro": f"Restrição violada: {e}"}
+            )
+        except Exception as e:
+            logging.error(f"Erro ao atender requisição {metodo} {caminho}: {e}")
+            self._responder(HTTPStatus.INTERNAL_SERVER_ERROR, {"erro": "Erro interno."})
+        else:
+            if resultado is None:
+                self._responder(HTTPStatus.NO_CONTENT)
+            else:
+                self._responder(
+                    HTTPStatus.CREATED if metodo == "POST" else HTTPStatus.OK,
+                    resultado,
+                )
+        finally:
+            _vagas.release()
+
+
+def criar_servidor(host: str, porta: int) -> ThreadingHTTPServer:
+    """
+    Cria o servidor da API, com uma thread por conexão e conexões ao banco do pool.
+
+    Args:
+        host (str): O endereço em que o servidor escuta.
+        porta (int): A porta em que o servidor escuta (0 escolhe uma porta livre).
+
+    Returns:
+        ThreadingHTTPServer: O servidor, pronto para `serve_forever()`.
+    """
+    servidor = ThreadingHTTPServer((host, porta), Atendente)
+    servidor.daemon_threads = True
+    return servidor
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--porta", type=int, default=8600)
+    args = parser.parse_args()
+
+    setup_logging()
+    criar_banco_de_dados()
+
+    servidor = criar_servidor(args.host, args.porta)
+    logging.info(f"API disponível em http://{args.host}:{servidor.server_port}")
+    try:
+        servidor.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        servidor.server_close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,242 @@
+"""
+Benchmark das funções dos controllers em bancos de vários tamanhos.
+
+Para cada escala (quantidade aproximada de itens de orçamento), um banco temporário é
+populado por `gerar_dados_em_massa()` com semente fixa e cada função é executada
+`--repeticoes` vezes, com o cache de consultas limpo antes de cada execução. Os tempos são
+gravados em JSON; com `--comparar`, as medianas são comparadas às de uma execução anterior
+e o comando termina com código 1 se alguma ficar acima da tolerância.
+
+Uso (a partir da pasta src):
+    python -m benchmarks.controladores --escalas 10000 100000 1000000 --saida atual.json
+    python -m benchmarks.controladores --saida atual.json --comparar anterior.json
+"""
+
+import argparse
+import json
+import os
+import platform
+import sqlite3
+import statistics
+import sys
+import tempfile
+import time
+from datetime import date, datetime, timedelta
+
+from services import banco_de_dados
+from services.banco_de_dados import configurar_banco, conectar, criar_banco_de_dados
+from services.cache import limpar_cache
+from services.dados_fakers import gerar_dados_em_massa
+from services.precificacao import ItemOrcamento
+from controllers.ClienteController import (
+    buscar_clientes,
+    lista_de_clientes,
+    pagina_de_clientes,
+)
+from controllers.ProdutoController import (
+    buscar_produtos,
+    lista_de_produtos,
+    pagina_de_produtos,
+)
+from controllers.VendedorController import lista_de_vendedores, pagina_de_vendedores
+from controllers.OfertasController import lista_de_ofertas, pagina_de_ofertas
+from controllers.OrcamentoController import (
+    adicionar_orcamento,
+    deletar_orcamento,
+    gerar_relatorio,
+    lista_de_orcamentos,
+    pagina_de_orcamentos,
+    resumo_do_relatorio,
+)
+
+
+ESCALAS = (10_000, 100_000, 1_000_000)
+ITENS_POR_ORCAMENTO = 4
+DIAS = 365
+SEMENTE = 42
+# Data fixa, para que a mesma semente gere sempre os mesmos dados.
+DATA_FINAL = date(2024, 12, 31)
+TOLERANCIA = 1.25
+
+
+def _periodo(dias: int) -> tuple[str, str]:
+    return (DATA_FINAL - timedelta(days=dias - 1)).isoformat(), DATA_FINAL.isoformat()
+
+
+def _ultimo_orcamento() -> tuple:
+    with conectar() as conn:
+        return (conn.execute("SELECT MAX(codigo) FROM orcamentos").fetchone()[0],)
+
+
+def _itens_de_exemplo() -> list:
+    with conectar() as conn:
+        produtos = conn.execute(
+            "SELECT codigo, descricao, preco_centavos FROM produtos LIMIT 4"
+        ).fetchall()
+
+    return [
+        ItemOrcamento(p["codigo"], p["descricao"], 2, p["preco_centavos"], 0, 0)
+        for p in produtos
+    ]
+
+
+def casos() -> list:
+    """
+    Retorna os casos medidos: (nome, função, preparação dos argumentos ou None).
+
+    A preparação é executada antes de cada repetição e não entra na medição.
+    """
+    itens = []
+
+    def preparar_itens():
+        if not itens:
+            itens.extend(_itens_de_exemplo())
+        return (1, 1, itens)
+
+    return [
+        ("lista_de_clientes", lista_de_clientes, None),
+        ("lista_de_produtos", lista_de_produtos, None),
+        ("lista_de_vendedores", lista_de_vendedores, None),
+        ("lista_de_ofertas", lista_de_ofertas, None),
+        ("lista_de_orcamentos", lista_de_orcamentos, None),
+        ("pagina_de_clientes", pagina_de_clientes, None),
+        ("pagina_de_produtos", pagina_de_produtos, None),
+        ("pagina_de_vendedores", pagina_de_vendedores, None),
+        ("pagina_de_ofertas", pagina_de_ofertas, None),
+        ("pagina_de_orcamentos", pagina_de_orcamentos, None),
+        ("buscar_clientes", buscar_clientes, lambda: ("ana",)),
+        ("buscar_produtos", buscar_produtos, lambda: ("dipi",)),
+        ("adicionar_orcamento", adicionar_orcamento, preparar_itens),
+        ("deletar_orcamento", deletar_orcamento, _ultimo_orcamento),
+        ("gerar_relatorio[1 dia]", gerar_relatorio, lambda: _periodo(1)),
+        ("gerar_relatorio[30 dias]", gerar_relatorio, lambda: _periodo(30)),
+        ("gerar_relatorio[365 dias]", gerar_relatorio, lambda: _periodo(365)),
+        ("resumo_do_relatorio[30 dias]", resumo_do_relatorio, lambda: _periodo(30)),
+        ("resumo_do_relatorio[365 dias]", resumo_do_relatorio, lambda: _periodo(365)),
+    ]
+
+
+def medir(funcao, preparar, repeticoes: int) -> dict:
+    tempos, linhas = [], None
+    for _ in range(repeticoes):
+        argumentos = preparar() if preparar else ()
+        limpar_cache()
+        inicio = time.perf_counter()
+        resultado = funcao(*argumentos)
+        tempos.append((time.perf_counter() - inicio) * 1000)
+        if isinstance(resultado, tuple):
+            resultado = resultado[0]
+        linhas = len(resultado) if hasattr(resultado, "__len__") else None
+
+    return {
+        "repeticoes": repeticoes,
+        "linhas": linhas,
+        "min_ms": round(min(tempos), 3),
+        "mediana_ms": round(statistics.median(tempos), 3),
+        "media_ms": round(statistics.fmean(tempos), 3),
+        "max_ms": round(max(tempos), 3),
+    }
+
+
+def executar(escalas, repeticoes: int) -> dict:
+    caminho_original = banco_de_dados.CAMINHO_BANCO
+    resultados = []
+    try:
+        for escala in escalas:
+            with tempfile.TemporaryDirectory() as pasta:
+                configurar_banco(os.path.join(pasta, "benchmark.db"))
+                criar_banco_de_dados()
+                geracao = gerar_dados_em_massa(
+                    max(1, escala // ITENS_POR_ORCAMENTO),
+                    ITENS_POR_ORCAMENTO,
+                    dias=DIAS,
+                    semente=SEMENTE,
+                    data_final=DATA_FINAL,
+                )
+                print(
+                    f"escala {escala}: {geracao['orcamento_itens']} itens gerados "
+                    f"em {geracao['segundos']:.1f}s",
+                    file=sys.stderr,
+                )
+                for nome, funcao, preparar in casos():
+                    medicao = medir(funcao, preparar, repeticoes)
+                    resultados.append({"escala": escala, "funcao": nome, **medicao})
+                    print(
+                        f"  {nome:32} mediana {medicao['mediana_ms']:10.2f} ms",
+                        file=sys.stderr,
+                    )
+                configurar_banco(caminho_original)
+    finally:
+        configurar_banco(caminho_original)
+
+    return {
+        "ambiente": {
+            "data": datetime.now().isoformat(timespec="seconds"),
+            "python": platform.python_version(),
+            "sqlite": sqlite3.sqlite_version,
+            "plataforma": platform.platform(),
+            "processador": platform.processor() or platform.machine(),
+        },
+        "parametros": {
+            "itens_por_orcamento": ITENS_POR_ORCAMENTO,
+            "dias": DIAS,
+            "semente": SEMENTE,
+            "data_final": DATA_FINAL.isoformat(),
+        },
+        "resultados": resultados,
+    }
+
+
+def comparar(atual: dict, anterior: dict, tolerancia: float) -> list:
+    """
+    Retorna as medições de `atual` cuja mediana ultrapassa a de `anterior` vezes `tolerancia`.
+    """
+    base = {
+        (resultado["escala"], resultado["funcao"]): resultado["mediana_ms"]
+        for resultado in anterior["resultados"]
+    }
+    regressoes = []
+    for resultado in atual["resultados"]:
+        mediana_anterior = base.get((resultado["escala"], resultado["funcao"]))
+        if mediana_anterior and resultado["mediana_ms"] > mediana_anterior * tolerancia:
+            regressoes.append(
+                {
+                    "escala": resultado["escala"],
+                    "funcao": resultado["funcao"],
+                    "mediana_anterior_ms": mediana_anterior,
+                    "mediana_ms": resultado["mediana_ms"],
+                }
+            )
+
+    return regressoes
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--escalas", type=int, nargs="+", default=list(ESCALAS))
+    parser.add_argument("--repeticoes", type=int, default=5)
+    parser.add_argument("--saida", default="benchmark_controladores.json")
+    parser.add_argument("--comparar", help="JSON de uma execução anterior")
+    parser.add_argument("--tolerancia", type=float, default=TOLERANCIA)
+    args = parser.parse_args()
+
+    atual = executar(args.escalas, args.repeticoes)
+    with open(args.saida, "w", encoding="utf-8") as arquivo:
+        json.dump(atual, arquivo, ensure_ascii=False, indent=2)
+    print(f"Resultados gravados em {args.saida}", file=sys.stderr)
+
+    if args.comparar:
+        with open(args.comparar, encoding="utf-8") as arquivo:
+            regressoes = comparar(atual, json.load(arquivo), args.tolerancia)
+        for regressao in regressoes:
+            print(
+                f"REGRESSÃO {regressao['funcao']} (escala {regressao['escala']}): "
+                f"{regressao['mediana_anterior_ms']:.2f} ms -> {regressao['mediana_ms']:.2f} ms",
+                file=sys.stderr,
+            )
+        if regressoes:
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,158 @@
+"""
+Benchmark da gravação de orçamentos por várias sessões simultâneas.
+
+Cada sessão é uma thread que grava orçamentos sem intervalo durante `--duracao` segundos,
+com `--itens` itens cada. São comparados dois modos, cada um em um banco temporário novo:
+  - direto: cada sessão grava o seu orçamento na sua própria transação, como antes da
+    thread de escrita, disputando a trava de escrita do SQLite.
+  - fila: `adicionar_orcamento()`, que envia o orçamento à thread de escrita
+    (services/escrita.py) e aguarda a confirmação do commit.
+
+São informados os orçamentos gravados por segundo, a latência de cada gravação (mediana e
+p95) e as gravações que falharam (ex: "database is locked").
+
+Uso (a partir da pasta src):
+    python -m benchmarks.escrita --sessoes 20 --duracao 10 --saida escrita.json
+"""
+
+import argparse
+import json
+import os
+import statistics
+import sys
+import tempfile
+import threading
+import time
+
+from services.banco_de_dados import configurar_banco, conectar, criar_banco_de_dados
+from services.dados_fakers import cadastrar_dados_fakes
+from services.precificacao import precificar_carrinho
+from controllers.OrcamentoController import adicionar_orcamento
+
+
+def _gravar_direto(cliente_id: int, vendedor_id: int, itens: list) -> int:
+    with conectar() as conn:
+        cursor = conn.cursor()
+        cursor.execute(
+            "INSERT INTO orcamentos (cliente_id, vendedor_id) VALUES (?, ?)",
+            (cliente_id, vendedor_id),
+        )
+        orcamento_id = cursor.lastrowid
+        cursor.executemany(
+            """
+            INSERT INTO orcamento_itens (
+                orcamento_id, produto_id, quantidade, preco_unitario_centavos, desconto_centavos
+            )
+            VALUES (?, ?, ?, ?, ?)
+            """,
+            [
+                (
+                    orcamento_id,
+                    item.produto_id,
+                    item.quantidade,
+                    item.preco_unitario_centavos,
+                    item.desconto_centavos,
+                )
+                for item in itens
+            ],
+        )
+        conn.commit()
+        return orcamento_id
+
+
+def _gravar_pela_fila(cliente_id: int, vendedor_id: int, itens: list) -> int:
+    codigo = adicionar_orcamento(cliente_id, vendedor_id, itens)
+    if codigo is None:
+        raise RuntimeError("orçamento não gravado")
+    return codigo
+
+
+MODOS = {"direto": _gravar_direto, "fila": _gravar_pela_fila}
+
+
+def _sessao(gravar, itens: list, fim: float, sessao: int, resultado: dict) -> None:
+    latencias, falhas = [], 0
+    while time.perf_counter() < fim:
+        inicio = time.perf_counter()
+        try:
+            gravar(1 + sessao % 6, 1 + sessao % 7, itens)
+            latencias.append((time.perf_counter() - inicio) * 1000)
+        except Exception:
+            falhas += 1
+    resultado[sessao] = (latencias, falhas)
+
+
+def executar(modo: str, sessoes: int, duracao: float, quantidade_itens: int) -> dict:
+    with tempfile.TemporaryDirectory() as pasta:
+        configurar_banco(os.path.join(pasta, "escrita.db"))
+        criar_banco_de_dados()
+        cadastrar_dados_fakes()
+        itens = precificar_carrinho(
+            [(1 + indice % 6, 1 + indice % 5) for indice in range(quantidade_itens)]
+        )
+
+        resultado = {}
+        fim = time.perf_counter() + duracao
+        threads = [
+            threading.Thread(
+                target=_sessao, args=(MODOS[modo], itens, fim, sessao, resultado)
+            )
+            for sessao in range(sessoes)
+        ]
+        inicio = time.perf_counter()
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        decorrido = time.perf_counter() - inicio
+
+        with conectar() as conn:
+            gravados = conn.execute("SELECT COUNT(*) FROM orcamentos").fetchone()[0]
+
+    latencias = sorted(
+        latencia for lista, _ in resultado.values() for latencia in lista
+    )
+    return {
+        "modo": modo,
+        "sessoes": sessoes,
+        "itens_por_orcamento": quantidade_itens,
+        "segundos": round(decorrido, 2),
+        "orcamentos_gravados": gravados,
+        "orcamentos_por_segundo": round(gravados / decorrido, 1),
+        "latencia_mediana_ms": (
+            round(statistics.median(latencias), 2) if latencias else None
+        ),
+        "latencia_p95_ms": (
+            round(latencias[int(len(latencias) * 0.95)], 2) if latencias else None
+        ),
+        "falhas": sum(falhas for _, falhas in resultado.values()),
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--sessoes", type=int, default=20)
+    parser.add_argument("--duracao", type=float, default=10.0)
+    parser.add_argument("--itens", type=int, default=5)
+    parser.add_argument("--modos", nargs="+", choices=list(MODOS), default=list(MODOS))
+    parser.add_argument("--saida", help="arquivo JSON para gravar os resultados")
+    args = parser.parse_args()
+
+    resultados = []
+    for modo in args.modos:
+        resultado = executar(modo, args.sessoes, args.duracao, args.itens)
+        resultados.append(resultado)
+        print(
+            f"{modo:8} {resultado['orcamentos_por_segundo']:10.1f} orçamentos/s  "
+            f"mediana {resultado['latencia_mediana_ms']} ms  "
+            f"p95 {resultado['latencia_p95_ms']} ms  falhas {resultado['falhas']}",
+            file=sys.stderr,
+        )
+
+    if args.saida:
+        with open(args.saida, "w", encoding="utf-8") as arquivo:
+            json.dump(resultados, arquivo, ensure_ascii=False, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,192 @@
+"""
+Benchmark do tempo de inicialização da aplicação Streamlit (importações e primeira execução).
+
+Cada medição é feita em um processo Python novo, como após reiniciar o servidor:
+  - importação: tempo para importar o módulo depois do `streamlit`, que o servidor já carregou
+    antes de executar o script; também verifica se o pandas e o NumPy foram carregados.
+  - primeira execução: tempo da primeira execução de `main.py` (AppTest) em uma página,
+    incluindo a abertura do banco de dados e a importação da página.
+
+Antes das medições, um banco é criado e populado com `ORCAMENTOS` orçamentos (e os clientes,
+produtos e vendedores correspondentes) por `gerar_dados_em_massa()`, em um processo separado;
+cada medição usa uma cópia dele, para que as listagens sejam medidas com registros.
+
+As medianas são comparadas com `ORCAMENTO_MS`, e as páginas de `SEM_PANDAS` não podem carregar
+o pandas. O comando termina com código 1 se algum limite for ultrapassado.
+
+Uso (a partir da pasta src):
+    python -m benchmarks.inicializacao --repeticoes 5 --saida inicializacao.json
+"""
+
+import argparse
+import json
+import os
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+
+
+# Limites da mediana, em ms. São folgados em relação às medições de referência, para absorver
+# a variação entre máquinas; o objetivo é detectar, por exemplo, um pandas importado de volta.
+ORCAMENTO_MS = {
+    "importacao[main]": 150,
+    "importacao[pages.clientes]": 150,
+    "importacao[pages.orcamentos]": 150,
+    "importacao[pages.relatorios]": 1500,
+    "importacao[pages.rankings]": 150,
+    "importacao[pages.painel]": 150,
+    "primeira_execucao[home]": 400,
+    "primeira_execucao[pagina_listar_clientes]": 400,
+    "primeira_execucao[pagina_listar_produtos]": 400,
+    "primeira_execucao[pagina_orcamentos]": 400,
+}
+
+ORCAMENTOS = 2_000
+
+SEM_PANDAS = (
+    "main",
+    "pages.clientes",
+    "pages.orcamentos",
+    "pages.rankings",
+    "pages.painel",
+    "home",
+    "pagina_listar_clientes",
+    "pagina_listar_produtos",
+    "pagina_orcamentos",
+)
+
+_IMPORTACAO = """
+import json, sys, time
+import streamlit
+inicio = time.perf_counter()
+import {modulo}
+duracao = (time.perf_counter() - inicio) * 1000
+print(json.dumps({{"ms": duracao, "pandas": "pandas" in sys.modules, "numpy": "numpy" in sys.modules}}))
+"""
+
+_POPULAR = """
+import os, sys
+from services import banco_de_dados
+from services.dados_fakers import gerar_dados_em_massa
+banco_de_dados.configurar_banco(os.path.join({pasta!r}, "inicializacao.db"))
+banco_de_dados.criar_banco_de_dados()
+if not gerar_dados_em_massa({orcamentos}):
+    sys.exit("Falha ao popular o banco de dados.")
+"""
+
+_PRIMEIRA_EXECUCAO = """
+import json, os, sys, time
+from streamlit.testing.v1 import AppTest
+from services import banco_de_dados
+banco_de_dados.configurar_banco(os.path.join({pasta!r}, "inicializacao.db"))
+app = AppTest.from_file("main.py", default_timeout=60)
+app.session_state["pagina_atual"] = {pagina!r}
+inicio = time.perf_counter()
+app.run()
+duracao = (time.perf_counter() - inicio) * 1000
+print(json.dumps({{"ms": duracao, "pandas": "pandas" in sys.modules, "numpy": "numpy" in sys.modules, "erro": bool(app.exception)}}))
+"""
+
+
+def _rodar(codigo: str) -> str:
+    # Executado a partir da pasta src, para que `main.py` e os pacotes sejam encontrados.
+    pasta_src = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    saida = subprocess.run(
+        [sys.executable, "-c", codigo],
+        cwd=pasta_src,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    return saida.stdout
+
+
+def _executar(codigo: str) -> dict:
+    return json.loads(_rodar(codigo).strip().splitlines()[-1])
+
+
+def casos() -> list:
+    """
+    Retorna os casos medidos: (nome, alvo, modelo do código executado em um processo novo).
+    """
+    return [
+        (f"importacao[{modulo}]", modulo, _IMPORTACAO)
+        for modulo in (
+            "main",
+            "pages.clientes",
+            "pages.orcamentos",
+            "pages.relatorios",
+            "pages.rankings",
+            "pages.painel",
+        )
+    ] + [
+        (f"primeira_execucao[{pagina}]", pagina, _PRIMEIRA_EXECUCAO)
+        for pagina in (
+            "home",
+            "pagina_listar_clientes",
+            "pagina_listar_produtos",
+            "pagina_orcamentos",
+        )
+    ]
+
+
+def executar(repeticoes: int) -> list:
+    resultados = []
+    with tempfile.TemporaryDirectory() as pasta:
+        # O banco é populado uma única vez; cada repetição usa uma cópia dele, em uma pasta nova.
+        populado = tempfile.mkdtemp(dir=pasta)
+        _rodar(_POPULAR.format(pasta=populado, orcamentos=ORCAMENTOS))
+
+        for nome, alvo, modelo in casos():
+            medicoes = []
+            for _ in range(repeticoes):
+                copia = tempfile.mkdtemp(dir=pasta)
+                shutil.copy(os.path.join(populado, "inicializacao.db"), copia)
+                medicoes.append(
+                    _executar(modelo.format(modulo=alvo, pagina=alvo, pasta=copia))
+                )
+
+            mediana = statistics.median(medicao["ms"] for medicao in medicoes)
+            carregou_pandas = any(medicao["pandas"] for medicao in medicoes)
+            resultado = {
+                "caso": nome,
+                "repeticoes": repeticoes,
+                "mediana_ms": round(mediana, 1),
+                "min_ms": round(min(medicao["ms"] for medicao in medicoes), 1),
+                "pandas": carregou_pandas,
+                "numpy": any(medicao["numpy"] for medicao in medicoes),
+                "orcamento_ms": ORCAMENTO_MS.get(nome),
+                "excedido": mediana > ORCAMENTO_MS.get(nome, float("inf"))
+                or (alvo in SEM_PANDAS and carregou_pandas)
+                or any(medicao.get("erro") for medicao in medicoes),
+            }
+            resultados.append(resultado)
+            print(
+                f"{nome:45} mediana {resultado['mediana_ms']:8.1f} ms "
+                f"(limite {resultado['orcamento_ms']}) pandas={resultado['pandas']}"
+                f"{'  EXCEDIDO' if resultado['excedido'] else ''}",
+                file=sys.stderr,
+            )
+
+    return resultados
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--repeticoes", type=int, default=5)
+    parser.add_argument("--saida", help="arquivo JSON para gravar os resultados")
+    args = parser.parse_args()
+
+    resultados = executar(args.repeticoes)
+    if args.saida:
+        with open(args.saida, "w", encoding="utf-8") as arquivo:
+            json.dump(resultados, arquivo, ensure_ascii=False, indent=2)
+
+    if any(resultado["excedido"] for resultado in resultados):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
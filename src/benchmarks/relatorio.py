@@ -0,0 +1,231 @@
+"""
+Benchmark do filtro por período de `gerar_relatorio`.
+
+Compara a consulta antiga (`DATE(o.data_criacao) BETWEEN ? AND ?`, que não pode usar
+índices) com a consulta atual (faixa semiaberta na coluna indexada "dia_criacao")
+em um banco temporário com o volume de itens informado. Também compara os totais por produto
+do período somados a partir dos itens com os lidos do resumo "vendas_diarias"
+(`ler_vendas_por_produto`), e o resumo do relatório por SQL (`ler_resumo_do_relatorio` e
+`ler_vendas_por_produto`) com o calculado pelo cache colunar (`ler_relatorio_colunar`).
+
+Uso (a partir da pasta src):
+    python -m benchmarks.relatorio --itens 3000000
+"""
+
+import argparse
+import os
+import tempfile
+import time
+from datetime import date, timedelta
+
+from services.banco_de_dados import configurar_banco, conectar, criar_banco_de_dados
+from services.datas import intervalo_de_dias
+from services.cache_colunar import descartar_cache_colunar, ler_relatorio_colunar
+from controllers.OrcamentoController import (
+    gerar_relatorio,
+    ler_resumo_do_relatorio,
+    ler_vendas_por_produto,
+)
+
+
+CONSULTA = """
+    SELECT
+        o.codigo as orcamento_id,
+        o.data_criacao,
+        c.nome as nome_cliente,
+        v.nome as nome_vendedor,
+        p.descricao as produto,
+        i.quantidade,
+        i.preco_unitario_centavos,
+        i.desconto_centavos,
+        (i.quantidade * i.preco_unitario_centavos - i.desconto_centavos)
+            as total_item_centavos
+    FROM orcamentos o
+    JOIN clientes c ON c.codigo = o.cliente_id
+    JOIN vendedores v ON v.codigo = o.vendedor_id
+    JOIN orcamento_itens i ON i.orcamento_id = o.codigo
+    JOIN produtos p ON p.codigo = i.produto_id
+    WHERE {filtro}
+    ORDER BY o.codigo
+"""
+CONSULTA_ANTIGA = CONSULTA.format(filtro="DATE(o.data_criacao) BETWEEN ? AND ?")
+CONSULTA_ATUAL = CONSULTA.format(filtro="o.dia_criacao >= ? AND o.dia_criacao < ?")
+CONSULTA_TOTAIS_PELOS_ITENS = """
+    SELECT
+        i.produto_id,
+        SUM(i.quantidade * i.preco_unitario_centavos - i.desconto_centavos) as valor_liquido
+    FROM orcamentos o
+    JOIN orcamento_itens i ON i.orcamento_id = o.codigo
+    WHERE o.dia_criacao >= ? AND o.dia_criacao < ?
+    GROUP BY i.produto_id
+"""
+
+
+def popular(
+    itens: int, itens_por_orcamento: int, dias: int, produtos: int = 2000
+) -> None:
+    orcamentos = itens // itens_por_orcamento
+    with conectar() as conn:
+        conn.execute(
+            "INSERT INTO clientes (nome) "
+            "WITH RECURSIVE n(x) AS (SELECT 1 UNION ALL SELECT x + 1 FROM n WHERE x < 500) "
+            "SELECT 'Cliente ' || x FROM n"
+        )
+        conn.execute(
+            "INSERT INTO vendedores (nome) "
+            "WITH RECURSIVE n(x) AS (SELECT 1 UNION ALL SELECT x + 1 FROM n WHERE x < 20) "
+            "SELECT 'Vendedor ' || x FROM n"
+        )
+        conn.execute(
+            "INSERT INTO produtos (descricao, preco_centavos) "
+            f"WITH RECURSIVE n(x) AS (SELECT 1 UNION ALL SELECT x + 1 FROM n WHERE x < {produtos}) "
+            "SELECT 'Produto ' || x, 100 * (1 + x % 50) FROM n"
+        )
+        # Orçamentos distribuídos uniformemente pelos últimos `dias` dias.
+        conn.execute(
+            f"""
+            INSERT INTO orcamentos (cliente_id, vendedor_id, data_criacao)
+            WITH RECURSIVE n(x) AS (SELECT 1 UNION ALL SELECT x + 1 FROM n WHERE x < {orcamentos})
+            SELECT 1 + x % 500, 1 + x % 20,
+                   datetime('now', '-' || (x * {dias} / {orcamentos}) || ' days')
+            FROM n
+            """
+        )
+        conn.execute(
+            f"""
+            INSERT INTO orcamento_itens (
+                orcamento_id, produto_id, quantidade, preco_unitario_centavos, desconto_centavos
+            )
+            WITH RECURSIVE n(x) AS (SELECT 0 UNION ALL SELECT x + 1 FROM n WHERE x < {itens - 1})
+            SELECT 1 + x / {itens_por_orcamento}, 1 + x % {produtos}, 1 + x % 5, 100 * (1 + x % 50), 0
+            FROM n
+            """
+        )
+        conn.execute("ANALYZE")
+        plano = conn.execute("EXPLAIN QUERY PLAN " + CONSULTA_ATUAL, (0, 1)).fetchall()
+        print("Plano da consulta atual:", "; ".join(linha["detail"] for linha in plano))
+
+
+def cronometrar(funcao, repeticoes: int) -> float:
+    melhor = float("inf")
+    for _ in range(repeticoes):
+        inicio = time.perf_counter()
+        funcao()
+        melhor = min(melhor, time.perf_counter() - inicio)
+
+    return melhor
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--itens", type=int, default=3_000_000)
+    parser.add_argument("--itens-por-orcamento", type=int, default=4)
+    parser.add_argument("--dias", type=int, default=3 * 365)
+    parser.add_argument("--produtos", type=int, default=2000)
+    parser.add_argument(
+        "--periodo", type=int, default=30, help="dias filtrados no relatório"
+    )
+    parser.add_argument("--repeticoes", type=int, default=3)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as pasta:
+        configurar_banco(os.path.join(pasta, "benchmark.db"))
+        criar_banco_de_dados()
+
+        inicio = time.perf_counter()
+        popular(args.itens, args.itens_por_orcamento, args.dias, args.produtos)
+        print(f"{args.itens} itens gerados em {time.perf_counter() - inicio:.1f}s")
+
+        data_fim = date.today() - timedelta(days=args.dias // 2)
+        data_inicio = data_fim - timedelta(days=args.periodo - 1)
+        parametros = (data_inicio.isoformat(), data_fim.isoformat())
+
+        def consulta_antiga():
+            with conectar() as conn:
+                return conn.execute(CONSULTA_ANTIGA, parametros).fetchall()
+
+        def consulta_atual():
+            with conectar() as conn:
+                return conn.execute(
+                    CONSULTA_ATUAL, intervalo_de_dias(*parametros)
+                ).fetchall()
+
+        linhas_antiga = len(consulta_antiga())
+        linhas_atual = len(consulta_atual())
+        linhas_relatorio = len(gerar_relatorio(*parametros))
+        assert linhas_antiga == linhas_atual == linhas_relatorio
+
+        tempo_antigo = cronometrar(consulta_antiga, args.repeticoes)
+        tempo_atual = cronometrar(consulta_atual, args.repeticoes)
+        tempo_relatorio = cronometrar(
+            lambda: gerar_relatorio(*parametros), args.repeticoes
+        )
+
+        print(f"Período de {args.periodo} dias: {linhas_atual} itens")
+        print(
+            f"SQL com DATE(data_criacao) BETWEEN (antes): {tempo_antigo * 1000:9.1f} ms"
+        )
+        print(
+            f"SQL com dia_criacao >= ? AND < ? (depois):  {tempo_atual * 1000:9.1f} ms"
+        )
+        print(
+            f"gerar_relatorio (SQL + DataFrame):          {tempo_relatorio * 1000:9.1f} ms"
+        )
+
+        def totais_pelos_itens():
+            with conectar() as conn:
+                return conn.execute(
+                    CONSULTA_TOTAIS_PELOS_ITENS, intervalo_de_dias(*parametros)
+                ).fetchall()
+
+        totais = dict(tuple(linha) for linha in totais_pelos_itens())
+        resumo = ler_vendas_por_produto(*parametros)
+        assert totais == dict(
+            zip(
+                resumo["produto_id"].tolist(), resumo["valor_liquido_centavos"].tolist()
+            )
+        )
+
+        tempo_itens = cronometrar(totais_pelos_itens, args.repeticoes)
+        tempo_resumo = cronometrar(
+            lambda: ler_vendas_por_produto(*parametros), args.repeticoes
+        )
+        print(
+            f"Totais por produto a partir dos itens:      {tempo_itens * 1000:9.1f} ms"
+        )
+        print(
+            f"ler_vendas_por_produto (vendas_diarias):    {tempo_resumo * 1000:9.1f} ms"
+        )
+
+        def relatorio_por_sql():
+            ler_resumo_do_relatorio(*parametros)
+            ler_vendas_por_produto(*parametros)
+
+        def carga_do_cache():
+            descartar_cache_colunar()
+            ler_relatorio_colunar(*parametros)
+
+        produto = 1 + args.produtos // 2
+        tempo_sql = cronometrar(relatorio_por_sql, args.repeticoes)
+        tempo_carga = cronometrar(carga_do_cache, 1)
+        tempo_colunar = cronometrar(
+            lambda: ler_relatorio_colunar(*parametros), args.repeticoes
+        )
+        tempo_colunar_produto = cronometrar(
+            lambda: ler_relatorio_colunar(*parametros, produto), args.repeticoes
+        )
+        print(f"Resumo do relatório por SQL + DataFrame:    {tempo_sql * 1000:9.1f} ms")
+        print(
+            f"Cache colunar, carga completa:              {tempo_carga * 1000:9.1f} ms"
+        )
+        print(
+            f"Cache colunar, resumo do período:           {tempo_colunar * 1000:9.1f} ms"
+        )
+        print(
+            f"Cache colunar, resumo com filtro de produto:{tempo_colunar_produto * 1000:9.1f} ms"
+        )
+        configurar_banco("prova.db")
+
+
+if __name__ == "__main__":
+    main()
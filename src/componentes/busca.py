@@ -0,0 +1,48 @@
+import streamlit as st
+from services.busca import LIMITE_RESULTADOS
+
+
+def selecionar_com_busca(
+    rotulo: str,
+    buscar,
+    campo: str,
+    chave: str,
+    atual: dict | None = None,
+    limite: int = LIMITE_RESULTADOS,
+) -> dict | None:
+    """
+    Exibe um campo de busca seguido de uma caixa de seleção com os registros encontrados.
+
+    Em vez de enviar a tabela inteira para o navegador, apenas os `limite` registros que
+    correspondem ao termo digitado são consultados e exibidos, a cada alteração do termo.
+
+    Args:
+        rotulo (str): O rótulo da caixa de seleção (ex: "Produto").
+        buscar: A função de busca do controller (ex: `buscar_produtos`), que recebe o termo e o limite.
+        campo (str): O campo do registro exibido como opção (ex: "descricao").
+        chave (str): Chave única dos componentes na página.
+        atual (dict | None): Registro já selecionado, mantido como primeira opção (ex: na edição).
+        limite (int): A quantidade máxima de opções exibidas.
+
+    Returns:
+        dict | None: O registro selecionado, ou None se nenhum registro for encontrado.
+    """
+    termo = st.text_input(
+        f"Buscar {rotulo.lower()}",
+        key=f"busca_{chave}",
+        placeholder="Digite parte do nome para filtrar",
+    )
+    opcoes = buscar(termo, limite)
+
+    if atual is not None and not termo:
+        opcoes = [atual] + [
+            opcao for opcao in opcoes if opcao["codigo"] != atual["codigo"]
+        ]
+
+    if not opcoes:
+        st.warning(f"Nenhum registro encontrado para '{termo}'.")
+        return None
+
+    return st.selectbox(
+        rotulo, opcoes, format_func=lambda opcao: opcao[campo], key=chave
+    )
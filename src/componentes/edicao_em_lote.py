@@ -0,0 +1,118 @@
+import streamlit as st
+
+
+COLUNA_SELECAO = "selecionado"
+
+
+def _versao(chave: str) -> int:
+    return st.session_state.setdefault(f"edicao_em_lote_{chave}", 0)
+
+
+def descartar_edicao(chave: str) -> None:
+    """
+    Descarta as alterações e a seleção pendentes da tabela de edição em lote.
+
+    Deve ser chamada após gravar as alterações ou remover os registros selecionados, antes do
+    `st.rerun()`, para que a tabela seja exibida novamente a partir dos dados do banco.
+
+    Args:
+        chave (str): Identificador da tabela, o mesmo utilizado em `tabela_em_lote()`.
+
+    Returns:
+        None
+    """
+    st.session_state[f"edicao_em_lote_{chave}"] = _versao(chave) + 1
+
+
+def _formatar(valor, configuracao: dict) -> str:
+    formato = (configuracao.get("type_config") or {}).get("format")
+    if valor is None:
+        return ""
+    if formato and isinstance(valor, (int, float)):
+        return formato % valor
+    return str(valor)
+
+
+def _exibir_linhas(chave: str, linhas: list, colunas: dict) -> list:
+    # Exibição somente leitura, sem `st.dataframe`/`st.data_editor`, que carregam o pandas.
+    larguras = [0.08] + [0.92 / len(colunas)] * len(colunas)
+    for coluna, configuracao in zip(st.columns(larguras)[1:], colunas.values()):
+        coluna.markdown(f"**{configuracao.get('label') or ''}**")
+
+    selecionados = []
+    for linha in linhas:
+        celulas = st.columns(larguras, vertical_alignment="center")
+        if celulas[0].checkbox(
+            "Selecionar",
+            key=f"selecao_{chave}_{_versao(chave)}_{linha['codigo']}",
+            label_visibility="collapsed",
+        ):
+            selecionados.append(int(linha["codigo"]))
+        for celula, (campo, configuracao) in zip(celulas[1:], colunas.items()):
+            celula.write(_formatar(linha[campo], configuracao))
+    return selecionados
+
+
+def tabela_em_lote(
+    chave: str,
+    registros: list,
+    colunas: dict,
+    editaveis: tuple = (),
+) -> tuple[list, list]:
+    """
+    Exibe os registros com uma caixa de seleção por linha e, opcionalmente, edição em tabela.
+
+    Por padrão os registros são exibidos somente para leitura, permitindo marcar vários
+    registros de uma vez. Se houver campos em `editaveis`, a opção "Editar na tabela" troca a
+    exibição por uma tabela editável (`st.data_editor`), com uma coluna de seleção, em que as
+    colunas de `editaveis` são editadas diretamente nas células. O `st.data_editor` carrega o
+    pandas e, por isso, só é montado quando essa opção é ativada.
+
+    Nada é gravado pelo componente: as alterações e a seleção são retornadas para que a página
+    as envie ao controller em uma única operação em lote. A tabela é identificada pelos códigos
+    dos registros exibidos, de modo que alterações pendentes não são aplicadas a outros
+    registros ao mudar de página.
+
+    Args:
+        chave (str): Identificador da tabela na página (ex: "clientes").
+        registros (list): Os registros exibidos, como dicionários com o campo "codigo".
+        colunas (dict): As colunas exibidas, na ordem desejada, como {campo: configuração}
+                        (ex: `st.column_config.TextColumn("Nome")`).
+        editaveis (tuple): Os campos que podem ser editados; os demais são somente leitura.
+
+    Returns:
+        tuple[list, list]: Os registros alterados (dicionários completos, com os novos valores)
+                           e os códigos dos registros selecionados.
+    """
+    campos = list(dict.fromkeys(["codigo", *colunas]))
+    linhas = [
+        {campo: registro.get(campo) for campo in campos} for registro in registros
+    ]
+
+    if not (editaveis and st.toggle("Editar na tabela", key=f"editar_{chave}")):
+        return [], _exibir_linhas(chave, linhas, colunas)
+
+    # Com uma lista de dicionários, o `st.data_editor` retorna uma lista de dicionários.
+    codigos = tuple(linha["codigo"] for linha in linhas)
+    editado = st.data_editor(
+        [{COLUNA_SELECAO: False, **linha} for linha in linhas],
+        key=f"tabela_{chave}_{_versao(chave)}_{hash(codigos)}",
+        column_order=(COLUNA_SELECAO, *colunas),
+        column_config={
+            COLUNA_SELECAO: st.column_config.CheckboxColumn("", width="small"),
+            **colunas,
+        },
+        disabled=[coluna for coluna in colunas if coluna not in editaveis],
+        hide_index=True,
+        num_rows="fixed",
+        use_container_width=True,
+    )
+
+    alterados = [
+        {campo: nova[campo] for campo in campos}
+        for original, nova in zip(linhas, editado)
+        if any(nova[campo] != original[campo] for campo in editaveis)
+    ]
+    selecionados = [int(linha["codigo"]) for linha in editado if linha[COLUNA_SELECAO]]
+
+    return alterados, selecionados
@@ -0,0 +1,77 @@
+import streamlit as st
+
+
+TAMANHO_PAGINA = 50
+
+
+def _cursores(chave: str) -> list:
+    return st.session_state.setdefault(f"paginacao_{chave}", [None])
+
+
+def _avancar(chave: str, proximo) -> None:
+    _cursores(chave).append(proximo)
+
+
+def _voltar(chave: str) -> None:
+    cursores = _cursores(chave)
+    if len(cursores) > 1:
+        cursores.pop()
+
+
+def cursor_da_pagina(chave: str):
+    """
+    Retorna o cursor (valor de `apos`) da página atual de uma listagem paginada.
+
+    Os cursores das páginas já visitadas ficam em uma pilha no estado da sessão, de modo que
+    voltar uma página não exige nenhuma consulta reversa no banco de dados.
+
+    Args:
+        chave (str): Identificador da listagem (ex: "clientes").
+
+    Returns:
+        O valor a ser passado como `apos` para a função `pagina_de_*` do controller.
+    """
+    return _cursores(chave)[-1]
+
+
+def controles_paginacao(chave: str, proximo, quantidade_na_pagina: int) -> None:
+    """
+    Exibe os botões "Anterior" e "Próxima" de uma listagem paginada.
+
+    Se a página atual ficou vazia (por exemplo, após remover o seu último registro), volta
+    automaticamente para a página anterior. Se a listagem inteira estiver vazia, nada é exibido.
+
+    Args:
+        chave (str): Identificador da listagem, o mesmo utilizado em `cursor_da_pagina()`.
+        proximo: O cursor da próxima página retornado pelo controller (None se não houver).
+        quantidade_na_pagina (int): A quantidade de registros exibidos na página atual.
+
+    Returns:
+        None
+    """
+    cursores = _cursores(chave)
+
+    if quantidade_na_pagina == 0:
+        if len(cursores) > 1:
+            _voltar(chave)
+            st.rerun()
+        return
+
+    col1, col2, col3 = st.columns([0.2, 0.6, 0.2])
+    col1.button(
+        label="Anterior",
+        key=f"anterior_{chave}",
+        use_container_width=True,
+        disabled=len(cursores) == 1,
+        on_click=_voltar,
+        args=(chave,),
+    )
+    col2.caption(f"Página {len(cursores)}")
+    col3.button(
+        label="Próxima",
+        key=f"proxima_{chave}",
+        use_container_width=True,
+        disabled=proximo is None,
+        on_click=_avancar,
+        args=(chave, proximo),
+    )
@@ -1,7 +1,16 @@
-from services.banco_de_dados import conectar, tabela_existe
+from services.banco_de_dados import conectar
+from services.escrita import (
+    executar_escrita,
+    executar_escrita_com_resultado,
+    executar_escrita_em_lote,
+)
+from services.esquema import tabela_existe
+from services.cache import em_cache
+from services.busca import LIMITE_RESULTADOS, expressao_de_busca
 import logging
 
 
+@em_cache("clientes")
 def lista_de_clientes() -> list:
     """
     Retorna uma lista de clientes cadastrados no banco de dados.
@@ -34,17 +43,106 @@ def lista_de_clientes() -> list:
         logging.error(f"Erro ao listar clientes: {e}")
 
 
+@em_cache("clientes")
+def pagina_de_clientes(
+    apos: str | None = None, limite: int = 50
+) -> tuple[list, str | None]:
+    """
+    Retorna uma página de clientes ordenada pelo campo "nome", usando paginação por chave (keyset).
+
+    Em vez de OFFSET, a consulta continua a partir do último "nome" exibido (`apos`),
+    percorrendo diretamente o índice único da coluna. Assim, o custo de cada página depende
+    apenas de `limite`, e não do tamanho da tabela nem da posição da página.
+
+    Args:
+        apos (str | None): O "nome" do último cliente da página anterior.
+                           Se for None, retorna a primeira página.
+        limite (int): A quantidade máxima de clientes na página. Padrão é 50.
+
+    Returns:
+        tuple[list, str | None]: Uma lista de dicionários representando os clientes da página e o
+                                 valor de `apos` para a próxima página (None se esta for a última).
+                                 Retorna ([], None) se ocorrer algum erro durante a consulta.
+
+    Raises:
+        Exception: Se ocorrer qualquer exceção durante a operação, ela será capturada e registrada no log.
+    """
+    try:
+        with conectar() as conn:
+            cursor = conn.cursor()
+            if apos is None:
+                cursor.execute(
+                    "SELECT * FROM clientes ORDER BY nome ASC LIMIT ?", (limite + 1,)
+                )
+            else:
+                cursor.execute(
+                    "SELECT * FROM clientes WHERE nome > ? ORDER BY nome ASC LIMIT ?",
+                    (apos, limite + 1),
+                )
+            clientes = [dict(cliente) for cliente in cursor.fetchall()]
+            proximo = clientes[limite - 1]["nome"] if len(clientes) > limite else None
+            return clientes[:limite], proximo
+    except Exception as e:
+        logging.error(f"Erro ao paginar clientes: {e}")
+        return [], None
+
+
+@em_cache("clientes")
+def buscar_clientes(termo: str, limite: int = LIMITE_RESULTADOS) -> list:
+    """
+    Busca clientes pelo campo "nome" utilizando o índice de busca textual (FTS5).
+
+    Cada palavra do termo é tratada como prefixo e os acentos são ignorados, de modo que
+    "goncal" encontra "Gonçalves Dias". Apenas os `limite` resultados mais relevantes são
+    retornados, permitindo consultar o banco a cada termo digitado sem carregar a tabela inteira.
+    Se o termo estiver vazio, retorna os primeiros clientes em ordem alfabética.
+
+    Args:
+        termo (str): O texto digitado pelo usuário.
+        limite (int): A quantidade máxima de clientes retornados. Padrão é `LIMITE_RESULTADOS`.
+
+    Returns:
+        list: Uma lista de dicionários representando os clientes encontrados.
+              Retorna uma lista vazia se ocorrer algum erro durante a consulta.
+
+    Raises:
+        Exception: Se ocorrer qualquer exceção durante a operação, ela será capturada e registrada no log.
+    """
+    expressao = expressao_de_busca(termo)
+    if expressao is None:
+        return pagina_de_clientes(None, limite)[0]
+
+    try:
+        with conectar() as conn:
+            cursor = conn.cursor()
+            cursor.execute(
+                """
+                SELECT t.*
+                FROM clientes_busca b
+                JOIN clientes t ON t.codigo = b.rowid
+                WHERE clientes_busca MATCH ?
+                ORDER BY b.rank
+                LIMIT ?
+            """,
+                (expressao, limite),
+            )
+            clientes = cursor.fetchall()
+            return [dict(cliente) for cliente in clientes]
+    except Exception as e:
+        logging.error(f"Erro ao buscar clientes: {e}")
+        return []
+
+
 def adicionar_cliente(nome: str) -> None:
     """
     Adiciona um novo cliente na tabela "clientes" do banco de dados.
 
     A função realiza as seguintes operações:
-      1. Abre uma conexão com o banco de dados utilizando a função `conectar()`.
-      2. Cria um cursor para executar a consulta SQL.
-      3. Executa a instrução INSERT OR IGNORE para inserir o nome do cliente na tabela "clientes".
+      1. Envia a instrução INSERT OR IGNORE para a thread de escrita (`executar_escrita()`),
+         que insere o nome do cliente na tabela "clientes".
          - Se o cliente já existir (baseado na restrição UNIQUE), a inserção é ignorada.
-      4. Efetua o commit da transação para salvar as alterações.
-      5. Registra uma mensagem de sucesso no log.
+      2. Aguarda o commit da transação em que a instrução foi gravada.
+      3. Registra uma mensagem de sucesso no log.
 
     Args:
         nome (str): O nome do cliente a ser adicionado.
@@ -56,19 +154,43 @@ def adicionar_cliente(nome: str) -> None:
         Exception: Se ocorrer algum erro durante a operação, a exceção é capturada e registrada no log.
     """
     try:
-        with conectar() as conn:
-            cursor = conn.cursor()
-            cursor.execute(
-                "INSERT OR IGNORE INTO clientes (nome) VALUES (?)",
-                (nome,),
-            )
-            conn.commit()
-            logging.info("Cliente adicionado com sucesso.")
+        executar_escrita(
+            "INSERT OR IGNORE INTO clientes (nome) VALUES (?)",
+            (nome,),
+        ).result()
+        logging.info("Cliente adicionado com sucesso.")
     except Exception as e:
         logging.error(f"Erro ao adicionar cliente: {e}")
 
 
-def atualizar_cliente(codigo: int, nome: str) -> None:
+def incluir_cliente(nome: str) -> int:
+    """
+    Inclui um cliente e retorna o seu código, sem tratar os erros.
+
+    Destinada à API (api.py). Diferente de `adicionar_cliente()`, que utiliza "INSERT OR IGNORE",
+    a inclusão que viola uma restrição da tabela falha, em vez de ser ignorada.
+
+    Args:
+        nome (str): O nome do cliente.
+
+    Returns:
+        int: O código do cliente incluído.
+
+    Raises:
+        sqlite3.IntegrityError: Se o nome já estiver cadastrado.
+        Exception: Se ocorrer qualquer outro erro durante a operação.
+    """
+    return (
+        executar_escrita_com_resultado(
+            "INSERT INTO clientes (nome) VALUES (?)",
+            (nome,),
+        )
+        .result()
+        .codigo
+    )
+
+
+def atualizar_cliente(codigo: int, nome: str) -> int | None:
     """
     Atualiza o nome de um cliente na tabela "clientes" do banco de dados.
 
@@ -82,25 +204,48 @@ def atualizar_cliente(codigo: int, nome: str) -> None:
         nome (str): O novo nome do cliente.
 
     Returns:
-        None
+        int | None: A quantidade de clientes atualizados (0 se o código não existir),
+                    ou None se ocorrer algum erro.
 
     Raises:
         Exception: Se ocorrer qualquer exceção durante a operação, ela será capturada e registrada no log.
     """
     try:
-        with conectar() as conn:
-            cursor = conn.cursor()
-            cursor.execute(
-                "UPDATE clientes SET nome = ? WHERE codigo = ?",
-                (nome, codigo),
-            )
-            conn.commit()
-            logging.info("Cliente atualizado com sucesso.")
+        linhas = alterar_cliente(codigo, nome)
+        logging.info("Cliente atualizado com sucesso.")
+        return linhas
     except Exception as e:
         logging.error(f"Erro ao atualizar cliente: {e}")
 
 
-def deletar_cliente(codigo: int) -> None:
+def alterar_cliente(codigo: int, nome: str) -> int:
+    """
+    Executa a alteração de `atualizar_cliente()` sem tratar os erros.
+
+    Destinada à API (api.py), que distingue os clientes inexistentes das restrições violadas.
+
+    Args:
+        codigo (int): O código identificador do cliente a ser alterado.
+        nome (str): O nome do cliente.
+
+    Returns:
+        int: A quantidade de clientes alterados (0 se o código não existir).
+
+    Raises:
+        sqlite3.IntegrityError: Se alguma restrição da tabela for violada.
+        Exception: Se ocorrer qualquer outro erro durante a operação.
+    """
+    return (
+        executar_escrita_com_resultado(
+            "UPDATE clientes SET nome = ? WHERE codigo = ?",
+            (nome, codigo),
+        )
+        .result()
+        .linhas
+    )
+
+
+def deletar_cliente(codigo: int) -> int | None:
     """
     Remove um cliente da tabela "clientes" do banco de dados.
 
@@ -112,16 +257,95 @@ def deletar_cliente(codigo: int) -> None:
         codigo (int): O código identificador do cliente a ser removido.
 
     Returns:
-        None
+        int | None: A quantidade de clientes removidos (0 se o código não existir),
+                    ou None se ocorrer algum erro.
 
     Raises:
         Exception: Se ocorrer qualquer exceção durante a operação, ela será capturada e registrada no log.
     """
     try:
-        with conectar() as conn:
-            cursor = conn.cursor()
-            cursor.execute("DELETE FROM clientes WHERE codigo = ?", (codigo,))
-            conn.commit()
-            logging.info("Cliente removido com sucesso.")
+        linhas = excluir_cliente(codigo)
+        logging.info("Cliente removido com sucesso.")
+        return linhas
     except Exception as e:
         logging.error(f"Erro ao deletar cliente: {e}")
+
+
+def excluir_cliente(codigo: int) -> int:
+    """
+    Executa a remoção de `deletar_cliente()` sem tratar os erros.
+
+    Destinada à API (api.py), que distingue os clientes inexistentes dos demais erros.
+
+    Args:
+        codigo (int): O código identificador do cliente a ser removido.
+
+    Returns:
+        int: A quantidade de clientes removidos (0 se o código não existir).
+
+    Raises:
+        sqlite3.IntegrityError: Se alguma restrição da tabela for violada.
+        Exception: Se ocorrer qualquer outro erro durante a operação.
+    """
+    return (
+        executar_escrita_com_resultado(
+            "DELETE FROM clientes WHERE codigo = ?", (codigo,)
+        )
+        .result()
+        .linhas
+    )
+
+
+def atualizar_clientes_em_lote(clientes: list[tuple[int, str]]) -> int | None:
+    """
+    Atualiza o nome de vários clientes em uma única transação.
+
+    As alterações são gravadas com um único `executemany`, utilizado pela edição em lote da
+    página de clientes. Se alguma atualização falhar (ex: nome já cadastrado), nenhuma é gravada.
+
+    Args:
+        clientes (list[tuple[int, str]]): Os clientes alterados, como (codigo, nome).
+
+    Returns:
+        int | None: A quantidade de clientes atualizados, ou None se ocorrer algum erro.
+
+    Raises:
+        Exception: Se ocorrer qualquer exceção durante a operação, ela será capturada e registrada no log.
+    """
+    try:
+        quantidade = executar_escrita_em_lote(
+            "UPDATE clientes SET nome = ? WHERE codigo = ?",
+            [(nome, codigo) for codigo, nome in clientes],
+        ).result()
+        logging.info(f"{quantidade} clientes atualizados com sucesso.")
+        return quantidade
+    except Exception as e:
+        logging.error(f"Erro ao atualizar clientes em lote: {e}")
+
+
+def deletar_clientes_em_lote(codigos: list[int]) -> int | None:
+    """
+    Remove vários clientes em uma única transação.
+
+    Os orçamentos dos clientes também são removidos (ON DELETE CASCADE).
+    As exclusões são feitas com um único `executemany`, utilizado pela remoção dos registros
+    selecionados na página de clientes. Se alguma exclusão falhar, nenhum registro é removido.
+
+    Args:
+        codigos (list[int]): Os códigos dos clientes a serem removidos.
+
+    Returns:
+        int | None: A quantidade de clientes removidos, ou None se ocorrer algum erro.
+
+    Raises:
+        Exception: Se ocorrer qualquer exceção durante a operação, ela será capturada e registrada no log.
+    """
+    try:
+        quantidade = executar_escrita_em_lote(
+            "DELETE FROM clientes WHERE codigo = ?",
+            [(codigo,) for codigo in codigos],
+        ).result()
+        logging.info(f"{quantidade} clientes removidos com sucesso.")
+        return quantidade
+    except Exception as e:
+        logging.error(f"Erro ao deletar clientes em lote: {e}")
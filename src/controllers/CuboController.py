@@ -0,0 +1,129 @@
+import logging
+from services.banco_de_dados import conectar
+from services.cache import em_cache
+from services.migracoes import CONTADOR_ALTERACOES_ORCAMENTOS
+
+
+LIMITE_CUBO = 1000
+
+# Dimensão -> (coluna em "cubo_vendas", tabela com o nome, coluna do nome).
+DIMENSOES_CUBO = {
+    "mes": ("mes", None, None),
+    "produto": ("produto_id", "produtos", "descricao"),
+    "vendedor": ("vendedor_id", "vendedores", "nome"),
+    "cliente": ("cliente_id", "clientes", "nome"),
+}
+
+MEDIDAS_CUBO = """
+    COALESCE(SUM(c.quantidade), 0) as quantidade,
+    COALESCE(SUM(c.itens), 0) as itens,
+    COALESCE(SUM(c.valor_bruto_centavos), 0) as valor_bruto_centavos,
+    COALESCE(SUM(c.desconto_centavos), 0) as desconto_centavos,
+    COALESCE(SUM(c.valor_liquido_centavos), 0) as valor_liquido_centavos
+"""
+
+
+def _consulta_cubo(
+    agrupar_por: tuple, filtros: dict, mes_inicio: int | None, mes_fim: int | None
+) -> tuple[str, list]:
+    condicoes, params = [], []
+    if mes_inicio is not None:
+        condicoes.append("c.mes >= ?")
+        params.append(mes_inicio)
+    if mes_fim is not None:
+        condicoes.append("c.mes <= ?")
+        params.append(mes_fim)
+    for dimensao, codigos in filtros.items():
+        if codigos:
+            condicoes.append(
+                f"c.{DIMENSOES_CUBO[dimensao][0]} IN ({', '.join('?' * len(codigos))})"
+            )
+            params.extend(codigos)
+
+    colunas = [DIMENSOES_CUBO[dimensao][0] for dimensao in agrupar_por]
+    agregacao = f"""
+        SELECT {''.join(f'c.{coluna}, ' for coluna in colunas)}{MEDIDAS_CUBO}
+        FROM cubo_vendas c
+        {'WHERE ' + ' AND '.join(condicoes) if condicoes else ''}
+        {'GROUP BY ' + ', '.join(f'c.{coluna}' for coluna in colunas) if colunas else ''}
+    """
+
+    # Os nomes são lidos apenas para as linhas agregadas.
+    selecao, juncoes = ["r.*"], []
+    for dimensao in agrupar_por:
+        coluna, tabela, nome = DIMENSOES_CUBO[dimensao]
+        if tabela is not None:
+            selecao.append(f"{dimensao}.{nome} as {dimensao}")
+            juncoes.append(
+                f"LEFT JOIN {tabela} {dimensao} ON {dimensao}.codigo = r.{coluna}"
+            )
+    ordem = ["r.mes"] if "mes" in agrupar_por else []
+    ordem += ["r.valor_liquido_centavos DESC"] + [f"r.{coluna}" for coluna in colunas]
+    query = f"""
+        SELECT {', '.join(selecao)}
+        FROM ({agregacao}) r
+        {' '.join(juncoes)}
+        ORDER BY {', '.join(ordem)}
+        LIMIT ?
+    """
+    return query, params
+
+
+@em_cache(
+    "orcamentos", CONTADOR_ALTERACOES_ORCAMENTOS, "produtos", "vendedores", "clientes"
+)
+def consultar_cubo(
+    agrupar_por: tuple = (),
+    mes_inicio: int | None = None,
+    mes_fim: int | None = None,
+    produtos: tuple = (),
+    vendedores: tuple = (),
+    clientes: tuple = (),
+    limite: int = LIMITE_CUBO,
+) -> list:
+    """
+    Agrega o cubo de vendas "cubo_vendas" pelas dimensões informadas, com filtros por dimensão.
+
+    O cubo guarda uma linha por mês, produto, vendedor e cliente, mantida por gatilhos a cada
+    orçamento incluído, alterado ou removido; a consulta soma essas linhas sem ler os itens.
+      - Roll-up: agrupar por menos dimensões (ex: apenas "mes"), ou por nenhuma, para o total.
+      - Drill-down: acrescentar uma dimensão em `agrupar_por` e filtrar pelos códigos da linha
+        detalhada (ex: agrupar por ("produto",) com `vendedores=(codigo,)`).
+
+    Args:
+        agrupar_por (tuple, optional): Dimensões de `DIMENSOES_CUBO` ("mes", "produto",
+                                       "vendedor" e "cliente"), na ordem das colunas.
+        mes_inicio (int | None, optional): Primeiro mês do período, como AAAAMM
+                                           (ver `services.datas.mes_de()`).
+        mes_fim (int | None, optional): Último mês do período (inclusive), como AAAAMM.
+        produtos (tuple, optional): Códigos dos produtos; vazio para todos.
+        vendedores (tuple, optional): Códigos dos vendedores; vazio para todos.
+        clientes (tuple, optional): Códigos dos clientes; vazio para todos.
+        limite (int, optional): A quantidade máxima de linhas retornadas.
+
+    Returns:
+        list: Uma lista de dicionários com a coluna de cada dimensão agrupada ('mes',
+              'produto_id', 'vendedor_id' ou 'cliente_id'), o nome correspondente ('produto',
+              'vendedor' ou 'cliente'), e as medidas 'quantidade', 'itens',
+              'valor_bruto_centavos', 'desconto_centavos' e 'valor_liquido_centavos'. As linhas
+              são ordenadas pelo mês, se agrupado, e pelo valor líquido, do maior para o menor.
+              Sem dimensões, retorna uma única linha com os totais. Retorna uma lista vazia se
+              ocorrer algum erro.
+
+    Raises:
+        Exception: Se ocorrer algum erro durante a execução da consulta, o erro é registrado no log.
+    """
+    try:
+        query, params = _consulta_cubo(
+            agrupar_por,
+            {"produto": produtos, "vendedor": vendedores, "cliente": clientes},
+            mes_inicio,
+            mes_fim,
+        )
+        with conectar() as conn:
+            cursor = conn.cursor()
+            cursor.execute(query, (*params, limite))
+            return [dict(linha) for linha in cursor.fetchall()]
+    except Exception as e:
+        logging.error(f"Erro ao consultar cubo de vendas: {e}")
+        return []
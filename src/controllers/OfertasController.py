@@ -1,7 +1,15 @@
-from services.banco_de_dados import conectar, tabela_existe
+from services.banco_de_dados import conectar
+from services.escrita import (
+    executar_escrita,
+    executar_escrita_com_resultado,
+    executar_escrita_em_lote,
+)
+from services.esquema import tabela_existe
+from services.cache import em_cache
 import logging
 
 
+@em_cache("ofertas", "produtos")
 def lista_de_ofertas() -> list:
     """
     Retorna uma lista de ofertas cadastradas no banco de dados.
@@ -46,6 +54,61 @@ def lista_de_ofertas() -> list:
         logging.error(f"Erro ao listar ofertas: {e}")
 
 
+@em_cache("ofertas", "produtos")
+def pagina_de_ofertas(
+    apos: str | None = None, limite: int = 50
+) -> tuple[list, str | None]:
+    """
+    Retorna uma página de ofertas ordenada pela descrição do produto, usando paginação por chave (keyset).
+
+    Como cada produto possui no máximo uma oferta, a descrição do produto identifica a oferta de
+    forma única. A consulta continua a partir da última descrição exibida (`apos`), percorrendo o
+    índice único de "produtos.descricao", sem OFFSET.
+
+    Args:
+        apos (str | None): A descrição do produto da última oferta da página anterior.
+                           Se for None, retorna a primeira página.
+        limite (int): A quantidade máxima de ofertas na página. Padrão é 50.
+
+    Returns:
+        tuple[list, str | None]: Uma lista de dicionários representando as ofertas da página (com os mesmos
+                                 campos de `lista_de_ofertas()`) e o valor de `apos` para a próxima página
+                                 (None se esta for a última). Retorna ([], None) em caso de erro.
+
+    Raises:
+        Exception: Se ocorrer qualquer exceção durante a operação, ela será capturada e registrada no log.
+    """
+    try:
+        with conectar() as conn:
+            cursor = conn.cursor()
+            cursor.execute(
+                """
+                SELECT
+                    o.codigo as codigo,
+                    o.quantidade_levar as quantidade_levar,
+                    o.quantidade_pagar as quantidade_pagar,
+                    o.produto_id as produto_id,
+                    p.descricao as produto_descricao
+                FROM produtos p
+                JOIN ofertas o ON o.produto_id = p.codigo
+                WHERE p.descricao > ?
+                ORDER BY p.descricao ASC
+                LIMIT ?
+            """,
+                (apos if apos is not None else "", limite + 1),
+            )
+            ofertas = [dict(oferta) for oferta in cursor.fetchall()]
+            proximo = (
+                ofertas[limite - 1]["produto_descricao"]
+                if len(ofertas) > limite
+                else None
+            )
+            return ofertas[:limite], proximo
+    except Exception as e:
+        logging.error(f"Erro ao paginar ofertas: {e}")
+        return [], None
+
+
 def adicionar_oferta(
     produto_id: int, quantidade_levar: int, quantidade_pagar: int
 ) -> None:
@@ -71,21 +134,49 @@ def adicionar_oferta(
         Exception: Se ocorrer algum erro durante a operação, a exceção é capturada e registrada no log.
     """
     try:
-        with conectar() as conn:
-            cursor = conn.cursor()
-            cursor.execute(
-                "INSERT OR IGNORE INTO ofertas (produto_id, quantidade_levar, quantidade_pagar) VALUES (?, ?, ?)",
-                (produto_id, quantidade_levar, quantidade_pagar),
-            )
-            conn.commit()
-            logging.info("Oferta adicionada com sucesso.")
+        executar_escrita(
+            "INSERT OR IGNORE INTO ofertas (produto_id, quantidade_levar, quantidade_pagar) VALUES (?, ?, ?)",
+            (produto_id, quantidade_levar, quantidade_pagar),
+        ).result()
+        logging.info("Oferta adicionada com sucesso.")
     except Exception as e:
         logging.error(f"Erro ao adicionar oferta: {e}")
 
 
+def incluir_oferta(
+    produto_id: int, quantidade_levar: int, quantidade_pagar: int
+) -> int:
+    """
+    Inclui uma oferta e retorna o seu código, sem tratar os erros.
+
+    Destinada à API (api.py). Diferente de `adicionar_oferta()`, que utiliza "INSERT OR IGNORE",
+    a inclusão que viola uma restrição da tabela falha, em vez de ser ignorada.
+
+    Args:
+        produto_id (int): O identificador do produto associado à oferta.
+        quantidade_levar (int): A quantidade de produto que será levada na oferta.
+        quantidade_pagar (int): A quantidade de produto que será paga na oferta.
+
+    Returns:
+        int: O código da oferta incluída.
+
+    Raises:
+        sqlite3.IntegrityError: Se o produto não existir (chave estrangeira).
+        Exception: Se ocorrer qualquer outro erro durante a operação.
+    """
+    return (
+        executar_escrita_com_resultado(
+            "INSERT INTO ofertas (produto_id, quantidade_levar, quantidade_pagar) VALUES (?, ?, ?)",
+            (produto_id, quantidade_levar, quantidade_pagar),
+        )
+        .result()
+        .codigo
+    )
+
+
 def atualizar_oferta(
     codigo: int, produto_id: int, quantidade_levar: int, quantidade_pagar: int
-) -> None:
+) -> int | None:
     """
     Atualiza uma oferta existente na tabela "ofertas" do banco de dados.
 
@@ -101,25 +192,52 @@ def atualizar_oferta(
         quantidade_pagar (int): A nova quantidade a pagar na oferta.
 
     Returns:
-        None
+        int | None: A quantidade de ofertas atualizadas (0 se o código não existir),
+                    ou None se ocorrer algum erro.
 
     Raises:
         Exception: Se ocorrer qualquer exceção durante a operação, ela será capturada e registrada no log.
     """
     try:
-        with conectar() as conn:
-            cursor = conn.cursor()
-            cursor.execute(
-                "UPDATE ofertas SET produto_id = ?, quantidade_levar = ?, quantidade_pagar = ? WHERE codigo = ?",
-                (produto_id, quantidade_levar, quantidade_pagar, codigo),
-            )
-            conn.commit()
-            logging.info("Oferta atualizada com sucesso.")
+        linhas = alterar_oferta(codigo, produto_id, quantidade_levar, quantidade_pagar)
+        logging.info("Oferta atualizada com sucesso.")
+        return linhas
     except Exception as e:
         logging.error(f"Erro ao atualizar oferta: {e}")
 
 
-def deletar_oferta(codigo: int) -> None:
+def alterar_oferta(
+    codigo: int, produto_id: int, quantidade_levar: int, quantidade_pagar: int
+) -> int:
+    """
+    Executa a alteração de `atualizar_oferta()` sem tratar os erros.
+
+    Destinada à API (api.py), que distingue as ofertas inexistentes das restrições violadas.
+
+    Args:
+        codigo (int): O código identificador da oferta a ser alterada.
+        produto_id (int): O identificador do produto associado à oferta.
+        quantidade_levar (int): A quantidade de produto que será levada na oferta.
+        quantidade_pagar (int): A quantidade de produto que será paga na oferta.
+
+    Returns:
+        int: A quantidade de ofertas alteradas (0 se o código não existir).
+
+    Raises:
+        sqlite3.IntegrityError: Se alguma restrição da tabela for violada.
+        Exception: Se ocorrer qualquer outro erro durante a operação.
+    """
+    return (
+        executar_escrita_com_resultado(
+            "UPDATE ofertas SET produto_id = ?, quantidade_levar = ?, quantidade_pagar = ? WHERE codigo = ?",
+            (produto_id, quantidade_levar, quantidade_pagar, codigo),
+        )
+        .result()
+        .linhas
+    )
+
+
+def deletar_oferta(codigo: int) -> int | None:
     """
     Remove uma oferta da tabela "ofertas" do banco de dados.
 
@@ -131,16 +249,98 @@ def deletar_oferta(codigo: int) -> None:
         codigo (int): O código identificador da oferta a ser removida.
 
     Returns:
-        None
+        int | None: A quantidade de ofertas removidas (0 se o código não existir),
+                    ou None se ocorrer algum erro.
 
     Raises:
         Exception: Se ocorrer qualquer exceção durante a operação, ela será capturada e registrada no log.
     """
     try:
-        with conectar() as conn:
-            cursor = conn.cursor()
-            cursor.execute("DELETE FROM ofertas WHERE codigo = ?", (codigo,))
-            conn.commit()
-            logging.info("Oferta removida com sucesso.")
+        linhas = excluir_oferta(codigo)
+        logging.info("Oferta removida com sucesso.")
+        return linhas
     except Exception as e:
         logging.error(f"Erro ao deletar oferta: {e}")
+
+
+def excluir_oferta(codigo: int) -> int:
+    """
+    Executa a remoção de `deletar_oferta()` sem tratar os erros.
+
+    Destinada à API (api.py), que distingue as ofertas inexistentes dos demais erros.
+
+    Args:
+        codigo (int): O código identificador da oferta a ser removida.
+
+    Returns:
+        int: A quantidade de ofertas removidas (0 se o código não existir).
+
+    Raises:
+        sqlite3.IntegrityError: Se alguma restrição da tabela for violada.
+        Exception: Se ocorrer qualquer outro erro durante a operação.
+    """
+    return (
+        executar_escrita_com_resultado(
+            "DELETE FROM ofertas WHERE codigo = ?", (codigo,)
+        )
+        .result()
+        .linhas
+    )
+
+
+def atualizar_ofertas_em_lote(ofertas: list[tuple[int, int, int]]) -> int | None:
+    """
+    Atualiza as quantidades de várias ofertas em uma única transação.
+
+    O produto de cada oferta é mantido; apenas as quantidades "leve X pague Y" são alteradas,
+    com um único `executemany`. Se alguma atualização falhar, nenhuma é gravada.
+
+    Args:
+        ofertas (list[tuple[int, int, int]]): As ofertas alteradas, como
+                                              (codigo, quantidade_levar, quantidade_pagar).
+
+    Returns:
+        int | None: A quantidade de ofertas atualizadas, ou None se ocorrer algum erro.
+
+    Raises:
+        Exception: Se ocorrer algum erro durante a operação, a exceção será capturada e registrada no log.
+    """
+    try:
+        quantidade = executar_escrita_em_lote(
+            "UPDATE ofertas SET quantidade_levar = ?, quantidade_pagar = ? WHERE codigo = ?",
+            [
+                (quantidade_levar, quantidade_pagar, codigo)
+                for codigo, quantidade_levar, quantidade_pagar in ofertas
+            ],
+        ).result()
+        logging.info(f"{quantidade} ofertas atualizadas com sucesso.")
+        return quantidade
+    except Exception as e:
+        logging.error(f"Erro ao atualizar ofertas em lote: {e}")
+
+
+def deletar_ofertas_em_lote(codigos: list[int]) -> int | None:
+    """
+    Remove várias ofertas em uma única transação.
+
+    As exclusões são feitas com um único `executemany`, utilizado pela remoção dos registros
+    selecionados na página de ofertas. Se alguma exclusão falhar, nenhum registro é removido.
+
+    Args:
+        codigos (list[int]): Os códigos das ofertas a serem removidas.
+
+    Returns:
+        int | None: A quantidade de ofertas removidas, ou None se ocorrer algum erro.
+
+    Raises:
+        Exception: Se ocorrer qualquer exceção durante a operação, ela será capturada e registrada no log.
+    """
+    try:
+        quantidade = executar_escrita_em_lote(
+            "DELETE FROM ofertas WHERE codigo = ?",
+            [(codigo,) for codigo in codigos],
+        ).result()
+        logging.info(f"{quantidade} ofertas removidas com sucesso.")
+        return quantidade
+    except Exception as e:
+        logging.error(f"Erro ao deletar ofertas em lote: {e}")
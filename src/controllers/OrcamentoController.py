@@ -1,25 +1,37 @@
 import logging
-import pandas as pd
-from services.banco_de_dados import conectar
+from typing import TYPE_CHECKING
+from services.banco_de_dados import conectar, conexao_dedicada
+from services.datas import intervalo_de_dias
+from services.escrita import enviar_escrita
+from services.precificacao import ItemOrcamento
+
+# O pandas é importado apenas nas funções do relatório, para não pesar no carregamento das
+# páginas que usam somente o cadastro de orçamentos.
+if TYPE_CHECKING:
+    import pandas as pd
 
 
 def lista_de_orcamentos() -> list:
     """
-    Retorna uma lista de orçamentos agregados a partir do banco de dados.
+    Retorna uma lista de orçamentos com seus totais a partir do banco de dados.
 
     A função executa uma consulta SQL que junta as tabelas "orcamentos", "clientes",
-    "vendedores" e "orcamento_itens" para calcular os seguintes campos:
+    "vendedores" e "orcamento_totais" para obter os seguintes campos:
       - "codigo": Código identificador do orçamento.
       - "nome_cliente": Nome do cliente associado ao orçamento.
       - "nome_vendedor": Nome do vendedor associado ao orçamento.
-      - "valor_itens": Soma dos valores dos itens do orçamento, calculada como (quantidade * preco_unitario).
-      - "desconto": Soma dos descontos aplicados aos itens do orçamento.
+      - "valor_itens_centavos": Soma dos valores dos itens do orçamento, calculada como
+        (quantidade * preco_unitario_centavos).
+      - "desconto_centavos": Soma dos descontos aplicados aos itens do orçamento.
 
-    Os resultados são agrupados pelo código do orçamento, nome do cliente e nome do vendedor.
+    Os totais não são recalculados a cada chamada: a tabela "orcamento_totais" é mantida por
+    gatilhos a cada inserção, alteração ou remoção em "orcamento_itens", de modo que a consulta
+    percorre apenas os orçamentos, e não todos os seus itens. Orçamentos sem itens não são listados.
 
     Returns:
         list: Uma lista de dicionários, onde cada dicionário contém os campos:
-              "codigo", "nome_cliente", "nome_vendedor", "valor_itens" e "desconto".
+              "codigo", "nome_cliente", "nome_vendedor", "valor_itens_centavos" e
+              "desconto_centavos" (valores em centavos).
               Se ocorrer um erro durante a execução da consulta, a função retorna uma lista vazia.
 
     Raises:
@@ -34,13 +46,13 @@ def lista_de_orcamentos() -> list:
                     o.codigo as codigo,
                     c.nome as nome_cliente,
                     v.nome as nome_vendedor,
-                    SUM(i.quantidade * i.preco_unitario) as valor_itens,
-                    SUM(i.desconto) as desconto
+                    t.valor_itens_centavos as valor_itens_centavos,
+                    t.desconto_centavos as desconto_centavos
                 FROM orcamentos o
                 JOIN clientes c ON c.codigo = o.cliente_id
                 JOIN vendedores v ON v.codigo = o.vendedor_id
-                JOIN orcamento_itens i ON i.orcamento_id = o.codigo
-                GROUP BY o.codigo, c.nome, v.nome
+                JOIN orcamento_totais t ON t.orcamento_id = o.codigo
+                WHERE t.quantidade_itens > 0
             """
             )
             orcamentos = cursor.fetchall()
@@ -49,113 +61,332 @@ def lista_de_orcamentos() -> list:
         logging.error(f"Erro ao listar orcamentos: {e}")
 
 
-def adicionar_orcamento(cliente_id: int, vendedor_id: int, itens: list) -> None:
+def pagina_de_orcamentos(
+    apos: int | None = None, limite: int = 50
+) -> tuple[list, int | None]:
     """
-    Adiciona um novo orçamento e seus itens correspondentes no banco de dados.
+    Retorna uma página de orçamentos ordenada pelo código, usando paginação por chave (keyset).
 
-    Esta função realiza as seguintes operações:
-      1. Insere um novo registro na tabela "orcamentos", associando um cliente e um vendedor.
-         A inserção utiliza "INSERT OR IGNORE", o que significa que se o registro já existir,
-         a operação será ignorada.
-      2. Obtém o ID do orçamento recém-criado (orcamento_id).
-      3. Para cada item presente na lista `itens`, insere um registro na tabela "orcamento_itens"
-         contendo:
-            - orcamento_id: o ID do orçamento criado.
-            - produto_id: o identificador do produto (extraído do campo "Código" do item).
-            - quantidade: a quantidade do produto (campo "Quantidade").
-            - preco_unitario: o preço unitário, convertido de string formatada (ex: "R$ 12.34")
-              para float.
-            - desconto: o desconto aplicado, convertido de string formatada (ex: "R$ 2.34") para float.
-      4. Efetua o commit da transação para salvar as inserções.
-      5. Registra uma mensagem de sucesso ou, em caso de exceção, registra o erro no log.
+    A consulta continua a partir do último código exibido (`apos`), percorrendo a chave primária
+    de "orcamentos" sem OFFSET, e lê os totais já materializados em "orcamento_totais".
 
     Args:
-        cliente_id (int): Identificador do cliente associado ao orçamento.
-        vendedor_id (int): Identificador do vendedor associado ao orçamento.
-        itens (list): Lista de dicionários, onde cada dicionário representa um item do orçamento e
-                      deve conter as seguintes chaves:
-                          - "Código" (int): Identificador do produto.
-                          - "Quantidade" (int): Quantidade do produto.
-                          - "Preço Unitário" (str): Preço unitário formatado (ex: "R$ 12.34").
-                          - "Desconto" (str): Desconto formatado (ex: "R$ 2.34").
+        apos (int | None): O código do último orçamento da página anterior.
+                           Se for None, retorna a primeira página.
+        limite (int): A quantidade máxima de orçamentos na página. Padrão é 50.
 
     Returns:
-        None
+        tuple[list, int | None]: Uma lista de dicionários com os mesmos campos de `lista_de_orcamentos()`
+                                 e o valor de `apos` para a próxima página (None se esta for a última).
+                                 Retorna ([], None) se ocorrer algum erro durante a consulta.
 
     Raises:
-        Exception: Se ocorrer algum erro durante a inserção do orçamento ou dos seus itens,
-                   a exceção é capturada e o erro é registrado no log.
+        Exception: Se ocorrer alguma exceção durante a execução da consulta, o erro será registrado no log.
     """
     try:
         with conectar() as conn:
             cursor = conn.cursor()
             cursor.execute(
-                "INSERT OR IGNORE INTO orcamentos (cliente_id, vendedor_id) VALUES (?, ?)",
-                (cliente_id, vendedor_id),
+                """
+                SELECT
+                    o.codigo as codigo,
+                    c.nome as nome_cliente,
+                    v.nome as nome_vendedor,
+                    t.valor_itens_centavos as valor_itens_centavos,
+                    t.desconto_centavos as desconto_centavos
+                FROM orcamentos o
+                JOIN clientes c ON c.codigo = o.cliente_id
+                JOIN vendedores v ON v.codigo = o.vendedor_id
+                JOIN orcamento_totais t ON t.orcamento_id = o.codigo
+                WHERE t.quantidade_itens > 0 AND o.codigo > ?
+                ORDER BY o.codigo ASC
+                LIMIT ?
+            """,
+                (apos if apos is not None else 0, limite + 1),
             )
+            orcamentos = [dict(orcamento) for orcamento in cursor.fetchall()]
+            proximo = (
+                orcamentos[limite - 1]["codigo"] if len(orcamentos) > limite else None
+            )
+            return orcamentos[:limite], proximo
+    except Exception as e:
+        logging.error(f"Erro ao paginar orcamentos: {e}")
+        return [], None
 
-            orcamento_id = cursor.lastrowid
 
-            for item in itens:
+def _gravar_orcamentos(pedidos: list) -> list:
+    # Operação da thread de escrita: grava os orçamentos de vários pedidos pendentes, com os
+    # itens de todos eles em um único `executemany`. Retorna os códigos criados por pedido.
+    with conectar() as conn:
+        cursor = conn.cursor()
+        codigos_por_pedido = []
+        linhas_dos_itens = []
+        for orcamentos in pedidos:
+            codigos = []
+            for cliente_id, vendedor_id, itens in orcamentos:
                 cursor.execute(
-                    """
-                    INSERT OR IGNORE INTO orcamento_itens (orcamento_id, produto_id, quantidade, preco_unitario, desconto)
-                    VALUES (?, ?, ?, ?, ?)
-                    """,
+                    "INSERT INTO orcamentos (cliente_id, vendedor_id) VALUES (?, ?)",
+                    (cliente_id, vendedor_id),
+                )
+                orcamento_id = cursor.lastrowid
+                codigos.append(orcamento_id)
+                linhas_dos_itens.extend(
                     (
                         orcamento_id,
-                        item["Código"],
-                        item["Quantidade"],
-                        float(item["Preço Unitário"].replace("R$", "").strip()),
-                        float(item["Desconto"].replace("R$", "").strip()),
-                    ),
+                        item.produto_id,
+                        item.quantidade,
+                        item.preco_unitario_centavos,
+                        item.desconto_centavos,
+                    )
+                    for item in itens
                 )
+            codigos_por_pedido.append(codigos)
+
+        cursor.executemany(
+            """
+            INSERT INTO orcamento_itens (
+                orcamento_id, produto_id, quantidade, preco_unitario_centavos, desconto_centavos
+            )
+            VALUES (?, ?, ?, ?, ?)
+            """,
+            linhas_dos_itens,
+        )
+    return codigos_por_pedido
+
+
+def adicionar_orcamento(
+    cliente_id: int, vendedor_id: int, itens: list[ItemOrcamento]
+) -> int | None:
+    """
+    Adiciona um novo orçamento e seus itens correspondentes no banco de dados.
+
+    Esta função realiza as seguintes operações:
+      1. Envia o orçamento para a thread de escrita (services/escrita.py), que grava, na mesma
+         transação, os orçamentos pendentes de todas as sessões (group commit):
+         - Insere um registro na tabela "orcamentos" para cada orçamento, associando um
+           cliente e um vendedor, e obtém o ID do orçamento criado.
+         - Insere os itens de todos esses orçamentos na tabela "orcamento_itens" com um único
+           `executemany`, gravando diretamente os valores em centavos já calculados em cada
+           `ItemOrcamento`, sem nenhuma conversão de texto.
+      2. Aguarda o commit da transação. Se o orçamento falhar (ex: cliente inexistente), apenas
+         ele deixa de ser gravado; os orçamentos das demais sessões não são afetados.
+      3. Registra uma mensagem de sucesso ou, em caso de exceção, registra o erro no log.
+
+    Args:
+        cliente_id (int): Identificador do cliente associado ao orçamento.
+        vendedor_id (int): Identificador do vendedor associado ao orçamento.
+        itens (list[ItemOrcamento]): Os itens do orçamento, já precificados
+                                     (ver `services.precificacao.precificar_carrinho()`).
 
-            conn.commit()
-            logging.info("orcamento adicionada com sucesso.")
+    Returns:
+        int | None: O código do orçamento, retornado somente após o commit (confirmação de que
+                    o orçamento foi gravado), ou None se ocorrer algum erro.
+
+    Raises:
+        Exception: Se ocorrer algum erro durante a inserção do orçamento ou dos seus itens,
+                   a exceção é capturada e o erro é registrado no log.
+    """
+    try:
+        codigo = enviar_escrita(
+            _gravar_orcamentos, [(cliente_id, vendedor_id, itens)]
+        ).result()[0]
+        logging.info("orcamento adicionada com sucesso.")
+        return codigo
     except Exception as e:
         logging.error(f"Erro ao adicionar orcamento: {e}")
 
 
-def deletar_orcamento(codigo: int) -> None:
+def adicionar_orcamentos(
+    orcamentos: list[tuple[int, int, list[ItemOrcamento]]],
+) -> list | None:
+    """
+    Adiciona vários orçamentos, com os seus itens, em uma única transação.
+
+    Cada orçamento é gravado como em `adicionar_orcamento()`, mas todos compartilham a mesma
+    transação: se algum orçamento ou item falhar (ex: cliente, vendedor ou produto
+    inexistente), nenhum orçamento do lote é gravado.
+
+    Args:
+        orcamentos (list[tuple[int, int, list[ItemOrcamento]]]): Os orçamentos, como
+                                                                 (cliente_id, vendedor_id, itens).
+
+    Returns:
+        list | None: Os códigos dos orçamentos criados, na ordem recebida, ou None se ocorrer algum erro.
+
+    Raises:
+        Exception: Se ocorrer algum erro durante a operação, a exceção é capturada e registrada no log.
+    """
+    try:
+        codigos = gravar_orcamentos(orcamentos)
+        logging.info(f"{len(codigos)} orcamentos adicionados com sucesso.")
+        return codigos
+    except Exception as e:
+        logging.error(f"Erro ao adicionar orcamentos: {e}")
+
+
+def gravar_orcamentos(orcamentos: list[tuple[int, int, list[ItemOrcamento]]]) -> list:
+    """
+    Executa a gravação de `adicionar_orcamentos()` sem tratar os erros.
+
+    Destinada à API (api.py), que distingue as restrições violadas (ex: cliente, vendedor ou
+    produto inexistente) dos demais erros.
+
+    Args:
+        orcamentos (list[tuple[int, int, list[ItemOrcamento]]]): Os orçamentos, como
+                                                                 (cliente_id, vendedor_id, itens).
+
+    Returns:
+        list: Os códigos dos orçamentos criados, na ordem recebida.
+
+    Raises:
+        sqlite3.IntegrityError: Se alguma chave estrangeira não existir.
+        Exception: Se ocorrer qualquer outro erro durante a operação.
+    """
+    return enviar_escrita(_gravar_orcamentos, orcamentos).result()
+
+
+def _remover_orcamentos(pedidos: list) -> list:
+    # Operação da thread de escrita: remove os itens e depois os orçamentos de cada pedido.
+    with conectar() as conn:
+        quantidades = []
+        for codigos in pedidos:
+            parametros = [(codigo,) for codigo in codigos]
+            conn.executemany(
+                "DELETE FROM orcamento_itens WHERE orcamento_id = ?", parametros
+            )
+            quantidades.append(
+                conn.executemany(
+                    "DELETE FROM orcamentos WHERE codigo = ?", parametros
+                ).rowcount
+            )
+    return quantidades
+
+
+def deletar_orcamento(codigo: int) -> int | None:
     """
     Remove um orçamento e seus itens associados do banco de dados.
 
     A função realiza as seguintes operações:
-      1. Abre uma conexão com o banco de dados utilizando a função `conectar()`.
-      2. Remove todos os registros da tabela "orcamento_itens" que estejam associados
-         ao orçamento identificado por `codigo`, garantindo que os itens relacionados sejam excluídos.
-      3. Remove o registro do orçamento da tabela "orcamentos" com o código especificado.
-      4. Efetua o commit da transação para confirmar as alterações no banco de dados.
-      5. Registra uma mensagem de sucesso no log. Se ocorrer algum erro, a exceção é capturada
+      1. Envia a remoção para a thread de escrita (services/escrita.py), que:
+         - Remove todos os registros da tabela "orcamento_itens" que estejam associados ao
+           orçamento identificado por `codigo`, garantindo que os itens relacionados sejam excluídos.
+         - Remove o registro do orçamento da tabela "orcamentos" com o código especificado.
+      2. Aguarda o commit da transação em que a remoção foi gravada.
+      3. Registra uma mensagem de sucesso no log. Se ocorrer algum erro, a exceção é capturada
          e o erro é registrado no log.
 
     Args:
         codigo (int): O código identificador do orçamento a ser removido.
 
     Returns:
-        None
+        int | None: A quantidade de orçamentos removidos (0 se o código não existir), ou None
+                    se ocorrer algum erro.
 
     Raises:
         Exception: Se ocorrer qualquer erro durante o processo de deleção, a exceção será
                    capturada e registrada no log.
     """
     try:
-        with conectar() as conn:
-            cursor = conn.cursor()
-            cursor.execute(
-                "DELETE FROM orcamento_itens WHERE orcamento_id = ?", (codigo,)
-            )
-            cursor.execute("DELETE FROM orcamentos WHERE codigo = ?", (codigo,))
-            conn.commit()
-            logging.info("orcamento removido com sucesso.")
+        linhas = excluir_orcamento(codigo)
+        logging.info("orcamento removido com sucesso.")
+        return linhas
     except Exception as e:
         logging.error(f"Erro ao deletar orcamento: {e}")
 
 
+def excluir_orcamento(codigo: int) -> int:
+    """
+    Executa a remoção de `deletar_orcamento()` sem tratar os erros.
+
+    Destinada à API (api.py), que distingue os orçamentos inexistentes dos demais erros.
+
+    Args:
+        codigo (int): O código identificador do orçamento a ser removido.
+
+    Returns:
+        int: A quantidade de orçamentos removidos (0 se o código não existir).
+
+    Raises:
+        Exception: Se ocorrer qualquer erro durante o processo de deleção.
+    """
+    return enviar_escrita(_remover_orcamentos, [codigo]).result()
+
+
+def deletar_orcamentos_em_lote(codigos: list[int]) -> int | None:
+    """
+    Remove vários orçamentos e seus itens associados em uma única transação.
+
+    Assim como em `deletar_orcamento()`, os itens são removidos antes dos orçamentos; cada etapa
+    é feita com um único `executemany`. Se alguma exclusão falhar, nenhum orçamento é removido.
+
+    Args:
+        codigos (list[int]): Os códigos dos orçamentos a serem removidos.
+
+    Returns:
+        int | None: A quantidade de orçamentos removidos, ou None se ocorrer algum erro.
+
+    Raises:
+        Exception: Se ocorrer qualquer erro durante o processo de deleção, a exceção será
+                   capturada e registrada no log.
+    """
+    try:
+        quantidade = enviar_escrita(_remover_orcamentos, codigos).result()
+        logging.info(f"{quantidade} orcamentos removidos com sucesso.")
+        return quantidade
+    except Exception as e:
+        logging.error(f"Erro ao deletar orcamentos em lote: {e}")
+
+
+# Colunas do relatório, na ordem retornada por `gerar_relatorio()` e `blocos_do_relatorio()`.
+COLUNAS_RELATORIO = (
+    "orcamento_id",
+    "data_criacao",
+    "nome_cliente",
+    "nome_vendedor",
+    "produto",
+    "quantidade",
+    "preco_unitario_centavos",
+    "desconto_centavos",
+    "total_item_centavos",
+)
+
+TAMANHO_BLOCO_RELATORIO = 50_000
+
+
+def _consulta_relatorio(
+    data_inicio: str, data_fim: str, produto_codigo: int
+) -> tuple[str, list]:
+    query = """
+            SELECT
+                o.codigo as orcamento_id,
+                o.data_criacao,
+                c.nome as nome_cliente,
+                v.nome as nome_vendedor,
+                p.descricao as produto,
+                i.quantidade,
+                i.preco_unitario_centavos,
+                i.desconto_centavos,
+                (i.quantidade * i.preco_unitario_centavos - i.desconto_centavos)
+                    as total_item_centavos
+            FROM orcamentos o
+            JOIN clientes c ON c.codigo = o.cliente_id
+            JOIN vendedores v ON v.codigo = o.vendedor_id
+            JOIN orcamento_itens i ON i.orcamento_id = o.codigo
+            JOIN produtos p ON p.codigo = i.produto_id
+            WHERE o.dia_criacao >= ? AND o.dia_criacao < ?
+            """
+    params = list(intervalo_de_dias(data_inicio, data_fim))
+    if produto_codigo != -1:
+        query += " AND p.codigo = ?"
+        params.append(produto_codigo)
+    query += " ORDER BY o.codigo"
+
+    return query, params
+
+
 def gerar_relatorio(
     data_inicio: str, data_fim: str, produto_codigo: int = -1
-) -> pd.DataFrame:
+) -> "pd.DataFrame":
     """
     Gera um relatório de orçamentos filtrado por período e, opcionalmente, por produto.
 
@@ -167,13 +398,15 @@ def gerar_relatorio(
       - nome_vendedor: Nome do vendedor associado ao orçamento.
       - produto: Descrição do produto presente no orçamento.
       - quantidade: Quantidade do produto orçado.
-      - preco_unitario: Preço unitário do produto.
-      - desconto: Desconto aplicado ao item.
-      - total_item: Total calculado para o item, definido como (quantidade * preco_unitario - desconto).
+      - preco_unitario_centavos: Preço unitário do produto, em centavos.
+      - desconto_centavos: Desconto aplicado ao item, em centavos.
+      - total_item_centavos: Total calculado para o item, em centavos, definido como
+        (quantidade * preco_unitario_centavos - desconto_centavos).
 
     Os filtros aplicados são:
-      - Período: A data de criação (data_criacao) do orçamento é filtrada entre data_inicio e data_fim.
-        A função DATE() do SQLite é utilizada para comparar apenas a parte da data.
+      - Período: O dia de criação do orçamento (coluna indexada "dia_criacao", em dias desde
+        1970-01-01) é filtrado pelo intervalo semiaberto [data_inicio, data_fim + 1 dia),
+        o que permite ao SQLite percorrer apenas a faixa correspondente do índice.
       - Produto: Se o parâmetro produto_codigo for diferente de -1, a consulta será filtrada para incluir
         apenas os orçamentos que contenham o produto com o código especificado.
 
@@ -187,37 +420,291 @@ def gerar_relatorio(
     Returns:
         pd.DataFrame: Um DataFrame contendo os resultados da consulta. As colunas retornadas incluem:
                       'orcamento_id', 'data_criacao', 'nome_cliente', 'nome_vendedor', 'produto',
-                      'quantidade', 'preco_unitario', 'desconto' e 'total_item'.
+                      'quantidade', 'preco_unitario_centavos', 'desconto_centavos' e
+                      'total_item_centavos'.
 
     Raises:
         Exception: Se ocorrer algum erro durante a execução da consulta, o erro é registrado no log.
     """
-    query = """
+    query, params = _consulta_relatorio(data_inicio, data_fim, produto_codigo)
+    try:
+        with conectar() as conn:
+            import pandas as pd
+
+            df = pd.read_sql_query(query, conn, params=params)
+            return df
+    except Exception as e:
+        logging.error(f"Erro ao gerar relatório: {e}")
+
+
+def resumo_do_relatorio(
+    data_inicio: str, data_fim: str, produto_codigo: int = -1
+) -> "tuple[pd.DataFrame, int]":
+    """
+    Retorna o total de cada orçamento do período e o total geral, agregados pelo próprio SQLite.
+
+    Apenas uma linha por orçamento é transferida do banco de dados; os itens são carregados
+    separadamente, sob demanda, por `itens_do_orcamento()`. O total geral é calculado na mesma
+    consulta, com a função de janela `SUM(...) OVER ()`.
+      - Sem filtro de produto, os totais são lidos de "orcamento_totais" (mantida por
+        gatilhos), sem percorrer os itens.
+      - Com filtro de produto, os itens desse produto são somados com `GROUP BY`, como em
+        `gerar_relatorio()`: o total de cada orçamento considera apenas os itens do produto.
+
+    Args:
+        data_inicio (str): Data de início do filtro, no formato "YYYY-MM-DD".
+        data_fim (str): Data final do filtro, no formato "YYYY-MM-DD".
+        produto_codigo (int, optional): Código do produto para filtrar os orçamentos.
+                                        Se for -1, o filtro por produto não é aplicado.
+
+    Returns:
+        tuple[pd.DataFrame, int]: Um DataFrame com as colunas 'orcamento_id', 'nome_cliente',
+                                  'nome_vendedor', 'data_criacao' e 'total_orcamento_centavos',
+                                  ordenado pelo código do orçamento, e o total geral em centavos.
+                                  Se ocorrer algum erro, retorna um DataFrame vazio e 0.
+
+    Raises:
+        Exception: Se ocorrer algum erro durante a execução da consulta, o erro é registrado no log.
+    """
+    try:
+        return ler_resumo_do_relatorio(data_inicio, data_fim, produto_codigo)
+    except Exception as e:
+        import pandas as pd
+
+        logging.error(f"Erro ao gerar resumo do relatório: {e}")
+        return pd.DataFrame(), 0
+
+
+def ler_resumo_do_relatorio(
+    data_inicio: str, data_fim: str, produto_codigo: int = -1
+) -> "tuple[pd.DataFrame, int]":
+    """
+    Executa a consulta de `resumo_do_relatorio()` sem tratar os erros.
+
+    Destinada às tarefas de relatório em segundo plano (services/tarefas_relatorio.py) e à API
+    (api.py), que precisam distinguir um período sem orçamentos de uma consulta que falhou.
+
+    Args:
+        data_inicio (str): Data de início do filtro, no formato "YYYY-MM-DD".
+        data_fim (str): Data final do filtro, no formato "YYYY-MM-DD".
+        produto_codigo (int, optional): Código do produto para filtrar os orçamentos.
+                                        Se for -1, o filtro por produto não é aplicado.
+
+    Returns:
+        tuple[pd.DataFrame, int]: O mesmo resultado de `resumo_do_relatorio()`.
+
+    Raises:
+        Exception: Se ocorrer algum erro durante a execução da consulta.
+    """
+    params = list(intervalo_de_dias(data_inicio, data_fim))
+    if produto_codigo == -1:
+        query = """
             SELECT
                 o.codigo as orcamento_id,
+                c.nome as nome_cliente,
+                v.nome as nome_vendedor,
                 o.data_criacao,
+                t.valor_itens_centavos - t.desconto_centavos as total_orcamento_centavos,
+                SUM(t.valor_itens_centavos - t.desconto_centavos) OVER ()
+                    as total_geral_centavos
+            FROM orcamentos o
+            JOIN clientes c ON c.codigo = o.cliente_id
+            JOIN vendedores v ON v.codigo = o.vendedor_id
+            JOIN orcamento_totais t ON t.orcamento_id = o.codigo
+            WHERE o.dia_criacao >= ? AND o.dia_criacao < ? AND t.quantidade_itens > 0
+            ORDER BY o.codigo
+        """
+    else:
+        query = """
+            SELECT
+                o.codigo as orcamento_id,
                 c.nome as nome_cliente,
                 v.nome as nome_vendedor,
-                p.descricao as produto,
-                i.quantidade,
-                i.preco_unitario,
-                i.desconto,
-                (i.quantidade * i.preco_unitario - i.desconto) as total_item
+                o.data_criacao,
+                SUM(i.quantidade * i.preco_unitario_centavos - i.desconto_centavos)
+                    as total_orcamento_centavos,
+                SUM(SUM(i.quantidade * i.preco_unitario_centavos - i.desconto_centavos))
+                    OVER () as total_geral_centavos
             FROM orcamentos o
             JOIN clientes c ON c.codigo = o.cliente_id
             JOIN vendedores v ON v.codigo = o.vendedor_id
             JOIN orcamento_itens i ON i.orcamento_id = o.codigo
-            JOIN produtos p ON p.codigo = i.produto_id
-            WHERE DATE(o.data_criacao) BETWEEN ? AND ?
-            """
-    params = [data_inicio, data_fim]
+            WHERE o.dia_criacao >= ? AND o.dia_criacao < ? AND i.produto_id = ?
+            GROUP BY o.codigo
+            ORDER BY o.codigo
+        """
+        params.append(produto_codigo)
+    import pandas as pd
+
+    with conectar() as conn:
+        df = pd.read_sql_query(query, conn, params=params)
+        total_geral = int(df.pop("total_geral_centavos").iloc[0]) if len(df) else 0
+        return df, total_geral
+
+
+def vendas_por_produto(
+    data_inicio: str, data_fim: str, produto_codigo: int = -1
+) -> "pd.DataFrame":
+    """
+    Retorna os totais vendidos de cada produto no período, lidos do resumo "vendas_diarias".
+
+    O resumo guarda uma linha por dia, produto e vendedor, mantida por gatilhos a cada
+    orçamento incluído ou removido; os totais de um período de meses ou anos somam essas
+    linhas, sem percorrer "orcamento_itens". Os itens só são lidos no detalhamento
+    (`resumo_do_relatorio()` com filtro de produto e `itens_do_orcamento()`).
+
+    Args:
+        data_inicio (str): Data de início do filtro, no formato "YYYY-MM-DD".
+        data_fim (str): Data final do filtro, no formato "YYYY-MM-DD".
+        produto_codigo (int, optional): Código do produto para filtrar os totais.
+                                        Se for -1, o filtro por produto não é aplicado.
+
+    Returns:
+        pd.DataFrame: Um DataFrame com as colunas 'produto_id', 'produto', 'quantidade',
+                      'valor_bruto_centavos', 'desconto_centavos' e 'valor_liquido_centavos',
+                      ordenado pelo valor líquido, do maior para o menor. Se ocorrer algum
+                      erro, retorna um DataFrame vazio.
+
+    Raises:
+        Exception: Se ocorrer algum erro durante a execução da consulta, o erro é registrado no log.
+    """
+    try:
+        return ler_vendas_por_produto(data_inicio, data_fim, produto_codigo)
+    except Exception as e:
+        import pandas as pd
+
+        logging.error(f"Erro ao consultar vendas por produto: {e}")
+        return pd.DataFrame()
+
+
+def ler_vendas_por_produto(
+    data_inicio: str, data_fim: str, produto_codigo: int = -1
+) -> "pd.DataFrame":
+    """
+    Executa a consulta de `vendas_por_produto()` sem tratar os erros.
+
+    Destinada às tarefas de relatório em segundo plano (services/tarefas_relatorio.py).
+
+    Args:
+        data_inicio (str): Data de início do filtro, no formato "YYYY-MM-DD".
+        data_fim (str): Data final do filtro, no formato "YYYY-MM-DD".
+        produto_codigo (int, optional): Código do produto para filtrar os totais.
+                                        Se for -1, o filtro por produto não é aplicado.
+
+    Returns:
+        pd.DataFrame: O mesmo resultado de `vendas_por_produto()`.
+
+    Raises:
+        Exception: Se ocorrer algum erro durante a execução da consulta.
+    """
+    params = list(intervalo_de_dias(data_inicio, data_fim))
+    # Sem filtro de produto, o período é lido pela chave primária (dia, ...); o "+" impede que o
+    # SQLite prefira percorrer o índice (produto_id, dia) inteiro para evitar a ordenação do
+    # GROUP BY. Com filtro de produto, esse índice restringe a leitura ao produto.
+    filtro = "v.dia >= ? AND v.dia < ?"
     if produto_codigo != -1:
-        query += " AND p.codigo = ?"
+        filtro = "v.produto_id = ? AND " + filtro
+        params.insert(0, produto_codigo)
+    query = f"""
+        SELECT
+            v.produto_id,
+            p.descricao as produto,
+            SUM(v.quantidade) as quantidade,
+            SUM(v.valor_bruto_centavos) as valor_bruto_centavos,
+            SUM(v.desconto_centavos) as desconto_centavos,
+            SUM(v.valor_liquido_centavos) as valor_liquido_centavos
+        FROM vendas_diarias v
+        JOIN produtos p ON p.codigo = v.produto_id
+        WHERE {filtro}
+        GROUP BY +v.produto_id
+        ORDER BY valor_liquido_centavos DESC, v.produto_id
+    """
+    import pandas as pd
+
+    with conectar() as conn:
+        return pd.read_sql_query(query, conn, params=params)
+
+
+def itens_do_orcamento(orcamento_id: int, produto_codigo: int = -1) -> list:
+    """
+    Retorna os itens de um orçamento, para o detalhamento do relatório sob demanda.
+
+    Args:
+        orcamento_id (int): O código do orçamento.
+        produto_codigo (int, optional): Código do produto para filtrar os itens.
+                                        Se for -1, todos os itens do orçamento são retornados.
+
+    Returns:
+        list: Uma lista de dicionários com os campos "produto", "quantidade",
+              "preco_unitario_centavos", "desconto_centavos" e "total_item_centavos".
+              Se ocorrer um erro durante a consulta, a função retorna uma lista vazia.
+
+    Raises:
+        Exception: Se ocorrer algum erro durante a execução da consulta, o erro é registrado no log.
+    """
+    query = """
+        SELECT
+            p.descricao as produto,
+            i.quantidade,
+            i.preco_unitario_centavos,
+            i.desconto_centavos,
+            (i.quantidade * i.preco_unitario_centavos - i.desconto_centavos)
+                as total_item_centavos
+        FROM orcamento_itens i
+        JOIN produtos p ON p.codigo = i.produto_id
+        WHERE i.orcamento_id = ?
+    """
+    params = [orcamento_id]
+    if produto_codigo != -1:
+        query += " AND i.produto_id = ?"
         params.append(produto_codigo)
-    query += " ORDER BY o.codigo"
+    query += " ORDER BY i.codigo"
     try:
         with conectar() as conn:
-            df = pd.read_sql_query(query, conn, params=params)
-            return df
+            cursor = conn.cursor()
+            cursor.execute(query, params)
+            return [dict(item) for item in cursor.fetchall()]
     except Exception as e:
-        logging.error(f"Erro ao listar clientes: {e}")
+        logging.error(f"Erro ao listar itens do orcamento: {e}")
+        return []
+
+
+def blocos_do_relatorio(
+    data_inicio: str,
+    data_fim: str,
+    produto_codigo: int = -1,
+    tamanho_bloco: int = TAMANHO_BLOCO_RELATORIO,
+):
+    """
+    Percorre o relatório de `gerar_relatorio()` em blocos, sem carregá-lo inteiro na memória.
+
+    A mesma consulta é executada uma única vez e o cursor é lido com `fetchmany()`, de modo que
+    apenas um bloco de linhas fica na memória por vez, independentemente do tamanho do período,
+    e todos os blocos vêm do mesmo instante do banco. A leitura usa uma conexão própria
+    (`conexao_dedicada()`), fechada quando o gerador é esgotado ou fechado; assim, a thread
+    que consome os blocos pode usar `conectar()` entre eles sem entrar na leitura em andamento.
+
+    Ao contrário das demais funções deste módulo, os erros não são capturados: quem consome os
+    blocos (ex: `services.exportacao`) precisa saber que o relatório ficou incompleto.
+
+    Args:
+        data_inicio (str): Data de início do filtro, no formato "YYYY-MM-DD".
+        data_fim (str): Data final do filtro, no formato "YYYY-MM-DD".
+        produto_codigo (int, optional): Código do produto para filtrar os orçamentos.
+                                        Se for -1, o filtro por produto não é aplicado.
+        tamanho_bloco (int, optional): Quantidade máxima de linhas por bloco.
+
+    Yields:
+        list: Uma lista de linhas (sequências com os valores de `COLUNAS_RELATORIO`, nessa ordem).
+
+    Raises:
+        sqlite3.Error: Se ocorrer algum erro durante a consulta.
+    """
+    query, params = _consulta_relatorio(data_inicio, data_fim, produto_codigo)
+    with conexao_dedicada() as conn:
+        cursor = conn.execute(query, params)
+        while True:
+            linhas = cursor.fetchmany(tamanho_bloco)
+            if not linhas:
+                break
+            yield linhas
@@ -1,7 +1,16 @@
-from services.banco_de_dados import conectar, tabela_existe
+from services.banco_de_dados import conectar
+from services.escrita import (
+    executar_escrita,
+    executar_escrita_com_resultado,
+    executar_escrita_em_lote,
+)
+from services.esquema import tabela_existe
+from services.cache import em_cache
+from services.busca import LIMITE_RESULTADOS, expressao_de_busca
 import logging
 
 
+@em_cache("produtos")
 def lista_de_produtos() -> list:
     """
     Retorna uma lista de produtos cadastrados na tabela "produtos" do banco de dados.
@@ -34,7 +43,100 @@ def lista_de_produtos() -> list:
         return []
 
 
-def adicionar_produto(descricao: str, preco: float) -> None:
+@em_cache("produtos")
+def pagina_de_produtos(
+    apos: str | None = None, limite: int = 50
+) -> tuple[list, str | None]:
+    """
+    Retorna uma página de produtos ordenada pelo campo "descricao", usando paginação por chave (keyset).
+
+    Em vez de OFFSET, a consulta continua a partir do último "descricao" exibido (`apos`),
+    percorrendo diretamente o índice único da coluna. Assim, o custo de cada página depende
+    apenas de `limite`, e não do tamanho da tabela nem da posição da página.
+
+    Args:
+        apos (str | None): O "descricao" do último produto da página anterior.
+                           Se for None, retorna a primeira página.
+        limite (int): A quantidade máxima de produtos na página. Padrão é 50.
+
+    Returns:
+        tuple[list, str | None]: Uma lista de dicionários representando os produtos da página e o
+                                 valor de `apos` para a próxima página (None se esta for a última).
+                                 Retorna ([], None) se ocorrer algum erro durante a consulta.
+
+    Raises:
+        Exception: Se ocorrer qualquer exceção durante a operação, ela será capturada e registrada no log.
+    """
+    try:
+        with conectar() as conn:
+            cursor = conn.cursor()
+            if apos is None:
+                cursor.execute(
+                    "SELECT * FROM produtos ORDER BY descricao ASC LIMIT ?",
+                    (limite + 1,),
+                )
+            else:
+                cursor.execute(
+                    "SELECT * FROM produtos WHERE descricao > ? ORDER BY descricao ASC LIMIT ?",
+                    (apos, limite + 1),
+                )
+            produtos = [dict(produto) for produto in cursor.fetchall()]
+            proximo = (
+                produtos[limite - 1]["descricao"] if len(produtos) > limite else None
+            )
+            return produtos[:limite], proximo
+    except Exception as e:
+        logging.error(f"Erro ao paginar produtos: {e}")
+        return [], None
+
+
+@em_cache("produtos")
+def buscar_produtos(termo: str, limite: int = LIMITE_RESULTADOS) -> list:
+    """
+    Busca produtos pelo campo "descricao" utilizando o índice de busca textual (FTS5).
+
+    Cada palavra do termo é tratada como prefixo e os acentos são ignorados, de modo que
+    "dor drag" encontra "Doralgina Com 20 Drágeas". Apenas os `limite` resultados mais relevantes são
+    retornados, permitindo consultar o banco a cada termo digitado sem carregar a tabela inteira.
+    Se o termo estiver vazio, retorna os primeiros produtos em ordem alfabética.
+
+    Args:
+        termo (str): O texto digitado pelo usuário.
+        limite (int): A quantidade máxima de produtos retornados. Padrão é `LIMITE_RESULTADOS`.
+
+    Returns:
+        list: Uma lista de dicionários representando os produtos encontrados.
+              Retorna uma lista vazia se ocorrer algum erro durante a consulta.
+
+    Raises:
+        Exception: Se ocorrer qualquer exceção durante a operação, ela será capturada e registrada no log.
+    """
+    expressao = expressao_de_busca(termo)
+    if expressao is None:
+        return pagina_de_produtos(None, limite)[0]
+
+    try:
+        with conectar() as conn:
+            cursor = conn.cursor()
+            cursor.execute(
+                """
+                SELECT t.*
+                FROM produtos_busca b
+                JOIN produtos t ON t.codigo = b.rowid
+                WHERE produtos_busca MATCH ?
+                ORDER BY b.rank
+                LIMIT ?
+            """,
+                (expressao, limite),
+            )
+            produtos = cursor.fetchall()
+            return [dict(produto) for produto in produtos]
+    except Exception as e:
+        logging.error(f"Erro ao buscar produtos: {e}")
+        return []
+
+
+def adicionar_produto(descricao: str, preco_centavos: int) -> None:
     """
     Adiciona um novo produto na tabela "produtos" do banco de dados.
 
@@ -44,7 +146,7 @@ def adicionar_produto(descricao: str, preco: float) -> None:
 
     Args:
         descricao (str): A descrição do produto.
-        preco (float): O preço do produto.
+        preco_centavos (int): O preço do produto, em centavos.
 
     Returns:
         None
@@ -54,19 +156,95 @@ def adicionar_produto(descricao: str, preco: float) -> None:
                    o erro será registrado no log.
     """
     try:
-        with conectar() as conn:
-            cursor = conn.cursor()
-            cursor.execute(
-                "INSERT OR IGNORE INTO produtos (descricao, preco) VALUES (?, ?)",
-                (descricao, preco),
-            )
-            conn.commit()
-            logging.info("Produto adicionado com sucesso.")
+        executar_escrita(
+            "INSERT OR IGNORE INTO produtos (descricao, preco_centavos) VALUES (?, ?)",
+            (descricao, preco_centavos),
+        ).result()
+        logging.info("Produto adicionado com sucesso.")
     except Exception as e:
         logging.error(f"Erro ao adicionar produto: {e}")
 
 
-def atualizar_produto(codigo: int, descricao: str, preco: float) -> None:
+def incluir_produto(descricao: str, preco_centavos: int) -> int:
+    """
+    Inclui um produto e retorna o seu código, sem tratar os erros.
+
+    Destinada à API (api.py). Diferente de `adicionar_produto()`, que utiliza "INSERT OR IGNORE",
+    a inclusão que viola uma restrição da tabela falha, em vez de ser ignorada.
+
+    Args:
+        descricao (str): A descrição do produto.
+        preco_centavos (int): O preço do produto, em centavos.
+
+    Returns:
+        int: O código do produto incluído.
+
+    Raises:
+        sqlite3.IntegrityError: Se a descrição já estiver cadastrada.
+        Exception: Se ocorrer qualquer outro erro durante a operação.
+    """
+    return (
+        executar_escrita_com_resultado(
+            "INSERT INTO produtos (descricao, preco_centavos) VALUES (?, ?)",
+            (descricao, preco_centavos),
+        )
+        .result()
+        .codigo
+    )
+
+
+def salvar_produtos(produtos: list[tuple[str, int]]) -> int | None:
+    """
+    Inclui ou atualiza vários produtos em uma única transação.
+
+    Os produtos são identificados pela descrição (restrição UNIQUE): as descrições novas são
+    incluídas e, para as já cadastradas, o preço é atualizado ("INSERT ... ON CONFLICT DO
+    UPDATE"), tudo com um único `executemany`. Se algum produto falhar, nenhum é gravado.
+
+    Args:
+        produtos (list[tuple[str, int]]): Os produtos, como (descricao, preco_centavos).
+
+    Returns:
+        int | None: A quantidade de produtos gravados, ou None se ocorrer algum erro.
+
+    Raises:
+        Exception: Se ocorrer algum erro durante a operação, a exceção é capturada e registrada no log.
+    """
+    try:
+        quantidade = gravar_produtos(produtos)
+        logging.info(f"{quantidade} produtos salvos com sucesso.")
+        return quantidade
+    except Exception as e:
+        logging.error(f"Erro ao salvar produtos: {e}")
+
+
+def gravar_produtos(produtos: list[tuple[str, int]]) -> int:
+    """
+    Executa a gravação de `salvar_produtos()` sem tratar os erros.
+
+    Destinada à API (api.py), que distingue as restrições violadas dos demais erros.
+
+    Args:
+        produtos (list[tuple[str, int]]): Os produtos, como (descricao, preco_centavos).
+
+    Returns:
+        int: A quantidade de produtos gravados.
+
+    Raises:
+        sqlite3.IntegrityError: Se alguma restrição da tabela for violada.
+        Exception: Se ocorrer qualquer outro erro durante a operação.
+    """
+    executar_escrita_em_lote(
+        """
+        INSERT INTO produtos (descricao, preco_centavos) VALUES (?, ?)
+        ON CONFLICT (descricao) DO UPDATE SET preco_centavos = excluded.preco_centavos
+        """,
+        produtos,
+    ).result()
+    return len(produtos)
+
+
+def atualizar_produto(codigo: int, descricao: str, preco_centavos: int) -> int | None:
     """
     Atualiza as informações de um produto na tabela "produtos" do banco de dados.
 
@@ -77,28 +255,52 @@ def atualizar_produto(codigo: int, descricao: str, preco: float) -> None:
     Args:
         codigo (int): O código identificador do produto a ser atualizado.
         descricao (str): A nova descrição do produto.
-        preco (float): O novo preço do produto.
+        preco_centavos (int): O novo preço do produto, em centavos.
 
     Returns:
-        None
+        int | None: A quantidade de produtos atualizados (0 se o código não existir),
+                    ou None se ocorrer algum erro.
 
     Raises:
         Exception: Se ocorrer algum erro durante a operação, a exceção será capturada e registrada no log.
     """
     try:
-        with conectar() as conn:
-            cursor = conn.cursor()
-            cursor.execute(
-                "UPDATE produtos SET descricao = ?, preco = ? WHERE codigo = ?",
-                (descricao, preco, codigo),
-            )
-            conn.commit()
-            logging.info("Produto atualizado com sucesso.")
+        linhas = alterar_produto(codigo, descricao, preco_centavos)
+        logging.info("Produto atualizado com sucesso.")
+        return linhas
     except Exception as e:
         logging.error(f"Erro ao atualizar produto: {e}")
 
 
-def deletar_produto(codigo: int) -> None:
+def alterar_produto(codigo: int, descricao: str, preco_centavos: int) -> int:
+    """
+    Executa a alteração de `atualizar_produto()` sem tratar os erros.
+
+    Destinada à API (api.py), que distingue os produtos inexistentes das restrições violadas.
+
+    Args:
+        codigo (int): O código identificador do produto a ser alterado.
+        descricao (str): A descrição do produto.
+        preco_centavos (int): O preço do produto, em centavos.
+
+    Returns:
+        int: A quantidade de produtos alterados (0 se o código não existir).
+
+    Raises:
+        sqlite3.IntegrityError: Se alguma restrição da tabela for violada.
+        Exception: Se ocorrer qualquer outro erro durante a operação.
+    """
+    return (
+        executar_escrita_com_resultado(
+            "UPDATE produtos SET descricao = ?, preco_centavos = ? WHERE codigo = ?",
+            (descricao, preco_centavos, codigo),
+        )
+        .result()
+        .linhas
+    )
+
+
+def deletar_produto(codigo: int) -> int | None:
     """
     Remove um produto da tabela "produtos" do banco de dados.
 
@@ -110,16 +312,100 @@ def deletar_produto(codigo: int) -> None:
         codigo (int): O código identificador do produto a ser removido.
 
     Returns:
-        None
+        int | None: A quantidade de produtos removidos (0 se o código não existir),
+                    ou None se ocorrer algum erro.
 
     Raises:
         Exception: Se ocorrer qualquer erro durante a operação, a exceção será capturada e registrada no log.
     """
     try:
-        with conectar() as conn:
-            cursor = conn.cursor()
-            cursor.execute("DELETE FROM produtos WHERE codigo = ?", (codigo,))
-            conn.commit()
-            logging.info("Produto removido com sucesso.")
+        linhas = excluir_produto(codigo)
+        logging.info("Produto removido com sucesso.")
+        return linhas
     except Exception as e:
         logging.error(f"Erro ao deletar produto: {e}")
+
+
+def excluir_produto(codigo: int) -> int:
+    """
+    Executa a remoção de `deletar_produto()` sem tratar os erros.
+
+    Destinada à API (api.py), que distingue os produtos inexistentes dos demais erros.
+
+    Args:
+        codigo (int): O código identificador do produto a ser removido.
+
+    Returns:
+        int: A quantidade de produtos removidos (0 se o código não existir).
+
+    Raises:
+        sqlite3.IntegrityError: Se alguma restrição da tabela for violada.
+        Exception: Se ocorrer qualquer outro erro durante a operação.
+    """
+    return (
+        executar_escrita_com_resultado(
+            "DELETE FROM produtos WHERE codigo = ?", (codigo,)
+        )
+        .result()
+        .linhas
+    )
+
+
+def atualizar_produtos_em_lote(produtos: list[tuple[int, str, int]]) -> int | None:
+    """
+    Atualiza a descrição e o preço de vários produtos em uma única transação.
+
+    Ao contrário de `salvar_produtos()`, que identifica os produtos pela descrição, os produtos
+    são identificados pelo código, o que permite alterar a descrição. As alterações são gravadas
+    com um único `executemany`; se alguma falhar (ex: descrição já cadastrada), nenhuma é gravada.
+
+    Args:
+        produtos (list[tuple[int, str, int]]): Os produtos alterados, como
+                                               (codigo, descricao, preco_centavos).
+
+    Returns:
+        int | None: A quantidade de produtos atualizados, ou None se ocorrer algum erro.
+
+    Raises:
+        Exception: Se ocorrer algum erro durante a operação, a exceção será capturada e registrada no log.
+    """
+    try:
+        quantidade = executar_escrita_em_lote(
+            "UPDATE produtos SET descricao = ?, preco_centavos = ? WHERE codigo = ?",
+            [
+                (descricao, preco_centavos, codigo)
+                for codigo, descricao, preco_centavos in produtos
+            ],
+        ).result()
+        logging.info(f"{quantidade} produtos atualizados com sucesso.")
+        return quantidade
+    except Exception as e:
+        logging.error(f"Erro ao atualizar produtos em lote: {e}")
+
+
+def deletar_produtos_em_lote(codigos: list[int]) -> int | None:
+    """
+    Remove vários produtos em uma única transação.
+
+    As ofertas e os itens de orçamento dos produtos também são removidos (ON DELETE CASCADE).
+    As exclusões são feitas com um único `executemany`, utilizado pela remoção dos registros
+    selecionados na página de produtos. Se alguma exclusão falhar, nenhum registro é removido.
+
+    Args:
+        codigos (list[int]): Os códigos dos produtos a serem removidos.
+
+    Returns:
+        int | None: A quantidade de produtos removidos, ou None se ocorrer algum erro.
+
+    Raises:
+        Exception: Se ocorrer qualquer exceção durante a operação, ela será capturada e registrada no log.
+    """
+    try:
+        quantidade = executar_escrita_em_lote(
+            "DELETE FROM produtos WHERE codigo = ?",
+            [(codigo,) for codigo in codigos],
+        ).result()
+        logging.info(f"{quantidade} produtos removidos com sucesso.")
+        return quantidade
+    except Exception as e:
+        logging.error(f"Erro ao deletar produtos em lote: {e}")
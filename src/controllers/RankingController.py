@@ -0,0 +1,202 @@
+import logging
+from services.banco_de_dados import conectar
+from services.cache import em_cache
+from services.datas import intervalo_de_dias
+from services.migracoes import CONTADOR_ALTERACOES_ORCAMENTOS
+
+
+LIMITE_RANKING = 10
+
+# Critério de classificação -> coluna agregada usada na ordenação.
+CRITERIOS_RANKING = {
+    "quantidade": "quantidade",
+    "valor_liquido": "valor_liquido_centavos",
+    "desconto": "desconto_centavos",
+}
+
+# Os rankings dependem dos orçamentos (inclusões, remoções e alterações de itens) e dos nomes.
+_TABELAS_DOS_RANKINGS = ("orcamentos", CONTADOR_ALTERACOES_ORCAMENTOS)
+
+# Produtos e vendedores são agregados a partir do resumo "vendas_diarias", lido pela chave
+# primária (dia, ...) no período; o "+" impede que o SQLite percorra o índice
+# (produto_id, dia) inteiro apenas para evitar a ordenação do GROUP BY.
+CONSULTA_RESUMO = """
+    SELECT r.codigo, n.{nome} as nome, r.quantidade, r.valor_bruto_centavos,
+           r.desconto_centavos, r.valor_liquido_centavos
+    FROM (
+        SELECT
+            v.{chave} as codigo,
+            SUM(v.quantidade) as quantidade,
+            SUM(v.valor_bruto_centavos) as valor_bruto_centavos,
+            SUM(v.desconto_centavos) as desconto_centavos,
+            SUM(v.valor_liquido_centavos) as valor_liquido_centavos
+        FROM vendas_diarias v
+        WHERE v.dia >= ? AND v.dia < ?
+        GROUP BY +v.{chave}
+        ORDER BY {coluna} DESC, codigo
+        LIMIT ?
+    ) r
+    JOIN {tabela} n ON n.codigo = r.codigo
+    ORDER BY r.{coluna} DESC, r.codigo
+"""
+
+# O resumo não guarda o cliente; os clientes são agregados a partir dos orçamentos do período
+# (índice (dia_criacao, cliente_id, vendedor_id)) e dos seus itens (índice de cobertura
+# por orcamento_id), sem ler as linhas das tabelas.
+CONSULTA_CLIENTES = """
+    SELECT r.codigo, c.nome, r.quantidade, r.valor_bruto_centavos,
+           r.desconto_centavos, r.valor_liquido_centavos
+    FROM (
+        SELECT
+            o.cliente_id as codigo,
+            SUM(i.quantidade) as quantidade,
+            SUM(i.quantidade * i.preco_unitario_centavos) as valor_bruto_centavos,
+            SUM(i.desconto_centavos) as desconto_centavos,
+            SUM(i.quantidade * i.preco_unitario_centavos - i.desconto_centavos)
+                as valor_liquido_centavos
+        FROM orcamentos o
+        JOIN orcamento_itens i ON i.orcamento_id = o.codigo
+        WHERE o.dia_criacao >= ? AND o.dia_criacao < ?
+        GROUP BY +o.cliente_id
+        ORDER BY {coluna} DESC, codigo
+        LIMIT ?
+    ) r
+    JOIN clientes c ON c.codigo = r.codigo
+    ORDER BY r.{coluna} DESC, r.codigo
+"""
+
+
+def _ranking(
+    consulta: str, data_inicio: str, data_fim: str, criterio: str, limite: int, **campos
+) -> list:
+    # O ORDER BY ... LIMIT é executado pelo SQLite mantendo apenas as `limite` maiores linhas
+    # durante a agregação; os nomes são lidos somente para essas linhas.
+    query = consulta.format(coluna=CRITERIOS_RANKING[criterio], **campos)
+    with conectar() as conn:
+        cursor = conn.cursor()
+        cursor.execute(query, (*intervalo_de_dias(data_inicio, data_fim), limite))
+        return [dict(linha) for linha in cursor.fetchall()]
+
+
+@em_cache(*_TABELAS_DOS_RANKINGS, "produtos")
+def ranking_de_produtos(
+    data_inicio: str,
+    data_fim: str,
+    criterio: str = "quantidade",
+    limite: int = LIMITE_RANKING,
+) -> list:
+    """
+    Retorna os produtos mais vendidos no período, pelo critério informado.
+
+    Os totais são somados a partir do resumo "vendas_diarias" (uma linha por dia, produto e
+    vendedor), sem percorrer "orcamento_itens", e apenas as `limite` primeiras posições são
+    mantidas durante a ordenação, o que permite períodos com milhões de itens.
+
+    Args:
+        data_inicio (str): Data de início do período, no formato "YYYY-MM-DD".
+        data_fim (str): Data final do período, no formato "YYYY-MM-DD".
+        criterio (str, optional): Uma das chaves de `CRITERIOS_RANKING`: "quantidade",
+                                  "valor_liquido" ou "desconto".
+        limite (int, optional): A quantidade de posições do ranking.
+
+    Returns:
+        list: Uma lista de dicionários com as chaves 'codigo', 'nome', 'quantidade',
+              'valor_bruto_centavos', 'desconto_centavos' e 'valor_liquido_centavos', do
+              maior para o menor valor do critério. Retorna uma lista vazia se ocorrer algum erro.
+
+    Raises:
+        Exception: Se ocorrer algum erro durante a execução da consulta, o erro é registrado no log.
+    """
+    try:
+        return _ranking(
+            CONSULTA_RESUMO,
+            data_inicio,
+            data_fim,
+            criterio,
+            limite,
+            chave="produto_id",
+            tabela="produtos",
+            nome="descricao",
+        )
+    except Exception as e:
+        logging.error(f"Erro ao consultar ranking de produtos: {e}")
+        return []
+
+
+@em_cache(*_TABELAS_DOS_RANKINGS, "vendedores")
+def ranking_de_vendedores(
+    data_inicio: str,
+    data_fim: str,
+    criterio: str = "valor_liquido",
+    limite: int = LIMITE_RANKING,
+) -> list:
+    """
+    Retorna os vendedores com mais vendas no período, pelo critério informado.
+
+    Assim como `ranking_de_produtos()`, os totais são somados a partir do resumo
+    "vendas_diarias", mantendo apenas as `limite` primeiras posições.
+
+    Args:
+        data_inicio (str): Data de início do período, no formato "YYYY-MM-DD".
+        data_fim (str): Data final do período, no formato "YYYY-MM-DD".
+        criterio (str, optional): Uma das chaves de `CRITERIOS_RANKING`: "quantidade",
+                                  "valor_liquido" ou "desconto".
+        limite (int, optional): A quantidade de posições do ranking.
+
+    Returns:
+        list: Uma lista de dicionários com as mesmas chaves de `ranking_de_produtos()`.
+              Retorna uma lista vazia se ocorrer algum erro.
+
+    Raises:
+        Exception: Se ocorrer algum erro durante a execução da consulta, o erro é registrado no log.
+    """
+    try:
+        return _ranking(
+            CONSULTA_RESUMO,
+            data_inicio,
+            data_fim,
+            criterio,
+            limite,
+            chave="vendedor_id",
+            tabela="vendedores",
+            nome="nome",
+        )
+    except Exception as e:
+        logging.error(f"Erro ao consultar ranking de vendedores: {e}")
+        return []
+
+
+@em_cache(*_TABELAS_DOS_RANKINGS, "clientes")
+def ranking_de_clientes(
+    data_inicio: str,
+    data_fim: str,
+    criterio: str = "valor_liquido",
+    limite: int = LIMITE_RANKING,
+) -> list:
+    """
+    Retorna os clientes com mais compras no período, pelo critério informado.
+
+    O resumo "vendas_diarias" não é separado por cliente; os totais são somados a partir dos
+    orçamentos do período e dos seus itens, lidos apenas pelos índices
+    (dia_criacao, cliente_id, vendedor_id) e (orcamento_id, ...), mantendo apenas as `limite`
+    primeiras posições durante a ordenação.
+
+    Args:
+        data_inicio (str): Data de início do período, no formato "YYYY-MM-DD".
+        data_fim (str): Data final do período, no formato "YYYY-MM-DD".
+        criterio (str, optional): Uma das chaves de `CRITERIOS_RANKING`: "quantidade",
+                                  "valor_liquido" ou "desconto".
+        limite (int, optional): A quantidade de posições do ranking.
+
+    Returns:
+        list: Uma lista de dicionários com as mesmas chaves de `ranking_de_produtos()`.
+              Retorna uma lista vazia se ocorrer algum erro.
+
+    Raises:
+        Exception: Se ocorrer algum erro durante a execução da consulta, o erro é registrado no log.
+    """
+    try:
+        return _ranking(CONSULTA_CLIENTES, data_inicio, data_fim, criterio, limite)
+    except Exception as e:
+        logging.error(f"Erro ao consultar ranking de clientes: {e}")
+        return []
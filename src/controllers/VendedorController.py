@@ -1,7 +1,16 @@
-from services.banco_de_dados import conectar, tabela_existe
+from services.banco_de_dados import conectar
+from services.escrita import (
+    executar_escrita,
+    executar_escrita_com_resultado,
+    executar_escrita_em_lote,
+)
+from services.esquema import tabela_existe
+from services.cache import em_cache
+from services.busca import LIMITE_RESULTADOS, expressao_de_busca
 import logging
 
 
+@em_cache("vendedores")
 def lista_de_vendedores() -> list:
     """
     Retorna uma lista de vendedores cadastrados na tabela "vendedores" do banco de dados.
@@ -33,6 +42,98 @@ def lista_de_vendedores() -> list:
         logging.error(f"Erro ao listar vendedores: {e}")
 
 
+@em_cache("vendedores")
+def pagina_de_vendedores(
+    apos: str | None = None, limite: int = 50
+) -> tuple[list, str | None]:
+    """
+    Retorna uma página de vendedores ordenada pelo campo "nome", usando paginação por chave (keyset).
+
+    Em vez de OFFSET, a consulta continua a partir do último "nome" exibido (`apos`),
+    percorrendo diretamente o índice único da coluna. Assim, o custo de cada página depende
+    apenas de `limite`, e não do tamanho da tabela nem da posição da página.
+
+    Args:
+        apos (str | None): O "nome" do último vendedor da página anterior.
+                           Se for None, retorna a primeira página.
+        limite (int): A quantidade máxima de vendedores na página. Padrão é 50.
+
+    Returns:
+        tuple[list, str | None]: Uma lista de dicionários representando os vendedores da página e o
+                                 valor de `apos` para a próxima página (None se esta for a última).
+                                 Retorna ([], None) se ocorrer algum erro durante a consulta.
+
+    Raises:
+        Exception: Se ocorrer qualquer exceção durante a operação, ela será capturada e registrada no log.
+    """
+    try:
+        with conectar() as conn:
+            cursor = conn.cursor()
+            if apos is None:
+                cursor.execute(
+                    "SELECT * FROM vendedores ORDER BY nome ASC LIMIT ?", (limite + 1,)
+                )
+            else:
+                cursor.execute(
+                    "SELECT * FROM vendedores WHERE nome > ? ORDER BY nome ASC LIMIT ?",
+                    (apos, limite + 1),
+                )
+            vendedores = [dict(vendedor) for vendedor in cursor.fetchall()]
+            proximo = (
+                vendedores[limite - 1]["nome"] if len(vendedores) > limite else None
+            )
+            return vendedores[:limite], proximo
+    except Exception as e:
+        logging.error(f"Erro ao paginar vendedores: {e}")
+        return [], None
+
+
+@em_cache("vendedores")
+def buscar_vendedores(termo: str, limite: int = LIMITE_RESULTADOS) -> list:
+    """
+    Busca vendedores pelo campo "nome" utilizando o índice de busca textual (FTS5).
+
+    Cada palavra do termo é tratada como prefixo e os acentos são ignorados, de modo que
+    "will sm" encontra "Will Smith". Apenas os `limite` resultados mais relevantes são
+    retornados, permitindo consultar o banco a cada termo digitado sem carregar a tabela inteira.
+    Se o termo estiver vazio, retorna os primeiros vendedores em ordem alfabética.
+
+    Args:
+        termo (str): O texto digitado pelo usuário.
+        limite (int): A quantidade máxima de vendedores retornados. Padrão é `LIMITE_RESULTADOS`.
+
+    Returns:
+        list: Uma lista de dicionários representando os vendedores encontrados.
+              Retorna uma lista vazia se ocorrer algum erro durante a consulta.
+
+    Raises:
+        Exception: Se ocorrer qualquer exceção durante a operação, ela será capturada e registrada no log.
+    """
+    expressao = expressao_de_busca(termo)
+    if expressao is None:
+        return pagina_de_vendedores(None, limite)[0]
+
+    try:
+        with conectar() as conn:
+            cursor = conn.cursor()
+            cursor.execute(
+                """
+                SELECT t.*
+                FROM vendedores_busca b
+                JOIN vendedores t ON t.codigo = b.rowid
+                WHERE vendedores_busca MATCH ?
+                ORDER BY b.rank
+                LIMIT ?
+            """,
+                (expressao, limite),
+            )
+            vendedores = cursor.fetchall()
+            return [dict(vendedor) for vendedor in vendedores]
+    except Exception as e:
+        logging.error(f"Erro ao buscar vendedores: {e}")
+        return []
+
+
 def adicionar_vendedor(nome: str) -> None:
     """
     Adiciona um novo vendedor na tabela "vendedores" do banco de dados.
@@ -52,25 +153,49 @@ def adicionar_vendedor(nome: str) -> None:
                    o erro é registrado no log.
     """
     try:
-        with conectar() as conn:
-            cursor = conn.cursor()
-            cursor.execute(
-                "INSERT OR IGNORE INTO vendedores (nome) VALUES (?)",
-                (nome,),
-            )
-            conn.commit()
-            logging.info("Vendedor adicionado com sucesso.")
+        executar_escrita(
+            "INSERT OR IGNORE INTO vendedores (nome) VALUES (?)",
+            (nome,),
+        ).result()
+        logging.info("Vendedor adicionado com sucesso.")
     except Exception as e:
         logging.error(f"Erro ao adicionar vendedor: {e}")
 
 
-def atualizar_vendedor(codigo: int, nome: str) -> None:
+def incluir_vendedor(nome: str) -> int:
+    """
+    Inclui um vendedor e retorna o seu código, sem tratar os erros.
+
+    Destinada à API (api.py). Diferente de `adicionar_vendedor()`, que utiliza "INSERT OR IGNORE",
+    a inclusão que viola uma restrição da tabela falha, em vez de ser ignorada.
+
+    Args:
+        nome (str): O nome do vendedor.
+
+    Returns:
+        int: O código do vendedor incluído.
+
+    Raises:
+        sqlite3.IntegrityError: Se o nome já estiver cadastrado.
+        Exception: Se ocorrer qualquer outro erro durante a operação.
+    """
+    return (
+        executar_escrita_com_resultado(
+            "INSERT INTO vendedores (nome) VALUES (?)",
+            (nome,),
+        )
+        .result()
+        .codigo
+    )
+
+
+def atualizar_vendedor(codigo: int, nome: str) -> int | None:
     """
     Atualiza o nome de um vendedor na tabela "vendedores" do banco de dados.
 
-    Esta função atualiza o registro de um vendedor identificado pelo código fornecido, 
-    definindo um novo nome para o vendedor. Após a atualização, a transação é confirmada (commit) 
-    e uma mensagem de sucesso é registrada no log. Caso ocorra algum erro durante o processo, 
+    Esta função atualiza o registro de um vendedor identificado pelo código fornecido,
+    definindo um novo nome para o vendedor. Após a atualização, a transação é confirmada (commit)
+    e uma mensagem de sucesso é registrada no log. Caso ocorra algum erro durante o processo,
     a exceção é capturada e o erro é registrado no log.
 
     Args:
@@ -78,26 +203,49 @@ def atualizar_vendedor(codigo: int, nome: str) -> None:
         nome (str): O novo nome do vendedor.
 
     Returns:
-        None
+        int | None: A quantidade de vendedores atualizados (0 se o código não existir),
+                    ou None se ocorrer algum erro.
 
     Raises:
-        Exception: Se ocorrer qualquer erro durante a operação, a exceção será capturada 
+        Exception: Se ocorrer qualquer erro durante a operação, a exceção será capturada
                    e registrada no log.
     """
     try:
-        with conectar() as conn:
-            cursor = conn.cursor()
-            cursor.execute(
-                "UPDATE vendedores SET nome = ? WHERE codigo = ?",
-                (nome, codigo),
-            )
-            conn.commit()
-            logging.info("Vendedor atualizado com sucesso.")
+        linhas = alterar_vendedor(codigo, nome)
+        logging.info("Vendedor atualizado com sucesso.")
+        return linhas
     except Exception as e:
         logging.error(f"Erro ao atualizar vendedor: {e}")
 
 
-def deletar_vendedor(codigo: int) -> None:
+def alterar_vendedor(codigo: int, nome: str) -> int:
+    """
+    Executa a alteração de `atualizar_vendedor()` sem tratar os erros.
+
+    Destinada à API (api.py), que distingue os vendedores inexistentes das restrições violadas.
+
+    Args:
+        codigo (int): O código identificador do vendedor a ser alterado.
+        nome (str): O nome do vendedor.
+
+    Returns:
+        int: A quantidade de vendedores alterados (0 se o código não existir).
+
+    Raises:
+        sqlite3.IntegrityError: Se alguma restrição da tabela for violada.
+        Exception: Se ocorrer qualquer outro erro durante a operação.
+    """
+    return (
+        executar_escrita_com_resultado(
+            "UPDATE vendedores SET nome = ? WHERE codigo = ?",
+            (nome, codigo),
+        )
+        .result()
+        .linhas
+    )
+
+
+def deletar_vendedor(codigo: int) -> int | None:
     """
     Remove um vendedor da tabela "vendedores" do banco de dados.
 
@@ -109,16 +257,95 @@ def deletar_vendedor(codigo: int) -> None:
         codigo (int): O código identificador do vendedor a ser removido.
 
     Returns:
-        None
+        int | None: A quantidade de vendedores removidos (0 se o código não existir),
+                    ou None se ocorrer algum erro.
 
     Raises:
         Exception: Se ocorrer qualquer erro durante a operação, a exceção será capturada e registrada no log.
     """
     try:
-        with conectar() as conn:
-            cursor = conn.cursor()
-            cursor.execute("DELETE FROM vendedores WHERE codigo = ?", (codigo,))
-            conn.commit()
-            logging.info("Vendedor removido com sucesso.")
+        linhas = excluir_vendedor(codigo)
+        logging.info("Vendedor removido com sucesso.")
+        return linhas
     except Exception as e:
         logging.error(f"Erro ao deletar vendedor: {e}")
+
+
+def excluir_vendedor(codigo: int) -> int:
+    """
+    Executa a remoção de `deletar_vendedor()` sem tratar os erros.
+
+    Destinada à API (api.py), que distingue os vendedores inexistentes dos demais erros.
+
+    Args:
+        codigo (int): O código identificador do vendedor a ser removido.
+
+    Returns:
+        int: A quantidade de vendedores removidos (0 se o código não existir).
+
+    Raises:
+        sqlite3.IntegrityError: Se alguma restrição da tabela for violada.
+        Exception: Se ocorrer qualquer outro erro durante a operação.
+    """
+    return (
+        executar_escrita_com_resultado(
+            "DELETE FROM vendedores WHERE codigo = ?", (codigo,)
+        )
+        .result()
+        .linhas
+    )
+
+
+def atualizar_vendedores_em_lote(vendedores: list[tuple[int, str]]) -> int | None:
+    """
+    Atualiza o nome de vários vendedores em uma única transação.
+
+    As alterações são gravadas com um único `executemany`, utilizado pela edição em lote da
+    página de vendedores. Se alguma atualização falhar (ex: nome já cadastrado), nenhuma é gravada.
+
+    Args:
+        vendedores (list[tuple[int, str]]): Os vendedores alterados, como (codigo, nome).
+
+    Returns:
+        int | None: A quantidade de vendedores atualizados, ou None se ocorrer algum erro.
+
+    Raises:
+        Exception: Se ocorrer qualquer exceção durante a operação, ela será capturada e registrada no log.
+    """
+    try:
+        quantidade = executar_escrita_em_lote(
+            "UPDATE vendedores SET nome = ? WHERE codigo = ?",
+            [(nome, codigo) for codigo, nome in vendedores],
+        ).result()
+        logging.info(f"{quantidade} vendedores atualizados com sucesso.")
+        return quantidade
+    except Exception as e:
+        logging.error(f"Erro ao atualizar vendedores em lote: {e}")
+
+
+def deletar_vendedores_em_lote(codigos: list[int]) -> int | None:
+    """
+    Remove vários vendedores em uma única transação.
+
+    Os orçamentos dos vendedores também são removidos (ON DELETE CASCADE).
+    As exclusões são feitas com um único `executemany`, utilizado pela remoção dos registros
+    selecionados na página de vendedores. Se alguma exclusão falhar, nenhum registro é removido.
+
+    Args:
+        codigos (list[int]): Os códigos dos vendedores a serem removidos.
+
+    Returns:
+        int | None: A quantidade de vendedores removidos, ou None se ocorrer algum erro.
+
+    Raises:
+        Exception: Se ocorrer qualquer exceção durante a operação, ela será capturada e registrada no log.
+    """
+    try:
+        quantidade = executar_escrita_em_lote(
+            "DELETE FROM vendedores WHERE codigo = ?",
+            [(codigo,) for codigo in codigos],
+        ).result()
+        logging.info(f"{quantidade} vendedores removidos com sucesso.")
+        return quantidade
+    except Exception as e:
+        logging.error(f"Erro ao deletar vendedores em lote: {e}")
@@ -1,21 +1,34 @@
+import importlib
 import streamlit as st
-from services.banco_de_dados import criar_banco_de_dados
+from services.banco_de_dados import inicializar_banco_de_dados
 # from services.dados_fakers import cadastrar_dados_fakes
 from routes import mudar_pagina
-import pages.clientes as PageListarClientes
-import pages.produtos as PageListarProdutos
-import pages.vendedores as PageListarVendedores
-import pages.ofertas as PageListarOfertas
-import pages.orcamentos as PageListarOrcamentos
-import pages.orcamentos_cadastro as PageCadastrarOrcamentos
-import pages.relatorios as PageRelatorios
 from services.log import setup_logging
 
 st.set_page_config(page_title="Minas Brasil", page_icon="📈", layout="wide")
 
+# Página -> (módulo, função). O módulo só é importado quando a página é exibida pela primeira
+# vez no processo, para que o carregamento inicial não pague pelas dependências (ex: pandas)
+# das demais páginas.
+PAGINAS = {
+    "pagina_listar_clientes": ("pages.clientes", "pagina_listar_clientes"),
+    "pagina_listar_produtos": ("pages.produtos", "pagina_listar_produtos"),
+    "pagina_listar_vendedores": ("pages.vendedores", "pagina_listar_vendedores"),
+    "pagina_listar_ofertas": ("pages.ofertas", "pagina_listar_ofertas"),
+    "pagina_orcamentos": ("pages.orcamentos", "pagina_orcamentos"),
+    "pagina_cadastro_orcamentos": (
+        "pages.orcamentos_cadastro",
+        "pagina_cadastro_orcamentos",
+    ),
+    "pagina_relatorios": ("pages.relatorios", "pagina_relatorios"),
+    "pagina_rankings": ("pages.rankings", "pagina_rankings"),
+    "pagina_painel": ("pages.painel", "pagina_painel"),
+    "pagina_consultas": ("pages.consultas", "pagina_consultas"),
+}
+
 
 def init():
-    criar_banco_de_dados()
+    inicializar_banco_de_dados()
 
     if "pagina_atual" not in st.session_state:
         mudar_pagina("home")
@@ -73,29 +86,33 @@ def main():
         args=("pagina_relatorios",),
     )
 
-    if st.session_state.pagina_atual == "home":
-        home()
-
-    elif st.session_state.pagina_atual == "pagina_listar_clientes":
-        PageListarClientes.pagina_listar_clientes()
-
-    elif st.session_state.pagina_atual == "pagina_listar_produtos":
-        PageListarProdutos.pagina_listar_produtos()
-
-    elif st.session_state.pagina_atual == "pagina_listar_vendedores":
-        PageListarVendedores.pagina_listar_vendedores()
-
-    elif st.session_state.pagina_atual == "pagina_listar_ofertas":
-        PageListarOfertas.pagina_listar_ofertas()
+    st.sidebar.button(
+        "Rankings",
+        use_container_width=True,
+        on_click=mudar_pagina,
+        args=("pagina_rankings",),
+    )
 
-    elif st.session_state.pagina_atual == "pagina_orcamentos":
-        PageListarOrcamentos.pagina_orcamentos()
+    st.sidebar.button(
+        "Painel de Vendas",
+        use_container_width=True,
+        on_click=mudar_pagina,
+        args=("pagina_painel",),
+    )
 
-    elif st.session_state.pagina_atual == "pagina_cadastro_orcamentos":
-        PageCadastrarOrcamentos.pagina_cadastro_orcamentos()
+    st.sidebar.button(
+        "Consultas",
+        use_container_width=True,
+        on_click=mudar_pagina,
+        args=("pagina_consultas",),
+    )
 
-    elif st.session_state.pagina_atual == "pagina_relatorios":
-        PageRelatorios.pagina_relatorios()
+    pagina = PAGINAS.get(st.session_state.pagina_atual)
+    if pagina is None:
+        home()
+    else:
+        modulo, funcao = pagina
+        getattr(importlib.import_module(modulo), funcao)()
 
 
 if __name__ == "__main__":
@@ -1,11 +1,17 @@
 import streamlit as st
 from controllers.ClienteController import (
-    lista_de_clientes,
+    pagina_de_clientes,
     adicionar_cliente,
-    deletar_cliente,
-    atualizar_cliente,
+    atualizar_clientes_em_lote,
+    deletar_clientes_em_lote,
 )
 from routes import mudar_pagina
+from componentes.edicao_em_lote import descartar_edicao, tabela_em_lote
+from componentes.paginacao import (
+    TAMANHO_PAGINA,
+    controles_paginacao,
+    cursor_da_pagina,
+)
 
 
 @st.dialog("Cadastrar Cliente")
@@ -26,23 +32,6 @@ def cadastrar_cliente():
                 st.rerun()
 
 
-@st.dialog("Editar Cliente")
-def editar_cliente(cliente):
-    with st.form("form_editar", clear_on_submit=True):
-        campo_nome = st.text_input("Nome do cliente", value=cliente["nome"])
-
-        submitted = st.form_submit_button(label="Salvar", type="primary")
-
-        if submitted:
-            if campo_nome == "":
-                st.error("O campo 'Nome do cliente' não pode estar vazio.")
-                return
-
-            else:
-                atualizar_cliente(cliente["codigo"], campo_nome)
-                st.rerun()
-
-
 def pagina_listar_clientes():
 
     if st.button(
@@ -54,28 +43,49 @@ def pagina_listar_clientes():
 
     st.header("Listagem de Clientes", divider=True)
 
-    clientes = lista_de_clientes()
+    clientes, proximo = pagina_de_clientes(cursor_da_pagina("clientes"), TAMANHO_PAGINA)
 
     if not clientes:
         st.info("Não há clientes cadastrados")
     else:
-        col1, col2, col3 = st.columns([0.6, 0.2, 0.2])
-        col1.write("NOME")
-        col2.write("")
-        col3.write("")
-        for cliente in clientes:
-            col1, col2, col3 = st.columns([0.6, 0.2, 0.2])
-            col1.write(cliente["nome"])
-            if col2.button(
-                label="Editar",
-                key=f"editar_{cliente['codigo']}",
-                use_container_width=True,
-            ):
-                editar_cliente(cliente)
-            if col3.button(
-                label="Remover",
-                key=f"remover_{cliente['codigo']}",
-                use_container_width=True,
+        alterados, selecionados = tabela_em_lote(
+            "clientes",
+            clientes,
+            {"nome": st.column_config.TextColumn("Nome", required=True)},
+            editaveis=("nome",),
+        )
+
+        col1, col2 = st.columns(2)
+        if col1.button(
+            label=f"Salvar alterações ({len(alterados)})",
+            key="salvar_clientes",
+            disabled=not alterados,
+            use_container_width=True,
+        ):
+            if any(not (cliente["nome"] or "").strip() for cliente in alterados):
+                st.error("O campo 'Nome do cliente' não pode estar vazio.")
+            elif (
+                atualizar_clientes_em_lote(
+                    [(cliente["codigo"], cliente["nome"]) for cliente in alterados]
+                )
+                is None
             ):
-                deletar_cliente(cliente["codigo"])
+                st.error(
+                    "Não foi possível salvar as alterações. Verifique se há nomes repetidos."
+                )
+            else:
+                descartar_edicao("clientes")
+                st.rerun()
+        if col2.button(
+            label=f"Remover selecionados ({len(selecionados)})",
+            key="remover_clientes",
+            disabled=not selecionados,
+            use_container_width=True,
+        ):
+            if deletar_clientes_em_lote(selecionados) is None:
+                st.error("Não foi possível remover os clientes selecionados.")
+            else:
+                descartar_edicao("clientes")
                 st.rerun()
+
+    controles_paginacao("clientes", proximo, len(clientes))
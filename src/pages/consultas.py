@@ -0,0 +1,74 @@
+import streamlit as st
+import pandas as pd
+from services.instrumentacao import (
+    LIMITE_CONSULTA_LENTA_MS,
+    consultas_lentas,
+    estatisticas_consultas,
+    limpar_estatisticas_consultas,
+)
+
+
+ORDENACOES = {
+    "Tempo total": "total_ms",
+    "Tempo médio": "media_ms",
+    "Tempo máximo": "max_ms",
+    "Execuções": "execucoes",
+    "Linhas": "linhas",
+}
+
+
+def _origens(origens: dict) -> str:
+    return ", ".join(
+        f"{origem} ({quantidade})" for origem, quantidade in origens.items()
+    )
+
+
+def pagina_consultas():
+    st.header("Consultas ao Banco de Dados", divider=True)
+    st.caption(
+        "Estatísticas acumuladas por este processo desde a sua inicialização. "
+        f"Consultas a partir de {LIMITE_CONSULTA_LENTA_MS:.0f} ms são registradas como lentas."
+    )
+
+    col1, col2, col3 = st.columns(3)
+    with col1:
+        ordenacao = st.selectbox("Ordenar por", ORDENACOES)
+    with col2:
+        limite = st.number_input("Quantidade", min_value=1, max_value=500, value=20)
+    with col3:
+        if st.button("Limpar Estatísticas"):
+            limpar_estatisticas_consultas()
+
+    consultas = estatisticas_consultas(ORDENACOES[ordenacao], limite)
+    if not consultas:
+        st.info("Nenhuma consulta registrada.")
+    else:
+        df_consultas = pd.DataFrame(consultas)
+        df_consultas["origens"] = df_consultas["origens"].map(_origens)
+        st.dataframe(
+            df_consultas.drop(columns="histograma"),
+            column_config={
+                "sql": st.column_config.TextColumn("SQL", width="large"),
+                "execucoes": "Execuções",
+                "total_ms": st.column_config.NumberColumn("Total (ms)", format="%.1f"),
+                "media_ms": st.column_config.NumberColumn("Média (ms)", format="%.2f"),
+                "p95_ms": st.column_config.NumberColumn("p95 até (ms)"),
+                "max_ms": st.column_config.NumberColumn("Máximo (ms)", format="%.1f"),
+                "linhas": "Linhas",
+                "origens": "Origens",
+            },
+            use_container_width=True,
+            hide_index=True,
+        )
+
+    st.subheader("Consultas Lentas")
+    lentas = consultas_lentas()
+    if not lentas:
+        st.info("Nenhuma consulta lenta registrada.")
+
+    for consulta in lentas:
+        with st.expander(
+            f"{consulta['duracao_ms']:.1f} ms · {consulta['linhas']} linhas · {consulta['origem']}"
+        ):
+            st.code(consulta["sql"], language="sql")
+            st.text(consulta["plano"] or "Plano de execução indisponível.")
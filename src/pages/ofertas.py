@@ -1,19 +1,28 @@
 import streamlit as st
 from controllers.OfertasController import (
-    lista_de_ofertas,
+    pagina_de_ofertas,
     adicionar_oferta,
-    deletar_oferta,
     atualizar_oferta,
+    atualizar_ofertas_em_lote,
+    deletar_ofertas_em_lote,
+)
+from controllers.ProdutoController import buscar_produtos
+from componentes.busca import selecionar_com_busca
+from componentes.edicao_em_lote import descartar_edicao, tabela_em_lote
+from componentes.paginacao import (
+    TAMANHO_PAGINA,
+    controles_paginacao,
+    cursor_da_pagina,
 )
-from controllers.ProdutoController import lista_de_produtos
 
 
 @st.dialog("Cadastrar Oferta")
-def cadastrar_oferta(produtos_dict):
+def cadastrar_oferta():
+    produto = selecionar_com_busca(
+        "Produto", buscar_produtos, "descricao", chave="input_produto"
+    )
+
     with st.form("form_cadastrar", clear_on_submit=True):
-        produto_escolhido = st.selectbox(
-            "Selecione o Produto", list(produtos_dict.keys()), key="input_produto"
-        )
         quantidade_levar = st.number_input(
             "Quantidade a Levar", min_value=1, key="input_qtd_levar"
         )
@@ -24,27 +33,34 @@ def cadastrar_oferta(produtos_dict):
         submitted = st.form_submit_button(label="Salvar", type="primary")
 
         if submitted:
+            if produto is None:
+                st.error("Selecione um produto.")
+                return
+
             if quantidade_levar <= quantidade_pagar:
                 st.error(
                     "A quantidade a levar deve ser maior que a quantidade a pagar."
                 )
                 return
 
-            adicionar_oferta(
-                produtos_dict[produto_escolhido], quantidade_levar, quantidade_pagar
-            )
+            adicionar_oferta(produto["codigo"], quantidade_levar, quantidade_pagar)
             st.rerun()
 
 
 @st.dialog("Editar Oferta")
-def editar_oferta(produtos_dict, oferta):
-    with st.form("form_editar", clear_on_submit=True):
-        produto_escolhido = st.selectbox(
-            label="Produto",
-            options=list(produtos_dict.keys()),
-            index=list(produtos_dict.values()).index(oferta["produto_id"]),
-        )
+def editar_oferta(oferta):
+    produto = selecionar_com_busca(
+        "Produto",
+        buscar_produtos,
+        "descricao",
+        chave="input_produto_editar",
+        atual={
+            "codigo": oferta["produto_id"],
+            "descricao": oferta["produto_descricao"],
+        },
+    )
 
+    with st.form("form_editar", clear_on_submit=True):
         quantidade_levar = st.number_input(
             "Quantidade a Levar", min_value=1, value=oferta["quantidade_levar"]
         )
@@ -56,6 +72,10 @@ def editar_oferta(produtos_dict, oferta):
         submitted = st.form_submit_button(label="Salvar", type="primary")
 
         if submitted:
+            if produto is None:
+                st.error("Selecione um produto.")
+                return
+
             if quantidade_levar <= quantidade_pagar:
                 st.error(
                     "A quantidade a levar deve ser maior que a quantidade a pagar."
@@ -64,53 +84,100 @@ def editar_oferta(produtos_dict, oferta):
 
             atualizar_oferta(
                 oferta["codigo"],
-                produtos_dict[produto_escolhido],
+                produto["codigo"],
                 quantidade_levar,
                 quantidade_pagar,
             )
+            descartar_edicao("ofertas")
             st.rerun()
 
 
 def pagina_listar_ofertas():
-    produtos = lista_de_produtos()
-    produtos_dict = {produto["descricao"]: produto["codigo"] for produto in produtos}
-
     if st.button(
         label="Adicionar Oferta",
         key="btn_incluir",
         type="primary",
     ):
-        cadastrar_oferta(produtos_dict)
+        cadastrar_oferta()
 
     st.header("Listagem de Ofertas", divider=True)
 
-    ofertas = lista_de_ofertas()
+    ofertas, proximo = pagina_de_ofertas(cursor_da_pagina("ofertas"), TAMANHO_PAGINA)
 
     if not ofertas:
         st.info("Não há ofertas cadastrados")
     else:
-        col1, col2, col3, col4, col5 = st.columns(5)
-        col1.write("PRODUTO")
-        col2.write("QUANT. LEVAR")
-        col3.write("QUANT. PAGAR")
-        col4.write("")
-        col5.write("")
-        for oferta in ofertas:
-            col1, col2, col3, col4, col5 = st.columns(5)
-            col1.write(oferta["produto_descricao"])
-            col2.write(oferta["quantidade_levar"])
-            col3.write(oferta["quantidade_pagar"])
-
-            if col4.button(
-                label="Editar",
-                key=f"editar_{oferta['codigo']}",
-                use_container_width=True,
+        alterados, selecionados = tabela_em_lote(
+            "ofertas",
+            ofertas,
+            {
+                "produto_descricao": st.column_config.TextColumn("Produto"),
+                "quantidade_levar": st.column_config.NumberColumn(
+                    "Quant. levar", min_value=1, step=1, required=True
+                ),
+                "quantidade_pagar": st.column_config.NumberColumn(
+                    "Quant. pagar", min_value=1, step=1, required=True
+                ),
+            },
+            editaveis=("quantidade_levar", "quantidade_pagar"),
+        )
+
+        col1, col2, col3 = st.columns(3)
+        if col1.button(
+            label=f"Salvar alterações ({len(alterados)})",
+            key="salvar_ofertas",
+            disabled=not alterados,
+            use_container_width=True,
+        ):
+            # Valores vazios chegam como NaN, que falha em qualquer comparação.
+            if not all(
+                oferta["quantidade_levar"]
+                and oferta["quantidade_pagar"]
+                and oferta["quantidade_levar"] > oferta["quantidade_pagar"] >= 1
+                for oferta in alterados
             ):
-                editar_oferta(produtos_dict, oferta)
-            if col5.button(
-                label="Remover",
-                key=f"remover_{oferta['codigo']}",
-                use_container_width=True,
+                st.error(
+                    "A quantidade a levar deve ser maior que a quantidade a pagar."
+                )
+            elif (
+                atualizar_ofertas_em_lote(
+                    [
+                        (
+                            oferta["codigo"],
+                            int(oferta["quantidade_levar"]),
+                            int(oferta["quantidade_pagar"]),
+                        )
+                        for oferta in alterados
+                    ]
+                )
+                is None
             ):
-                deletar_oferta(oferta["codigo"])
+                st.error("Não foi possível salvar as alterações.")
+            else:
+                descartar_edicao("ofertas")
                 st.rerun()
+        # A troca do produto de uma oferta continua sendo feita pela caixa de busca.
+        if col2.button(
+            label="Trocar produto",
+            key="editar_oferta",
+            disabled=len(selecionados) != 1,
+            use_container_width=True,
+        ):
+            editar_oferta(
+                next(
+                    oferta for oferta in ofertas if oferta["codigo"] == selecionados[0]
+                )
+            )
+        if col3.button(
+            label=f"Remover selecionadas ({len(selecionados)})",
+            key="remover_ofertas",
+            disabled=not selecionados,
+            use_container_width=True,
+        ):
+            if deletar_ofertas_em_lote(selecionados) is None:
+                st.error("Não foi possível remover as ofertas selecionadas.")
+            else:
+                descartar_edicao("ofertas")
+                st.rerun()
+
+    controles_paginacao("ofertas", proximo, len(ofertas))
@@ -1,6 +1,16 @@
 import streamlit as st
-from controllers.OrcamentoController import lista_de_orcamentos, deletar_orcamento
+from controllers.OrcamentoController import (
+    pagina_de_orcamentos,
+    deletar_orcamentos_em_lote,
+)
 from routes import mudar_pagina
+from services.dinheiro import formatar_reais
+from componentes.edicao_em_lote import descartar_edicao, tabela_em_lote
+from componentes.paginacao import (
+    TAMANHO_PAGINA,
+    controles_paginacao,
+    cursor_da_pagina,
+)
 
 
 def pagina_orcamentos():
@@ -13,27 +23,42 @@ def pagina_orcamentos():
     )
     st.header("Listagem de Orcamentos", divider=True)
 
-    orcamentos = lista_de_orcamentos()
+    orcamentos, proximo = pagina_de_orcamentos(
+        cursor_da_pagina("orcamentos"), TAMANHO_PAGINA
+    )
 
     if not orcamentos:
         st.info("Não há orçamentos cadastrados")
     else:
-        col1, col2, col3, col4, col5 = st.columns(5)
-        col1.write("CLIENTE")
-        col2.write("VENDEDOR")
-        col3.write("VALOR DO ORÇAMENTO")
-        col4.write("DESCONTO")
+        _, selecionados = tabela_em_lote(
+            "orcamentos",
+            [
+                {
+                    "codigo": orcamento["codigo"],
+                    "nome_cliente": orcamento["nome_cliente"],
+                    "nome_vendedor": orcamento["nome_vendedor"],
+                    "valor": formatar_reais(orcamento["valor_itens_centavos"]),
+                    "desconto": formatar_reais(orcamento["desconto_centavos"]),
+                }
+                for orcamento in orcamentos
+            ],
+            {
+                "nome_cliente": st.column_config.TextColumn("Cliente"),
+                "nome_vendedor": st.column_config.TextColumn("Vendedor"),
+                "valor": st.column_config.TextColumn("Valor do orçamento"),
+                "desconto": st.column_config.TextColumn("Desconto"),
+            },
+        )
 
-        for orcamento in orcamentos:
-            col1, col2, col3, col4, col5 = st.columns(5)
-            col1.write(orcamento["nome_cliente"])
-            col2.write(orcamento["nome_vendedor"])
-            col3.write(f"R${orcamento['valor_itens']:.2f}")
-            col4.write(f"R${orcamento["desconto"]:.2f}")
-            if col5.button(
-                label="Remover",
-                key=f"remover_{orcamento['codigo']}",
-                use_container_width=True,
-            ):
-                deletar_orcamento(orcamento["codigo"])
+        if st.button(
+            label=f"Remover selecionados ({len(selecionados)})",
+            key="remover_orcamentos",
+            disabled=not selecionados,
+        ):
+            if deletar_orcamentos_em_lote(selecionados) is None:
+                st.error("Não foi possível remover os orçamentos selecionados.")
+            else:
+                descartar_edicao("orcamentos")
                 st.rerun()
+
+    controles_paginacao("orcamentos", proximo, len(orcamentos))
@@ -1,57 +1,40 @@
 import streamlit as st
 import pandas as pd
 from controllers.OrcamentoController import adicionar_orcamento
-from controllers.ProdutoController import lista_de_produtos
-from controllers.ClienteController import lista_de_clientes
-from controllers.VendedorController import lista_de_vendedores
-from controllers.OfertasController import lista_de_ofertas
+from controllers.ProdutoController import buscar_produtos
+from controllers.ClienteController import buscar_clientes
+from controllers.VendedorController import buscar_vendedores
+from controllers.OfertasController import pagina_de_ofertas
 from routes import mudar_pagina
-
-
-orcamento_produtos = []
+from services.dinheiro import formatar_reais
+from services.precificacao import precificar_carrinho
+from services.rascunhos import (
+    adicionar_item,
+    descartar_rascunho,
+    itens_do_rascunho,
+    rascunho_do_vendedor,
+)
+from componentes.busca import selecionar_com_busca
 
 
 # Função para adicionar produtos ao orçamento
 @st.dialog("Adicionar Produto ao Orçamento")
-def adicionar_produto(produtos_dict, ofertas_dict):
+def adicionar_produto(rascunho):
+    produto = selecionar_com_busca(
+        "Produto", buscar_produtos, "descricao", chave="produto_orcamento"
+    )
+
     with st.form("form_add_produto", clear_on_submit=True):
-        produto_escolhido = st.selectbox("Produto", list(produtos_dict.keys()))
         quantidade = st.number_input("Quantidade", min_value=1, step=1)
 
         submitted = st.form_submit_button(label="Adicionar", type="primary")
 
         if submitted:
-            produto = produtos_dict[produto_escolhido]
-            preco_unitario = produto["preco"]
-            total = preco_unitario * quantidade
-
-            # Verifica se existe uma oferta para esse produto
-            desconto = 0
-            if produto["codigo"] in ofertas_dict:
-                oferta = ofertas_dict[produto["codigo"]]
-                qtd_levar = oferta["quantidade_levar"]
-                qtd_pagar = oferta["quantidade_pagar"]
-
-                # Calcula a quantidade de grupos da oferta
-                grupos = quantidade // qtd_levar
-                restante = quantidade % qtd_levar
-
-                # Preço real baseado na oferta
-                total = (grupos * qtd_pagar * preco_unitario) + (
-                    restante * preco_unitario
-                )
-                desconto = grupos * (qtd_levar - qtd_pagar) * preco_unitario
-
-            orcamento_produtos.append(
-                {
-                    "Código": produto["codigo"],
-                    "Produto": produto["descricao"],
-                    "Quantidade": quantidade,
-                    "Preço Unitário": f"R$ {preco_unitario:.2f}",
-                    "Desconto": f"R$ {desconto:.2f}",
-                    "Total": f"R$ {total:.2f}",
-                }
-            )
+            if produto is None:
+                st.error("Selecione um produto.")
+                return
+
+            adicionar_item(rascunho, produto["codigo"], quantidade)
             st.rerun()
 
 
@@ -66,74 +49,103 @@ def pagina_cadastro_orcamentos():
     # Interface de seleção de vendedor e cliente
     st.header("Criar Orçamento", divider=True)
     # Obtendo dados do banco
-    clientes = lista_de_clientes()
-    vendedores = lista_de_vendedores()
-    produtos = lista_de_produtos()
-    ofertas = lista_de_ofertas()
-
-    if not clientes or not vendedores or not produtos or not ofertas:
+    possui_clientes = bool(buscar_clientes("", 1))
+    possui_vendedores = bool(buscar_vendedores("", 1))
+    possui_produtos = bool(buscar_produtos("", 1))
+    possui_ofertas = bool(pagina_de_ofertas(None, 1)[0])
+
+    if (
+        not possui_clientes
+        or not possui_vendedores
+        or not possui_produtos
+        or not possui_ofertas
+    ):
         st.info(
             "Faltam dados essenciais. Cadastre clientes, vendedores, produtos e ofertas antes de continuar."
         )
     else:
+        col1, col2 = st.columns(2)
+        with col1:
+            vendedor = selecionar_com_busca(
+                "Vendedor", buscar_vendedores, "nome", chave="vendedor"
+            )
+        with col2:
+            cliente = selecionar_com_busca(
+                "Cliente", buscar_clientes, "nome", chave="cliente"
+            )
 
-        # Criando dicionários para facilitar buscas
-        clientes_dict = {cliente["nome"]: cliente["codigo"] for cliente in clientes}
-        vendedores_dict = {
-            vendedor["nome"]: vendedor["codigo"] for vendedor in vendedores
-        }
-        produtos_dict = {produto["descricao"]: produto for produto in produtos}
-
-        # Criando dicionário de ofertas
-        ofertas_dict = {}
-        for oferta in ofertas:
-            ofertas_dict[oferta["produto_id"]] = {
-                "quantidade_levar": oferta["quantidade_levar"],
-                "quantidade_pagar": oferta["quantidade_pagar"],
-            }
-
-        vendedor_nome = st.selectbox(
-            "Selecione o Vendedor", list(vendedores_dict.keys()), key="vendedor"
-        )
-        cliente_nome = st.selectbox(
-            "Selecione o Cliente", list(clientes_dict.keys()), key="cliente"
-        )
+        if vendedor is None:
+            st.stop()
+
+        # O rascunho pertence ao vendedor: é recuperado ao selecioná-lo novamente, mesmo em
+        # outra sessão ou após reiniciar a aplicação.
+        rascunho = rascunho_do_vendedor(vendedor["codigo"])
+        st.caption(f"Rascunho do orçamento de {vendedor['nome']}.")
+
+        if cliente is None:
+            st.stop()
 
         # Regra: Vendedor não pode ser cliente ao mesmo tempo
-        if vendedor_nome == cliente_nome:
+        if vendedor["nome"] == cliente["nome"]:
             st.error("O vendedor não pode ser o mesmo que o cliente!")
             st.stop()
 
         # Botão para adicionar produtos
         if st.button("Adicionar Produto", type="primary"):
-            adicionar_produto(produtos_dict, ofertas_dict)
+            adicionar_produto(rascunho)
 
-        # Exibe produtos adicionados ao orçamento
+        # Exibe produtos adicionados ao orçamento, com os preços e ofertas atuais
         st.subheader("Itens do Orçamento")
+        try:
+            orcamento_produtos = precificar_carrinho(itens_do_rascunho(rascunho))
+        except ValueError as e:
+            # Ex: um produto do rascunho foi removido do cadastro.
+            st.error(str(e))
+            if st.button("Descartar Orçamento"):
+                descartar_rascunho(rascunho)
+                st.rerun()
+            return
+
         if not orcamento_produtos:
             st.info("Nenhum produto adicionado ainda.")
         else:
-            df_orcamento = pd.DataFrame(orcamento_produtos)
+            df_orcamento = pd.DataFrame(
+                [
+                    {
+                        "Código": item.produto_id,
+                        "Produto": item.descricao,
+                        "Quantidade": item.quantidade,
+                        "Preço Unitário": formatar_reais(item.preco_unitario_centavos),
+                        "Desconto": formatar_reais(item.desconto_centavos),
+                        "Total": formatar_reais(item.total_centavos),
+                    }
+                    for item in orcamento_produtos
+                ]
+            )
             st.dataframe(df_orcamento, hide_index=True, use_container_width=True)
 
-            total_final = sum(
-                float(produto["Total"].replace("R$", "").strip())
-                for produto in orcamento_produtos
-            )
-            st.markdown(f"### Total do Orçamento: R$ {total_final:.2f}")
+            total_final = sum(item.total_centavos for item in orcamento_produtos)
+            st.markdown(f"### Total do Orçamento: {formatar_reais(total_final)}")
 
             # Botão para salvar o orçamento no banco de dados
             if st.button("Salvar Orçamento", type="primary"):
-                if vendedor_nome == cliente_nome:
+                if vendedor["nome"] == cliente["nome"]:
                     st.warning("O vendedor não pode ser cliente ao mesmo tempo.")
                     return
+                codigo = adicionar_orcamento(
+                    cliente_id=cliente["codigo"],
+                    vendedor_id=vendedor["codigo"],
+                    itens=orcamento_produtos,
+                )
+                if codigo is None:
+                    # O rascunho é mantido, para que o orçamento possa ser salvo novamente.
+                    st.error("Não foi possível salvar o orçamento. Tente novamente.")
                 else:
-                    adicionar_orcamento(
-                        cliente_id=clientes_dict[cliente_nome],
-                        vendedor_id=vendedores_dict[vendedor_nome],
-                        itens=orcamento_produtos,
-                    )
-                    orcamento_produtos.clear()
+                    descartar_rascunho(rascunho)
                     st.success("Orçamento salvo com sucesso!")
                     mudar_pagina("pagina_orcamentos")
                     st.rerun()
+
+            if st.button("Descartar Orçamento"):
+                descartar_rascunho(rascunho)
+                st.rerun()
@@ -0,0 +1,159 @@
+import streamlit as st
+from controllers.ClienteController import lista_de_clientes
+from controllers.CuboController import DIMENSOES_CUBO, LIMITE_CUBO, consultar_cubo
+from controllers.ProdutoController import lista_de_produtos
+from controllers.VendedorController import lista_de_vendedores
+from services.datas import mes_de
+from services.dinheiro import formatar_reais, para_reais
+from datetime import date
+
+
+TITULOS = {
+    "mes": "Mês",
+    "produto": "Produto",
+    "vendedor": "Vendedor",
+    "cliente": "Cliente",
+}
+
+# Dimensão -> (argumento de `consultar_cubo()`, função que lista os registros, campo do nome).
+FILTROS = {
+    "produto": ("produtos", lista_de_produtos, "descricao"),
+    "vendedor": ("vendedores", lista_de_vendedores, "nome"),
+    "cliente": ("clientes", lista_de_clientes, "nome"),
+}
+
+
+def _formatar_mes(mes: int) -> str:
+    return f"{mes // 100}-{mes % 100:02d}"
+
+
+def selecionar_membros(dimensao: str) -> tuple:
+    _, listar, campo = FILTROS[dimensao]
+    nomes = {registro["codigo"]: registro[campo] for registro in listar() or []}
+    return tuple(
+        st.multiselect(
+            TITULOS[dimensao],
+            nomes,
+            format_func=nomes.get,
+            placeholder="Todos",
+            key=f"painel_{dimensao}",
+        )
+    )
+
+
+def descrever_linha(linha: dict, agrupar_por: list) -> str:
+    return " · ".join(
+        _formatar_mes(linha["mes"]) if dimensao == "mes" else str(linha[dimensao])
+        for dimensao in agrupar_por
+    )
+
+
+def exibir_cubo(linhas: list, agrupar_por: list, chave: str) -> int | None:
+    # Retorna a posição da linha selecionada, ou None.
+    exibicao = [
+        {
+            **{
+                TITULOS[dimensao]: (
+                    _formatar_mes(linha["mes"])
+                    if dimensao == "mes"
+                    else linha[dimensao]
+                )
+                for dimensao in agrupar_por
+            },
+            "Quantidade": linha["quantidade"],
+            "Itens": linha["itens"],
+            "Valor Bruto": para_reais(linha["valor_bruto_centavos"]),
+            "Desconto": para_reais(linha["desconto_centavos"]),
+            "Valor Líquido": para_reais(linha["valor_liquido_centavos"]),
+        }
+        for linha in linhas
+    ]
+    selecao = st.dataframe(
+        exibicao,
+        column_config={
+            coluna: st.column_config.NumberColumn(format="R$ %.2f")
+            for coluna in ("Valor Bruto", "Desconto", "Valor Líquido")
+        },
+        use_container_width=True,
+        hide_index=True,
+        on_select="rerun",
+        selection_mode="single-row",
+        key=chave,
+    )
+    linhas_selecionadas = selecao.selection.rows
+    if linhas_selecionadas and linhas_selecionadas[0] < len(linhas):
+        return linhas_selecionadas[0]
+    return None
+
+
+def pagina_painel():
+    st.header("Painel de Vendas", divider=True)
+    st.caption(
+        "Os totais são lidos do cubo de vendas (mês x produto x vendedor x cliente). "
+        "O período considera meses inteiros."
+    )
+
+    col1, col2 = st.columns(2)
+    with col1:
+        data_inicio = st.date_input(
+            "Mês Início",
+            value=date.today().replace(month=1, day=1),
+            key="inicio_painel",
+        )
+    with col2:
+        data_fim = st.date_input("Mês Fim", value=date.today(), key="fim_painel")
+
+    col1, col2, col3 = st.columns(3)
+    filtros = {"mes_inicio": mes_de(data_inicio), "mes_fim": mes_de(data_fim)}
+    for coluna, dimensao in zip((col1, col2, col3), FILTROS):
+        with coluna:
+            filtros[FILTROS[dimensao][0]] = selecionar_membros(dimensao)
+
+    totais = consultar_cubo((), **filtros)
+    if totais:
+        col1, col2, col3, col4 = st.columns(4)
+        col1.metric(
+            "Valor Líquido", formatar_reais(totais[0]["valor_liquido_centavos"])
+        )
+        col2.metric("Descontos", formatar_reais(totais[0]["desconto_centavos"]))
+        col3.metric("Quantidade", totais[0]["quantidade"])
+        col4.metric("Itens", totais[0]["itens"])
+
+    # Roll-up: a tabela agrupa pelas dimensões escolhidas, na ordem escolhida.
+    agrupar_por = st.multiselect(
+        "Agrupar por", DIMENSOES_CUBO, default=["mes"], format_func=TITULOS.get
+    )
+    if not agrupar_por:
+        st.info("Selecione ao menos uma dimensão para agrupar os totais.")
+        return
+
+    linhas = consultar_cubo(tuple(agrupar_por), **filtros)
+    if not linhas:
+        st.info("Nenhuma venda encontrada para os filtros selecionados.")
+        return
+    if len(linhas) == LIMITE_CUBO:
+        st.caption(f"Exibindo as {LIMITE_CUBO} primeiras linhas.")
+
+    posicao = exibir_cubo(linhas, agrupar_por, f"painel_{'_'.join(agrupar_por)}")
+
+    # Drill-down: a linha selecionada é detalhada por uma das demais dimensões.
+    restantes = [dimensao for dimensao in DIMENSOES_CUBO if dimensao not in agrupar_por]
+    if not restantes:
+        return
+    if posicao is None:
+        st.info("Selecione uma linha para detalhá-la por outra dimensão.")
+        return
+
+    linha = linhas[posicao]
+    st.subheader(f"Detalhamento de {descrever_linha(linha, agrupar_por)}")
+    dimensao = st.selectbox("Detalhar por", restantes, format_func=TITULOS.get)
+
+    filtros_linha = dict(filtros)
+    for agrupada in agrupar_por:
+        if agrupada == "mes":
+            filtros_linha["mes_inicio"] = filtros_linha["mes_fim"] = linha["mes"]
+        else:
+            filtros_linha[FILTROS[agrupada][0]] = (linha[DIMENSOES_CUBO[agrupada][0]],)
+
+    detalhes = consultar_cubo((dimensao,), **filtros_linha)
+    exibir_cubo(detalhes, [dimensao], f"painel_detalhe_{dimensao}")
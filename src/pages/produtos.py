@@ -1,11 +1,18 @@
 import streamlit as st
 from controllers.ProdutoController import (
-    lista_de_produtos,
+    pagina_de_produtos,
     adicionar_produto,
-    deletar_produto,
-    atualizar_produto,
+    atualizar_produtos_em_lote,
+    deletar_produtos_em_lote,
 )
 from routes import mudar_pagina
+from services.dinheiro import para_centavos, para_reais
+from componentes.edicao_em_lote import descartar_edicao, tabela_em_lote
+from componentes.paginacao import (
+    TAMANHO_PAGINA,
+    controles_paginacao,
+    cursor_da_pagina,
+)
 
 
 @st.dialog("Cadastrar Produto")
@@ -33,37 +40,11 @@ def cadastrar_produto():
                 return
 
             else:
-                adicionar_produto(descricao_produto, preco_produto)
+                adicionar_produto(descricao_produto, para_centavos(preco_produto))
                 mudar_pagina("pagina_listar_produtos")
                 st.rerun()
 
 
-@st.dialog("Editar Produto")
-def editar_produto(produto):
-    with st.form("form_editar", clear_on_submit=True):
-        campo_descricao = st.text_input(
-            "Descrição do produto", value=produto["descricao"]
-        )
-        campo_preco = st.number_input(
-            "Preço do produto", value=float(produto["preco"]), step=0.01
-        )
-
-        submitted = st.form_submit_button(label="Salvar", type="primary")
-
-        if submitted:
-            if campo_descricao == "":
-                st.error("O campo 'Descrição do Produto' não pode estar vazio.")
-                return
-
-            elif float(campo_preco) <= 0:
-                st.error("O campo 'Preço do Produto' não pode ser zero.")
-                return
-
-            else:
-                atualizar_produto(produto["codigo"], campo_descricao, campo_preco)
-                st.rerun()
-
-
 def pagina_listar_produtos():
 
     if st.button(
@@ -75,32 +56,74 @@ def pagina_listar_produtos():
 
     st.header("Listagem de Produtos", divider=True)
 
-    produtos = lista_de_produtos()
+    produtos, proximo = pagina_de_produtos(cursor_da_pagina("produtos"), TAMANHO_PAGINA)
 
     if not produtos:
         st.info("Não há produtos cadastrados")
     else:
-        col1, col2, col3, col4, col5 = st.columns([0.1, 0.3, 0.2, 0.2, 0.2])
-        col1.write("CÓDIGO")
-        col2.write("DESCRIÇÃO")
-        col3.write("PREÇO")
-        col4.write("")
-        col5.write("")
-        for produto in produtos:
-            col1, col2, col3, col4, col5 = st.columns([0.1, 0.3, 0.2, 0.2, 0.2])
-            col1.write(produto["codigo"])
-            col2.write(produto["descricao"])
-            col3.write(f"R${produto["preco"]}")
-            if col4.button(
-                label="Editar",
-                key=f"editar_{produto['codigo']}",
-                use_container_width=True,
+        # O preço é editado em reais e convertido de volta para centavos ao salvar.
+        alterados, selecionados = tabela_em_lote(
+            "produtos",
+            [
+                {
+                    "codigo": produto["codigo"],
+                    "descricao": produto["descricao"],
+                    "preco": para_reais(produto["preco_centavos"]),
+                }
+                for produto in produtos
+            ],
+            {
+                "codigo": st.column_config.NumberColumn("Código"),
+                "descricao": st.column_config.TextColumn("Descrição", required=True),
+                "preco": st.column_config.NumberColumn(
+                    "Preço", min_value=0.01, step=0.01, format="R$ %.2f", required=True
+                ),
+            },
+            editaveis=("descricao", "preco"),
+        )
+
+        col1, col2 = st.columns(2)
+        if col1.button(
+            label=f"Salvar alterações ({len(alterados)})",
+            key="salvar_produtos",
+            disabled=not alterados,
+            use_container_width=True,
+        ):
+            if any(not (produto["descricao"] or "").strip() for produto in alterados):
+                st.error("O campo 'Descrição do Produto' não pode estar vazio.")
+            elif any(
+                not (produto["preco"] and produto["preco"] > 0) for produto in alterados
             ):
-                editar_produto(produto)
-            if col5.button(
-                label="Remover",
-                key=f"remover_{produto['codigo']}",
-                use_container_width=True,
+                st.error("O campo 'Preço do Produto' não pode ser zero.")
+            elif (
+                atualizar_produtos_em_lote(
+                    [
+                        (
+                            produto["codigo"],
+                            produto["descricao"],
+                            para_centavos(produto["preco"]),
+                        )
+                        for produto in alterados
+                    ]
+                )
+                is None
             ):
-                deletar_produto(produto["codigo"])
+                st.error(
+                    "Não foi possível salvar as alterações. Verifique se há descrições repetidas."
+                )
+            else:
+                descartar_edicao("produtos")
                 st.rerun()
+        if col2.button(
+            label=f"Remover selecionados ({len(selecionados)})",
+            key="remover_produtos",
+            disabled=not selecionados,
+            use_container_width=True,
+        ):
+            if deletar_produtos_em_lote(selecionados) is None:
+                st.error("Não foi possível remover os produtos selecionados.")
+            else:
+                descartar_edicao("produtos")
+                st.rerun()
+
+    controles_paginacao("produtos", proximo, len(produtos))
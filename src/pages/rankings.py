@@ -0,0 +1,90 @@
+import streamlit as st
+from controllers.RankingController import (
+    LIMITE_RANKING,
+    ranking_de_clientes,
+    ranking_de_produtos,
+    ranking_de_vendedores,
+)
+from services.dinheiro import para_reais
+from datetime import date
+
+
+CRITERIOS = {
+    "Valor líquido": "valor_liquido",
+    "Quantidade": "quantidade",
+    "Desconto concedido": "desconto",
+}
+
+RANKINGS = {
+    "Produtos mais vendidos": (ranking_de_produtos, "Produto"),
+    "Melhores vendedores": (ranking_de_vendedores, "Vendedor"),
+    "Maiores clientes": (ranking_de_clientes, "Cliente"),
+}
+
+
+def exibir_ranking(ranking: list, titulo_nome: str) -> None:
+    if not ranking:
+        st.info("Nenhuma venda encontrada no período.")
+        return
+
+    # Os valores são convertidos de centavos para reais apenas na exibição.
+    linhas = [
+        {
+            "posicao": posicao,
+            "nome": linha["nome"],
+            "quantidade": linha["quantidade"],
+            "valor_bruto": para_reais(linha["valor_bruto_centavos"]),
+            "desconto": para_reais(linha["desconto_centavos"]),
+            "valor_liquido": para_reais(linha["valor_liquido_centavos"]),
+        }
+        for posicao, linha in enumerate(ranking, start=1)
+    ]
+    st.dataframe(
+        linhas,
+        column_config={
+            "posicao": "Posição",
+            "nome": titulo_nome,
+            "quantidade": "Quantidade",
+            "valor_bruto": st.column_config.NumberColumn(
+                "Valor Bruto", format="R$ %.2f"
+            ),
+            "desconto": st.column_config.NumberColumn("Desconto", format="R$ %.2f"),
+            "valor_liquido": st.column_config.NumberColumn(
+                "Valor Líquido", format="R$ %.2f"
+            ),
+        },
+        use_container_width=True,
+        hide_index=True,
+    )
+
+
+def pagina_rankings():
+    st.header("Rankings de Vendas", divider=True)
+
+    col1, col2, col3, col4 = st.columns(4)
+    with col1:
+        data_inicio = st.date_input(
+            "Data Início", value=date.today().replace(day=1), key="inicio_rankings"
+        )
+    with col2:
+        data_fim = st.date_input("Data Fim", value=date.today(), key="fim_rankings")
+    with col3:
+        criterio = st.selectbox("Classificar por", CRITERIOS)
+    with col4:
+        limite = st.number_input(
+            "Posições", min_value=1, max_value=100, value=LIMITE_RANKING
+        )
+
+    # Cada ranking é calculado no banco de dados, que mantém apenas as primeiras posições.
+    abas = st.tabs(list(RANKINGS))
+    for aba, (funcao, titulo_nome) in zip(abas, RANKINGS.values()):
+        with aba:
+            exibir_ranking(
+                funcao(
+                    data_inicio.isoformat(),
+                    data_fim.isoformat(),
+                    CRITERIOS[criterio],
+                    int(limite),
+                ),
+                titulo_nome,
+            )
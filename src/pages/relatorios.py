@@ -1,7 +1,114 @@
 import streamlit as st
-from controllers.ProdutoController import lista_de_produtos
-from controllers.OrcamentoController import gerar_relatorio
+import pandas as pd
+from controllers.ProdutoController import buscar_produtos
+from componentes.busca import selecionar_com_busca
+from controllers.OrcamentoController import itens_do_orcamento
+from services.cache_colunar import relatorio_colunar
+from services.dinheiro import formatar_reais
+from services.exportacao import FORMATOS, exportar_relatorio
+from services.tarefas_relatorio import (
+    enviar_relatorio,
+    resultado_do_relatorio,
+    situacao_do_relatorio,
+)
 from datetime import date
+import os
+import tempfile
+
+
+def _em_reais(df):
+    # Converte as colunas em centavos para reais apenas na exibição.
+    colunas = [coluna for coluna in df.columns if coluna.endswith("_centavos")]
+    exibicao = df.copy()
+    exibicao[colunas] = exibicao[colunas] / 100
+    exibicao = exibicao.rename(columns=lambda coluna: coluna.removesuffix("_centavos"))
+    formato = {
+        coluna.removesuffix("_centavos"): st.column_config.NumberColumn(
+            format="R$ %.2f"
+        )
+        for coluna in colunas
+    }
+    return exibicao, formato
+
+
+def preparar_exportacao(
+    formato: str, data_inicio: str, data_fim: str, produto_codigo: int
+) -> None:
+    # O relatório é gravado em blocos em um arquivo temporário, sem montar um DataFrame.
+    anterior = st.session_state.pop("exportacao_relatorio", None)
+    if anterior is not None and os.path.exists(anterior["caminho"]):
+        os.remove(anterior["caminho"])
+
+    with tempfile.NamedTemporaryFile(suffix=f".{formato}", delete=False) as arquivo:
+        linhas = exportar_relatorio(
+            arquivo, formato, data_inicio, data_fim, produto_codigo
+        )
+
+    if linhas is None:
+        os.remove(arquivo.name)
+        st.error("Não foi possível exportar o relatório.")
+    else:
+        st.session_state["exportacao_relatorio"] = {
+            "caminho": arquivo.name,
+            "formato": formato,
+            "linhas": linhas,
+        }
+
+
+def baixar_exportacao() -> None:
+    exportacao = st.session_state.get("exportacao_relatorio")
+    if exportacao is None or not os.path.exists(exportacao["caminho"]):
+        return
+
+    with open(exportacao["caminho"], "rb") as arquivo:
+        st.download_button(
+            label=f"Baixar ({exportacao['linhas']} linhas)",
+            data=arquivo,
+            file_name=f"relatorio.{exportacao['formato']}",
+            mime=(
+                "text/csv"
+                if exportacao["formato"] == "csv"
+                else "application/vnd.apache.parquet"
+            ),
+        )
+
+
+@st.fragment(run_every=1)
+def acompanhar_relatorio(chave: str) -> None:
+    # Atualiza apenas o progresso; ao terminar, a página inteira é executada novamente.
+    situacao = situacao_do_relatorio(chave)
+    if situacao is None or situacao["situacao"] in ("concluida", "erro"):
+        st.rerun()
+
+    st.progress(
+        situacao["progresso"],
+        text=f"{situacao['etapa']}... ({situacao['segundos']:.0f}s)",
+    )
+
+
+def carregar_relatorio(relatorio: dict) -> bool:
+    # Retorna True quando o resultado da tarefa estiver disponível em `relatorio`.
+    if "resumo" in relatorio:
+        return True
+
+    situacao = situacao_do_relatorio(relatorio["chave"])
+    if situacao is None:
+        st.warning("O relatório expirou. Gere o relatório novamente.")
+        return False
+    if situacao["situacao"] == "erro":
+        st.error("Não foi possível gerar o relatório.")
+        return False
+    if situacao["situacao"] != "concluida":
+        acompanhar_relatorio(relatorio["chave"])
+        return False
+
+    resultado = resultado_do_relatorio(relatorio["chave"])
+    if resultado is None:
+        st.error("Não foi possível carregar o relatório.")
+        return False
+
+    relatorio.update(resultado)
+    return True
 
 
 def pagina_relatorios():
@@ -14,35 +121,97 @@ def pagina_relatorios():
     with col2:
         data_fim = st.date_input("Data Fim", value=date.today())
     with col3:
-        produtos = lista_de_produtos()
-        if produtos:
-            opcoes_produto = {"Todos": -1}
-            for produto in produtos:
-                opcoes_produto[produto["descricao"]] = produto["codigo"]
-
-            produto_selecionado = st.selectbox("Produto", list(opcoes_produto.keys()))
-            produto_codigo = opcoes_produto[produto_selecionado]
+        produto = selecionar_com_busca(
+            "Produto",
+            buscar_produtos,
+            "descricao",
+            chave="produto_relatorio",
+            atual={"codigo": -1, "descricao": "Todos"},
+        )
+        produto_codigo = produto["codigo"] if produto is not None else -1
     with col4:
         botao_gerar_relatorio = st.button("Gerar Relatório")
-        
-    if botao_gerar_relatorio:
-        df = gerar_relatorio(data_inicio.isoformat(), data_fim.isoformat(), produto_codigo)
+        formato = st.radio(
+            "Exportar como", FORMATOS, format_func=str.upper, horizontal=True
+        )
+        if st.button("Exportar Relatório"):
+            preparar_exportacao(
+                formato, data_inicio.isoformat(), data_fim.isoformat(), produto_codigo
+            )
+        baixar_exportacao()
 
-        if df.empty:
-            st.info("Nenhum orçamento encontrado para os filtros selecionados.")
+    if botao_gerar_relatorio:
+        # Com o cache colunar carregado, o relatório é calculado em milissegundos, aqui mesmo.
+        resultado = relatorio_colunar(
+            data_inicio.isoformat(), data_fim.isoformat(), produto_codigo
+        )
+        if resultado is not None:
+            st.session_state["relatorio"] = {
+                **resultado,
+                "produto_codigo": produto_codigo,
+            }
         else:
-            df_orcamento = (
-                df.groupby(["orcamento_id", "nome_cliente", "nome_vendedor", "data_criacao"])["total_item"]
-                .sum()
-                .reset_index()
-                .rename(columns={"total_item": "total_orcamento"})
+            # Caso contrário, o relatório é gerado em segundo plano (carregando o cache) e a
+            # página acompanha o andamento da tarefa.
+            chave = enviar_relatorio(
+                data_inicio.isoformat(), data_fim.isoformat(), produto_codigo
             )
+            if chave is None:
+                st.error("Não foi possível gerar o relatório.")
+                st.session_state.pop("relatorio", None)
+            else:
+                st.session_state["relatorio"] = {
+                    "chave": chave,
+                    "produto_codigo": produto_codigo,
+                }
+
+    relatorio = st.session_state.get("relatorio")
+    if relatorio is None or not carregar_relatorio(relatorio):
+        return
 
-            st.subheader("Totalização por Orçamento")
-            st.dataframe(df_orcamento, use_container_width=True)
-            
-            total_geral = df_orcamento["total_orcamento"].sum()
-            st.markdown(f"### Total Geral dos Orçamentos: R$ {total_geral:.2f}")
-            
-            st.subheader("Itens dos Orçamentos")
-            st.dataframe(df, use_container_width=True)
\ No newline at end of file
+    df_orcamento = relatorio["resumo"]
+    if df_orcamento.empty:
+        st.info("Nenhum orçamento encontrado para os filtros selecionados.")
+    else:
+        st.subheader("Totalização por Produto")
+        exibicao, formato = _em_reais(relatorio["produtos"].drop(columns="produto_id"))
+        st.dataframe(
+            exibicao,
+            column_config=formato,
+            use_container_width=True,
+            hide_index=True,
+        )
+
+        st.subheader("Totalização por Orçamento")
+        exibicao, formato = _em_reais(df_orcamento)
+        selecao = st.dataframe(
+            exibicao,
+            column_config=formato,
+            use_container_width=True,
+            hide_index=True,
+            on_select="rerun",
+            selection_mode="single-row",
+            key="tabela_resumo_relatorio",
+        )
+
+        st.markdown(
+            f"### Total Geral dos Orçamentos: {formatar_reais(relatorio['total_geral'])}"
+        )
+
+        # Os itens são carregados apenas para o orçamento selecionado.
+        st.subheader("Itens do Orçamento")
+        linhas_selecionadas = selecao.selection.rows
+        if not linhas_selecionadas:
+            st.info("Selecione um orçamento para ver os seus itens.")
+        else:
+            orcamento_id = int(
+                df_orcamento.iloc[linhas_selecionadas[0]]["orcamento_id"]
+            )
+            itens = itens_do_orcamento(orcamento_id, relatorio["produto_codigo"])
+            exibicao, formato = _em_reais(pd.DataFrame(itens))
+            st.dataframe(
+                exibicao,
+                column_config=formato,
+                use_container_width=True,
+                hide_index=True,
+            )
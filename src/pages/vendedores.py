@@ -1,11 +1,17 @@
 import streamlit as st
 from controllers.VendedorController import (
-    lista_de_vendedores,
+    pagina_de_vendedores,
     adicionar_vendedor,
-    deletar_vendedor,
-    atualizar_vendedor,
+    atualizar_vendedores_em_lote,
+    deletar_vendedores_em_lote,
 )
 from routes import mudar_pagina
+from componentes.edicao_em_lote import descartar_edicao, tabela_em_lote
+from componentes.paginacao import (
+    TAMANHO_PAGINA,
+    controles_paginacao,
+    cursor_da_pagina,
+)
 
 
 @st.dialog("Cadastrar Vendedor")
@@ -28,23 +34,6 @@ def cadastrar_vendedor():
                 st.rerun()
 
 
-@st.dialog("Editar Vendedor")
-def editar_vendedor(vendedor):
-    with st.form("form_editar", clear_on_submit=True):
-        campo_nome = st.text_input("Nome do vendedor", value=vendedor["nome"])
-
-        submitted = st.form_submit_button(label="Salvar", type="primary")
-
-        if submitted:
-            if campo_nome == "":
-                st.error("O campo 'Nome do vendedor' não pode estar vazio.")
-                return
-
-            else:
-                atualizar_vendedor(vendedor["codigo"], campo_nome)
-                st.rerun()
-
-
 def pagina_listar_vendedores():
 
     if st.button(
@@ -56,28 +45,51 @@ def pagina_listar_vendedores():
 
     st.header("Listagem de Vendedores", divider=True)
 
-    vendedores = lista_de_vendedores()
+    vendedores, proximo = pagina_de_vendedores(
+        cursor_da_pagina("vendedores"), TAMANHO_PAGINA
+    )
 
     if not vendedores:
         st.info("Não há vendedores cadastrados")
     else:
-        col1, col2, col3 = st.columns([0.6, 0.2, 0.2])
-        col1.write("NOME")
-        col2.write("")
-        col3.write("")
-        for vendedor in vendedores:
-            col1, col2, col3 = st.columns([0.6, 0.2, 0.2])
-            col1.write(vendedor["nome"])
-            if col2.button(
-                label="Editar",
-                key=f"editar_{vendedor['codigo']}",
-                use_container_width=True,
-            ):
-                editar_vendedor(vendedor)
-            if col3.button(
-                label="Remover",
-                key=f"remover_{vendedor['codigo']}",
-                use_container_width=True,
+        alterados, selecionados = tabela_em_lote(
+            "vendedores",
+            vendedores,
+            {"nome": st.column_config.TextColumn("Nome", required=True)},
+            editaveis=("nome",),
+        )
+
+        col1, col2 = st.columns(2)
+        if col1.button(
+            label=f"Salvar alterações ({len(alterados)})",
+            key="salvar_vendedores",
+            disabled=not alterados,
+            use_container_width=True,
+        ):
+            if any(not (vendedor["nome"] or "").strip() for vendedor in alterados):
+                st.error("O campo 'Nome do vendedor' não pode estar vazio.")
+            elif (
+                atualizar_vendedores_em_lote(
+                    [(vendedor["codigo"], vendedor["nome"]) for vendedor in alterados]
+                )
+                is None
             ):
-                deletar_vendedor(vendedor["codigo"])
+                st.error(
+                    "Não foi possível salvar as alterações. Verifique se há nomes repetidos."
+                )
+            else:
+                descartar_edicao("vendedores")
                 st.rerun()
+        if col2.button(
+            label=f"Remover selecionados ({len(selecionados)})",
+            key="remover_vendedores",
+            disabled=not selecionados,
+            use_container_width=True,
+        ):
+            if deletar_vendedores_em_lote(selecionados) is None:
+                st.error("Não foi possível remover os vendedores selecionados.")
+            else:
+                descartar_edicao("vendedores")
+                st.rerun()
+
+    controles_paginacao("vendedores", proximo, len(vendedores))
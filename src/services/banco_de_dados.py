@@ -1,15 +1,418 @@
 import sqlite3
-import os
 import logging
+import queue
+import sys
+import threading
+import time
+from contextlib import contextmanager
+from services import instrumentacao
 
 
-def conectar():
-    conn = sqlite3.connect("prova.db")
+CAMINHO_BANCO = "prova.db"
+TAMANHO_POOL = 8
+TEMPO_ESPERA_POOL = 30.0
+
+PRAGMAS_CONEXAO = (
+    "PRAGMA journal_mode = WAL",
+    "PRAGMA synchronous = NORMAL",
+    "PRAGMA cache_size = -16000",
+    "PRAGMA mmap_size = 268435456",
+    "PRAGMA busy_timeout = 5000",
+    "PRAGMA temp_store = MEMORY",
+    "PRAGMA foreign_keys = ON",
+)
+
+# Registra a duração, as linhas e a origem de cada comando em `services.instrumentacao`.
+INSTRUMENTAR_CONSULTAS = True
+MODULOS_DE_ORIGEM = (
+    "controllers.",
+    "services.",
+    "pages.",
+    "componentes.",
+    "benchmarks.",
+)
+COMANDOS_COM_PLANO = ("SELECT", "WITH", "INSERT", "UPDATE", "DELETE", "REPLACE")
+
+
+def _origem_da_chamada() -> str:
+    # Primeira função da aplicação na pilha, fora deste módulo (ex: pandas.read_sql_query).
+    quadro = sys._getframe(2)
+    while quadro is not None:
+        modulo = quadro.f_globals.get("__name__", "")
+        if modulo.startswith(MODULOS_DE_ORIGEM) and modulo != __name__:
+            return f"{modulo}.{quadro.f_code.co_name}"
+        quadro = quadro.f_back
+
+    return "desconhecida"
+
+
+def _plano_de_execucao(conn, sql: str, parametros) -> str | None:
+    if not sql.lstrip().upper().startswith(COMANDOS_COM_PLANO):
+        return None
+
+    try:
+        # Cursor não instrumentado, para que o EXPLAIN não seja contabilizado.
+        linhas = sqlite3.Cursor(conn).execute(f"EXPLAIN QUERY PLAN {sql}", parametros)
+        return " | ".join(linha[3] for linha in linhas)
+    except Exception:
+        return None
+
+
+class CursorInstrumentado(sqlite3.Cursor):
+    """
+    Cursor que mede cada comando executado e registra a medição em `services.instrumentacao`.
+
+    A duração inclui a execução e a leitura das linhas (`fetchone`, `fetchmany`, `fetchall`
+    ou iteração), já que o SQLite processa as consultas à medida que as linhas são lidas.
+    A medição é registrada quando o resultado termina, quando outro comando é executado no
+    mesmo cursor, ou quando o cursor é fechado ou descartado. Comandos acima de
+    `LIMITE_CONSULTA_LENTA_MS` são registrados com o resultado do EXPLAIN QUERY PLAN, exceto
+    quando o cursor é descartado sem ler todo o resultado: o descarte é feito pelo coletor de
+    lixo, possivelmente em outra thread, quando a conexão já pode ter voltado ao pool.
+    """
+
+    _medicao = None
+
+    def _registrar(self, com_plano: bool = True) -> None:
+        medicao, self._medicao = self._medicao, None
+        if medicao is None:
+            return
+
+        sql, parametros, origem, duracao, linhas = medicao
+        duracao_ms = duracao * 1000
+        plano = None
+        if (
+            com_plano
+            and duracao_ms >= instrumentacao.LIMITE_CONSULTA_LENTA_MS
+            and parametros is not None
+        ):
+            plano = _plano_de_execucao(self.connection, sql, parametros)
+        instrumentacao.registrar_execucao(sql, duracao_ms, linhas, origem, plano)
+
+    def _medir(self, sql: str, parametros, executar, *args) -> "CursorInstrumentado":
+        self._registrar()
+        origem = _origem_da_chamada()
+        inicio = time.perf_counter()
+        try:
+            executar(*args)
+        finally:
+            duracao = time.perf_counter() - inicio
+            self._medicao = [sql, parametros, origem, duracao, 0]
+            if self.description is None:
+                # Comandos sem resultado (INSERT, UPDATE, DDL...) terminam na execução.
+                self._medicao[4] = max(self.rowcount, 0)
+                self._registrar()
+
+        return self
+
+    def execute(self, sql: str, parameters=(), /) -> "CursorInstrumentado":
+        return self._medir(sql, parameters, super().execute, sql, parameters)
+
+    def executemany(self, sql: str, seq_of_parameters, /) -> "CursorInstrumentado":
+        # Os parâmetros podem ser um iterador já consumido; o plano não é obtido.
+        return self._medir(sql, None, super().executemany, sql, seq_of_parameters)
+
+    def _ler(self, ler, *args):
+        medicao = self._medicao
+        if medicao is None:
+            return ler(*args)
+
+        inicio = time.perf_counter()
+        try:
+            resultado = ler(*args)
+        finally:
+            medicao[3] += time.perf_counter() - inicio
+
+        return resultado
+
+    def fetchone(self):
+        linha = self._ler(super().fetchone)
+        if self._medicao is not None:
+            if linha is None:
+                self._registrar()
+            else:
+                self._medicao[4] += 1
+        return linha
+
+    def fetchmany(self, size: int | None = None) -> list:
+        tamanho = self.arraysize if size is None else size
+        linhas = self._ler(super().fetchmany, tamanho)
+        if self._medicao is not None:
+            self._medicao[4] += len(linhas)
+            if len(linhas) < tamanho:
+                self._registrar()
+        return linhas
+
+    def fetchall(self) -> list:
+        linhas = self._ler(super().fetchall)
+        if self._medicao is not None:
+            self._medicao[4] += len(linhas)
+            self._registrar()
+        return linhas
+
+    def __next__(self):
+        # Caminho mais frequente na iteração linha a linha; evita as chamadas de `_ler`.
+        medicao = self._medicao
+        if medicao is None:
+            return super().__next__()
+
+        inicio = time.perf_counter()
+        try:
+            linha = super().__next__()
+        except StopIteration:
+            medicao[3] += time.perf_counter() - inicio
+            self._registrar()
+            raise
+        medicao[3] += time.perf_counter() - inicio
+        medicao[4] += 1
+        return linha
+
+    def close(self) -> None:
+        self._registrar()
+        super().close()
+
+    def __del__(self) -> None:
+        try:
+            self._registrar(com_plano=False)
+        except Exception:
+            pass
+
+
+class ConexaoSQLite(sqlite3.Connection):
+    """
+    Conexão SQLite mantida pelo pool de conexões.
+
+    Quando a mesma thread utiliza `conectar()` de forma aninhada, a conexão é reaproveitada
+    e as chamadas internas passam a ser executadas dentro de um SAVEPOINT. Nesse caso,
+    `commit()` e `rollback()` só têm efeito no nível mais externo, preservando a
+    atomicidade da operação que abriu a conexão.
+    """
+
+    profundidade = 0
+    caminho = None
+
+    def commit(self) -> None:
+        if self.profundidade <= 1:
+            super().commit()
+
+    def rollback(self) -> None:
+        if self.profundidade <= 1:
+            super().rollback()
+
+    def cursor(self, factory=None) -> sqlite3.Cursor:
+        if factory is None:
+            factory = CursorInstrumentado if INSTRUMENTAR_CONSULTAS else sqlite3.Cursor
+        return super().cursor(factory)
+
+    # Os atalhos de `sqlite3.Connection` não passam por `cursor()`; são redefinidos aqui
+    # para que os comandos executados diretamente na conexão também sejam instrumentados.
+    def execute(self, sql: str, parameters=(), /) -> sqlite3.Cursor:
+        return self.cursor().execute(sql, parameters)
+
+    def executemany(self, sql: str, parameters, /) -> sqlite3.Cursor:
+        return self.cursor().executemany(sql, parameters)
+
+
+def _criar_conexao() -> ConexaoSQLite:
+    conn = sqlite3.connect(
+        CAMINHO_BANCO, factory=ConexaoSQLite, check_same_thread=False
+    )
     conn.row_factory = sqlite3.Row
+    conn.caminho = CAMINHO_BANCO
+    for pragma in PRAGMAS_CONEXAO:
+        conn.execute(pragma)
 
     return conn
 
 
+_conexoes_livres = queue.LifoQueue()
+_conexoes_criadas = 0
+_trava_pool = threading.Lock()
+_local = threading.local()
+
+
+def _obter_conexao() -> ConexaoSQLite:
+    """
+    Retira uma conexão do pool, criando uma nova enquanto o limite `TAMANHO_POOL` não for atingido.
+
+    Se todas as conexões estiverem em uso, aguarda até `TEMPO_ESPERA_POOL` segundos pela
+    devolução de alguma delas.
+
+    Returns:
+        ConexaoSQLite: Uma conexão pronta para uso, com os PRAGMAs já aplicados.
+
+    Raises:
+        sqlite3.OperationalError: Se nenhuma conexão for liberada dentro do tempo de espera.
+    """
+    global _conexoes_criadas
+
+    try:
+        return _conexoes_livres.get_nowait()
+    except queue.Empty:
+        pass
+
+    with _trava_pool:
+        pode_criar = _conexoes_criadas < TAMANHO_POOL
+        if pode_criar:
+            _conexoes_criadas += 1
+
+    if pode_criar:
+        try:
+            return _criar_conexao()
+        except Exception:
+            with _trava_pool:
+                _conexoes_criadas -= 1
+            raise
+
+    try:
+        return _conexoes_livres.get(timeout=TEMPO_ESPERA_POOL)
+    except queue.Empty:
+        raise sqlite3.OperationalError(
+            "Pool de conexões esgotado: nenhuma conexão disponível."
+        )
+
+
+def _devolver_conexao(conn: ConexaoSQLite) -> None:
+    global _conexoes_criadas
+
+    if conn.caminho != CAMINHO_BANCO:
+        conn.close()
+        with _trava_pool:
+            _conexoes_criadas -= 1
+        return
+
+    if conn.in_transaction:
+        sqlite3.Connection.rollback(conn)
+    _conexoes_livres.put(conn)
+
+
+@contextmanager
+def conectar():
+    """
+    Fornece uma conexão do pool para uso dentro de um bloco `with`.
+
+    A conexão é reutilizada entre execuções da aplicação e entre sessões do Streamlit,
+    evitando o custo de abrir o arquivo e aplicar os PRAGMAs a cada consulta. Ao final
+    do bloco, a transação é confirmada (ou desfeita, em caso de exceção) e a conexão
+    retorna ao pool.
+
+    Se a thread atual já estiver utilizando uma conexão, a mesma conexão é reaproveitada
+    e o bloco interno é isolado em um SAVEPOINT.
+
+    Yields:
+        ConexaoSQLite: A conexão a ser utilizada.
+    """
+    conn = getattr(_local, "conexao", None)
+
+    if conn is not None:
+        yield from _conexao_aninhada(conn)
+        return
+
+    conn = _obter_conexao()
+    _local.conexao = conn
+    conn.profundidade = 1
+    try:
+        yield conn
+        sqlite3.Connection.commit(conn)
+    except BaseException:
+        sqlite3.Connection.rollback(conn)
+        raise
+    finally:
+        conn.profundidade = 0
+        _local.conexao = None
+        _devolver_conexao(conn)
+
+
+def conexao_em_uso() -> bool:
+    """
+    Indica se a thread atual está dentro de um bloco `conectar()`.
+
+    Returns:
+        bool: True se a thread atual já estiver utilizando uma conexão do pool.
+    """
+    return getattr(_local, "conexao", None) is not None
+
+
+@contextmanager
+def conexao_dedicada():
+    """
+    Fornece uma conexão própria, fora do pool, para leituras longas consumidas aos poucos.
+
+    Destinada a geradores que mantêm um cursor aberto entre `yield`s (ex: a exportação do
+    relatório em blocos). Ao contrário de `conectar()`, a conexão não é registrada como a
+    conexão da thread: outras chamadas a `conectar()` feitas pela mesma thread enquanto o
+    gerador está suspenso recebem uma conexão do pool normalmente, em vez de um SAVEPOINT
+    dentro da leitura. A conexão é fechada ao final do bloco, inclusive se o gerador for
+    fechado antes de ser esgotado.
+
+    Yields:
+        ConexaoSQLite: A conexão a ser utilizada, com os PRAGMAs já aplicados.
+    """
+    conn = _criar_conexao()
+    try:
+        yield conn
+    finally:
+        conn.close()
+
+
+def _conexao_aninhada(conn: ConexaoSQLite):
+    nome_savepoint = f"sp_{conn.profundidade}"
+    if not conn.in_transaction:
+        conn.execute("BEGIN")
+    conn.execute(f"SAVEPOINT {nome_savepoint}")
+    conn.profundidade += 1
+    try:
+        yield conn
+        conn.execute(f"RELEASE {nome_savepoint}")
+    except BaseException:
+        conn.execute(f"ROLLBACK TO {nome_savepoint}")
+        conn.execute(f"RELEASE {nome_savepoint}")
+        raise
+    finally:
+        conn.profundidade -= 1
+
+
+def fechar_conexoes() -> None:
+    """
+    Fecha todas as conexões ociosas do pool.
+
+    Útil ao encerrar a aplicação ou ao trocar o arquivo de banco de dados utilizado.
+    Conexões em uso no momento da chamada não são afetadas.
+
+    Returns:
+        None
+    """
+    global _conexoes_criadas
+
+    while True:
+        try:
+            conn = _conexoes_livres.get_nowait()
+        except queue.Empty:
+            break
+        conn.close()
+        with _trava_pool:
+            _conexoes_criadas -= 1
+
+
+def configurar_banco(caminho: str) -> None:
+    """
+    Define o arquivo de banco de dados utilizado pelas próximas conexões do pool.
+
+    As conexões ociosas apontando para o arquivo anterior são fechadas; as que estiverem
+    em uso são fechadas quando forem devolvidas ao pool.
+
+    Args:
+        caminho (str): Caminho do arquivo SQLite.
+
+    Returns:
+        None
+    """
+    global CAMINHO_BANCO
+
+    fechar_conexoes()
+    CAMINHO_BANCO = caminho
+
+
 def criar_tabela_clientes(conn):
     sql = """
         CREATE TABLE IF NOT EXISTS clientes (
@@ -18,7 +421,6 @@ def criar_tabela_clientes(conn):
         )
     """
     conn.execute(sql)
-    conn.commit()
 
 
 def criar_tabela_produtos(conn):
@@ -30,7 +432,6 @@ def criar_tabela_produtos(conn):
         )
     """
     conn.execute(sql)
-    conn.commit()
 
 
 def criar_tabela_vendedores(conn):
@@ -41,115 +442,97 @@ def criar_tabela_vendedores(conn):
         )
     """
     conn.execute(sql)
-    conn.commit()
 
 
-def criar_tabela_ofertas(conn):
-    sql = """
-        CREATE TABLE IF NOT EXISTS ofertas (
+def criar_tabela_ofertas(conn, nome="ofertas"):
+    sql = f"""
+        CREATE TABLE IF NOT EXISTS {nome} (
             codigo INTEGER PRIMARY KEY AUTOINCREMENT,
             produto_id INTEGER UNIQUE NOT NULL,
             quantidade_levar INTEGER NOT NULL CHECK (quantidade_levar > 0),
             quantidade_pagar INTEGER NOT NULL CHECK (quantidade_pagar > 0 AND quantidade_pagar < quantidade_levar),
-            FOREIGN KEY (produto_id) REFERENCES produtos (id) ON DELETE CASCADE
+            FOREIGN KEY (produto_id) REFERENCES produtos (codigo) ON DELETE CASCADE
         )
     """
     conn.execute(sql)
-    conn.commit()
 
 
-def criar_tabela_orcamentos(conn):
-    sql = """
-        CREATE TABLE IF NOT EXISTS orcamentos (
+def criar_tabela_orcamentos(conn, nome="orcamentos"):
+    sql = f"""
+        CREATE TABLE IF NOT EXISTS {nome} (
             codigo INTEGER PRIMARY KEY AUTOINCREMENT,
             cliente_id INTEGER NOT NULL,
             vendedor_id INTEGER NOT NULL,
             data_criacao DATETIME DEFAULT CURRENT_TIMESTAMP,
-            FOREIGN KEY (cliente_id) REFERENCES clientes (id) ON DELETE CASCADE,
-            FOREIGN KEY (vendedor_id) REFERENCES vendedores (id) ON DELETE CASCADE
+            FOREIGN KEY (cliente_id) REFERENCES clientes (codigo) ON DELETE CASCADE,
+            FOREIGN KEY (vendedor_id) REFERENCES vendedores (codigo) ON DELETE CASCADE
         )
     """
     conn.execute(sql)
-    conn.commit()
 
 
-def criar_tabela_orcamento_itens(conn):
-    sql = """
-        CREATE TABLE IF NOT EXISTS orcamento_itens (
+def criar_tabela_orcamento_itens(conn, nome="orcamento_itens"):
+    sql = f"""
+        CREATE TABLE IF NOT EXISTS {nome} (
             codigo INTEGER PRIMARY KEY AUTOINCREMENT,
             orcamento_id INTEGER NOT NULL,
             produto_id INTEGER NOT NULL,
             quantidade INTEGER NOT NULL,
             preco_unitario NUMERIC NOT NULL,
             desconto NUMERIC NOT NULL,
-            FOREIGN KEY (orcamento_id) REFERENCES orcamentos (id) ON DELETE CASCADE,
-            FOREIGN KEY (produto_id) REFERENCES produtos (id) ON DELETE CASCADE
+            FOREIGN KEY (orcamento_id) REFERENCES orcamentos (codigo) ON DELETE CASCADE,
+            FOREIGN KEY (produto_id) REFERENCES produtos (codigo) ON DELETE CASCADE
         )
     """
     conn.execute(sql)
-    conn.commit()
 
 
-def criar_banco_de_dados() -> None:
+def criar_banco_de_dados() -> bool:
     """
-    Cria o banco de dados e as tabelas necessárias se o arquivo "prova.db" não existir.
+    Cria o banco de dados e atualiza o seu esquema para a versão mais recente.
 
-    A função verifica se o arquivo "prova.db" já existe. Caso não exista, ela:
-      1. Abre uma conexão com o banco de dados utilizando a função `conectar()`.
-      2. Cria as tabelas necessárias chamando as funções:
-           - criar_tabela_clientes(conn)
-           - criar_tabela_produtos(conn)
-           - criar_tabela_vendedores(conn)
-           - criar_tabela_ofertas(conn)
-           - criar_tabela_orcamentos(conn)
-           - criar_tabela_orcamento_itens(conn)
-      3. Registra uma mensagem de sucesso no log informando que o banco de dados e as tabelas foram criados.
+    A função delega para `migrar_banco_de_dados()` (em services/migracoes.py), que aplica,
+    em ordem, as migrações ainda não executadas no arquivo, controladas pelo
+    `PRAGMA user_version`. Em um arquivo novo, todas as tabelas e índices são criados;
+    em um banco já existente, apenas as migrações pendentes são aplicadas.
 
-    Se ocorrer um erro durante o processo de criação do banco de dados (capturado como `sqlite3.Error`),
-    o erro será registrado no log.
+    Se ocorrer um erro durante o processo (capturado como `sqlite3.Error`), o erro será
+    registrado no log.
 
     Returns:
-        None
+        bool: True se o esquema estiver atualizado, False se ocorrer algum erro.
     """
-    if not os.path.exists("prova.db"):
-        try:
-            with conectar() as conn:
-                criar_tabela_clientes(conn)
-                criar_tabela_produtos(conn)
-                criar_tabela_vendedores(conn)
-                criar_tabela_ofertas(conn)
-                criar_tabela_orcamentos(conn)
-                criar_tabela_orcamento_itens(conn)
-                logging.info("Banco de dados e tabelas criados com sucesso.")
-        except sqlite3.Error as e:
-            logging.error(f"Erro ao criar banco de dados: {e}")
+    from services.migracoes import migrar_banco_de_dados
 
+    try:
+        versao = migrar_banco_de_dados()
+        logging.info(f"Banco de dados na versão {versao} do esquema.")
+        return True
+    except sqlite3.Error as e:
+        logging.error(f"Erro ao criar banco de dados: {e}")
+        return False
 
-def tabela_existe(nome_tabela: str) -> bool:
-    """
-    Verifica se uma tabela específica existe no banco de dados SQLite.
 
-    A função executa uma consulta na tabela interna "sqlite_master" para verificar se existe
-    uma tabela com o nome fornecido. Retorna True se a tabela existir, caso contrário, retorna False.
+_bancos_inicializados = set()
+_trava_inicializacao = threading.Lock()
 
-    Args:
-        nome_tabela (str): O nome da tabela a ser verificada.
 
-    Returns:
-        bool: True se a tabela existir, False caso contrário.
+def inicializar_banco_de_dados() -> None:
+    """
+    Executa `criar_banco_de_dados()` apenas uma vez por processo para o arquivo atual.
 
-    Raises:
-        Exception: Se ocorrer um erro durante a verificação, o erro será registrado no log e
-                   a função retornará False.
+    Destinada a pontos de entrada executados repetidamente, como o script do Streamlit, que
+    roda novamente a cada interação: a verificação das migrações é feita na primeira chamada
+    e as seguintes retornam sem acessar o banco de dados. Se a criação falhar, a próxima
+    chamada tenta novamente.
+
+    Returns:
+        None
     """
-    try:
-        with conectar() as conn:
-            cursor = conn.cursor()
-            cursor.execute(
-                "SELECT name FROM sqlite_master WHERE type='table' AND name=?",
-                (nome_tabela,),
-            )
-            return cursor.fetchone() is not None  # Retorna True se a tabela existir
-    except Exception as e:
-        logging.error(f"Erro ao verificar existência da tabela {nome_tabela}: {e}")
-        return False
+    if CAMINHO_BANCO in _bancos_inicializados:
+        return
+
+    with _trava_inicializacao:
+        caminho = CAMINHO_BANCO
+        if caminho not in _bancos_inicializados and criar_banco_de_dados():
+            _bancos_inicializados.add(caminho)
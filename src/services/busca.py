@@ -0,0 +1,26 @@
+import re
+
+
+LIMITE_RESULTADOS = 20
+
+
+def expressao_de_busca(termo: str) -> str | None:
+    """
+    Converte o texto digitado pelo usuário em uma expressão MATCH do FTS5.
+
+    Cada palavra do termo vira um prefixo entre aspas (ex: "dor bras" -> '"dor"* "bras"*'),
+    de modo que todas as palavras precisam aparecer no início de alguma palavra do texto
+    indexado. As aspas impedem que caracteres digitados sejam interpretados como operadores
+    do FTS5. Acentos são ignorados pelo tokenizador das tabelas de busca.
+
+    Args:
+        termo (str): O texto digitado pelo usuário.
+
+    Returns:
+        str | None: A expressão de busca, ou None se o termo não tiver nenhuma palavra.
+    """
+    palavras = re.findall(r"\w+", termo or "")
+    if not palavras:
+        return None
+
+    return " ".join(f'"{palavra}"*' for palavra in palavras)
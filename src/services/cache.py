@@ -0,0 +1,183 @@
+import logging
+import sys
+import threading
+from collections import OrderedDict
+from functools import wraps
+from services import banco_de_dados
+from services.banco_de_dados import conectar
+
+
+# Limite da memória ocupada pelos resultados, estimada por `_tamanho_aproximado()`.
+TAMANHO_MAXIMO_CACHE_BYTES = 64 * 1024 * 1024
+# Resultados maiores não são armazenados, para que uma única consulta grande (ex: a lista
+# completa de um cadastro com milhares de registros) não descarte todas as demais entradas.
+TAMANHO_MAXIMO_ENTRADA_BYTES = 4 * 1024 * 1024
+
+# Chave -> (resultado, tamanho aproximado em bytes).
+_entradas = OrderedDict()
+_bytes_em_uso = 0
+_trava = threading.Lock()
+_estatisticas = {"acertos": 0, "falhas": 0, "descartes": 0, "grandes": 0}
+
+
+def versoes_das_tabelas() -> dict:
+    """
+    Retorna o contador de versão atual de cada tabela do catálogo.
+
+    Os contadores são mantidos por gatilhos no banco de dados (tabela "versoes_tabelas")
+    e mudam a cada inserção, alteração ou remoção, feita por qualquer processo.
+
+    Returns:
+        dict: Um dicionário {tabela: versão}.
+    """
+    with conectar() as conn:
+        cursor = conn.cursor()
+        cursor.execute("SELECT tabela, versao FROM versoes_tabelas")
+        return dict(cursor.fetchall())
+
+
+def _tamanho_aproximado(resultado) -> int:
+    # Soma `sys.getsizeof()` do resultado e dos valores contidos em listas, tuplas e
+    # dicionários. Objetos repetidos (ex: os nomes das colunas) são contados uma única vez.
+    total, vistos, pendentes = 0, set(), [resultado]
+    while pendentes:
+        valor = pendentes.pop()
+        if id(valor) in vistos:
+            continue
+        vistos.add(id(valor))
+        total += sys.getsizeof(valor)
+        if isinstance(valor, dict):
+            pendentes.extend(valor.keys())
+            pendentes.extend(valor.values())
+        elif isinstance(valor, (list, tuple)):
+            pendentes.extend(valor)
+
+    return total
+
+
+def _armazenar(chave: tuple, resultado) -> None:
+    global _bytes_em_uso
+
+    tamanho = _tamanho_aproximado(resultado)
+    with _trava:
+        if tamanho > TAMANHO_MAXIMO_ENTRADA_BYTES:
+            _estatisticas["grandes"] += 1
+            return
+        if chave in _entradas:
+            _bytes_em_uso -= _entradas.pop(chave)[1]
+        _entradas[chave] = (resultado, tamanho)
+        _bytes_em_uso += tamanho
+        while _bytes_em_uso > TAMANHO_MAXIMO_CACHE_BYTES:
+            _, (_, tamanho_descartado) = _entradas.popitem(last=False)
+            _bytes_em_uso -= tamanho_descartado
+            _estatisticas["descartes"] += 1
+
+
+def _vazio(resultado) -> bool:
+    if isinstance(resultado, tuple):
+        return not resultado or not resultado[0]
+
+    return not resultado
+
+
+def em_cache(*tabelas: str):
+    """
+    Decorador que mantém em memória os resultados de uma consulta ao catálogo.
+
+    O cache é compartilhado por todas as sessões do processo. Cada resultado é armazenado
+    junto com as versões das `tabelas` das quais depende, de modo que qualquer alteração
+    nessas tabelas invalida exatamente os resultados afetados, sem prazo de expiração.
+    A cada chamada, apenas os contadores de versão são lidos do banco de dados.
+
+    Resultados vazios ou None (incluindo páginas vazias, no formato ([], cursor)) não são
+    armazenados, pois as funções de consulta retornam esses valores em caso de erro. Os
+    resultados armazenados são compartilhados e não devem ser modificados por quem os recebe.
+
+    O cache é limitado pela memória ocupada, estimada por `sys.getsizeof()` sobre os valores
+    do resultado: resultados acima de `TAMANHO_MAXIMO_ENTRADA_BYTES` não são armazenados e,
+    quando o total passa de `TAMANHO_MAXIMO_CACHE_BYTES`, as entradas usadas há mais tempo
+    são descartadas.
+
+    Args:
+        *tabelas (str): As tabelas consultadas pela função decorada.
+
+    Returns:
+        Um decorador para a função de consulta.
+    """
+
+    def decorador(funcao):
+        nome = f"{funcao.__module__}.{funcao.__qualname__}"
+
+        @wraps(funcao)
+        def consultar(*args, **kwargs):
+            try:
+                versoes = versoes_das_tabelas()
+            except Exception as e:
+                logging.error(f"Erro ao ler versões das tabelas: {e}")
+                return funcao(*args, **kwargs)
+
+            chave = (
+                banco_de_dados.CAMINHO_BANCO,
+                nome,
+                args,
+                tuple(sorted(kwargs.items())),
+                tuple(versoes.get(tabela) for tabela in tabelas),
+            )
+
+            with _trava:
+                if chave in _entradas:
+                    _entradas.move_to_end(chave)
+                    _estatisticas["acertos"] += 1
+                    return _entradas[chave][0]
+                _estatisticas["falhas"] += 1
+
+            resultado = funcao(*args, **kwargs)
+
+            if not _vazio(resultado):
+                _armazenar(chave, resultado)
+
+            return resultado
+
+        return consultar
+
+    return decorador
+
+
+def estatisticas_cache() -> dict:
+    """
+    Retorna as estatísticas de uso do cache de consultas.
+
+    Returns:
+        dict: Um dicionário com os campos "acertos", "falhas", "descartes" (entradas removidas
+              pelo limite de memória), "grandes" (resultados não armazenados por excederem
+              `TAMANHO_MAXIMO_ENTRADA_BYTES`), "entradas", "bytes" (tamanho aproximado das
+              entradas), "capacidade_bytes" e "taxa_acerto" (entre 0 e 1).
+    """
+    with _trava:
+        estatisticas = dict(_estatisticas)
+        estatisticas["entradas"] = len(_entradas)
+        estatisticas["bytes"] = _bytes_em_uso
+
+    consultas = estatisticas["acertos"] + estatisticas["falhas"]
+    estatisticas["capacidade_bytes"] = TAMANHO_MAXIMO_CACHE_BYTES
+    estatisticas["taxa_acerto"] = (
+        estatisticas["acertos"] / consultas if consultas else 0.0
+    )
+
+    return estatisticas
+
+
+def limpar_cache() -> None:
+    """
+    Remove todas as entradas do cache e zera as estatísticas.
+
+    Returns:
+        None
+    """
+    global _bytes_em_uso
+
+    with _trava:
+        _entradas.clear()
+        _bytes_em_uso = 0
+        for chave in _estatisticas:
+            _estatisticas[chave] = 0
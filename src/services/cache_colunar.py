@@ -0,0 +1,421 @@
+import itertools
+import logging
+import threading
+import numpy as np
+from services import banco_de_dados
+from services.banco_de_dados import conectar
+from services.cache import versoes_das_tabelas
+from services.datas import intervalo_de_dias
+from services.migracoes import CONTADOR_ALTERACOES_ORCAMENTOS
+
+
+TAMANHO_BLOCO_CARGA = 100_000
+CAPACIDADE_INICIAL = 4096
+
+# Colunas de cada item, ordenadas pelo dia de criação do orçamento. Produtos, vendedores e
+# clientes são codificados por dicionário: a coluna guarda a posição do código na lista de
+# códigos correspondente (estado["ids"]).
+COLUNAS_ITENS = {
+    "dia": np.int32,
+    "orcamento": np.int64,
+    "produto": np.int32,
+    "vendedor": np.int32,
+    "cliente": np.int32,
+    "quantidade": np.int64,
+    "valor_bruto": np.int64,
+    "desconto": np.int64,
+}
+# Colunas de cada orçamento, ordenadas pelo código; "instante" é a data de criação em
+# segundos desde 1970-01-01.
+COLUNAS_ORCAMENTOS = {
+    "codigo": np.int64,
+    "dia": np.int32,
+    "instante": np.int64,
+    "vendedor": np.int32,
+    "cliente": np.int32,
+}
+
+CONSULTA_ORCAMENTOS = """
+    SELECT
+        codigo,
+        dia_criacao,
+        CAST(strftime('%s', data_criacao) AS INTEGER),
+        vendedor_id,
+        cliente_id
+    FROM orcamentos
+    WHERE codigo > ? AND dia_criacao IS NOT NULL
+    ORDER BY codigo
+"""
+CONSULTA_ITENS = """
+    SELECT
+        codigo,
+        orcamento_id,
+        produto_id,
+        quantidade,
+        quantidade * preco_unitario_centavos,
+        desconto_centavos
+    FROM orcamento_itens
+    WHERE codigo > ?
+    ORDER BY codigo
+"""
+
+# Arquivo do banco -> estado do cache (ver `_carregar()`).
+_caches = {}
+_trava = threading.Lock()
+
+
+def _ler(sql: str, maior_codigo: int, quantidade_colunas: int) -> np.ndarray:
+    # Lê as linhas posteriores a `maior_codigo` em uma matriz, em blocos, sem montar uma
+    # lista de tuplas com todas as linhas.
+    blocos = [np.empty(0, dtype=np.int64)]
+    with conectar() as conn:
+        cursor = conn.cursor()
+        cursor.row_factory = None
+        cursor.execute(sql, (maior_codigo,))
+        while True:
+            linhas = cursor.fetchmany(TAMANHO_BLOCO_CARGA)
+            if not linhas:
+                break
+            valores = itertools.chain.from_iterable(linhas)
+            blocos.append(
+                np.fromiter(valores, np.int64, len(linhas) * quantidade_colunas)
+            )
+    return np.concatenate(blocos).reshape(-1, quantidade_colunas)
+
+
+def _colunas_vazias(tipos: dict) -> tuple:
+    return {nome: np.empty(CAPACIDADE_INICIAL, tipo) for nome, tipo in tipos.items()}, 0
+
+
+def _acrescentar_colunas(visao: tuple, novas: dict) -> tuple:
+    # Grava `novas` após as linhas válidas de `visao` e retorna a nova visão (colunas,
+    # tamanho). Sem capacidade, as colunas são realocadas com 25% de folga; as consultas em
+    # andamento continuam usando as colunas e o tamanho anteriores.
+    colunas, tamanho = visao
+    total = tamanho + len(novas["dia"])
+    if total > len(colunas["dia"]):
+        ampliadas = {}
+        for nome, coluna in colunas.items():
+            ampliadas[nome] = np.empty(
+                total + max(CAPACIDADE_INICIAL, total // 4), dtype=coluna.dtype
+            )
+            ampliadas[nome][:tamanho] = coluna[:tamanho]
+        colunas = ampliadas
+    for nome, valores in novas.items():
+        colunas[nome][tamanho:total] = valores
+    return colunas, total
+
+
+def _codificar(estado: dict, dicionario: str, valores: np.ndarray) -> np.ndarray:
+    # Converte os códigos do banco nas posições do dicionário, incluindo os códigos novos.
+    posicoes_por_codigo = estado["dicionarios"][dicionario]
+    ids = estado["ids"][dicionario]
+    unicos, inverso = np.unique(valores, return_inverse=True)
+    posicoes = np.empty(len(unicos), dtype=np.int32)
+    for indice, valor in enumerate(unicos.tolist()):
+        posicao = posicoes_por_codigo.get(valor)
+        if posicao is None:
+            posicao = posicoes_por_codigo[valor] = len(ids)
+            ids.append(valor)
+        posicoes[indice] = posicao
+    return posicoes[inverso]
+
+
+def _ler_orcamentos_novos(estado: dict) -> None:
+    matriz = _ler(
+        CONSULTA_ORCAMENTOS, estado["maior_orcamento"], len(COLUNAS_ORCAMENTOS)
+    )
+    if not len(matriz):
+        return
+
+    novos = {
+        "codigo": matriz[:, 0],
+        "dia": matriz[:, 1],
+        "instante": matriz[:, 2],
+        "vendedor": _codificar(estado, "vendedor", matriz[:, 3]),
+        "cliente": _codificar(estado, "cliente", matriz[:, 4]),
+    }
+    estado["orcamentos"] = _acrescentar_colunas(estado["orcamentos"], novos)
+    estado["maior_orcamento"] = int(matriz[-1, 0])
+
+
+def _ler_itens_novos(estado: dict) -> dict | None:
+    # Os itens são lidos antes dos orçamentos: um item gravado entre as duas leituras ficará
+    # para a próxima atualização, mas o orçamento de cada item lido já estará carregado.
+    itens = _ler(CONSULTA_ITENS, estado["maior_item"], 6)
+    _ler_orcamentos_novos(estado)
+    if not len(itens):
+        return None
+    estado["maior_item"] = int(itens[-1, 0])
+
+    # Junção com os orçamentos por busca binária no código (ignora os orçamentos sem dia).
+    orcamentos, tamanho = estado["orcamentos"]
+    if not tamanho:
+        return None
+    codigos = orcamentos["codigo"][:tamanho]
+    posicoes = np.searchsorted(codigos, itens[:, 1]).clip(max=tamanho - 1)
+    encontrados = codigos[posicoes] == itens[:, 1]
+    itens, posicoes = itens[encontrados], posicoes[encontrados]
+
+    return {
+        "dia": orcamentos["dia"][posicoes],
+        "orcamento": itens[:, 1],
+        "produto": _codificar(estado, "produto", itens[:, 2]),
+        "vendedor": orcamentos["vendedor"][posicoes],
+        "cliente": orcamentos["cliente"][posicoes],
+        "quantidade": itens[:, 3],
+        "valor_bruto": itens[:, 4],
+        "desconto": itens[:, 5],
+    }
+
+
+def _carregar(alteracoes: int) -> dict:
+    # Carga completa: os itens são lidos na ordem do código e ordenados pelo dia.
+    estado = {
+        "alteracoes": alteracoes,
+        "maior_item": 0,
+        "maior_orcamento": 0,
+        "dicionarios": {nome: {} for nome in ("produto", "vendedor", "cliente")},
+        "ids": {nome: [] for nome in ("produto", "vendedor", "cliente")},
+        "orcamentos": _colunas_vazias(COLUNAS_ORCAMENTOS),
+        "visao": _colunas_vazias(COLUNAS_ITENS),
+    }
+    itens = _ler_itens_novos(estado)
+    if itens is not None:
+        ordem = np.argsort(itens["dia"], kind="stable")
+        estado["visao"] = _acrescentar_colunas(
+            estado["visao"], {nome: valores[ordem] for nome, valores in itens.items()}
+        )
+    return estado
+
+
+def _acrescentar(estado: dict) -> bool:
+    # Acrescenta os itens novos ao final das colunas. Retorna False se algum item novo for de
+    # um dia anterior ao último carregado, caso em que a ordem exige uma carga completa.
+    itens = _ler_itens_novos(estado)
+    if itens is None or not len(itens["dia"]):
+        return True
+
+    colunas, tamanho = estado["visao"]
+    dias = itens["dia"]
+    if (tamanho and dias[0] < colunas["dia"][tamanho - 1]) or np.any(
+        dias[1:] < dias[:-1]
+    ):
+        return False
+
+    estado["visao"] = _acrescentar_colunas(estado["visao"], itens)
+    return True
+
+
+def atualizar_cache_colunar() -> dict:
+    """
+    Carrega ou atualiza o cache colunar dos itens dos orçamentos do banco de dados atual.
+
+    O cache é compartilhado por todas as sessões do processo e guarda, em colunas NumPy
+    ordenadas pelo dia de criação do orçamento, o dia, o orçamento, o produto, o vendedor, o
+    cliente, a quantidade, o valor bruto e o desconto de cada item. Produtos, vendedores e
+    clientes são codificados por dicionário. A data de criação fica em colunas à parte, uma
+    linha por orçamento.
+
+    A cada chamada:
+      - Se o contador `CONTADOR_ALTERACOES_ORCAMENTOS` mudou (itens já carregados foram
+        alterados ou removidos), o cache é recarregado por completo.
+      - Caso contrário, apenas os itens e orçamentos com "codigo" maior que o último
+        carregado são lidos e acrescentados ao final das colunas, que têm capacidade
+        reservada para isso. Se algum item novo for de um dia anterior ao último carregado
+        (ex: orçamento com data retroativa), o cache também é recarregado.
+
+    Returns:
+        dict: O estado do cache. Os campos "visao" (itens) e "orcamentos" contêm (colunas,
+              tamanho): apenas as `tamanho` primeiras posições de cada coluna são válidas. As
+              colunas são compartilhadas e não devem ser modificadas.
+
+    Raises:
+        Exception: Se ocorrer algum erro durante a leitura dos itens.
+    """
+    caminho = banco_de_dados.CAMINHO_BANCO
+    with _trava:
+        alteracoes = versoes_das_tabelas().get(CONTADOR_ALTERACOES_ORCAMENTOS, 0)
+        estado = _caches.get(caminho)
+        if (
+            estado is None
+            or estado["alteracoes"] != alteracoes
+            or not _acrescentar(estado)
+        ):
+            estado = _caches[caminho] = _carregar(alteracoes)
+        return estado
+
+
+def cache_colunar_carregado() -> bool:
+    """
+    Indica se o cache colunar do banco de dados atual já foi carregado neste processo.
+
+    Com o cache carregado, `ler_relatorio_colunar()` só lê do banco de dados os itens novos;
+    sem ele, a primeira chamada lê todos os itens.
+
+    Returns:
+        bool: True se o cache já foi carregado.
+    """
+    return banco_de_dados.CAMINHO_BANCO in _caches
+
+
+def descartar_cache_colunar() -> None:
+    """
+    Descarta os caches colunares de todos os bancos de dados, liberando a memória.
+
+    Returns:
+        None
+    """
+    with _trava:
+        _caches.clear()
+
+
+def _nomes(ids: list, lista: list, campo: str) -> np.ndarray:
+    nomes = {registro["codigo"]: registro[campo] for registro in lista}
+    return np.array([nomes.get(codigo) for codigo in ids], dtype=object)
+
+
+def _totais_por_produto(estado: dict, colunas: dict) -> "pd.DataFrame":
+    import pandas as pd
+    from controllers.ProdutoController import lista_de_produtos
+
+    ids = np.array(estado["ids"]["produto"][:], dtype=np.int64)
+    produto = colunas["produto"]
+    # `np.bincount` soma em ponto flutuante, que é exato para inteiros até 2**53.
+    somas = {
+        nome: np.rint(
+            np.bincount(produto, weights=colunas[nome], minlength=len(ids))
+        ).astype(np.int64)
+        for nome in ("quantidade", "valor_bruto", "desconto")
+    }
+    vendidos = np.flatnonzero(np.bincount(produto, minlength=len(ids)))
+
+    df = pd.DataFrame(
+        {
+            "produto_id": ids[vendidos],
+            "produto": _nomes(ids, lista_de_produtos() or [], "descricao")[vendidos],
+            "quantidade": somas["quantidade"][vendidos],
+            "valor_bruto_centavos": somas["valor_bruto"][vendidos],
+            "desconto_centavos": somas["desconto"][vendidos],
+        }
+    )
+    df["valor_liquido_centavos"] = df["valor_bruto_centavos"] - df["desconto_centavos"]
+    return df.sort_values(
+        ["valor_liquido_centavos", "produto_id"], ascending=[False, True]
+    ).reset_index(drop=True)
+
+
+def _totais_por_orcamento(estado: dict, colunas: dict) -> "pd.DataFrame":
+    import pandas as pd
+    from controllers.ClienteController import lista_de_clientes
+    from controllers.VendedorController import lista_de_vendedores
+
+    orcamento = colunas["orcamento"]
+    liquido = colunas["valor_bruto"] - colunas["desconto"]
+    if len(orcamento) and np.all(orcamento[1:] >= orcamento[:-1]):
+        # Caso comum: os orçamentos mais novos têm código e dia maiores, e os itens de cada
+        # orçamento já estão contíguos e em ordem de código.
+        primeiros = np.flatnonzero(np.r_[True, orcamento[1:] != orcamento[:-1]])
+        totais = np.add.reduceat(liquido, primeiros)
+    else:
+        _, primeiros, inverso = np.unique(
+            orcamento, return_index=True, return_inverse=True
+        )
+        totais = np.rint(np.bincount(inverso, weights=liquido)).astype(np.int64)
+
+    orcamentos, tamanho = estado["orcamentos"]
+    posicoes = np.searchsorted(orcamentos["codigo"][:tamanho], orcamento[primeiros])
+    instantes = orcamentos["instante"][posicoes]
+
+    clientes = _nomes(estado["ids"]["cliente"][:], lista_de_clientes() or [], "nome")
+    vendedores = _nomes(
+        estado["ids"]["vendedor"][:], lista_de_vendedores() or [], "nome"
+    )
+    return pd.DataFrame(
+        {
+            "orcamento_id": orcamento[primeiros],
+            "nome_cliente": clientes[colunas["cliente"][primeiros]],
+            "nome_vendedor": vendedores[colunas["vendedor"][primeiros]],
+            "data_criacao": pd.to_datetime(instantes, unit="s"),
+            "total_orcamento_centavos": totais,
+        }
+    )
+
+
+def ler_relatorio_colunar(
+    data_inicio: str, data_fim: str, produto_codigo: int = -1
+) -> dict:
+    """
+    Calcula o resumo do relatório de orçamentos a partir do cache colunar, sem SQL nem pandas
+    sobre os itens.
+
+    O cache é atualizado por `atualizar_cache_colunar()`. Como as colunas estão ordenadas pelo
+    dia, o período é localizado com duas buscas binárias (`np.searchsorted`); o filtro de
+    produto é uma máscara booleana sobre o período. As somas por orçamento e por produto são
+    feitas pelo NumPy, e apenas o resultado agregado vira DataFrame.
+
+    Args:
+        data_inicio (str): Data de início do filtro, no formato "YYYY-MM-DD".
+        data_fim (str): Data final do filtro, no formato "YYYY-MM-DD".
+        produto_codigo (int, optional): Código do produto para filtrar os itens.
+                                        Se for -1, o filtro por produto não é aplicado.
+
+    Returns:
+        dict: Um dicionário com os campos "resumo" (DataFrame com as colunas de
+              `resumo_do_relatorio()`, ordenado pelo código do orçamento), "total_geral" (em
+              centavos) e "produtos" (DataFrame com as colunas de `vendas_por_produto()`).
+
+    Raises:
+        Exception: Se ocorrer algum erro durante a atualização do cache ou o cálculo.
+    """
+    estado = atualizar_cache_colunar()
+    colunas, tamanho = estado["visao"]
+
+    inicio, fim = intervalo_de_dias(data_inicio, data_fim)
+    primeira, ultima = np.searchsorted(colunas["dia"][:tamanho], [inicio, fim])
+    periodo = {nome: coluna[primeira:ultima] for nome, coluna in colunas.items()}
+
+    if produto_codigo != -1:
+        posicao = estado["dicionarios"]["produto"].get(produto_codigo, -1)
+        mascara = periodo["produto"] == posicao
+        periodo = {nome: coluna[mascara] for nome, coluna in periodo.items()}
+
+    resumo = _totais_por_orcamento(estado, periodo)
+    return {
+        "resumo": resumo,
+        "total_geral": int(resumo["total_orcamento_centavos"].sum()),
+        "produtos": _totais_por_produto(estado, periodo),
+    }
+
+
+def relatorio_colunar(
+    data_inicio: str, data_fim: str, produto_codigo: int = -1
+) -> dict | None:
+    """
+    Calcula o resumo do relatório a partir do cache colunar, se ele já estiver carregado.
+
+    Destinada à página de relatórios: com o cache carregado, o resultado é obtido em
+    milissegundos, na própria execução da página. Se o cache ainda não foi carregado neste
+    processo, retorna None, e a página agenda a tarefa em segundo plano
+    (services/tarefas_relatorio.py), que faz a carga completa.
+
+    Args:
+        data_inicio (str): Data de início do filtro, no formato "YYYY-MM-DD".
+        data_fim (str): Data final do filtro, no formato "YYYY-MM-DD".
+        produto_codigo (int, optional): Código do produto para filtrar os itens.
+                                        Se for -1, o filtro por produto não é aplicado.
+
+    Returns:
+        dict | None: O resultado de `ler_relatorio_colunar()`, ou None se o cache não estiver
+                     carregado ou ocorrer algum erro.
+
+    Raises:
+        Exception: Se ocorrer algum erro durante o cálculo, a exceção é capturada e registrada no log.
+    """
+    if not cache_colunar_carregado():
+        return None
+
+    try:
+        return ler_relatorio_colunar(data_inicio, data_fim, produto_codigo)
+    except Exception as e:
+        logging.error(f"Erro ao calcular relatório pelo cache colunar: {e}")
@@ -2,7 +2,17 @@ from controllers.ClienteController import adicionar_cliente
 from controllers.ProdutoController import adicionar_produto
 from controllers.VendedorController import adicionar_vendedor
 from controllers.OfertasController import adicionar_oferta
+from services.banco_de_dados import configurar_banco, conectar, criar_banco_de_dados
+from services.datas import dia_epoch
+from services.importacao import indexacao_de_busca_adiada
+from services.log import setup_logging
+from services.precificacao import calcular_item
+from datetime import date, timedelta
+import argparse
 import logging
+import math
+import random
+import time
 
 
 def cadastrar_dados_fakes():
@@ -14,12 +24,12 @@ def cadastrar_dados_fakes():
         adicionar_cliente("Castro Alves")
         adicionar_cliente("José de Alencar")
         adicionar_cliente("Olavo Bilac")
-        adicionar_produto("Epocler Sabor Abacaxi Flaconete Com 10ml", 3.10)
-        adicionar_produto("Engov Com 6 Comprimidos", 7.00)
-        adicionar_produto("Doralgina Com 20 Drágeas", 8.90)
-        adicionar_produto("Histamin 2Mg C/ 20 Comprimidos", 5.90)
-        adicionar_produto("Neosoro Solução Nasal Adulto Com 30 Ml", 4.99)
-        adicionar_produto("Dormec Infantil 100Mg Com 10 Comprimidos", 1.33)
+        adicionar_produto("Epocler Sabor Abacaxi Flaconete Com 10ml", 310)
+        adicionar_produto("Engov Com 6 Comprimidos", 700)
+        adicionar_produto("Doralgina Com 20 Drágeas", 890)
+        adicionar_produto("Histamin 2Mg C/ 20 Comprimidos", 590)
+        adicionar_produto("Neosoro Solução Nasal Adulto Com 30 Ml", 499)
+        adicionar_produto("Dormec Infantil 100Mg Com 10 Comprimidos", 133)
         adicionar_vendedor("Jason Statham")
         adicionar_vendedor("Adam Sandler")
         adicionar_vendedor("Castro Alves")
@@ -33,3 +43,341 @@ def cadastrar_dados_fakes():
         logging.warning("==========TERMINOU DE INSERIR DADOS FAKES==========")
     except Exception as e:
         logging.error(f"Erro ao inserir dados fakes: {e}")
+
+
+TAMANHO_LOTE = 20_000
+
+NOMES = (
+    "Ana",
+    "Bruno",
+    "Carla",
+    "Daniel",
+    "Eduarda",
+    "Felipe",
+    "Gabriela",
+    "Henrique",
+    "Isabela",
+    "João",
+    "Larissa",
+    "Marcos",
+    "Natália",
+    "Otávio",
+    "Paula",
+    "Rafael",
+    "Sofia",
+    "Thiago",
+    "Vitória",
+    "Wesley",
+)
+SOBRENOMES = (
+    "Silva",
+    "Santos",
+    "Oliveira",
+    "Souza",
+    "Rodrigues",
+    "Ferreira",
+    "Alves",
+    "Pereira",
+    "Lima",
+    "Gomes",
+    "Costa",
+    "Ribeiro",
+    "Martins",
+    "Carvalho",
+    "Almeida",
+    "Lopes",
+)
+PRODUTOS = (
+    "Dipirona",
+    "Paracetamol",
+    "Ibuprofeno",
+    "Loratadina",
+    "Omeprazol",
+    "Vitamina C",
+    "Soro Fisiológico",
+    "Protetor Solar",
+    "Shampoo",
+    "Sabonete",
+    "Fralda",
+    "Escova Dental",
+)
+APRESENTACOES = (
+    "10 Comprimidos",
+    "20 Comprimidos",
+    "30 Cápsulas",
+    "Gotas 20ml",
+    "Xarope 100ml",
+    "Frasco 500ml",
+    "Tubo 50g",
+    "Pacote",
+)
+
+# Peso relativo de cada dia da semana (segunda a domingo) na distribuição dos orçamentos.
+PESOS_DIA_DA_SEMANA = (1.0, 1.0, 1.0, 1.0, 1.15, 0.8, 0.3)
+
+# Proporção dos produtos que recebem uma oferta "leve X pague Y".
+PROPORCAO_OFERTAS = 0.1
+
+
+def _pesos_de_zipf(quantidade: int, expoente: float = 1.1) -> list:
+    # Pesos acumulados de uma distribuição de Zipf: poucos registros concentram a maior
+    # parte das escolhas, como os produtos e clientes mais frequentes de uma loja.
+    pesos, acumulado = [], 0.0
+    for posicao in range(1, quantidade + 1):
+        acumulado += 1 / posicao**expoente
+        pesos.append(acumulado)
+
+    return pesos
+
+
+def _proximo_codigo(conn, tabela: str) -> int:
+    return conn.execute(
+        f"SELECT COALESCE(MAX(codigo), 0) + 1 FROM {tabela}"
+    ).fetchone()[0]
+
+
+def _inserir_em_massa(conn, tabela: str, colunas: tuple, linhas: list) -> None:
+    with indexacao_de_busca_adiada(conn, tabela):
+        conn.executemany(
+            f"INSERT INTO {tabela} ({', '.join(colunas)}) "
+            f"VALUES ({', '.join('?' * len(colunas))})",
+            linhas,
+        )
+    conn.commit()
+
+
+def gerar_dados_em_massa(
+    orcamentos: int,
+    itens_por_orcamento: int = 4,
+    clientes: int | None = None,
+    vendedores: int | None = None,
+    produtos: int | None = None,
+    dias: int = 365,
+    semente: int = 42,
+    data_final: date | None = None,
+    tamanho_lote: int = TAMANHO_LOTE,
+) -> dict:
+    """
+    Gera um volume de dados semelhante ao de produção, para testes de carga e benchmarks.
+
+    Os dados são sorteados por um gerador pseudoaleatório com a `semente` informada, então a
+    mesma chamada sobre o mesmo banco produz sempre os mesmos registros. As distribuições
+    procuram reproduzir o movimento de uma loja:
+      - Orçamentos espalhados pelos `dias` anteriores a `data_final`, com movimento crescente
+        ao longo do período, menor nos fins de semana e em horário comercial.
+      - Produtos e clientes escolhidos por uma distribuição de Zipf (poucos muito frequentes).
+      - De 1 a (2 * itens_por_orcamento - 1) itens por orçamento, com quantidades pequenas.
+      - Preços com distribuição log-normal e ofertas em `PROPORCAO_OFERTAS` dos produtos,
+        com os descontos calculados por `services.precificacao.calcular_item()`.
+
+    Os registros são inseridos com `executemany`, em transações de `tamanho_lote` orçamentos,
+    com os códigos atribuídos pelo gerador e a indexação da busca textual feita em bloco.
+    Os dados são acrescentados aos já existentes.
+
+    Args:
+        orcamentos (int): Quantidade de orçamentos a gerar.
+        itens_por_orcamento (int): Média de itens por orçamento. Padrão é 4.
+        clientes (int | None): Quantidade de clientes. Padrão proporcional aos orçamentos.
+        vendedores (int | None): Quantidade de vendedores. Padrão proporcional aos orçamentos.
+        produtos (int | None): Quantidade de produtos. Padrão proporcional aos orçamentos.
+        dias (int): Quantidade de dias do período dos orçamentos. Padrão é 365.
+        semente (int): Semente do gerador pseudoaleatório. Padrão é 42.
+        data_final (date | None): Último dia do período. Padrão é a data atual.
+        tamanho_lote (int): Quantidade de orçamentos por transação.
+
+    Returns:
+        dict: A quantidade de registros gerados por tabela ("clientes", "vendedores",
+              "produtos", "ofertas", "orcamentos", "orcamento_itens") e a duração em
+              "segundos". Retorna um dicionário vazio se ocorrer algum erro.
+
+    Raises:
+        Exception: Se ocorrer algum erro durante a operação, a exceção é capturada e registrada no log.
+    """
+    aleatorio = random.Random(semente)
+    data_final = data_final or date.today()
+    clientes = clientes or max(10, orcamentos // 20)
+    vendedores = vendedores or max(5, min(200, orcamentos // 2_000))
+    produtos = produtos or max(20, min(20_000, orcamentos // 50))
+    inicio = time.perf_counter()
+    resumo = {}
+
+    try:
+        with conectar() as conn:
+            primeiro = _proximo_codigo(conn, "clientes")
+            codigos_clientes = list(range(primeiro, primeiro + clientes))
+            _inserir_em_massa(
+                conn,
+                "clientes",
+                ("codigo", "nome"),
+                [
+                    (
+                        codigo,
+                        f"{aleatorio.choice(NOMES)} {aleatorio.choice(SOBRENOMES)} {codigo}",
+                    )
+                    for codigo in codigos_clientes
+                ],
+            )
+
+            primeiro = _proximo_codigo(conn, "vendedores")
+            codigos_vendedores = list(range(primeiro, primeiro + vendedores))
+            _inserir_em_massa(
+                conn,
+                "vendedores",
+                ("codigo", "nome"),
+                [
+                    (
+                        codigo,
+                        f"Vendedor {aleatorio.choice(NOMES)} {aleatorio.choice(SOBRENOMES)} {codigo}",
+                    )
+                    for codigo in codigos_vendedores
+                ],
+            )
+
+            primeiro = _proximo_codigo(conn, "produtos")
+            codigos_produtos = list(range(primeiro, primeiro + produtos))
+            precos = {
+                codigo: max(50, round(math.exp(aleatorio.gauss(math.log(1_500), 0.8))))
+                for codigo in codigos_produtos
+            }
+            _inserir_em_massa(
+                conn,
+                "produtos",
+                ("codigo", "descricao", "preco_centavos"),
+                [
+                    (
+                        codigo,
+                        f"{aleatorio.choice(PRODUTOS)} {aleatorio.choice(APRESENTACOES)} {codigo}",
+                        precos[codigo],
+                    )
+                    for codigo in codigos_produtos
+                ],
+            )
+
+            ofertas = {}
+            for codigo in aleatorio.sample(
+                codigos_produtos, int(produtos * PROPORCAO_OFERTAS)
+            ):
+                quantidade_levar = aleatorio.randint(2, 6)
+                ofertas[codigo] = (
+                    quantidade_levar,
+                    aleatorio.randint(1, quantidade_levar - 1),
+                )
+            _inserir_em_massa(
+                conn,
+                "ofertas",
+                ("produto_id", "quantidade_levar", "quantidade_pagar"),
+                [(codigo, *oferta) for codigo, oferta in ofertas.items()],
+            )
+
+            # Os mais frequentes não devem ser sempre os de menor código.
+            aleatorio.shuffle(codigos_clientes)
+            aleatorio.shuffle(codigos_produtos)
+            pesos_clientes = _pesos_de_zipf(clientes)
+            pesos_produtos = _pesos_de_zipf(produtos)
+
+            datas = [data_final - timedelta(days=dias - 1 - dia) for dia in range(dias)]
+            pesos_dias, acumulado = [], 0.0
+            for dia, data in enumerate(datas):
+                acumulado += (0.6 + 0.8 * dia / dias) * PESOS_DIA_DA_SEMANA[
+                    data.weekday()
+                ]
+                pesos_dias.append(acumulado)
+            dias_sorteados = sorted(
+                aleatorio.choices(range(dias), cum_weights=pesos_dias, k=orcamentos)
+            )
+
+            primeiro_orcamento = _proximo_codigo(conn, "orcamentos")
+            total_itens = 0
+            for inicio_lote in range(0, orcamentos, tamanho_lote):
+                lote = dias_sorteados[inicio_lote : inicio_lote + tamanho_lote]
+                clientes_lote = aleatorio.choices(
+                    codigos_clientes, cum_weights=pesos_clientes, k=len(lote)
+                )
+                linhas_orcamentos, linhas_itens = [], []
+                for posicao, dia in enumerate(lote):
+                    codigo = primeiro_orcamento + inicio_lote + posicao
+                    data = datas[dia]
+                    linhas_orcamentos.append(
+                        (
+                            codigo,
+                            clientes_lote[posicao],
+                            aleatorio.choice(codigos_vendedores),
+                            f"{data.isoformat()} {aleatorio.randint(8, 19):02d}:"
+                            f"{aleatorio.randint(0, 59):02d}:{aleatorio.randint(0, 59):02d}",
+                            dia_epoch(data),
+                        )
+                    )
+                    quantidade_itens = aleatorio.randint(1, 2 * itens_por_orcamento - 1)
+                    for produto_id in aleatorio.choices(
+                        codigos_produtos, cum_weights=pesos_produtos, k=quantidade_itens
+                    ):
+                        quantidade = min(24, 1 + int(aleatorio.expovariate(0.6)))
+                        _, desconto = calcular_item(
+                            precos[produto_id],
+                            quantidade,
+                            *ofertas.get(produto_id, (0, 0)),
+                        )
+                        linhas_itens.append(
+                            (
+                                codigo,
+                                produto_id,
+                                quantidade,
+                                precos[produto_id],
+                                desconto,
+                            )
+                        )
+
+                conn.executemany(
+                    "INSERT INTO orcamentos "
+                    "(codigo, cliente_id, vendedor_id, data_criacao, dia_criacao) "
+                    "VALUES (?, ?, ?, ?, ?)",
+                    linhas_orcamentos,
+                )
+                conn.executemany(
+                    "INSERT INTO orcamento_itens (orcamento_id, produto_id, quantidade, "
+                    "preco_unitario_centavos, desconto_centavos) VALUES (?, ?, ?, ?, ?)",
+                    linhas_itens,
+                )
+                conn.commit()
+                total_itens += len(linhas_itens)
+
+            conn.execute("ANALYZE")
+
+        resumo = {
+            "clientes": clientes,
+            "vendedores": vendedores,
+            "produtos": produtos,
+            "ofertas": len(ofertas),
+            "orcamentos": orcamentos,
+            "orcamento_itens": total_itens,
+            "segundos": time.perf_counter() - inicio,
+        }
+        logging.info(f"Dados gerados: {resumo}")
+    except Exception as e:
+        logging.error(f"Erro ao gerar dados em massa: {e}")
+
+    return resumo
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Geração de dados em massa.")
+    parser.add_argument("--orcamentos", type=int, default=250_000)
+    parser.add_argument("--itens-por-orcamento", type=int, default=4)
+    parser.add_argument("--dias", type=int, default=365)
+    parser.add_argument("--semente", type=int, default=42)
+    parser.add_argument("--banco", help="arquivo SQLite (padrão: o banco da aplicação)")
+    args = parser.parse_args()
+
+    setup_logging()
+    if args.banco:
+        configurar_banco(args.banco)
+    criar_banco_de_dados()
+
+    resumo = gerar_dados_em_massa(
+        args.orcamentos, args.itens_por_orcamento, dias=args.dias, semente=args.semente
+    )
+    print(resumo or "A geração falhou; consulte o log.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,57 @@
+from datetime import date
+
+
+EPOCH = date(1970, 1, 1).toordinal()
+
+
+def dia_epoch(data: date | str) -> int:
+    """
+    Converte uma data no número de dias desde 1970-01-01.
+
+    É a mesma codificação da coluna "dia_criacao" da tabela "orcamentos".
+
+    Args:
+        data (date | str): A data, como objeto `date` ou texto no formato "YYYY-MM-DD".
+
+    Returns:
+        int: O número de dias desde 1970-01-01.
+    """
+    if isinstance(data, str):
+        data = date.fromisoformat(data[:10])
+
+    return data.toordinal() - EPOCH
+
+
+def intervalo_de_dias(data_inicio: date | str, data_fim: date | str) -> tuple[int, int]:
+    """
+    Converte um período fechado [data_inicio, data_fim] em limites semiabertos de dias.
+
+    O resultado é usado em filtros `dia_criacao >= inicio AND dia_criacao < fim`, que
+    aproveitam o índice da coluna.
+
+    Args:
+        data_inicio (date | str): Primeiro dia do período.
+        data_fim (date | str): Último dia do período (inclusive).
+
+    Returns:
+        tuple[int, int]: Os limites (inicio, fim), com `fim` exclusivo.
+    """
+    return dia_epoch(data_inicio), dia_epoch(data_fim) + 1
+
+
+def mes_de(data: date | str) -> int:
+    """
+    Converte uma data no mês a que pertence, no formato inteiro AAAAMM (ex: 202503).
+
+    É a mesma codificação da coluna "mes" da tabela "cubo_vendas".
+
+    Args:
+        data (date | str): A data, como objeto `date` ou texto no formato "YYYY-MM-DD".
+
+    Returns:
+        int: O mês, como AAAAMM.
+    """
+    if isinstance(data, str):
+        data = date.fromisoformat(data[:10])
+
+    return data.year * 100 + data.month
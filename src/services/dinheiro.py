@@ -0,0 +1,57 @@
+from decimal import Decimal, InvalidOperation, ROUND_HALF_UP
+
+
+def para_centavos(valor) -> int:
+    """
+    Converte um valor em reais para centavos inteiros, arredondando meio centavo para cima.
+
+    Os valores monetários são armazenados e calculados em centavos inteiros; esta função deve
+    ser usada apenas na entrada de dados (formulários, arquivos importados).
+
+    Args:
+        valor (int | float | str | Decimal): O valor em reais (ex: 3.1, "3,10" ou "R$ 3.10").
+
+    Returns:
+        int: O valor em centavos (ex: 310).
+
+    Raises:
+        ValueError: Se o valor não for numérico.
+    """
+    if isinstance(valor, str):
+        valor = valor.replace("R$", "").strip().replace(",", ".")
+    try:
+        reais = Decimal(str(valor))
+    except InvalidOperation:
+        raise ValueError(f"Valor monetário inválido: {valor!r}.")
+    if not reais.is_finite():
+        raise ValueError(f"Valor monetário inválido: {valor!r}.")
+
+    return int((reais * 100).quantize(Decimal(1), rounding=ROUND_HALF_UP))
+
+
+def para_reais(centavos: int) -> float:
+    """
+    Converte centavos inteiros para reais, para exibição e campos numéricos da interface.
+
+    Args:
+        centavos (int): O valor em centavos.
+
+    Returns:
+        float: O valor em reais.
+    """
+    return centavos / 100
+
+
+def formatar_reais(centavos: int) -> str:
+    """
+    Formata um valor em centavos como texto em reais (ex: 310 -> "R$ 3.10").
+
+    Args:
+        centavos (int): O valor em centavos.
+
+    Returns:
+        str: O valor formatado.
+    """
+    sinal = "-" if centavos < 0 else ""
+    reais, resto = divmod(abs(int(centavos)), 100)
+    return f"{sinal}R$ {reais}.{resto:02d}"
@@ -0,0 +1,283 @@
+import atexit
+import itertools
+import logging
+import queue
+import sqlite3
+import threading
+import time
+from concurrent.futures import Future
+from functools import lru_cache
+from typing import NamedTuple
+from services.banco_de_dados import conectar, conexao_em_uso
+
+
+# Quantidade máxima de pedidos gravados em uma mesma transação (group commit).
+MAXIMO_POR_TRANSACAO = 500
+# Tentativas de obter a trava de escrita do SQLite (ex: durante uma importação feita por outro
+# processo) antes de devolver o erro aos pedidos; cada tentativa já aguarda o `busy_timeout`.
+TENTATIVAS_BLOQUEIO = 5
+ESPERA_ENTRE_TENTATIVAS = 0.5
+
+
+class ResultadoEscrita(NamedTuple):
+    codigo: int | None
+    linhas: int
+
+
+class _Pedido(NamedTuple):
+    operacao: object
+    argumento: object
+    futuro: Future
+
+
+_fila = queue.SimpleQueue()
+_escritor = None
+_trava = threading.Lock()
+_FIM = object()
+
+
+def _bloqueado(erro: Exception) -> bool:
+    return isinstance(erro, sqlite3.OperationalError) and (
+        "locked" in str(erro) or "busy" in str(erro)
+    )
+
+
+def _executar_grupo(operacao, pedidos: list) -> list:
+    """
+    Executa um grupo de pedidos da mesma operação, cada um em um SAVEPOINT próprio se a
+    execução conjunta falhar. Retorna (pedido, resultado, erro) para cada pedido.
+    """
+    try:
+        with conectar():
+            resultados = operacao([pedido.argumento for pedido in pedidos])
+        return [
+            (pedido, resultado, None) for pedido, resultado in zip(pedidos, resultados)
+        ]
+    except Exception as e:
+        if _bloqueado(e):
+            raise
+        if len(pedidos) == 1:
+            return [(pedidos[0], None, e)]
+
+    # A execução conjunta foi desfeita; cada pedido é repetido isoladamente, para que o erro
+    # de um pedido (ex: nome repetido) não impeça a gravação dos demais.
+    saidas = []
+    for pedido in pedidos:
+        try:
+            with conectar():
+                saidas.append((pedido, operacao([pedido.argumento])[0], None))
+        except Exception as e:
+            if _bloqueado(e):
+                raise
+            saidas.append((pedido, None, e))
+    return saidas
+
+
+def _gravar(pedidos: list) -> None:
+    for tentativa in range(TENTATIVAS_BLOQUEIO):
+        try:
+            saidas = []
+            with conectar() as conn:
+                # Obtém a trava de escrita antes de executar os pedidos.
+                conn.execute("BEGIN IMMEDIATE")
+                for operacao, grupo in itertools.groupby(
+                    pedidos, key=lambda pedido: pedido.operacao
+                ):
+                    saidas.extend(_executar_grupo(operacao, list(grupo)))
+            break
+        except Exception as e:
+            if _bloqueado(e) and tentativa < TENTATIVAS_BLOQUEIO - 1:
+                logging.warning(
+                    f"Banco de dados ocupado; nova tentativa de escrita: {e}"
+                )
+                time.sleep(ESPERA_ENTRE_TENTATIVAS)
+                continue
+            for pedido in pedidos:
+                pedido.futuro.set_exception(e)
+            return
+
+    # Os pedidos só são confirmados após o commit da transação.
+    for pedido, resultado, erro in saidas:
+        if erro is None:
+            pedido.futuro.set_result(resultado)
+        else:
+            pedido.futuro.set_exception(erro)
+
+
+def _laco_do_escritor() -> None:
+    while True:
+        pedidos = [_fila.get()]
+        # Agrupa os pedidos que chegaram enquanto a transação anterior era gravada.
+        while len(pedidos) < MAXIMO_POR_TRANSACAO:
+            try:
+                pedidos.append(_fila.get_nowait())
+            except queue.Empty:
+                break
+
+        encerrar = any(pedido is _FIM for pedido in pedidos)
+        pedidos = [pedido for pedido in pedidos if pedido is not _FIM]
+        try:
+            if pedidos:
+                _gravar(pedidos)
+        except BaseException as e:
+            logging.error(f"Erro na thread de escrita: {e}")
+            for pedido in pedidos:
+                if not pedido.futuro.done():
+                    pedido.futuro.set_exception(e)
+        if encerrar:
+            return
+
+
+def _iniciar_escritor() -> None:
+    global _escritor
+
+    if _escritor is not None and _escritor.is_alive():
+        return
+    with _trava:
+        if _escritor is None or not _escritor.is_alive():
+            _escritor = threading.Thread(
+                target=_laco_do_escritor, name="escritor", daemon=True
+            )
+            _escritor.start()
+
+
+@atexit.register
+def encerrar_escritor() -> None:
+    """
+    Grava os pedidos pendentes e encerra a thread de escrita.
+
+    É chamada automaticamente ao encerrar o processo, de modo que as escritas já enviadas não
+    são perdidas. Uma nova escrita enviada depois disso inicia outra thread.
+
+    Returns:
+        None
+    """
+    escritor = _escritor
+    if escritor is not None and escritor.is_alive():
+        _fila.put(_FIM)
+        escritor.join()
+
+
+def enviar_escrita(operacao, argumento) -> Future:
+    """
+    Envia uma escrita para a thread de escrita, que grava todas as escritas do processo.
+
+    Uma única thread executa as escritas, em ordem de chegada, de modo que as sessões não
+    disputam a trava de escrita do SQLite. Os pedidos acumulados enquanto uma transação é
+    gravada são executados juntos na transação seguinte (group commit):
+      - Pedidos consecutivos da mesma `operacao` são executados em uma única chamada, que pode
+        gravar todos com um `executemany`.
+      - Se essa chamada falhar, cada pedido é repetido em um SAVEPOINT próprio, e apenas os
+        pedidos com erro recebem a exceção.
+      - Se o banco estiver ocupado por outro processo, a transação é repetida até
+        `TENTATIVAS_BLOQUEIO` vezes.
+
+    Se a thread atual já estiver dentro de um bloco `conectar()`, a operação é executada
+    diretamente nessa transação, preservando a atomicidade do bloco externo.
+
+    Args:
+        operacao: Função que recebe a lista de argumentos de um grupo de pedidos e retorna a
+                  lista de resultados, na mesma ordem. É executada dentro de `conectar()`.
+        argumento: O argumento deste pedido.
+
+    Returns:
+        Future: Concluído após o commit da transação, com o resultado do pedido ou a exceção
+                que impediu a sua gravação.
+    """
+    futuro = Future()
+    if conexao_em_uso():
+        try:
+            futuro.set_result(operacao([argumento])[0])
+        except Exception as e:
+            futuro.set_exception(e)
+        return futuro
+
+    _iniciar_escritor()
+    _fila.put(_Pedido(operacao, argumento, futuro))
+    return futuro
+
+
+@lru_cache(maxsize=256)
+def _operacao_sql(sql: str):
+    def operacao(argumentos: list) -> list:
+        with conectar() as conn:
+            conn.executemany(sql, argumentos)
+        return [None] * len(argumentos)
+
+    return operacao
+
+
+@lru_cache(maxsize=256)
+def _operacao_sql_em_lote(sql: str):
+    def operacao(argumentos: list) -> list:
+        with conectar() as conn:
+            return [conn.executemany(sql, lote).rowcount for lote in argumentos]
+
+    return operacao
+
+
+@lru_cache(maxsize=256)
+def _operacao_sql_com_resultado(sql: str):
+    def operacao(argumentos: list) -> list:
+        with conectar() as conn:
+            resultados = []
+            for parametros in argumentos:
+                cursor = conn.execute(sql, parametros)
+                resultados.append(ResultadoEscrita(cursor.lastrowid, cursor.rowcount))
+            return resultados
+
+    return operacao
+
+
+def executar_escrita(sql: str, parametros=()) -> Future:
+    """
+    Envia uma instrução SQL para a thread de escrita (ver `enviar_escrita()`).
+
+    Instruções idênticas enviadas por sessões diferentes e pendentes ao mesmo tempo são
+    gravadas com um único `executemany`.
+
+    Args:
+        sql (str): A instrução (INSERT, UPDATE ou DELETE).
+        parametros: Os parâmetros da instrução.
+
+    Returns:
+        Future: Concluído com None após o commit, ou com a exceção da instrução.
+    """
+    return enviar_escrita(_operacao_sql(sql), parametros)
+
+
+def executar_escrita_em_lote(sql: str, lista_de_parametros: list) -> Future:
+    """
+    Envia uma instrução SQL com vários conjuntos de parâmetros para a thread de escrita.
+
+    Todos os conjuntos são gravados com um único `executemany`, de forma atômica: se algum
+    falhar, nenhum é gravado.
+
+    Args:
+        sql (str): A instrução (INSERT, UPDATE ou DELETE).
+        lista_de_parametros (list): Os parâmetros de cada execução.
+
+    Returns:
+        Future: Concluído com a quantidade de linhas alteradas após o commit, ou com a exceção.
+    """
+    return enviar_escrita(_operacao_sql_em_lote(sql), lista_de_parametros)
+
+
+def executar_escrita_com_resultado(sql: str, parametros=()) -> Future:
+    """
+    Envia uma instrução SQL para a thread de escrita e informa o seu resultado.
+
+    Diferente de `executar_escrita()`, cada pedido é executado isoladamente (ainda na mesma
+    transação dos demais pedidos pendentes), para que o código gerado e a quantidade de linhas
+    alteradas sejam os do próprio pedido.
+
+    Args:
+        sql (str): A instrução (INSERT, UPDATE ou DELETE).
+        parametros: Os parâmetros da instrução.
+
+    Returns:
+        Future: Concluído após o commit com um `ResultadoEscrita` (codigo: o rowid da linha
+                inserida, linhas: a quantidade de linhas alteradas), ou com a exceção da
+                instrução (ex: sqlite3.IntegrityError).
+    """
+    return enviar_escrita(_operacao_sql_com_resultado(sql), parametros)
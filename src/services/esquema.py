@@ -0,0 +1,94 @@
+import logging
+import threading
+from services import banco_de_dados
+from services.banco_de_dados import conectar
+
+
+# Arquivo do banco -> esquema lido por `carregar_esquema()`.
+_esquemas = {}
+_trava = threading.Lock()
+
+
+def carregar_esquema() -> dict:
+    """
+    Lê o esquema do banco de dados atual e o guarda no registro em memória do processo.
+
+    São lidos a versão do esquema (`PRAGMA user_version`) e, para cada tabela, as suas colunas
+    (`PRAGMA table_info`) e índices (`PRAGMA index_list`). A função é chamada pelo executor de
+    migrações (`migrar_banco_de_dados()`) ao final de cada execução, que é o único ponto em que
+    o esquema muda; as consultas ao registro não acessam o banco de dados.
+
+    Quando chamada dentro de um bloco `conectar()`, a leitura usa a mesma conexão e enxerga as
+    alterações ainda não confirmadas.
+
+    Returns:
+        dict: Um dicionário com os campos "versao" e "tabelas" ({tabela: {"colunas": tuple,
+              "indices": tuple}}).
+
+    Raises:
+        sqlite3.Error: Se ocorrer algum erro na leitura do esquema.
+    """
+    caminho = banco_de_dados.CAMINHO_BANCO
+    with conectar() as conn:
+        versao = conn.execute("PRAGMA user_version").fetchone()[0]
+        nomes = conn.execute(
+            "SELECT name FROM sqlite_master WHERE type = 'table' ORDER BY name"
+        ).fetchall()
+        tabelas = {
+            nome: {
+                "colunas": tuple(
+                    coluna["name"]
+                    for coluna in conn.execute(f'PRAGMA table_info("{nome}")')
+                ),
+                "indices": tuple(
+                    indice["name"]
+                    for indice in conn.execute(f'PRAGMA index_list("{nome}")')
+                ),
+            }
+            for (nome,) in nomes
+        }
+
+    esquema = {"versao": versao, "tabelas": tabelas}
+    with _trava:
+        _esquemas[caminho] = esquema
+
+    return esquema
+
+
+def esquema_do_banco() -> dict:
+    """
+    Retorna o esquema registrado para o banco de dados atual.
+
+    Se o esquema ainda não tiver sido lido neste processo (ex: o banco foi usado sem passar
+    por `criar_banco_de_dados()`), ele é lido uma vez por `carregar_esquema()`.
+
+    Returns:
+        dict: O esquema, no formato de `carregar_esquema()`. O dicionário é compartilhado e
+              não deve ser modificado. Se a leitura falhar, retorna um esquema vazio, que não
+              é guardado no registro.
+
+    Raises:
+        Exception: Se ocorrer algum erro na leitura do esquema, o erro é registrado no log.
+    """
+    esquema = _esquemas.get(banco_de_dados.CAMINHO_BANCO)
+    if esquema is not None:
+        return esquema
+
+    try:
+        return carregar_esquema()
+    except Exception as e:
+        logging.error(f"Erro ao carregar esquema do banco de dados: {e}")
+        return {"versao": 0, "tabelas": {}}
+
+
+def tabela_existe(nome_tabela: str) -> bool:
+    """
+    Verifica se uma tabela existe no banco de dados, consultando o registro do esquema em memória.
+
+    Args:
+        nome_tabela (str): O nome da tabela a ser verificada.
+
+    Returns:
+        bool: True se a tabela existir, False caso contrário.
+    """
+    return nome_tabela in esquema_do_banco()["tabelas"]
@@ -0,0 +1,156 @@
+"""
+Exportação do relatório de orçamentos em CSV ou Parquet, lido e gravado em blocos.
+
+Uso (a partir da pasta src):
+    python -m services.exportacao relatorio.parquet --inicio 2024-01-01 --fim 2024-12-31
+
+O formato é definido pela extensão do arquivo (.csv ou .parquet). A exportação em Parquet
+requer o pacote pyarrow.
+"""
+
+import argparse
+import csv
+import io
+import logging
+import time
+from controllers.OrcamentoController import (
+    COLUNAS_RELATORIO,
+    TAMANHO_BLOCO_RELATORIO,
+    blocos_do_relatorio,
+)
+from services.banco_de_dados import criar_banco_de_dados
+from services.log import setup_logging
+
+
+FORMATOS = ("csv", "parquet")
+
+
+def _gravar_csv(destino, blocos) -> int:
+    texto = io.TextIOWrapper(destino, encoding="utf-8", newline="", write_through=True)
+    try:
+        escritor = csv.writer(texto)
+        escritor.writerow(COLUNAS_RELATORIO)
+        linhas = 0
+        for bloco in blocos:
+            escritor.writerows(bloco)
+            linhas += len(bloco)
+    finally:
+        # Desassocia o wrapper para não fechar o destino, que pertence a quem chamou.
+        texto.detach()
+
+    return linhas
+
+
+def _gravar_parquet(destino, blocos) -> int:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    esquema = pa.schema(
+        [
+            ("orcamento_id", pa.int64()),
+            ("data_criacao", pa.string()),
+            ("nome_cliente", pa.string()),
+            ("nome_vendedor", pa.string()),
+            ("produto", pa.string()),
+            ("quantidade", pa.int64()),
+            ("preco_unitario_centavos", pa.int64()),
+            ("desconto_centavos", pa.int64()),
+            ("total_item_centavos", pa.int64()),
+        ]
+    )
+    linhas = 0
+    with pq.ParquetWriter(destino, esquema) as escritor:
+        for bloco in blocos:
+            colunas = [
+                pa.array(valores, type=campo.type)
+                for valores, campo in zip(zip(*bloco), esquema)
+            ]
+            escritor.write_batch(pa.record_batch(colunas, schema=esquema))
+            linhas += len(bloco)
+
+    return linhas
+
+
+def exportar_relatorio(
+    destino,
+    formato: str,
+    data_inicio: str,
+    data_fim: str,
+    produto_codigo: int = -1,
+    tamanho_bloco: int = TAMANHO_BLOCO_RELATORIO,
+) -> int | None:
+    """
+    Exporta o relatório de orçamentos de um período para um arquivo CSV ou Parquet.
+
+    A consulta de `gerar_relatorio()` é percorrida com `blocos_do_relatorio()` e cada bloco é
+    gravado no destino assim que é lido: no CSV, como linhas de texto; no Parquet, como um
+    "row group". Apenas um bloco de `tamanho_bloco` linhas fica na memória por vez, então o
+    consumo de memória não cresce com o tamanho do período. Os valores monetários são
+    exportados em centavos inteiros, como armazenados no banco de dados.
+
+    Args:
+        destino (str | BinaryIO): Caminho do arquivo ou objeto binário gravável (ex: um arquivo
+                                  temporário ou `io.BytesIO`).
+        formato (str): "csv" ou "parquet".
+        data_inicio (str): Data de início do filtro, no formato "YYYY-MM-DD".
+        data_fim (str): Data final do filtro, no formato "YYYY-MM-DD".
+        produto_codigo (int, optional): Código do produto para filtrar os orçamentos.
+                                        Se for -1, o filtro por produto não é aplicado.
+        tamanho_bloco (int, optional): Quantidade de linhas lidas e gravadas por vez.
+
+    Returns:
+        int | None: A quantidade de linhas exportadas, ou None se ocorrer algum erro
+                    (o conteúdo já gravado no destino fica incompleto).
+
+    Raises:
+        Exception: Se ocorrer algum erro durante a operação, a exceção é capturada e registrada no log.
+    """
+    blocos = blocos_do_relatorio(data_inicio, data_fim, produto_codigo, tamanho_bloco)
+    try:
+        if formato == "csv":
+            if isinstance(destino, str):
+                with open(destino, "wb") as arquivo:
+                    return _gravar_csv(arquivo, blocos)
+            return _gravar_csv(destino, blocos)
+
+        elif formato == "parquet":
+            return _gravar_parquet(destino, blocos)
+
+        raise ValueError(f"Formato de exportação desconhecido: {formato}.")
+    except Exception as e:
+        logging.error(f"Erro ao exportar relatório: {e}")
+        return None
+    finally:
+        blocos.close()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Exportação do relatório de orçamentos."
+    )
+    parser.add_argument("arquivo", help="arquivo de saída (.csv ou .parquet)")
+    parser.add_argument("--inicio", required=True, help="data inicial (YYYY-MM-DD)")
+    parser.add_argument("--fim", required=True, help="data final (YYYY-MM-DD)")
+    parser.add_argument("--produto", type=int, default=-1)
+    parser.add_argument("--bloco", type=int, default=TAMANHO_BLOCO_RELATORIO)
+    args = parser.parse_args()
+
+    formato = args.arquivo.rsplit(".", 1)[-1].lower()
+    if formato not in FORMATOS:
+        parser.error("o arquivo deve ter a extensão .csv ou .parquet")
+
+    setup_logging()
+    criar_banco_de_dados()
+
+    inicio = time.perf_counter()
+    linhas = exportar_relatorio(
+        args.arquivo, formato, args.inicio, args.fim, args.produto, args.bloco
+    )
+    if linhas is None:
+        print("A exportação falhou; consulte o log.")
+    else:
+        print(f"{linhas} linhas exportadas em {time.perf_counter() - inicio:.2f}s.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,297 @@
+"""
+Importação em massa de produtos, clientes, vendedores e ofertas a partir de arquivos CSV.
+
+Uso (a partir da pasta src):
+    python -m services.importacao produtos produtos.csv --erros erros.csv
+
+Colunas esperadas (primeira linha do arquivo):
+    produtos:   descricao, preco (em reais, ex: 3.10 ou 3,10)
+    clientes:   nome
+    vendedores: nome
+    ofertas:    produto_id, quantidade_levar, quantidade_pagar
+"""
+
+import argparse
+import csv
+import logging
+import time
+from contextlib import contextmanager
+from services.banco_de_dados import conectar, criar_banco_de_dados
+from services.dinheiro import para_centavos
+from services.log import setup_logging
+from services.migracoes import TABELAS_BUSCA
+
+
+TAMANHO_LOTE = 10_000
+LIMITE_ERROS_EM_MEMORIA = 1_000
+
+
+def _texto_obrigatorio(valor: str, campo: str) -> str:
+    valor = (valor or "").strip()
+    if not valor:
+        raise ValueError(f"O campo '{campo}' não pode estar vazio.")
+
+    return valor
+
+
+def _inteiro_positivo(valor: str, campo: str) -> int:
+    try:
+        numero = int((valor or "").strip())
+    except ValueError:
+        raise ValueError(f"O campo '{campo}' deve ser um número inteiro.")
+    if numero <= 0:
+        raise ValueError(f"O campo '{campo}' deve ser maior que zero.")
+
+    return numero
+
+
+def _validar_produto(linha: dict, contexto: dict) -> tuple:
+    descricao = _texto_obrigatorio(linha["descricao"], "descricao")
+    try:
+        preco_centavos = para_centavos(linha["preco"] or "")
+    except ValueError:
+        raise ValueError("O campo 'preco' deve ser numérico.")
+    if preco_centavos <= 0:
+        raise ValueError("O campo 'preco' deve ser maior que zero.")
+
+    return (descricao, preco_centavos)
+
+
+def _validar_nome(linha: dict, contexto: dict) -> tuple:
+    return (_texto_obrigatorio(linha["nome"], "nome"),)
+
+
+def _validar_oferta(linha: dict, contexto: dict) -> tuple:
+    produto_id = _inteiro_positivo(linha["produto_id"], "produto_id")
+    quantidade_levar = _inteiro_positivo(linha["quantidade_levar"], "quantidade_levar")
+    quantidade_pagar = _inteiro_positivo(linha["quantidade_pagar"], "quantidade_pagar")
+
+    if quantidade_pagar >= quantidade_levar:
+        raise ValueError(
+            "A quantidade a pagar deve ser menor que a quantidade a levar."
+        )
+    if produto_id not in contexto["produtos"]:
+        raise ValueError(f"O produto {produto_id} não existe.")
+
+    return (produto_id, quantidade_levar, quantidade_pagar)
+
+
+def _carregar_produtos(conn) -> dict:
+    cursor = conn.execute("SELECT codigo FROM produtos")
+    return {"produtos": {linha[0] for linha in cursor}}
+
+
+@contextmanager
+def indexacao_de_busca_adiada(conn, tabela: str):
+    """
+    Substitui, dentro de uma transação, a indexação linha a linha da busca textual por uma
+    única inserção em bloco no índice FTS5 ao final.
+
+    O gatilho de inserção do índice é removido e recriado na mesma transação, portanto nenhuma
+    outra conexão observa o banco de dados sem ele. Os registros novos são identificados pelo
+    "codigo", que é sempre crescente (AUTOINCREMENT).
+    """
+    if tabela not in TABELAS_BUSCA:
+        yield
+        return
+
+    busca = f"{tabela}_busca"
+    coluna = TABELAS_BUSCA[tabela]
+    gatilho = f"trg_{busca}_insert"
+
+    if not conn.in_transaction:
+        conn.execute("BEGIN IMMEDIATE")
+    ultimo_codigo = conn.execute(
+        f"SELECT COALESCE(MAX(codigo), 0) FROM {tabela}"
+    ).fetchone()[0]
+    sql_gatilho = conn.execute(
+        "SELECT sql FROM sqlite_master WHERE type = 'trigger' AND name = ?", (gatilho,)
+    ).fetchone()[0]
+    conn.execute(f"DROP TRIGGER {gatilho}")
+
+    yield
+
+    conn.execute(
+        f"INSERT INTO {busca} (rowid, {coluna}) "
+        f"SELECT codigo, {coluna} FROM {tabela} WHERE codigo > ?",
+        (ultimo_codigo,),
+    )
+    conn.execute(sql_gatilho)
+
+
+# Tipo -> (colunas do CSV, validação de uma linha, INSERT, carga do contexto de validação)
+IMPORTACOES = {
+    "produtos": (
+        ("descricao", "preco"),
+        _validar_produto,
+        "INSERT OR IGNORE INTO produtos (descricao, preco_centavos) VALUES (?, ?)",
+        None,
+    ),
+    "clientes": (
+        ("nome",),
+        _validar_nome,
+        "INSERT OR IGNORE INTO clientes (nome) VALUES (?)",
+        None,
+    ),
+    "vendedores": (
+        ("nome",),
+        _validar_nome,
+        "INSERT OR IGNORE INTO vendedores (nome) VALUES (?)",
+        None,
+    ),
+    "ofertas": (
+        ("produto_id", "quantidade_levar", "quantidade_pagar"),
+        _validar_oferta,
+        "INSERT OR IGNORE INTO ofertas (produto_id, quantidade_levar, quantidade_pagar) "
+        "VALUES (?, ?, ?)",
+        _carregar_produtos,
+    ),
+}
+
+
+def importar_csv(
+    tipo: str,
+    caminho: str,
+    tamanho_lote: int = TAMANHO_LOTE,
+    arquivo_erros: str | None = None,
+) -> dict:
+    """
+    Importa em massa os registros de um arquivo CSV para a tabela indicada por `tipo`.
+
+    O arquivo é lido linha a linha, sem carregá-lo inteiro na memória. Cada linha é validada
+    (ex: preço maior que zero, quantidade a pagar menor que a quantidade a levar, produto
+    existente) e as linhas válidas são acumuladas em blocos de `tamanho_lote` registros,
+    inseridos com um único `executemany` e confirmados em uma transação por bloco. Nas tabelas
+    com busca textual, o índice FTS5 é atualizado uma única vez por bloco, em vez de uma vez
+    por linha. Assim como em `adicionar_*`, a inserção utiliza "INSERT OR IGNORE": registros
+    já existentes são contados como ignorados.
+
+    As linhas inválidas não interrompem a importação: cada erro é registrado com o número da
+    linha no arquivo. Os primeiros `LIMITE_ERROS_EM_MEMORIA` erros são retornados no relatório
+    e, se `arquivo_erros` for informado, todos os erros são gravados nele em formato CSV.
+
+    Args:
+        tipo (str): "produtos", "clientes", "vendedores" ou "ofertas".
+        caminho (str): Caminho do arquivo CSV (UTF-8, separado por vírgulas, com cabeçalho).
+        tamanho_lote (int): Quantidade de registros por bloco/transação. Padrão é `TAMANHO_LOTE`.
+        arquivo_erros (str | None): Caminho do CSV em que os erros serão gravados.
+
+    Returns:
+        dict: Um relatório com os campos:
+              - "lidas": linhas de dados lidas do arquivo.
+              - "inseridas": registros inseridos.
+              - "ignoradas": linhas válidas ignoradas por já existirem no banco de dados.
+              - "invalidas": linhas rejeitadas pela validação.
+              - "erros": lista de tuplas (linha, mensagem).
+              - "segundos": duração da importação.
+
+    Raises:
+        Exception: Se ocorrer algum erro durante a operação, a exceção é capturada, registrada no
+                   log e no relatório; os blocos já confirmados permanecem no banco de dados.
+    """
+    colunas, validar, sql, carregar_contexto = IMPORTACOES[tipo]
+    relatorio = {
+        "lidas": 0,
+        "inseridas": 0,
+        "ignoradas": 0,
+        "invalidas": 0,
+        "erros": [],
+        "segundos": 0.0,
+    }
+    inicio = time.perf_counter()
+    saida_erros = (
+        open(arquivo_erros, "w", newline="", encoding="utf-8")
+        if arquivo_erros
+        else None
+    )
+
+    def registrar_erro(numero_linha: int, mensagem: str) -> None:
+        relatorio["invalidas"] += 1
+        if len(relatorio["erros"]) < LIMITE_ERROS_EM_MEMORIA:
+            relatorio["erros"].append((numero_linha, mensagem))
+        if saida_erros is not None:
+            escritor_erros.writerow((numero_linha, mensagem))
+
+    try:
+        if saida_erros is not None:
+            escritor_erros = csv.writer(saida_erros)
+            escritor_erros.writerow(("linha", "erro"))
+
+        with open(
+            caminho, newline="", encoding="utf-8-sig"
+        ) as arquivo, conectar() as conn:
+            leitor = csv.DictReader(arquivo)
+            faltantes = [
+                coluna for coluna in colunas if coluna not in (leitor.fieldnames or [])
+            ]
+            if faltantes:
+                registrar_erro(
+                    1, f"Colunas ausentes no cabeçalho: {', '.join(faltantes)}."
+                )
+                return relatorio
+
+            contexto = carregar_contexto(conn) if carregar_contexto else {}
+            cursor = conn.cursor()
+
+            def gravar(valores: list) -> None:
+                with indexacao_de_busca_adiada(conn, tipo):
+                    cursor.executemany(sql, valores)
+                conn.commit()
+                relatorio["inseridas"] += cursor.rowcount
+                relatorio["ignoradas"] += len(valores) - cursor.rowcount
+
+            valores = []
+            for linha in leitor:
+                relatorio["lidas"] += 1
+                try:
+                    valores.append(validar(linha, contexto))
+                except ValueError as e:
+                    registrar_erro(leitor.line_num, str(e))
+
+                if len(valores) >= tamanho_lote:
+                    gravar(valores)
+                    valores = []
+
+            if valores:
+                gravar(valores)
+
+        logging.info(
+            f"Importação de {tipo}: {relatorio['inseridas']} inseridos, "
+            f"{relatorio['ignoradas']} ignorados, {relatorio['invalidas']} inválidos."
+        )
+    except Exception as e:
+        logging.error(f"Erro ao importar {tipo}: {e}")
+        relatorio["erros"].append((None, str(e)))
+    finally:
+        if saida_erros is not None:
+            saida_erros.close()
+        relatorio["segundos"] = time.perf_counter() - inicio
+
+    return relatorio
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Importação em massa a partir de CSV.")
+    parser.add_argument("tipo", choices=list(IMPORTACOES))
+    parser.add_argument("arquivo")
+    parser.add_argument("--lote", type=int, default=TAMANHO_LOTE)
+    parser.add_argument("--erros", help="arquivo CSV para o relatório de erros")
+    args = parser.parse_args()
+
+    setup_logging()
+    criar_banco_de_dados()
+
+    relatorio = importar_csv(args.tipo, args.arquivo, args.lote, args.erros)
+    for numero_linha, mensagem in relatorio["erros"][:20]:
+        print(f"linha {numero_linha}: {mensagem}")
+
+    taxa = relatorio["lidas"] / relatorio["segundos"] if relatorio["segundos"] else 0
+    print(
+        f"{relatorio['lidas']} linhas lidas em {relatorio['segundos']:.2f}s "
+        f"({taxa:,.0f} linhas/s): {relatorio['inseridas']} inseridas, "
+        f"{relatorio['ignoradas']} ignoradas, {relatorio['invalidas']} inválidas."
+    )
+
+
+if __name__ == "__main__":
+    main()
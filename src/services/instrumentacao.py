@@ -0,0 +1,191 @@
+import logging
+import re
+import threading
+from collections import Counter, deque
+from functools import lru_cache
+
+
+LIMITE_CONSULTA_LENTA_MS = 200.0
+MAXIMO_CONSULTAS_LENTAS = 100
+MAXIMO_CONSULTAS_DISTINTAS = 2_000
+
+# Limites superiores (em ms) das faixas do histograma de duração; a última faixa é aberta.
+FAIXAS_HISTOGRAMA_MS = (0.1, 0.5, 1, 5, 10, 50, 100, 500, 1_000, 5_000)
+
+_estatisticas = {}
+_consultas_lentas = deque(maxlen=MAXIMO_CONSULTAS_LENTAS)
+_trava = threading.Lock()
+
+_LITERAIS = re.compile(r"'(?:[^']|'')*'|\b\d+(?:\.\d+)?\b")
+_LISTAS = re.compile(r"\(\s*\?(?:\s*,\s*\?)+\s*\)")
+_ESPACOS = re.compile(r"\s+")
+
+
+@lru_cache(maxsize=1_024)
+def normalizar_sql(sql: str) -> str:
+    """
+    Normaliza um comando SQL para agrupar as execuções da mesma consulta.
+
+    Literais de texto e números são substituídos por "?", listas de parâmetros
+    (ex: "IN (?, ?, ?)") são reduzidas a "(...)" e os espaços em branco são compactados.
+
+    Args:
+        sql (str): O comando SQL executado.
+
+    Returns:
+        str: O comando normalizado.
+    """
+    sql = _LITERAIS.sub("?", sql)
+    sql = _LISTAS.sub("(...)", sql)
+    return _ESPACOS.sub(" ", sql).strip()
+
+
+def _faixa(duracao_ms: float) -> int:
+    for posicao, limite in enumerate(FAIXAS_HISTOGRAMA_MS):
+        if duracao_ms <= limite:
+            return posicao
+
+    return len(FAIXAS_HISTOGRAMA_MS)
+
+
+def registrar_execucao(
+    sql: str,
+    duracao_ms: float,
+    linhas: int,
+    origem: str,
+    plano: str | None = None,
+) -> None:
+    """
+    Acumula a execução de um comando SQL nas estatísticas em memória do processo.
+
+    As execuções são agrupadas pelo SQL normalizado. Para cada grupo são mantidos a quantidade
+    de execuções, as durações total e máxima, o total de linhas, o histograma de durações e as
+    funções de origem. Execuções com duração a partir de `LIMITE_CONSULTA_LENTA_MS` são
+    registradas no log e na lista de consultas lentas, junto com o plano de execução.
+
+    Args:
+        sql (str): O comando SQL executado.
+        duracao_ms (float): A duração da execução (incluindo a leitura das linhas), em ms.
+        linhas (int): As linhas lidas ou alteradas.
+        origem (str): A função que executou o comando (ex: "controllers.X.lista_de_x").
+        plano (str | None): O resultado do EXPLAIN QUERY PLAN, para as consultas lentas.
+
+    Returns:
+        None
+    """
+    normalizado = normalizar_sql(sql)
+    lenta = duracao_ms >= LIMITE_CONSULTA_LENTA_MS
+
+    with _trava:
+        estatistica = _estatisticas.get(normalizado)
+        if estatistica is None:
+            if len(_estatisticas) >= MAXIMO_CONSULTAS_DISTINTAS:
+                normalizado = "(outras consultas)"
+                estatistica = _estatisticas.get(normalizado)
+            if estatistica is None:
+                estatistica = _estatisticas[normalizado] = {
+                    "execucoes": 0,
+                    "total_ms": 0.0,
+                    "max_ms": 0.0,
+                    "linhas": 0,
+                    "histograma": [0] * (len(FAIXAS_HISTOGRAMA_MS) + 1),
+                    "origens": Counter(),
+                }
+        estatistica["execucoes"] += 1
+        estatistica["total_ms"] += duracao_ms
+        estatistica["max_ms"] = max(estatistica["max_ms"], duracao_ms)
+        estatistica["linhas"] += linhas
+        estatistica["histograma"][_faixa(duracao_ms)] += 1
+        estatistica["origens"][origem] += 1
+
+        if lenta:
+            _consultas_lentas.append(
+                {
+                    "sql": normalizado,
+                    "duracao_ms": duracao_ms,
+                    "linhas": linhas,
+                    "origem": origem,
+                    "plano": plano,
+                }
+            )
+
+    if lenta:
+        logging.warning(
+            f"Consulta lenta ({duracao_ms:.1f} ms, {linhas} linhas, {origem}): "
+            f"{normalizado} | Plano: {plano or 'indisponível'}"
+        )
+
+
+def _percentil(histograma: list, execucoes: int, percentil: float) -> float | None:
+    # Limite superior da faixa que contém o percentil (a faixa aberta não tem limite).
+    alvo = execucoes * percentil
+    acumulado = 0
+    for posicao, quantidade in enumerate(histograma):
+        acumulado += quantidade
+        if acumulado >= alvo:
+            return (
+                FAIXAS_HISTOGRAMA_MS[posicao]
+                if posicao < len(FAIXAS_HISTOGRAMA_MS)
+                else None
+            )
+
+    return None
+
+
+def estatisticas_consultas(ordenar_por: str = "total_ms", limite: int = 50) -> list:
+    """
+    Retorna as consultas mais custosas registradas desde o início do processo.
+
+    Args:
+        ordenar_por (str): O campo usado na ordenação decrescente: "total_ms", "media_ms",
+                           "max_ms", "execucoes" ou "linhas". Padrão é "total_ms".
+        limite (int): A quantidade máxima de consultas retornadas. Padrão é 50.
+
+    Returns:
+        list: Uma lista de dicionários com os campos "sql", "execucoes", "total_ms", "media_ms",
+              "p95_ms" (limite superior da faixa do histograma, None se for a faixa aberta),
+              "max_ms", "linhas", "histograma" e "origens" (as funções que executaram a consulta).
+    """
+    with _trava:
+        consultas = [
+            {
+                "sql": sql,
+                "execucoes": estatistica["execucoes"],
+                "total_ms": estatistica["total_ms"],
+                "media_ms": estatistica["total_ms"] / estatistica["execucoes"],
+                "p95_ms": _percentil(
+                    estatistica["histograma"], estatistica["execucoes"], 0.95
+                ),
+                "max_ms": estatistica["max_ms"],
+                "linhas": estatistica["linhas"],
+                "histograma": list(estatistica["histograma"]),
+                "origens": dict(estatistica["origens"].most_common()),
+            }
+            for sql, estatistica in _estatisticas.items()
+        ]
+
+    consultas.sort(key=lambda consulta: consulta[ordenar_por], reverse=True)
+    return consultas[:limite]
+
+
+def consultas_lentas() -> list:
+    """
+    Retorna as últimas `MAXIMO_CONSULTAS_LENTAS` consultas lentas, da mais recente à mais antiga.
+
+    Returns:
+        list: Uma lista de dicionários com os campos "sql", "duracao_ms", "linhas", "origem" e "plano".
+    """
+    with _trava:
+        return list(reversed(_consultas_lentas))
+
+
+def limpar_estatisticas_consultas() -> None:
+    """
+    Descarta as estatísticas e a lista de consultas lentas acumuladas.
+
+    Returns:
+        None
+    """
+    with _trava:
+        _estatisticas.clear()
+        _consultas_lentas.clear()
@@ -0,0 +1,318 @@
+"""
+Comandos de manutenção do banco de dados.
+
+Uso (a partir da pasta src):
+    python -m services.manutencao reconstruir-totais
+    python -m services.manutencao verificar-totais
+    python -m services.manutencao reconstruir-vendas-diarias
+    python -m services.manutencao verificar-vendas-diarias
+    python -m services.manutencao reconstruir-cubo-vendas
+    python -m services.manutencao verificar-cubo-vendas
+"""
+
+import argparse
+import logging
+from services.banco_de_dados import conectar, criar_banco_de_dados
+from services.log import setup_logging
+from services.migracoes import (
+    preencher_cubo_vendas,
+    preencher_orcamento_totais,
+    preencher_vendas_diarias,
+)
+
+
+def reconstruir_totais_orcamentos() -> None:
+    """
+    Recalcula a tabela "orcamento_totais" a partir dos itens dos orçamentos.
+
+    Deve ser utilizada após alterações feitas fora da aplicação com os gatilhos desativados,
+    ou quando `verificar_totais_orcamentos()` apontar divergências.
+
+    Returns:
+        None
+
+    Raises:
+        Exception: Se ocorrer algum erro durante a operação, a exceção é capturada e registrada no log.
+    """
+    try:
+        with conectar() as conn:
+            preencher_orcamento_totais(conn)
+            conn.commit()
+            logging.info("Totais dos orçamentos reconstruídos com sucesso.")
+    except Exception as e:
+        logging.error(f"Erro ao reconstruir totais dos orçamentos: {e}")
+
+
+def verificar_totais_orcamentos() -> list:
+    """
+    Compara os valores de "orcamento_totais" com os recalculados a partir de "orcamento_itens".
+
+    Como os valores são centavos inteiros, qualquer diferença de valor é uma divergência, assim
+    como diferenças na quantidade de itens e orçamentos com itens sem linha correspondente em
+    "orcamento_totais".
+
+    Returns:
+        list: Uma lista de dicionários com os campos "orcamento_id", "quantidade_itens",
+              "valor_itens_centavos" e "desconto_centavos" armazenados e os respectivos valores esperados
+              (prefixados com "esperado_"). Retorna uma lista vazia se tudo estiver consistente.
+
+    Raises:
+        Exception: Se ocorrer algum erro durante a consulta, a exceção é capturada e registrada no log.
+    """
+    try:
+        with conectar() as conn:
+            cursor = conn.cursor()
+            cursor.execute(
+                """
+                WITH esperado AS (
+                    SELECT
+                        orcamento_id,
+                        COUNT(*) as quantidade_itens,
+                        SUM(quantidade * preco_unitario_centavos) as valor_itens_centavos,
+                        SUM(desconto_centavos) as desconto_centavos
+                    FROM orcamento_itens
+                    GROUP BY orcamento_id
+                ),
+                comparacao AS (
+                    SELECT
+                        e.orcamento_id,
+                        t.quantidade_itens,
+                        t.valor_itens_centavos,
+                        t.desconto_centavos,
+                        e.quantidade_itens as esperado_quantidade_itens,
+                        e.valor_itens_centavos as esperado_valor_itens_centavos,
+                        e.desconto_centavos as esperado_desconto_centavos
+                    FROM esperado e
+                    LEFT JOIN orcamento_totais t ON t.orcamento_id = e.orcamento_id
+                    UNION ALL
+                    SELECT
+                        t.orcamento_id,
+                        t.quantidade_itens,
+                        t.valor_itens_centavos,
+                        t.desconto_centavos,
+                        0,
+                        0,
+                        0
+                    FROM orcamento_totais t
+                    WHERE t.orcamento_id NOT IN (SELECT orcamento_id FROM esperado)
+                )
+                SELECT * FROM comparacao
+                WHERE quantidade_itens IS NULL
+                   OR quantidade_itens != esperado_quantidade_itens
+                   OR valor_itens_centavos != esperado_valor_itens_centavos
+                   OR desconto_centavos != esperado_desconto_centavos
+                """
+            )
+            divergencias = cursor.fetchall()
+            return [dict(divergencia) for divergencia in divergencias]
+    except Exception as e:
+        logging.error(f"Erro ao verificar totais dos orçamentos: {e}")
+        return []
+
+
+def reconstruir_vendas_diarias() -> None:
+    """
+    Recalcula a tabela de resumo "vendas_diarias" a partir dos itens dos orçamentos.
+
+    Preenche o resumo de bancos de dados com orçamentos gravados com os gatilhos desativados, e
+    corrige as divergências apontadas por `verificar_vendas_diarias()`.
+
+    Returns:
+        None
+
+    Raises:
+        Exception: Se ocorrer algum erro durante a operação, a exceção é capturada e registrada no log.
+    """
+    try:
+        with conectar() as conn:
+            preencher_vendas_diarias(conn)
+            conn.commit()
+            logging.info("Resumo de vendas diárias reconstruído com sucesso.")
+    except Exception as e:
+        logging.error(f"Erro ao reconstruir resumo de vendas diárias: {e}")
+
+
+def verificar_vendas_diarias() -> list:
+    """
+    Compara as linhas de "vendas_diarias" com as recalculadas a partir de "orcamento_itens".
+
+    Returns:
+        list: Uma lista de dicionários com os campos "dia", "produto_id", "vendedor_id",
+              "quantidade", "itens", "valor_bruto_centavos" e "desconto_centavos" de cada linha
+              divergente, e o campo "origem": "resumo" para as linhas armazenadas que não
+              correspondem aos itens, e "itens" para as linhas esperadas que não estão no
+              resumo. Retorna uma lista vazia se tudo estiver consistente.
+
+    Raises:
+        Exception: Se ocorrer algum erro durante a consulta, a exceção é capturada e registrada no log.
+    """
+    try:
+        with conectar() as conn:
+            cursor = conn.cursor()
+            cursor.execute(
+                """
+                WITH esperado AS (
+                    SELECT
+                        o.dia_criacao as dia,
+                        i.produto_id,
+                        o.vendedor_id,
+                        SUM(i.quantidade) as quantidade,
+                        COUNT(*) as itens,
+                        SUM(i.quantidade * i.preco_unitario_centavos) as valor_bruto_centavos,
+                        SUM(i.desconto_centavos) as desconto_centavos
+                    FROM orcamento_itens i
+                    JOIN orcamentos o ON o.codigo = i.orcamento_id
+                    WHERE o.dia_criacao IS NOT NULL
+                    GROUP BY o.dia_criacao, i.produto_id, o.vendedor_id
+                ),
+                armazenado AS (
+                    SELECT
+                        dia, produto_id, vendedor_id,
+                        quantidade, itens, valor_bruto_centavos, desconto_centavos
+                    FROM vendas_diarias
+                )
+                SELECT 'resumo' as origem, * FROM (
+                    SELECT * FROM armazenado EXCEPT SELECT * FROM esperado
+                )
+                UNION ALL
+                SELECT 'itens' as origem, * FROM (
+                    SELECT * FROM esperado EXCEPT SELECT * FROM armazenado
+                )
+                ORDER BY dia, produto_id, vendedor_id
+                """
+            )
+            divergencias = cursor.fetchall()
+            return [dict(divergencia) for divergencia in divergencias]
+    except Exception as e:
+        logging.error(f"Erro ao verificar resumo de vendas diárias: {e}")
+        return []
+
+
+def reconstruir_cubo_vendas() -> None:
+    """
+    Recalcula o cubo de vendas "cubo_vendas" a partir dos itens dos orçamentos.
+
+    Corrige as divergências apontadas por `verificar_cubo_vendas()`.
+
+    Returns:
+        None
+
+    Raises:
+        Exception: Se ocorrer algum erro durante a operação, a exceção é capturada e registrada no log.
+    """
+    try:
+        with conectar() as conn:
+            preencher_cubo_vendas(conn)
+            conn.commit()
+            logging.info("Cubo de vendas reconstruído com sucesso.")
+    except Exception as e:
+        logging.error(f"Erro ao reconstruir cubo de vendas: {e}")
+
+
+def verificar_cubo_vendas() -> list:
+    """
+    Compara as linhas de "cubo_vendas" com as recalculadas a partir de "orcamento_itens".
+
+    Returns:
+        list: Uma lista de dicionários com os campos "mes", "produto_id", "vendedor_id",
+              "cliente_id", "quantidade", "itens", "valor_bruto_centavos" e
+              "desconto_centavos" de cada linha divergente, e o campo "origem", como em
+              `verificar_vendas_diarias()`. Retorna uma lista vazia se tudo estiver consistente.
+
+    Raises:
+        Exception: Se ocorrer algum erro durante a consulta, a exceção é capturada e registrada no log.
+    """
+    try:
+        with conectar() as conn:
+            cursor = conn.cursor()
+            cursor.execute(
+                """
+                WITH esperado AS (
+                    SELECT
+                        CAST(strftime('%Y%m', o.dia_criacao * 86400, 'unixepoch') AS INTEGER)
+                            as mes,
+                        i.produto_id,
+                        o.vendedor_id,
+                        o.cliente_id,
+                        SUM(i.quantidade) as quantidade,
+                        COUNT(*) as itens,
+                        SUM(i.quantidade * i.preco_unitario_centavos) as valor_bruto_centavos,
+                        SUM(i.desconto_centavos) as desconto_centavos
+                    FROM orcamento_itens i
+                    JOIN orcamentos o ON o.codigo = i.orcamento_id
+                    WHERE o.dia_criacao IS NOT NULL
+                    GROUP BY mes, i.produto_id, o.vendedor_id, o.cliente_id
+                ),
+                armazenado AS (
+                    SELECT
+                        mes, produto_id, vendedor_id, cliente_id,
+                        quantidade, itens, valor_bruto_centavos, desconto_centavos
+                    FROM cubo_vendas
+                )
+                SELECT 'cubo' as origem, * FROM (
+                    SELECT * FROM armazenado EXCEPT SELECT * FROM esperado
+                )
+                UNION ALL
+                SELECT 'itens' as origem, * FROM (
+                    SELECT * FROM esperado EXCEPT SELECT * FROM armazenado
+                )
+                ORDER BY mes, produto_id, vendedor_id, cliente_id
+                """
+            )
+            divergencias = cursor.fetchall()
+            return [dict(divergencia) for divergencia in divergencias]
+    except Exception as e:
+        logging.error(f"Erro ao verificar cubo de vendas: {e}")
+        return []
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Manutenção do banco de dados.")
+    parser.add_argument(
+        "comando",
+        choices=[
+            "reconstruir-totais",
+            "verificar-totais",
+            "reconstruir-vendas-diarias",
+            "verificar-vendas-diarias",
+            "reconstruir-cubo-vendas",
+            "verificar-cubo-vendas",
+        ],
+    )
+    args = parser.parse_args()
+
+    setup_logging()
+    criar_banco_de_dados()
+
+    if args.comando == "reconstruir-totais":
+        reconstruir_totais_orcamentos()
+
+    elif args.comando == "verificar-totais":
+        divergencias = verificar_totais_orcamentos()
+        for divergencia in divergencias:
+            print(divergencia)
+        print(f"{len(divergencias)} orçamento(s) com totais divergentes.")
+
+    elif args.comando == "reconstruir-vendas-diarias":
+        reconstruir_vendas_diarias()
+
+    elif args.comando == "verificar-vendas-diarias":
+        divergencias = verificar_vendas_diarias()
+        for divergencia in divergencias:
+            print(divergencia)
+        print(
+            f"{len(divergencias)} linha(s) divergente(s) no resumo de vendas diárias."
+        )
+
+    elif args.comando == "reconstruir-cubo-vendas":
+        reconstruir_cubo_vendas()
+
+    elif args.comando == "verificar-cubo-vendas":
+        divergencias = verificar_cubo_vendas()
+        for divergencia in divergencias:
+            print(divergencia)
+        print(f"{len(divergencias)} linha(s) divergente(s) no cubo de vendas.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,930 @@
+import sqlite3
+import logging
+from services.esquema import carregar_esquema
+from services.banco_de_dados import (
+    conectar,
+    criar_tabela_clientes,
+    criar_tabela_produtos,
+    criar_tabela_vendedores,
+    criar_tabela_ofertas,
+    criar_tabela_orcamentos,
+    criar_tabela_orcamento_itens,
+)
+
+
+def _migracao_tabelas_base(conn) -> None:
+    criar_tabela_clientes(conn)
+    criar_tabela_produtos(conn)
+    criar_tabela_vendedores(conn)
+    criar_tabela_ofertas(conn)
+    criar_tabela_orcamentos(conn)
+    criar_tabela_orcamento_itens(conn)
+
+
+# Tabela -> (função de criação, colunas, condição para manter a linha na cópia)
+TABELAS_COM_CHAVES_ESTRANGEIRAS = {
+    "ofertas": (
+        criar_tabela_ofertas,
+        "codigo, produto_id, quantidade_levar, quantidade_pagar",
+        "produto_id IN (SELECT codigo FROM produtos)",
+    ),
+    "orcamentos": (
+        criar_tabela_orcamentos,
+        "codigo, cliente_id, vendedor_id, data_criacao",
+        "cliente_id IN (SELECT codigo FROM clientes) "
+        "AND vendedor_id IN (SELECT codigo FROM vendedores)",
+    ),
+    "orcamento_itens": (
+        criar_tabela_orcamento_itens,
+        "codigo, orcamento_id, produto_id, quantidade, preco_unitario, desconto",
+        "orcamento_id IN (SELECT codigo FROM orcamentos) "
+        "AND produto_id IN (SELECT codigo FROM produtos)",
+    ),
+}
+
+
+def _migracao_chaves_estrangeiras(conn) -> None:
+    """
+    Recria as tabelas cujas chaves estrangeiras apontam para a coluna inexistente "id".
+
+    As versões anteriores do esquema declaravam `REFERENCES <tabela> (id)`, mas as tabelas
+    utilizam "codigo" como chave primária. Como o SQLite não permite alterar uma chave
+    estrangeira, cada tabela afetada é recriada seguindo o procedimento recomendado:
+    cria-se a nova tabela, copiam-se os dados, remove-se a antiga e renomeia-se a nova.
+
+    Linhas órfãs (que referenciam registros já removidos) não são copiadas, pois nunca
+    foram exibidas pela aplicação, que sempre utilizou JOINs internos nessas tabelas.
+    """
+    for tabela, (
+        criar_tabela,
+        colunas,
+        condicao,
+    ) in TABELAS_COM_CHAVES_ESTRANGEIRAS.items():
+        chaves = conn.execute(f"PRAGMA foreign_key_list({tabela})").fetchall()
+        if not any(chave["to"] == "id" for chave in chaves):
+            continue
+
+        nova_tabela = f"{tabela}_nova"
+        criar_tabela(conn, nome=nova_tabela)
+        conn.execute(
+            f"INSERT INTO {nova_tabela} ({colunas}) "
+            f"SELECT {colunas} FROM {tabela} WHERE {condicao}"
+        )
+
+        total = conn.execute(f"SELECT COUNT(*) FROM {tabela}").fetchone()[0]
+        copiadas = conn.execute(f"SELECT COUNT(*) FROM {nova_tabela}").fetchone()[0]
+        if total != copiadas:
+            logging.warning(
+                f"{total - copiadas} registro(s) órfão(s) descartado(s) da tabela '{tabela}'."
+            )
+
+        sequencia = conn.execute(
+            "SELECT seq FROM sqlite_sequence WHERE name = ?", (tabela,)
+        ).fetchone()
+
+        conn.execute(f"DROP TABLE {tabela}")
+        conn.execute(f"ALTER TABLE {nova_tabela} RENAME TO {tabela}")
+
+        if sequencia is not None:
+            conn.execute(
+                "UPDATE sqlite_sequence SET seq = MAX(seq, ?) WHERE name = ?",
+                (sequencia["seq"], tabela),
+            )
+
+    _verificar_chaves_estrangeiras(conn)
+
+
+def _verificar_chaves_estrangeiras(conn) -> None:
+    violacoes = conn.execute("PRAGMA foreign_key_check").fetchall()
+    if violacoes:
+        raise sqlite3.IntegrityError(
+            f"A migração violaria {len(violacoes)} chave(s) estrangeira(s)."
+        )
+
+
+INDICES = (
+    # Junção com orcamentos e somas por orçamento, sem acessar a tabela.
+    "CREATE INDEX IF NOT EXISTS idx_orcamento_itens_orcamento "
+    "ON orcamento_itens (orcamento_id, produto_id, quantidade, preco_unitario, desconto)",
+    # Filtro por produto nos relatórios e remoção em cascata de produtos.
+    "CREATE INDEX IF NOT EXISTS idx_orcamento_itens_produto "
+    "ON orcamento_itens (produto_id, orcamento_id)",
+    # Filtro por período nos relatórios.
+    "CREATE INDEX IF NOT EXISTS idx_orcamentos_data_criacao "
+    "ON orcamentos (data_criacao, cliente_id, vendedor_id)",
+    # Remoção em cascata de clientes e vendedores.
+    "CREATE INDEX IF NOT EXISTS idx_orcamentos_cliente ON orcamentos (cliente_id)",
+    "CREATE INDEX IF NOT EXISTS idx_orcamentos_vendedor ON orcamentos (vendedor_id)",
+)
+
+
+def _migracao_indices(conn) -> None:
+    for sql in INDICES:
+        conn.execute(sql)
+
+
+# Dia do calendário (UTC) contado a partir de 1970-01-01, o mesmo valor de `services.datas.dia_epoch()`.
+EXPRESSAO_DIA_CRIACAO = "CAST(julianday(date({coluna})) - 2440587.5 AS INTEGER)"
+
+
+def _migracao_dia_criacao(conn) -> None:
+    """
+    Adiciona a coluna inteira "dia_criacao" em orcamentos, indexada, para filtros por período.
+
+    Comparar `DATE(data_criacao)` impede o uso de índices; com o dia armazenado como inteiro,
+    um intervalo de datas vira uma busca por faixa no índice. Os gatilhos preenchem a coluna
+    em qualquer inserção que não a informe e a mantêm coerente se "data_criacao" mudar.
+    """
+    dia_novo = EXPRESSAO_DIA_CRIACAO.format(coluna="NEW.data_criacao")
+
+    conn.execute("ALTER TABLE orcamentos ADD COLUMN dia_criacao INTEGER")
+    conn.execute(
+        "UPDATE orcamentos SET dia_criacao = "
+        + EXPRESSAO_DIA_CRIACAO.format(coluna="data_criacao")
+    )
+    conn.execute(
+        "CREATE INDEX IF NOT EXISTS idx_orcamentos_dia_criacao "
+        "ON orcamentos (dia_criacao, cliente_id, vendedor_id)"
+    )
+    conn.execute(
+        f"""
+        CREATE TRIGGER IF NOT EXISTS trg_orcamentos_dia_criacao_insert
+        AFTER INSERT ON orcamentos
+        WHEN NEW.dia_criacao IS NULL
+        BEGIN
+            UPDATE orcamentos SET dia_criacao = {dia_novo} WHERE codigo = NEW.codigo;
+        END
+        """
+    )
+    conn.execute(
+        f"""
+        CREATE TRIGGER IF NOT EXISTS trg_orcamentos_dia_criacao_update
+        AFTER UPDATE OF data_criacao ON orcamentos
+        BEGIN
+            UPDATE orcamentos SET dia_criacao = {dia_novo} WHERE codigo = NEW.codigo;
+        END
+        """
+    )
+
+
+def preencher_orcamento_totais(conn) -> None:
+    """
+    Recalcula, a partir de "orcamento_itens", todas as linhas de "orcamento_totais".
+
+    Args:
+        conn: Conexão com uma transação aberta.
+    """
+    conn.execute("DELETE FROM orcamento_totais")
+    conn.execute(
+        """
+        INSERT INTO orcamento_totais (
+            orcamento_id, quantidade_itens, valor_itens_centavos, desconto_centavos
+        )
+        SELECT
+            orcamento_id,
+            COUNT(*),
+            SUM(quantidade * preco_unitario_centavos),
+            SUM(desconto_centavos)
+        FROM orcamento_itens
+        GROUP BY orcamento_id
+        """
+    )
+
+
+def _migracao_orcamento_totais(conn) -> None:
+    """
+    Cria a tabela materializada "orcamento_totais", mantida por gatilhos em "orcamento_itens".
+
+    Cada orçamento guarda a quantidade de itens, a soma de (quantidade * preco_unitario) e a
+    soma dos descontos, permitindo listar os orçamentos sem reagregar todos os itens.
+    """
+    conn.execute(
+        """
+        CREATE TABLE IF NOT EXISTS orcamento_totais (
+            orcamento_id INTEGER PRIMARY KEY,
+            quantidade_itens INTEGER NOT NULL DEFAULT 0,
+            valor_itens NUMERIC NOT NULL DEFAULT 0,
+            desconto NUMERIC NOT NULL DEFAULT 0,
+            FOREIGN KEY (orcamento_id) REFERENCES orcamentos (codigo) ON DELETE CASCADE
+        )
+        """
+    )
+    conn.execute(
+        """
+        CREATE TRIGGER IF NOT EXISTS trg_orcamento_itens_totais_insert
+        AFTER INSERT ON orcamento_itens
+        BEGIN
+            INSERT INTO orcamento_totais (orcamento_id, quantidade_itens, valor_itens, desconto)
+            VALUES (NEW.orcamento_id, 1, NEW.quantidade * NEW.preco_unitario, NEW.desconto)
+            ON CONFLICT (orcamento_id) DO UPDATE SET
+                quantidade_itens = quantidade_itens + 1,
+                valor_itens = valor_itens + excluded.valor_itens,
+                desconto = desconto + excluded.desconto;
+        END
+        """
+    )
+    conn.execute(
+        """
+        CREATE TRIGGER IF NOT EXISTS trg_orcamento_itens_totais_delete
+        AFTER DELETE ON orcamento_itens
+        BEGIN
+            UPDATE orcamento_totais SET
+                quantidade_itens = quantidade_itens - 1,
+                valor_itens = valor_itens - OLD.quantidade * OLD.preco_unitario,
+                desconto = desconto - OLD.desconto
+            WHERE orcamento_id = OLD.orcamento_id;
+        END
+        """
+    )
+    conn.execute(
+        """
+        CREATE TRIGGER IF NOT EXISTS trg_orcamento_itens_totais_update
+        AFTER UPDATE OF orcamento_id, quantidade, preco_unitario, desconto ON orcamento_itens
+        BEGIN
+            UPDATE orcamento_totais SET
+                quantidade_itens = quantidade_itens - 1,
+                valor_itens = valor_itens - OLD.quantidade * OLD.preco_unitario,
+                desconto = desconto - OLD.desconto
+            WHERE orcamento_id = OLD.orcamento_id;
+            INSERT INTO orcamento_totais (orcamento_id, quantidade_itens, valor_itens, desconto)
+            VALUES (NEW.orcamento_id, 1, NEW.quantidade * NEW.preco_unitario, NEW.desconto)
+            ON CONFLICT (orcamento_id) DO UPDATE SET
+                quantidade_itens = quantidade_itens + 1,
+                valor_itens = valor_itens + excluded.valor_itens,
+                desconto = desconto + excluded.desconto;
+        END
+        """
+    )
+    conn.execute(
+        """
+        INSERT INTO orcamento_totais (orcamento_id, quantidade_itens, valor_itens, desconto)
+        SELECT orcamento_id, COUNT(*), SUM(quantidade * preco_unitario), SUM(desconto)
+        FROM orcamento_itens
+        GROUP BY orcamento_id
+        """
+    )
+
+
+# Tabela -> coluna indexada na busca textual (tabela FTS5 "<tabela>_busca").
+TABELAS_BUSCA = {
+    "produtos": "descricao",
+    "clientes": "nome",
+    "vendedores": "nome",
+}
+
+
+def _migracao_busca_textual(conn) -> None:
+    """
+    Cria os índices de busca textual (FTS5) de produtos, clientes e vendedores.
+
+    Cada índice é uma tabela FTS5 de conteúdo externo, que não duplica o texto da tabela de
+    origem e usa o "codigo" do registro como rowid. O tokenizador remove acentos e os prefixos
+    de 2 e 3 caracteres são indexados, para que a busca por prefixo enquanto o usuário digita
+    seja resolvida diretamente no índice. Gatilhos mantêm os índices sincronizados.
+    """
+    for tabela, coluna in TABELAS_BUSCA.items():
+        busca = f"{tabela}_busca"
+        conn.execute(
+            f"""
+            CREATE VIRTUAL TABLE IF NOT EXISTS {busca} USING fts5(
+                {coluna},
+                content = '{tabela}',
+                content_rowid = 'codigo',
+                tokenize = 'unicode61 remove_diacritics 2',
+                prefix = '2 3'
+            )
+            """
+        )
+        conn.execute(
+            f"""
+            CREATE TRIGGER IF NOT EXISTS trg_{busca}_insert AFTER INSERT ON {tabela}
+            BEGIN
+                INSERT INTO {busca} (rowid, {coluna}) VALUES (NEW.codigo, NEW.{coluna});
+            END
+            """
+        )
+        conn.execute(
+            f"""
+            CREATE TRIGGER IF NOT EXISTS trg_{busca}_delete AFTER DELETE ON {tabela}
+            BEGIN
+                INSERT INTO {busca} ({busca}, rowid, {coluna})
+                VALUES ('delete', OLD.codigo, OLD.{coluna});
+            END
+            """
+        )
+        conn.execute(
+            f"""
+            CREATE TRIGGER IF NOT EXISTS trg_{busca}_update AFTER UPDATE OF {coluna} ON {tabela}
+            BEGIN
+                INSERT INTO {busca} ({busca}, rowid, {coluna})
+                VALUES ('delete', OLD.codigo, OLD.{coluna});
+                INSERT INTO {busca} (rowid, {coluna}) VALUES (NEW.codigo, NEW.{coluna});
+            END
+            """
+        )
+        conn.execute(f"INSERT INTO {busca} ({busca}) VALUES ('rebuild')")
+
+
+TABELAS_VERSIONADAS = ("clientes", "produtos", "vendedores", "ofertas")
+
+
+def _migracao_versoes_tabelas(conn) -> None:
+    """
+    Cria a tabela "versoes_tabelas", com um contador de versão por tabela do catálogo.
+
+    Gatilhos incrementam o contador a cada inserção, alteração ou remoção (inclusive as
+    remoções em cascata), independentemente do processo que alterou os dados. O cache de
+    consultas (services/cache.py) usa esses contadores para descartar resultados desatualizados.
+    """
+    conn.execute(
+        """
+        CREATE TABLE IF NOT EXISTS versoes_tabelas (
+            tabela TEXT PRIMARY KEY,
+            versao INTEGER NOT NULL DEFAULT 0
+        ) WITHOUT ROWID
+        """
+    )
+    for tabela in TABELAS_VERSIONADAS:
+        _criar_gatilhos_de_versao(conn, tabela)
+
+
+def _criar_gatilhos_de_versao(conn, tabela: str) -> None:
+    conn.execute("INSERT OR IGNORE INTO versoes_tabelas (tabela) VALUES (?)", (tabela,))
+    for operacao in ("INSERT", "UPDATE", "DELETE"):
+        conn.execute(
+            f"""
+            CREATE TRIGGER IF NOT EXISTS trg_{tabela}_versao_{operacao.lower()}
+            AFTER {operacao} ON {tabela}
+            BEGIN
+                UPDATE versoes_tabelas SET versao = versao + 1 WHERE tabela = '{tabela}';
+            END
+            """
+        )
+
+
+# Tabela -> colunas monetárias convertidas de reais (NUMERIC) para centavos inteiros.
+COLUNAS_EM_CENTAVOS = {
+    "produtos": ("preco",),
+    "orcamento_itens": ("preco_unitario", "desconto"),
+    "orcamento_totais": ("valor_itens", "desconto"),
+}
+
+
+def _migracao_valores_em_centavos(conn) -> None:
+    """
+    Converte as colunas monetárias para centavos inteiros, renomeando-as com o sufixo "_centavos".
+
+    Valores em reais gravados como ponto flutuante acumulam erros de arredondamento nas somas
+    (ex: 0.1 + 0.2 != 0.3). Em centavos inteiros, preços, descontos e totais são exatos.
+    O `ALTER TABLE ... RENAME COLUMN` atualiza automaticamente os índices e gatilhos que usam
+    as colunas. Durante a conversão, o gatilho de alteração de "orcamento_itens" é suspenso e
+    "orcamento_totais" é recalculada uma única vez ao final.
+    """
+    for tabela, colunas in COLUNAS_EM_CENTAVOS.items():
+        for coluna in colunas:
+            conn.execute(
+                f"ALTER TABLE {tabela} RENAME COLUMN {coluna} TO {coluna}_centavos"
+            )
+
+    gatilho = "trg_orcamento_itens_totais_update"
+    sql_gatilho = conn.execute(
+        "SELECT sql FROM sqlite_master WHERE type = 'trigger' AND name = ?", (gatilho,)
+    ).fetchone()[0]
+    conn.execute(f"DROP TRIGGER {gatilho}")
+    for tabela in ("produtos", "orcamento_itens"):
+        conn.execute(
+            f"UPDATE {tabela} SET "
+            + ", ".join(
+                f"{coluna}_centavos = CAST(ROUND({coluna}_centavos * 100) AS INTEGER)"
+                for coluna in COLUNAS_EM_CENTAVOS[tabela]
+            )
+        )
+    conn.execute(sql_gatilho)
+
+    preencher_orcamento_totais(conn)
+
+
+def _migracao_versao_orcamentos(conn) -> None:
+    """
+    Adiciona a tabela "orcamentos" aos contadores de "versoes_tabelas".
+
+    Os resultados das tarefas de relatório (services/tarefas_relatorio.py) são identificados
+    por esse contador, e não são reaproveitados depois que algum orçamento é incluído ou
+    removido. Os itens não têm contador próprio: eles são gravados e removidos (em cascata)
+    na mesma transação do seu orçamento, que já incrementa o contador, e um gatilho por item
+    tornaria mais lenta a inclusão de orçamentos grandes.
+    """
+    _criar_gatilhos_de_versao(conn, "orcamentos")
+
+
+def _migracao_rascunhos(conn) -> None:
+    """
+    Cria a tabela "rascunhos", com os carrinhos dos orçamentos em elaboração.
+
+    Cada rascunho guarda apenas os pares (produto_id, quantidade), em JSON; os preços e
+    ofertas são aplicados ao exibir ou salvar o orçamento. O índice por "atualizado" atende à
+    remoção dos rascunhos abandonados (services/rascunhos.py).
+    """
+    conn.execute(
+        """
+        CREATE TABLE IF NOT EXISTS rascunhos (
+            codigo TEXT PRIMARY KEY,
+            itens TEXT NOT NULL,
+            atualizado REAL NOT NULL
+        ) WITHOUT ROWID
+        """
+    )
+    conn.execute(
+        "CREATE INDEX IF NOT EXISTS idx_rascunhos_atualizado ON rascunhos (atualizado)"
+    )
+
+
+def _acumular_vendas_diarias(selecao: str) -> str:
+    # Soma as linhas de `selecao` (dia, produto_id, vendedor_id, quantidade, itens,
+    # valor_bruto_centavos, desconto_centavos) em "vendas_diarias"; valores negativos subtraem.
+    return f"""
+        INSERT INTO vendas_diarias (
+            dia, produto_id, vendedor_id,
+            quantidade, itens, valor_bruto_centavos, desconto_centavos
+        )
+        {selecao}
+        ON CONFLICT (dia, produto_id, vendedor_id) DO UPDATE SET
+            quantidade = quantidade + excluded.quantidade,
+            itens = itens + excluded.itens,
+            valor_bruto_centavos = valor_bruto_centavos + excluded.valor_bruto_centavos,
+            desconto_centavos = desconto_centavos + excluded.desconto_centavos;
+    """
+
+
+def _vendas_do_item(item: str, sinal: str) -> str:
+    return _acumular_vendas_diarias(
+        f"""
+        SELECT
+            o.dia_criacao, {item}.produto_id, o.vendedor_id,
+            {sinal}{item}.quantidade, {sinal}1,
+            {sinal}{item}.quantidade * {item}.preco_unitario_centavos,
+            {sinal}{item}.desconto_centavos
+        FROM orcamentos o
+        WHERE o.codigo = {item}.orcamento_id AND o.dia_criacao IS NOT NULL
+        """
+    )
+
+
+def _vendas_do_orcamento(orcamento: str, sinal: str) -> str:
+    return _acumular_vendas_diarias(
+        f"""
+        SELECT
+            {orcamento}.dia_criacao, i.produto_id, {orcamento}.vendedor_id,
+            {sinal}SUM(i.quantidade), {sinal}COUNT(*),
+            {sinal}SUM(i.quantidade * i.preco_unitario_centavos),
+            {sinal}SUM(i.desconto_centavos)
+        FROM orcamento_itens i
+        WHERE i.orcamento_id = {orcamento}.codigo AND {orcamento}.dia_criacao IS NOT NULL
+        GROUP BY i.produto_id
+        """
+    )
+
+
+def preencher_vendas_diarias(conn) -> None:
+    """
+    Recalcula, a partir de "orcamento_itens" e "orcamentos", todas as linhas de "vendas_diarias".
+
+    Args:
+        conn: Conexão com uma transação aberta.
+    """
+    conn.execute("DELETE FROM vendas_diarias")
+    conn.execute(
+        """
+        INSERT INTO vendas_diarias (
+            dia, produto_id, vendedor_id,
+            quantidade, itens, valor_bruto_centavos, desconto_centavos
+        )
+        SELECT
+            o.dia_criacao,
+            i.produto_id,
+            o.vendedor_id,
+            SUM(i.quantidade),
+            COUNT(*),
+            SUM(i.quantidade * i.preco_unitario_centavos),
+            SUM(i.desconto_centavos)
+        FROM orcamento_itens i
+        JOIN orcamentos o ON o.codigo = i.orcamento_id
+        WHERE o.dia_criacao IS NOT NULL
+        GROUP BY o.dia_criacao, i.produto_id, o.vendedor_id
+        """
+    )
+
+
+def _migracao_vendas_diarias(conn) -> None:
+    """
+    Cria a tabela de resumo "vendas_diarias" (dia x produto x vendedor), mantida por gatilhos.
+
+    Cada linha guarda a quantidade vendida, a quantidade de itens, o valor bruto
+    (quantidade * preco_unitario), os descontos e o valor líquido (coluna gerada) dos itens dos
+    orçamentos daquele dia, produto e vendedor. Relatórios de meses ou anos somam algumas
+    linhas por dia, em vez de percorrer todos os itens do período.
+
+    Os gatilhos em "orcamento_itens" somam ou subtraem cada item. Um orçamento removido com os
+    itens ainda presentes (ex: em cascata, ao remover o seu cliente) é subtraído pelo gatilho
+    BEFORE DELETE de "orcamentos": quando a cascata remove os itens, o orçamento já não existe e
+    os gatilhos dos itens não encontram o dia. As linhas que ficam sem itens são removidas.
+    """
+    conn.execute(
+        """
+        CREATE TABLE IF NOT EXISTS vendas_diarias (
+            dia INTEGER NOT NULL,
+            produto_id INTEGER NOT NULL,
+            vendedor_id INTEGER NOT NULL,
+            quantidade INTEGER NOT NULL DEFAULT 0,
+            itens INTEGER NOT NULL DEFAULT 0,
+            valor_bruto_centavos INTEGER NOT NULL DEFAULT 0,
+            desconto_centavos INTEGER NOT NULL DEFAULT 0,
+            valor_liquido_centavos INTEGER
+                GENERATED ALWAYS AS (valor_bruto_centavos - desconto_centavos) VIRTUAL,
+            PRIMARY KEY (dia, produto_id, vendedor_id)
+        ) WITHOUT ROWID
+        """
+    )
+    conn.execute(
+        "CREATE INDEX IF NOT EXISTS idx_vendas_diarias_produto "
+        "ON vendas_diarias (produto_id, dia)"
+    )
+    conn.execute(
+        f"""
+        CREATE TRIGGER IF NOT EXISTS trg_orcamento_itens_vendas_insert
+        AFTER INSERT ON orcamento_itens
+        BEGIN
+            {_vendas_do_item("NEW", "")}
+        END
+        """
+    )
+    remover_vazias = """
+        DELETE FROM vendas_diarias
+        WHERE itens = 0 AND produto_id = OLD.produto_id AND (dia, vendedor_id) = (
+            SELECT dia_criacao, vendedor_id FROM orcamentos WHERE codigo = OLD.orcamento_id
+        );
+    """
+    conn.execute(
+        f"""
+        CREATE TRIGGER IF NOT EXISTS trg_orcamento_itens_vendas_delete
+        AFTER DELETE ON orcamento_itens
+        BEGIN
+            {_vendas_do_item("OLD", "-")}
+            {remover_vazias}
+        END
+        """
+    )
+    conn.execute(
+        f"""
+        CREATE TRIGGER IF NOT EXISTS trg_orcamento_itens_vendas_update
+        AFTER UPDATE OF orcamento_id, produto_id, quantidade, preco_unitario_centavos,
+            desconto_centavos ON orcamento_itens
+        BEGIN
+            {_vendas_do_item("OLD", "-")}
+            {remover_vazias}
+            {_vendas_do_item("NEW", "")}
+        END
+        """
+    )
+    remover_vazias_do_orcamento = """
+        DELETE FROM vendas_diarias
+        WHERE dia = OLD.dia_criacao AND vendedor_id = OLD.vendedor_id AND itens = 0;
+    """
+    conn.execute(
+        f"""
+        CREATE TRIGGER IF NOT EXISTS trg_orcamentos_vendas_delete
+        BEFORE DELETE ON orcamentos
+        BEGIN
+            {_vendas_do_orcamento("OLD", "-")}
+            {remover_vazias_do_orcamento}
+        END
+        """
+    )
+    conn.execute(
+        f"""
+        CREATE TRIGGER IF NOT EXISTS trg_orcamentos_vendas_update
+        AFTER UPDATE OF dia_criacao, vendedor_id ON orcamentos
+        WHEN OLD.dia_criacao IS NOT NEW.dia_criacao OR OLD.vendedor_id IS NOT NEW.vendedor_id
+        BEGIN
+            {_vendas_do_orcamento("OLD", "-")}
+            {remover_vazias_do_orcamento}
+            {_vendas_do_orcamento("NEW", "")}
+        END
+        """
+    )
+    preencher_vendas_diarias(conn)
+
+
+# Contador de "versoes_tabelas" incrementado quando itens de orçamentos já gravados são
+# alterados ou removidos, ou quando um orçamento muda de dia, cliente ou vendedor. Inclusões
+# não alteram o contador.
+CONTADOR_ALTERACOES_ORCAMENTOS = "orcamentos_alterados"
+
+
+def _migracao_contador_alteracoes_orcamentos(conn) -> None:
+    """
+    Cria o contador `CONTADOR_ALTERACOES_ORCAMENTOS` em "versoes_tabelas".
+
+    O cache colunar do relatório (services/cache_colunar.py) acrescenta os itens novos a partir
+    do maior "codigo" já carregado, e só precisa recarregar tudo quando linhas já carregadas
+    mudam. O contador de "orcamentos" não distingue os dois casos, pois também muda a cada
+    inclusão. As inclusões, que são a maioria das escritas, não executam esses gatilhos.
+    """
+    conn.execute(
+        "INSERT OR IGNORE INTO versoes_tabelas (tabela) VALUES (?)",
+        (CONTADOR_ALTERACOES_ORCAMENTOS,),
+    )
+    incrementar = f"""
+        UPDATE versoes_tabelas SET versao = versao + 1
+        WHERE tabela = '{CONTADOR_ALTERACOES_ORCAMENTOS}';
+    """
+    for operacao in ("UPDATE", "DELETE"):
+        conn.execute(
+            f"""
+            CREATE TRIGGER IF NOT EXISTS trg_orcamento_itens_alteracoes_{operacao.lower()}
+            AFTER {operacao} ON orcamento_itens
+            BEGIN
+                {incrementar}
+            END
+            """
+        )
+    # O preenchimento de "dia_criacao" logo após a inclusão do orçamento não é uma alteração.
+    conn.execute(
+        f"""
+        CREATE TRIGGER IF NOT EXISTS trg_orcamentos_alteracoes_update
+        AFTER UPDATE OF dia_criacao, data_criacao, cliente_id, vendedor_id ON orcamentos
+        WHEN OLD.dia_criacao IS NOT NULL
+        BEGIN
+            {incrementar}
+        END
+        """
+    )
+
+
+def _mes_do_dia(dia: str) -> str:
+    # Converte um número de dias desde 1970-01-01 no mês, no formato inteiro AAAAMM.
+    return f"CAST(strftime('%Y%m', {dia} * 86400, 'unixepoch') AS INTEGER)"
+
+
+def _acumular_cubo_vendas(selecao: str) -> str:
+    # Soma as linhas de `selecao` (mes, produto_id, vendedor_id, cliente_id, quantidade, itens,
+    # valor_bruto_centavos, desconto_centavos) em "cubo_vendas"; valores negativos subtraem.
+    return f"""
+        INSERT INTO cubo_vendas (
+            mes, produto_id, vendedor_id, cliente_id,
+            quantidade, itens, valor_bruto_centavos, desconto_centavos
+        )
+        {selecao}
+        ON CONFLICT (mes, produto_id, vendedor_id, cliente_id) DO UPDATE SET
+            quantidade = quantidade + excluded.quantidade,
+            itens = itens + excluded.itens,
+            valor_bruto_centavos = valor_bruto_centavos + excluded.valor_bruto_centavos,
+            desconto_centavos = desconto_centavos + excluded.desconto_centavos;
+    """
+
+
+def _cubo_do_item(item: str, sinal: str) -> str:
+    return _acumular_cubo_vendas(
+        f"""
+        SELECT
+            {_mes_do_dia("o.dia_criacao")}, {item}.produto_id, o.vendedor_id, o.cliente_id,
+            {sinal}{item}.quantidade, {sinal}1,
+            {sinal}{item}.quantidade * {item}.preco_unitario_centavos,
+            {sinal}{item}.desconto_centavos
+        FROM orcamentos o
+        WHERE o.codigo = {item}.orcamento_id AND o.dia_criacao IS NOT NULL
+        """
+    )
+
+
+def _cubo_do_orcamento(orcamento: str, sinal: str) -> str:
+    return _acumular_cubo_vendas(
+        f"""
+        SELECT
+            {_mes_do_dia(f"{orcamento}.dia_criacao")}, i.produto_id,
+            {orcamento}.vendedor_id, {orcamento}.cliente_id,
+            {sinal}SUM(i.quantidade), {sinal}COUNT(*),
+            {sinal}SUM(i.quantidade * i.preco_unitario_centavos),
+            {sinal}SUM(i.desconto_centavos)
+        FROM orcamento_itens i
+        WHERE i.orcamento_id = {orcamento}.codigo AND {orcamento}.dia_criacao IS NOT NULL
+        GROUP BY i.produto_id
+        """
+    )
+
+
+def preencher_cubo_vendas(conn) -> None:
+    """
+    Recalcula, a partir de "orcamento_itens" e "orcamentos", todas as linhas de "cubo_vendas".
+
+    Args:
+        conn: Conexão com uma transação aberta.
+    """
+    conn.execute("DELETE FROM cubo_vendas")
+    conn.execute(
+        f"""
+        INSERT INTO cubo_vendas (
+            mes, produto_id, vendedor_id, cliente_id,
+            quantidade, itens, valor_bruto_centavos, desconto_centavos
+        )
+        SELECT
+            {_mes_do_dia("o.dia_criacao")} as mes,
+            i.produto_id,
+            o.vendedor_id,
+            o.cliente_id,
+            SUM(i.quantidade),
+            COUNT(*),
+            SUM(i.quantidade * i.preco_unitario_centavos),
+            SUM(i.desconto_centavos)
+        FROM orcamento_itens i
+        JOIN orcamentos o ON o.codigo = i.orcamento_id
+        WHERE o.dia_criacao IS NOT NULL
+        GROUP BY mes, i.produto_id, o.vendedor_id, o.cliente_id
+        """
+    )
+
+
+def _migracao_cubo_vendas(conn) -> None:
+    """
+    Cria o cubo de vendas "cubo_vendas" (mês x produto x vendedor x cliente), mantido por gatilhos.
+
+    Cada linha guarda os mesmos totais de "vendas_diarias" (quantidade, itens, valor bruto,
+    descontos e valor líquido) para um mês, produto, vendedor e cliente. As consultas do painel
+    de vendas agrupam e filtram essas linhas por qualquer combinação das quatro dimensões, sem
+    ler os itens. A chave primária começa pelo mês; os índices por produto, vendedor e cliente
+    atendem aos filtros por essas dimensões.
+
+    Os gatilhos seguem as mesmas regras dos de "vendas_diarias", incluindo a troca de cliente de
+    um orçamento. As linhas que ficam sem itens são removidas.
+    """
+    conn.execute(
+        """
+        CREATE TABLE IF NOT EXISTS cubo_vendas (
+            mes INTEGER NOT NULL,
+            produto_id INTEGER NOT NULL,
+            vendedor_id INTEGER NOT NULL,
+            cliente_id INTEGER NOT NULL,
+            quantidade INTEGER NOT NULL DEFAULT 0,
+            itens INTEGER NOT NULL DEFAULT 0,
+            valor_bruto_centavos INTEGER NOT NULL DEFAULT 0,
+            desconto_centavos INTEGER NOT NULL DEFAULT 0,
+            valor_liquido_centavos INTEGER
+                GENERATED ALWAYS AS (valor_bruto_centavos - desconto_centavos) VIRTUAL,
+            PRIMARY KEY (mes, produto_id, vendedor_id, cliente_id)
+        ) WITHOUT ROWID
+        """
+    )
+    for dimensao in ("produto_id", "vendedor_id", "cliente_id"):
+        conn.execute(
+            f"CREATE INDEX IF NOT EXISTS idx_cubo_vendas_{dimensao.removesuffix('_id')} "
+            f"ON cubo_vendas ({dimensao}, mes)"
+        )
+    conn.execute(
+        f"""
+        CREATE TRIGGER IF NOT EXISTS trg_orcamento_itens_cubo_insert
+        AFTER INSERT ON orcamento_itens
+        BEGIN
+            {_cubo_do_item("NEW", "")}
+        END
+        """
+    )
+    remover_vazias = f"""
+        DELETE FROM cubo_vendas
+        WHERE itens = 0 AND produto_id = OLD.produto_id
+            AND (mes, vendedor_id, cliente_id) = (
+                SELECT {_mes_do_dia("dia_criacao")}, vendedor_id, cliente_id
+                FROM orcamentos WHERE codigo = OLD.orcamento_id
+            );
+    """
+    conn.execute(
+        f"""
+        CREATE TRIGGER IF NOT EXISTS trg_orcamento_itens_cubo_delete
+        AFTER DELETE ON orcamento_itens
+        BEGIN
+            {_cubo_do_item("OLD", "-")}
+            {remover_vazias}
+        END
+        """
+    )
+    conn.execute(
+        f"""
+        CREATE TRIGGER IF NOT EXISTS trg_orcamento_itens_cubo_update
+        AFTER UPDATE OF orcamento_id, produto_id, quantidade, preco_unitario_centavos,
+            desconto_centavos ON orcamento_itens
+        BEGIN
+            {_cubo_do_item("OLD", "-")}
+            {remover_vazias}
+            {_cubo_do_item("NEW", "")}
+        END
+        """
+    )
+    remover_vazias_do_orcamento = f"""
+        DELETE FROM cubo_vendas
+        WHERE mes = {_mes_do_dia("OLD.dia_criacao")} AND vendedor_id = OLD.vendedor_id
+            AND cliente_id = OLD.cliente_id AND itens = 0;
+    """
+    conn.execute(
+        f"""
+        CREATE TRIGGER IF NOT EXISTS trg_orcamentos_cubo_delete
+        BEFORE DELETE ON orcamentos
+        BEGIN
+            {_cubo_do_orcamento("OLD", "-")}
+            {remover_vazias_do_orcamento}
+        END
+        """
+    )
+    conn.execute(
+        f"""
+        CREATE TRIGGER IF NOT EXISTS trg_orcamentos_cubo_update
+        AFTER UPDATE OF dia_criacao, vendedor_id, cliente_id ON orcamentos
+        WHEN OLD.dia_criacao IS NOT NEW.dia_criacao OR OLD.vendedor_id IS NOT NEW.vendedor_id
+            OR OLD.cliente_id IS NOT NEW.cliente_id
+        BEGIN
+            {_cubo_do_orcamento("OLD", "-")}
+            {remover_vazias_do_orcamento}
+            {_cubo_do_orcamento("NEW", "")}
+        END
+        """
+    )
+    preencher_cubo_vendas(conn)
+
+
+# A posição de cada migração na lista define a versão (PRAGMA user_version) que ela produz.
+# Novas migrações devem ser sempre adicionadas ao final.
+MIGRACOES = [
+    _migracao_tabelas_base,
+    _migracao_chaves_estrangeiras,
+    _migracao_indices,
+    _migracao_dia_criacao,
+    _migracao_orcamento_totais,
+    _migracao_busca_textual,
+    _migracao_versoes_tabelas,
+    _migracao_valores_em_centavos,
+    _migracao_versao_orcamentos,
+    _migracao_rascunhos,
+    _migracao_vendas_diarias,
+    _migracao_contador_alteracoes_orcamentos,
+    _migracao_cubo_vendas,
+]
+
+
+def versao_do_banco(conn) -> int:
+    return conn.execute("PRAGMA user_version").fetchone()[0]
+
+
+def migrar_banco_de_dados() -> int:
+    """
+    Atualiza o esquema do banco de dados aplicando as migrações pendentes.
+
+    A versão atual do esquema é lida do `PRAGMA user_version`. Cada migração de `MIGRACOES`
+    com posição maior que essa versão é executada em sua própria transação (BEGIN IMMEDIATE),
+    que também grava a nova versão. Assim:
+      - Um banco novo recebe todas as migrações.
+      - Um banco existente é atualizado no próprio arquivo, sem perda de dados.
+      - Uma falha em uma migração desfaz apenas aquela migração, mantendo as anteriores.
+      - Processos concorrentes não aplicam a mesma migração duas vezes.
+
+    As chaves estrangeiras ficam desativadas durante as migrações, para permitir a recriação
+    de tabelas; migrações que recriam tabelas devem verificar a integridade com
+    `_verificar_chaves_estrangeiras()` antes de concluir.
+
+    Ao final, o registro do esquema em memória (services/esquema.py) é atualizado; é a única
+    atualização desse registro, já que o esquema só muda pelas migrações.
+
+    Returns:
+        int: A versão do esquema após a execução.
+
+    Raises:
+        sqlite3.Error: Se alguma migração falhar.
+    """
+    versao = _aplicar_migracoes()
+    carregar_esquema()
+    return versao
+
+
+def _aplicar_migracoes() -> int:
+    with conectar() as conn:
+        if versao_do_banco(conn) >= len(MIGRACOES):
+            return versao_do_banco(conn)
+
+        conn.execute("PRAGMA foreign_keys = OFF")
+        try:
+            while True:
+                conn.execute("BEGIN IMMEDIATE")
+                versao = versao_do_banco(conn)
+                if versao >= len(MIGRACOES):
+                    sqlite3.Connection.rollback(conn)
+                    return versao
+
+                migracao = MIGRACOES[versao]
+                try:
+                    migracao(conn)
+                    conn.execute(f"PRAGMA user_version = {versao + 1}")
+                    sqlite3.Connection.commit(conn)
+                except BaseException:
+                    sqlite3.Connection.rollback(conn)
+                    raise
+
+                logging.info(f"Migração {versao + 1} ({migracao.__name__}) aplicada.")
+        finally:
+            conn.execute("PRAGMA foreign_keys = ON")
@@ -0,0 +1,304 @@
+import json
+import logging
+from typing import TYPE_CHECKING, NamedTuple
+from services.banco_de_dados import conectar
+from services.datas import intervalo_de_dias
+
+# O NumPy é importado apenas nas funções vetorizadas; `ItemOrcamento` e a precificação item a
+# item são usados pelas páginas de orçamentos, que não precisam carregá-lo.
+if TYPE_CHECKING:
+    import numpy as np
+
+
+TAMANHO_BLOCO = 100_000
+
+
+class ItemOrcamento(NamedTuple):
+    """
+    Item de um orçamento já precificado, com os valores monetários em centavos inteiros.
+
+    É o registro que percorre o carrinho da página de orçamentos e `adicionar_orcamento()`;
+    os valores só são formatados em reais na exibição.
+    """
+
+    produto_id: int
+    descricao: str
+    quantidade: int
+    preco_unitario_centavos: int
+    desconto_centavos: int
+    total_centavos: int
+
+
+def calcular_item(
+    preco_unitario_centavos: int,
+    quantidade: int,
+    quantidade_levar: int = 0,
+    quantidade_pagar: int = 0,
+) -> tuple[int, int]:
+    """
+    Calcula o total e o desconto de um item, aplicando a oferta "leve X pague Y" se houver.
+
+    A quantidade é dividida em grupos de `quantidade_levar` unidades; em cada grupo completo
+    são cobradas apenas `quantidade_pagar` unidades, e as unidades restantes são cobradas pelo
+    preço unitário. Sem oferta (`quantidade_levar` igual a 0), o total é preço * quantidade.
+
+    Args:
+        preco_unitario_centavos (int): O preço unitário do produto, em centavos.
+        quantidade (int): A quantidade do produto.
+        quantidade_levar (int): A quantidade a levar da oferta, ou 0 se não houver oferta.
+        quantidade_pagar (int): A quantidade a pagar da oferta.
+
+    Returns:
+        tuple[int, int]: O total a pagar e o desconto concedido, em centavos.
+    """
+    if not quantidade_levar:
+        return preco_unitario_centavos * quantidade, 0
+
+    grupos = quantidade // quantidade_levar
+    restante = quantidade % quantidade_levar
+
+    total = (grupos * quantidade_pagar + restante) * preco_unitario_centavos
+    desconto = grupos * (quantidade_levar - quantidade_pagar) * preco_unitario_centavos
+
+    return total, desconto
+
+
+def precificar_item(
+    produto: dict, quantidade: int, oferta: dict | None = None
+) -> ItemOrcamento:
+    """
+    Monta o item de orçamento de um produto, aplicando a sua oferta, se houver.
+
+    Args:
+        produto (dict): O produto, com os campos "codigo", "descricao" e "preco_centavos".
+        quantidade (int): A quantidade do produto.
+        oferta (dict | None): A oferta do produto, com os campos "quantidade_levar" e
+                              "quantidade_pagar", ou None se não houver oferta.
+
+    Returns:
+        ItemOrcamento: O item precificado.
+    """
+    oferta = oferta or {}
+    total, desconto = calcular_item(
+        produto["preco_centavos"],
+        quantidade,
+        oferta.get("quantidade_levar", 0),
+        oferta.get("quantidade_pagar", 0),
+    )
+
+    return ItemOrcamento(
+        produto["codigo"],
+        produto["descricao"],
+        quantidade,
+        produto["preco_centavos"],
+        desconto,
+        total,
+    )
+
+
+def precificar_carrinho(itens: list[tuple[int, int]]) -> list[ItemOrcamento]:
+    """
+    Precifica um carrinho com os preços e ofertas atuais, lidos em uma única consulta.
+
+    Os produtos e as suas ofertas são lidos juntos (LEFT JOIN), de modo que todos os itens são
+    precificados com a mesma versão do catálogo. Quando chamada dentro de outro bloco
+    `conectar()`, a leitura participa da transação em andamento.
+
+    Args:
+        itens (list[tuple[int, int]]): Os itens do carrinho, como (produto_id, quantidade).
+
+    Returns:
+        list[ItemOrcamento]: Os itens precificados, na mesma ordem de `itens`.
+
+    Raises:
+        ValueError: Se alguma quantidade não for positiva ou algum produto não existir.
+        sqlite3.Error: Se ocorrer algum erro na consulta.
+    """
+    for produto_id, quantidade in itens:
+        if quantidade <= 0:
+            raise ValueError(f"Quantidade inválida para o produto {produto_id}.")
+
+    with conectar() as conn:
+        linhas = conn.execute(
+            """
+            SELECT p.codigo, p.descricao, p.preco_centavos,
+                   o.quantidade_levar, o.quantidade_pagar
+            FROM produtos p
+            LEFT JOIN ofertas o ON o.produto_id = p.codigo
+            WHERE p.codigo IN (SELECT value FROM json_each(?))
+            """,
+            (json.dumps(sorted({produto_id for produto_id, _ in itens})),),
+        ).fetchall()
+    produtos = {linha["codigo"]: dict(linha) for linha in linhas}
+
+    carrinho = []
+    for produto_id, quantidade in itens:
+        produto = produtos.get(produto_id)
+        if produto is None:
+            raise ValueError(f"Produto {produto_id} não encontrado.")
+        oferta = produto if produto["quantidade_levar"] is not None else None
+        carrinho.append(precificar_item(produto, quantidade, oferta))
+
+    return carrinho
+
+
+def calcular_lote(
+    precos_unitarios_centavos, quantidades, quantidades_levar, quantidades_pagar
+) -> "tuple[np.ndarray, np.ndarray]":
+    """
+    Versão vetorizada de `calcular_item()`, que calcula vários itens em uma única passagem NumPy.
+
+    Os argumentos são sequências (ou arrays) do mesmo tamanho, uma posição por item. Itens sem
+    oferta devem ter `quantidades_levar` igual a 0. Como os valores são centavos inteiros, os
+    resultados são idênticos aos de `calcular_item()`.
+
+    Args:
+        precos_unitarios_centavos: Os preços unitários, em centavos.
+        quantidades: As quantidades.
+        quantidades_levar: As quantidades a levar das ofertas (0 = sem oferta).
+        quantidades_pagar: As quantidades a pagar das ofertas.
+
+    Returns:
+        tuple[np.ndarray, np.ndarray]: Os totais a pagar e os descontos de cada item, em centavos.
+    """
+    import numpy as np
+
+    precos = np.asarray(precos_unitarios_centavos, dtype=np.int64)
+    quantidades = np.asarray(quantidades, dtype=np.int64)
+    levar = np.asarray(quantidades_levar, dtype=np.int64)
+    pagar = np.asarray(quantidades_pagar, dtype=np.int64)
+
+    com_oferta = levar > 0
+    divisor = np.where(com_oferta, levar, 1)
+    grupos = np.where(com_oferta, quantidades // divisor, 0)
+    restante = np.where(com_oferta, quantidades % divisor, quantidades)
+
+    totais = (grupos * pagar + restante) * precos
+    descontos = grupos * np.where(com_oferta, levar - pagar, 0) * precos
+
+    return totais, descontos
+
+
+def _tabela_de_ofertas(
+    ofertas: dict, maior_produto: int
+) -> "tuple[np.ndarray, np.ndarray]":
+    import numpy as np
+
+    levar = np.zeros(maior_produto + 1, dtype=np.int64)
+    pagar = np.zeros(maior_produto + 1, dtype=np.int64)
+    for produto_id, (quantidade_levar, quantidade_pagar) in ofertas.items():
+        if produto_id <= maior_produto:
+            levar[produto_id] = quantidade_levar
+            pagar[produto_id] = quantidade_pagar
+
+    return levar, pagar
+
+
+def simular_ofertas(
+    data_inicio: str,
+    data_fim: str,
+    ofertas: dict | None = None,
+    produto_codigo: int = -1,
+) -> dict:
+    """
+    Recalcula os itens dos orçamentos de um período com um conjunto de ofertas.
+
+    Os itens são lidos do banco de dados em blocos de `TAMANHO_BLOCO` linhas e cada bloco é
+    precificado de uma só vez por `calcular_lote()`, sem montar um DataFrame com todo o período.
+    A função atende a dois usos:
+      - Validação: sem o parâmetro `ofertas`, utiliza as ofertas cadastradas atualmente e
+        informa quantos itens têm desconto registrado diferente do recalculado.
+      - Simulação: com `ofertas`, calcula quanto os orçamentos do período teriam custado com
+        as ofertas informadas (ex: uma nova oferta para um produto).
+
+    Args:
+        data_inicio (str): Data de início do período, no formato "YYYY-MM-DD".
+        data_fim (str): Data final do período (inclusive), no formato "YYYY-MM-DD".
+        ofertas (dict | None): Dicionário {produto_id: (quantidade_levar, quantidade_pagar)}.
+                               Se for None, utiliza as ofertas cadastradas.
+        produto_codigo (int, optional): Código do produto para filtrar os itens.
+                                        Se for -1, todos os produtos são considerados.
+
+    Returns:
+        dict: Um dicionário com os campos:
+              - "itens": quantidade de itens recalculados.
+              - "total_registrado" e "desconto_registrado": somas dos valores gravados, em centavos.
+              - "total_simulado" e "desconto_simulado": somas dos valores recalculados, em centavos.
+              - "itens_divergentes": itens cujo desconto recalculado difere do gravado.
+              Retorna um dicionário vazio se ocorrer algum erro.
+
+    Raises:
+        Exception: Se ocorrer algum erro durante a operação, a exceção é capturada e registrada no log.
+    """
+    import numpy as np
+
+    query = """
+        SELECT i.produto_id, i.quantidade, i.preco_unitario_centavos, i.desconto_centavos
+        FROM orcamentos o
+        JOIN orcamento_itens i ON i.orcamento_id = o.codigo
+        WHERE o.dia_criacao >= ? AND o.dia_criacao < ?
+    """
+    params = list(intervalo_de_dias(data_inicio, data_fim))
+    if produto_codigo != -1:
+        query += " AND i.produto_id = ?"
+        params.append(produto_codigo)
+
+    resultado = {
+        "itens": 0,
+        "total_registrado": 0,
+        "desconto_registrado": 0,
+        "total_simulado": 0,
+        "desconto_simulado": 0,
+        "itens_divergentes": 0,
+    }
+
+    try:
+        with conectar() as conn:
+            if ofertas is None:
+                ofertas = {
+                    linha["produto_id"]: (
+                        linha["quantidade_levar"],
+                        linha["quantidade_pagar"],
+                    )
+                    for linha in conn.execute(
+                        "SELECT produto_id, quantidade_levar, quantidade_pagar FROM ofertas"
+                    )
+                }
+            maior_produto = conn.execute(
+                "SELECT COALESCE(MAX(codigo), 0) FROM produtos"
+            ).fetchone()[0]
+            levar_por_produto, pagar_por_produto = _tabela_de_ofertas(
+                ofertas, maior_produto
+            )
+
+            cursor = conn.execute(query, params)
+            while True:
+                linhas = cursor.fetchmany(TAMANHO_BLOCO)
+                if not linhas:
+                    break
+
+                produtos, quantidades, precos, descontos = (
+                    np.array(coluna, dtype=np.int64) for coluna in zip(*linhas)
+                )
+                totais_simulados, descontos_simulados = calcular_lote(
+                    precos,
+                    quantidades,
+                    levar_por_produto[produtos],
+                    pagar_por_produto[produtos],
+                )
+
+                resultado["itens"] += len(linhas)
+                resultado["total_registrado"] += int(
+                    (quantidades * precos - descontos).sum()
+                )
+                resultado["desconto_registrado"] += int(descontos.sum())
+                resultado["total_simulado"] += int(totais_simulados.sum())
+                resultado["desconto_simulado"] += int(descontos_simulados.sum())
+                resultado["itens_divergentes"] += int(
+                    np.count_nonzero(descontos != descontos_simulados)
+                )
+
+        return resultado
+    except Exception as e:
+        logging.error(f"Erro ao simular ofertas: {e}")
+        return {}
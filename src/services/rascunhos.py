@@ -0,0 +1,199 @@
+import json
+import logging
+import time
+from services.banco_de_dados import conectar
+from services.escrita import executar_escrita
+
+
+# Se True, os rascunhos também são gravados na tabela "rascunhos" e sobrevivem a um reinício.
+PERSISTIR_RASCUNHOS = True
+VALIDADE_RASCUNHOS = 24 * 60 * 60
+INTERVALO_LIMPEZA = 10 * 60
+
+# Código do rascunho -> {"itens": {produto_id: quantidade}, "atualizado": timestamp}.
+# Cada sessão altera apenas o seu próprio rascunho, e as operações sobre o dicionário são
+# atômicas no CPython; por isso não há uma trava global no caminho de cada alteração.
+_rascunhos = {}
+_ultima_limpeza = 0.0
+
+
+def _ler_persistido(codigo: str) -> dict:
+    if not PERSISTIR_RASCUNHOS:
+        return {}
+
+    try:
+        with conectar() as conn:
+            linha = conn.execute(
+                "SELECT itens FROM rascunhos WHERE codigo = ? AND atualizado >= ?",
+                (codigo, time.time() - VALIDADE_RASCUNHOS),
+            ).fetchone()
+    except Exception as e:
+        logging.error(f"Erro ao carregar rascunho: {e}")
+        return {}
+
+    if linha is None:
+        return {}
+    return {produto_id: quantidade for produto_id, quantidade in json.loads(linha[0])}
+
+
+def _registrar_erro(futuro) -> None:
+    if futuro.exception() is not None:
+        # O rascunho continua disponível em memória; apenas não sobreviverá a um reinício.
+        logging.error(f"Erro ao gravar rascunho: {futuro.exception()}")
+
+
+def _gravar(codigo: str, rascunho: dict) -> None:
+    if not PERSISTIR_RASCUNHOS:
+        return
+
+    # A gravação é feita pela thread de escrita, sem que a sessão aguarde o commit; as
+    # gravações de várias sessões pendentes ao mesmo tempo são agrupadas em um `executemany`.
+    if rascunho["itens"]:
+        futuro = executar_escrita(
+            """
+            INSERT INTO rascunhos (codigo, itens, atualizado) VALUES (?, ?, ?)
+            ON CONFLICT (codigo) DO UPDATE SET
+                itens = excluded.itens, atualizado = excluded.atualizado
+            """,
+            (
+                codigo,
+                json.dumps(list(rascunho["itens"].items())),
+                rascunho["atualizado"],
+            ),
+        )
+    else:
+        futuro = executar_escrita("DELETE FROM rascunhos WHERE codigo = ?", (codigo,))
+    futuro.add_done_callback(_registrar_erro)
+
+
+def _obter(codigo: str) -> dict:
+    rascunho = _rascunhos.get(codigo)
+    if rascunho is None:
+        rascunho = _rascunhos.setdefault(
+            codigo, {"itens": _ler_persistido(codigo), "atualizado": time.time()}
+        )
+    return rascunho
+
+
+def _limpar_periodicamente() -> None:
+    global _ultima_limpeza
+
+    agora = time.time()
+    if agora - _ultima_limpeza >= INTERVALO_LIMPEZA:
+        _ultima_limpeza = agora
+        remover_rascunhos_expirados()
+
+
+def rascunho_do_vendedor(vendedor_id: int) -> str:
+    """
+    Retorna o código do rascunho de orçamento de um vendedor.
+
+    Cada vendedor tem um único rascunho, identificado pelo seu código. Assim, o orçamento em
+    elaboração é recuperado ao selecionar o mesmo vendedor em outra sessão, após atualizar a
+    página ou reiniciar a aplicação. O rascunho só é registrado quando o primeiro item é
+    adicionado, de modo que sessões que apenas abrem a página não ocupam memória nem linhas
+    no banco de dados.
+
+    Args:
+        vendedor_id (int): O código do vendedor responsável pelo orçamento.
+
+    Returns:
+        str: O código do rascunho, usado pelas demais funções deste módulo.
+    """
+    return f"vendedor-{vendedor_id}"
+
+
+def itens_do_rascunho(codigo: str) -> list[tuple[int, int]]:
+    """
+    Retorna os itens de um rascunho de orçamento.
+
+    Se o rascunho não estiver em memória (ex: após reiniciar a aplicação), ele é lido da tabela
+    "rascunhos", desde que não tenha expirado. A cada `INTERVALO_LIMPEZA` segundos, a consulta
+    também remove os rascunhos abandonados (ver `remover_rascunhos_expirados()`).
+
+    Args:
+        codigo (str): O código do rascunho.
+
+    Returns:
+        list[tuple[int, int]]: Os itens, como (produto_id, quantidade), na ordem de inclusão.
+                               Os preços são aplicados por `precificar_carrinho()`.
+    """
+    _limpar_periodicamente()
+    rascunho = _rascunhos.get(codigo)
+    if rascunho is None:
+        itens = _ler_persistido(codigo)
+        if not itens:
+            return []
+        rascunho = _rascunhos.setdefault(
+            codigo, {"itens": itens, "atualizado": time.time()}
+        )
+    return list(rascunho["itens"].items())
+
+
+def adicionar_item(codigo: str, produto_id: int, quantidade: int) -> None:
+    """
+    Adiciona um produto ao rascunho de orçamento.
+
+    Se o produto já estiver no rascunho, as quantidades são somadas, para que a oferta
+    "leve X pague Y" seja aplicada sobre a quantidade total do produto.
+
+    Args:
+        codigo (str): O código do rascunho.
+        produto_id (int): O código do produto.
+        quantidade (int): A quantidade a adicionar.
+
+    Returns:
+        None
+    """
+    rascunho = _obter(codigo)
+    itens = rascunho["itens"]
+    itens[produto_id] = itens.get(produto_id, 0) + quantidade
+    rascunho["atualizado"] = time.time()
+    _gravar(codigo, rascunho)
+
+
+def descartar_rascunho(codigo: str) -> None:
+    """
+    Descarta um rascunho de orçamento, da memória e da tabela "rascunhos".
+
+    Deve ser chamada após salvar o orçamento, ou quando o usuário desiste dele.
+
+    Args:
+        codigo (str): O código do rascunho.
+
+    Returns:
+        None
+    """
+    _rascunhos.pop(codigo, None)
+    _gravar(codigo, {"itens": {}})
+
+
+def remover_rascunhos_expirados() -> int:
+    """
+    Remove os rascunhos não alterados há mais de `VALIDADE_RASCUNHOS` segundos.
+
+    Os rascunhos são removidos da memória e da tabela "rascunhos", o que limita o consumo de
+    memória do processo às sessões ativas.
+
+    Returns:
+        int: A quantidade de rascunhos removidos da memória.
+
+    Raises:
+        Exception: Se ocorrer algum erro na remoção dos rascunhos gravados, o erro é
+                   registrado no log.
+    """
+    limite = time.time() - VALIDADE_RASCUNHOS
+    expirados = [
+        codigo
+        for codigo, rascunho in list(_rascunhos.items())
+        if rascunho["atualizado"] < limite
+    ]
+    for codigo in expirados:
+        _rascunhos.pop(codigo, None)
+
+    if PERSISTIR_RASCUNHOS:
+        executar_escrita(
+            "DELETE FROM rascunhos WHERE atualizado < ?", (limite,)
+        ).add_done_callback(_registrar_erro)
+
+    return len(expirados)
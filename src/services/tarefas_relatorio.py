@@ -0,0 +1,270 @@
+import hashlib
+import json
+import logging
+import os
+import shutil
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from services import banco_de_dados
+from services.cache import versoes_das_tabelas
+from services.cache_colunar import ler_relatorio_colunar
+
+
+# Pasta dos resultados, criada ao lado do arquivo do banco de dados (ver `_pasta_resultados()`).
+PASTA_RESULTADOS = "cache_relatorios"
+MAXIMO_TAREFAS_SIMULTANEAS = 2
+VALIDADE_RESULTADOS = 24 * 60 * 60
+
+# Tabelas cujas alterações tornam um resultado desatualizado.
+TABELAS_DO_RELATORIO = ("orcamentos", "clientes", "vendedores", "produtos")
+
+# Situação da tarefa -> (progresso, descrição da etapa).
+ETAPAS = {
+    "na_fila": (0.0, "Aguardando na fila"),
+    "consultando": (0.3, "Consultando o banco de dados"),
+    "gravando": (0.8, "Gravando o resultado"),
+    "concluida": (1.0, "Concluído"),
+    "erro": (1.0, "Falhou"),
+}
+
+_tarefas = {}
+_trava = threading.Lock()
+_executor = None
+
+
+def _obter_executor() -> ThreadPoolExecutor:
+    global _executor
+
+    if _executor is None:
+        _executor = ThreadPoolExecutor(
+            max_workers=MAXIMO_TAREFAS_SIMULTANEAS, thread_name_prefix="relatorio"
+        )
+    return _executor
+
+
+def _pasta_resultados() -> str:
+    # Acompanha o banco configurado, de modo que bancos diferentes não compartilham resultados
+    # e a pasta não depende do diretório em que a aplicação foi iniciada.
+    pasta_banco = os.path.dirname(os.path.abspath(banco_de_dados.CAMINHO_BANCO))
+    return os.path.join(pasta_banco, PASTA_RESULTADOS)
+
+
+def _caminho_resultado(chave: str) -> str:
+    # Cada resultado é uma pasta com "resumo.parquet", "produtos.parquet" e "total_geral.json".
+    return os.path.join(_pasta_resultados(), chave)
+
+
+def _gravar_resultado(caminho: str, resultado: dict) -> None:
+    # Grava em uma pasta temporária e renomeia, para que leitores nunca vejam um resultado
+    # parcial. A pasta temporária tem nome único, pois outro processo que use o mesmo banco
+    # (ex: a API) pode estar gravando o mesmo resultado ao mesmo tempo.
+    pasta = _pasta_resultados()
+    os.makedirs(pasta, exist_ok=True)
+    temporaria = tempfile.mkdtemp(dir=pasta, prefix=".gravando-")
+    try:
+        resultado["resumo"].to_parquet(os.path.join(temporaria, "resumo.parquet"))
+        resultado["produtos"].to_parquet(os.path.join(temporaria, "produtos.parquet"))
+        with open(os.path.join(temporaria, "total_geral.json"), "w") as arquivo:
+            json.dump(int(resultado["total_geral"]), arquivo)
+        try:
+            os.replace(temporaria, caminho)
+        except OSError:
+            # O mesmo resultado já foi gravado por outro processo; ele é mantido.
+            if not os.path.isdir(caminho):
+                raise
+    finally:
+        shutil.rmtree(temporaria, ignore_errors=True)
+
+
+def _ler_resultado(caminho: str) -> dict:
+    import pandas as pd
+
+    with open(os.path.join(caminho, "total_geral.json")) as arquivo:
+        total_geral = json.load(arquivo)
+    return {
+        "resumo": pd.read_parquet(os.path.join(caminho, "resumo.parquet")),
+        "total_geral": total_geral,
+        "produtos": pd.read_parquet(os.path.join(caminho, "produtos.parquet")),
+    }
+
+
+def _chave_da_tarefa(data_inicio: str, data_fim: str, produto_codigo: int) -> str:
+    versoes = versoes_das_tabelas()
+    identificacao = json.dumps(
+        [
+            os.path.abspath(banco_de_dados.CAMINHO_BANCO),
+            data_inicio,
+            data_fim,
+            produto_codigo,
+            [versoes.get(tabela) for tabela in TABELAS_DO_RELATORIO],
+        ]
+    )
+    return hashlib.sha256(identificacao.encode()).hexdigest()[:32]
+
+
+def _atualizar(tarefa: dict, situacao: str, **campos) -> None:
+    with _trava:
+        tarefa["situacao"] = situacao
+        tarefa.update(campos)
+
+
+def _executar(chave: str, tarefa: dict) -> None:
+    _atualizar(tarefa, "consultando", inicio=time.time())
+    try:
+        # Na primeira tarefa do processo, carrega o cache colunar com todos os itens.
+        resultado = ler_relatorio_colunar(
+            tarefa["data_inicio"], tarefa["data_fim"], tarefa["produto_codigo"]
+        )
+
+        _atualizar(tarefa, "gravando")
+        _gravar_resultado(_caminho_resultado(chave), resultado)
+
+        _atualizar(
+            tarefa, "concluida", fim=time.time(), linhas=len(resultado["resumo"])
+        )
+    except Exception as e:
+        logging.error(f"Erro ao executar tarefa de relatório: {e}")
+        _atualizar(tarefa, "erro", fim=time.time(), erro=str(e))
+
+
+def _remover_resultados_antigos() -> None:
+    limite = time.time() - VALIDADE_RESULTADOS
+    with _trava:
+        for chave, tarefa in list(_tarefas.items()):
+            if tarefa.get("fim") is not None and tarefa["fim"] < limite:
+                del _tarefas[chave]
+
+    pasta = _pasta_resultados()
+    if not os.path.isdir(pasta):
+        return
+    for nome in os.listdir(pasta):
+        caminho = os.path.join(pasta, nome)
+        try:
+            if os.path.getmtime(caminho) < limite:
+                shutil.rmtree(caminho)
+        except OSError:
+            pass
+
+
+def enviar_relatorio(
+    data_inicio: str, data_fim: str, produto_codigo: int = -1
+) -> str | None:
+    """
+    Agenda a geração do resumo do relatório de orçamentos em segundo plano.
+
+    O resumo é calculado por `ler_relatorio_colunar()` em um grupo de até
+    `MAXIMO_TAREFAS_SIMULTANEAS` threads, e o resultado é gravado em arquivos Parquet na pasta
+    `PASTA_RESULTADOS`, ao lado do arquivo do banco de dados. A primeira tarefa do processo
+    também carrega o cache colunar dos itens (services/cache_colunar.py); a partir daí, a
+    página calcula os relatórios diretamente pelo cache. A tarefa é identificada pelos filtros
+    e pelos contadores de versão das tabelas consultadas (ver "versoes_tabelas"), de modo que:
+      - Pedidos idênticos feitos enquanto a tarefa está na fila ou em execução, por qualquer
+        sessão, compartilham a mesma tarefa.
+      - Um resultado já gravado é reaproveitado, inclusive após reiniciar a aplicação, até
+        que algum orçamento, cliente, vendedor ou produto seja alterado.
+      - Uma tarefa que falhou é executada novamente.
+
+    Resultados com mais de `VALIDADE_RESULTADOS` segundos são removidos a cada novo pedido.
+
+    Args:
+        data_inicio (str): Data de início do filtro, no formato "YYYY-MM-DD".
+        data_fim (str): Data final do filtro, no formato "YYYY-MM-DD".
+        produto_codigo (int, optional): Código do produto para filtrar os orçamentos.
+                                        Se for -1, o filtro por produto não é aplicado.
+
+    Returns:
+        str | None: A chave da tarefa, usada em `situacao_do_relatorio()` e
+                    `resultado_do_relatorio()`, ou None se ocorrer algum erro.
+
+    Raises:
+        Exception: Se ocorrer algum erro durante a operação, a exceção é capturada e registrada no log.
+    """
+    try:
+        _remover_resultados_antigos()
+        chave = _chave_da_tarefa(data_inicio, data_fim, produto_codigo)
+        gravado = os.path.isdir(_caminho_resultado(chave))
+
+        with _trava:
+            tarefa = _tarefas.get(chave)
+            if tarefa is not None and tarefa["situacao"] != "erro":
+                if tarefa["situacao"] != "concluida" or gravado:
+                    return chave
+
+            tarefa = {
+                "data_inicio": data_inicio,
+                "data_fim": data_fim,
+                "produto_codigo": produto_codigo,
+                "situacao": "concluida" if gravado else "na_fila",
+                "enviada": time.time(),
+                "inicio": None,
+                "fim": time.time() if gravado else None,
+            }
+            _tarefas[chave] = tarefa
+
+        if not gravado:
+            _obter_executor().submit(_executar, chave, tarefa)
+        return chave
+    except Exception as e:
+        logging.error(f"Erro ao enviar tarefa de relatório: {e}")
+
+
+def situacao_do_relatorio(chave: str) -> dict | None:
+    """
+    Retorna a situação de uma tarefa de relatório, para acompanhamento do progresso.
+
+    Args:
+        chave (str): A chave retornada por `enviar_relatorio()`.
+
+    Returns:
+        dict | None: Um dicionário com os campos "situacao" ("na_fila", "consultando",
+                     "gravando", "concluida" ou "erro"), "progresso" (entre 0 e 1), "etapa"
+                     (descrição da situação), "segundos" (tempo desde o envio ou até a
+                     conclusão) e, conforme a situação, "linhas" ou "erro". Retorna None se a
+                     tarefa não existir (ex: o resultado expirou).
+    """
+    with _trava:
+        tarefa = dict(_tarefas.get(chave) or {})
+
+    if not tarefa:
+        if not os.path.isdir(_caminho_resultado(chave)):
+            return None
+        # Resultado gravado por uma execução anterior da aplicação.
+        tarefa = {"situacao": "concluida", "enviada": None, "fim": None}
+
+    progresso, etapa = ETAPAS[tarefa["situacao"]]
+    segundos = None
+    if tarefa["enviada"] is not None:
+        segundos = (tarefa["fim"] or time.time()) - tarefa["enviada"]
+
+    return {
+        "situacao": tarefa["situacao"],
+        "progresso": progresso,
+        "etapa": etapa,
+        "segundos": segundos,
+        "linhas": tarefa.get("linhas"),
+        "erro": tarefa.get("erro"),
+    }
+
+
+def resultado_do_relatorio(chave: str) -> dict | None:
+    """
+    Carrega o resultado de uma tarefa de relatório concluída.
+
+    Args:
+        chave (str): A chave retornada por `enviar_relatorio()`.
+
+    Returns:
+        dict | None: O resultado de `ler_relatorio_colunar()` ("resumo", "total_geral" e
+                     "produtos"), ou None se o resultado não existir ou ocorrer algum erro.
+
+    Raises:
+        Exception: Se ocorrer algum erro durante a leitura, a exceção é capturada e registrada no log.
+    """
+    try:
+        return _ler_resultado(_caminho_resultado(chave))
+    except FileNotFoundError:
+        return None
+    except Exception as e:
+        logging.error(f"Erro ao carregar resultado do relatório: {e}")
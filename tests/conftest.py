@@ -0,0 +1,24 @@
+import os
+import sys
+
+import pytest
+
+# Os módulos da aplicação são importados a partir da pasta src (ex: `services.precificacao`).
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(__file__)), "src"))
+
+
+@pytest.fixture
+def banco(tmp_path):
+    """
+    Configura um banco de dados novo, com o esquema atual, em uma pasta temporária.
+
+    O banco anterior é restaurado ao final do teste.
+    """
+    from services import banco_de_dados
+
+    anterior = banco_de_dados.CAMINHO_BANCO
+    caminho = str(tmp_path / "teste.db")
+    banco_de_dados.configurar_banco(caminho)
+    assert banco_de_dados.criar_banco_de_dados()
+    yield caminho
+    banco_de_dados.configurar_banco(anterior)
@@ -0,0 +1,37 @@
+import socket
+import threading
+
+import pytest
+
+from api import criar_servidor
+
+
+@pytest.fixture
+def servidor(banco):
+    servidor = criar_servidor("127.0.0.1", 0)
+    thread = threading.Thread(target=servidor.serve_forever, daemon=True)
+    thread.start()
+    yield servidor.server_address
+    servidor.shutdown()
+    servidor.server_close()
+
+
+def _enviar(endereco, content_length: str) -> bytes:
+    with socket.create_connection(endereco, timeout=5) as conexao:
+        conexao.sendall(
+            b"POST /clientes HTTP/1.1\r\nHost: teste\r\n"
+            + f"Content-Length: {content_length}\r\n\r\n".encode()
+        )
+        # A conexão deve ser encerrada pelo servidor após a resposta.
+        resposta = b""
+        while bloco := conexao.recv(4096):
+            resposta += bloco
+    return resposta
+
+
+@pytest.mark.parametrize("content_length", ["abc", "-5", "1.5"])
+def test_content_length_invalido(servidor, content_length):
+    resposta = _enviar(servidor, content_length)
+
+    assert resposta.startswith(b"HTTP/1.1 400 ")
+    assert "Content-Length".encode() in resposta.split(b"\r\n\r\n", 1)[1]
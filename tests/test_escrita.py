@@ -0,0 +1,97 @@
+import sqlite3
+import threading
+
+import pytest
+
+from services.banco_de_dados import conectar
+from services.escrita import enviar_escrita, executar_escrita
+
+
+def _inserir_clientes(chamadas: list):
+    # Operação que registra o tamanho de cada grupo recebido pela thread de escrita.
+    def operacao(nomes: list) -> list:
+        chamadas.append(len(nomes))
+        with conectar() as conn:
+            return [
+                conn.execute(
+                    "INSERT INTO clientes (nome) VALUES (?)", (nome,)
+                ).lastrowid
+                for nome in nomes
+            ]
+
+    return operacao
+
+
+def _segurar_escritor() -> threading.Event:
+    # Ocupa a thread de escrita até o evento ser liberado, para que os pedidos enviados nesse
+    # intervalo sejam gravados juntos na transação seguinte.
+    liberar, ocupado = threading.Event(), threading.Event()
+
+    def esperar(argumentos: list) -> list:
+        ocupado.set()
+        liberar.wait(timeout=10)
+        return [None for _ in argumentos]
+
+    enviar_escrita(esperar, None)
+    assert ocupado.wait(timeout=10)
+    return liberar
+
+
+def _clientes() -> list:
+    with conectar() as conn:
+        return [
+            linha[0]
+            for linha in conn.execute("SELECT nome FROM clientes ORDER BY codigo")
+        ]
+
+
+def test_pedido_com_erro_nao_impede_os_demais(banco):
+    chamadas = []
+    operacao = _inserir_clientes(chamadas)
+    executar_escrita("INSERT INTO clientes (nome) VALUES (?)", ("Repetido",)).result()
+
+    liberar = _segurar_escritor()
+    futuros = [
+        enviar_escrita(operacao, nome)
+        for nome in ("Ana", "Bruno", "Repetido", "Carla", "Daniel")
+    ]
+    liberar.set()
+
+    with pytest.raises(sqlite3.IntegrityError):
+        futuros[2].result(timeout=10)
+    codigos = [futuros[posicao].result(timeout=10) for posicao in (0, 1, 3, 4)]
+    assert all(isinstance(codigo, int) for codigo in codigos)
+    # O grupo foi executado em uma única chamada e, após a falha, pedido a pedido.
+    assert chamadas == [5, 1, 1, 1, 1, 1]
+    assert _clientes() == ["Repetido", "Ana", "Bruno", "Carla", "Daniel"]
+
+
+def test_erro_em_um_grupo_nao_desfaz_os_outros_grupos(banco):
+    liberar = _segurar_escritor()
+    produtos = executar_escrita(
+        "INSERT INTO produtos (descricao, preco_centavos) VALUES (?, ?)",
+        ("Engov", 700),
+    )
+    oferta_invalida = executar_escrita(
+        "INSERT INTO ofertas (produto_id, quantidade_levar, quantidade_pagar) "
+        "VALUES (?, ?, ?)",
+        (999, 2, 1),
+    )
+    clientes = [
+        executar_escrita("INSERT INTO clientes (nome) VALUES (?)", (nome,))
+        for nome in ("Eduarda", "Felipe")
+    ]
+    liberar.set()
+
+    produtos.result(timeout=10)
+    with pytest.raises(sqlite3.IntegrityError):
+        oferta_invalida.result(timeout=10)
+    for futuro in clientes:
+        futuro.result(timeout=10)
+
+    assert _clientes() == ["Eduarda", "Felipe"]
+    with conectar() as conn:
+        assert (
+            conn.execute("SELECT descricao FROM produtos").fetchall()[0][0] == "Engov"
+        )
+        assert conn.execute("SELECT COUNT(*) FROM ofertas").fetchone()[0] == 0
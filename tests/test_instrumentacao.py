@@ -0,0 +1,59 @@
+import gc
+
+import pytest
+
+from services import banco_de_dados, instrumentacao
+from services.banco_de_dados import conectar
+
+CONSULTA = "SELECT nome FROM clientes ORDER BY nome"
+
+
+@pytest.fixture
+def consultas_lentas(banco, monkeypatch):
+    # Todas as consultas passam a ser lentas; as chamadas a EXPLAIN QUERY PLAN são registradas.
+    monkeypatch.setattr(instrumentacao, "LIMITE_CONSULTA_LENTA_MS", 0.0)
+    planos = []
+
+    def plano_de_execucao(conn, sql, parametros):
+        planos.append(sql)
+        return "plano"
+
+    monkeypatch.setattr(banco_de_dados, "_plano_de_execucao", plano_de_execucao)
+    with conectar() as conn:
+        conn.executemany(
+            "INSERT INTO clientes (nome) VALUES (?)", [("Ana",), ("Bruno",), ("Carla",)]
+        )
+    instrumentacao.limpar_estatisticas_consultas()
+    planos.clear()
+    yield planos
+    instrumentacao.limpar_estatisticas_consultas()
+
+
+def _registro_da_consulta() -> dict:
+    return [
+        consulta
+        for consulta in instrumentacao.consultas_lentas()
+        if consulta["sql"] == instrumentacao.normalizar_sql(CONSULTA)
+    ][0]
+
+
+def test_consulta_lida_ate_o_fim_registra_o_plano(consultas_lentas):
+    with conectar() as conn:
+        assert len(conn.execute(CONSULTA).fetchall()) == 3
+
+    assert consultas_lentas == [CONSULTA]
+    assert _registro_da_consulta()["plano"] == "plano"
+
+
+def test_cursor_descartado_registra_sem_plano(consultas_lentas):
+    with conectar() as conn:
+        cursor = conn.execute(CONSULTA)
+        assert cursor.fetchone() is not None
+        # O cursor é descartado com linhas não lidas; a medição é registrada pelo `__del__`.
+        del cursor
+        gc.collect()
+
+    assert consultas_lentas == []
+    registro = _registro_da_consulta()
+    assert registro["plano"] is None
+    assert registro["linhas"] == 1
@@ -0,0 +1,210 @@
+import sqlite3
+
+import pytest
+
+from controllers.ClienteController import buscar_clientes
+from services import banco_de_dados
+from services.banco_de_dados import conectar, criar_banco_de_dados
+from services.datas import dia_epoch
+from services.manutencao import (
+    verificar_cubo_vendas,
+    verificar_totais_orcamentos,
+    verificar_vendas_diarias,
+)
+from services.migracoes import MIGRACOES
+
+# Esquema da primeira versão da aplicação, antes das migrações: chaves estrangeiras para a
+# coluna inexistente "id" e valores monetários em reais, como NUMERIC.
+ESQUEMA_ORIGINAL = """
+CREATE TABLE clientes (
+    codigo INTEGER PRIMARY KEY AUTOINCREMENT,
+    nome TEXT UNIQUE NOT NULL
+);
+CREATE TABLE produtos (
+    codigo INTEGER PRIMARY KEY AUTOINCREMENT,
+    descricao TEXT UNIQUE NOT NULL,
+    preco NUMERIC NOT NULL
+);
+CREATE TABLE vendedores (
+    codigo INTEGER PRIMARY KEY AUTOINCREMENT,
+    nome TEXT UNIQUE NOT NULL
+);
+CREATE TABLE ofertas (
+    codigo INTEGER PRIMARY KEY AUTOINCREMENT,
+    produto_id INTEGER UNIQUE NOT NULL,
+    quantidade_levar INTEGER NOT NULL CHECK (quantidade_levar > 0),
+    quantidade_pagar INTEGER NOT NULL CHECK (quantidade_pagar > 0 AND quantidade_pagar < quantidade_levar),
+    FOREIGN KEY (produto_id) REFERENCES produtos (id) ON DELETE CASCADE
+);
+CREATE TABLE orcamentos (
+    codigo INTEGER PRIMARY KEY AUTOINCREMENT,
+    cliente_id INTEGER NOT NULL,
+    vendedor_id INTEGER NOT NULL,
+    data_criacao DATETIME DEFAULT CURRENT_TIMESTAMP,
+    FOREIGN KEY (cliente_id) REFERENCES clientes (id) ON DELETE CASCADE,
+    FOREIGN KEY (vendedor_id) REFERENCES vendedores (id) ON DELETE CASCADE
+);
+CREATE TABLE orcamento_itens (
+    codigo INTEGER PRIMARY KEY AUTOINCREMENT,
+    orcamento_id INTEGER NOT NULL,
+    produto_id INTEGER NOT NULL,
+    quantidade INTEGER NOT NULL,
+    preco_unitario NUMERIC NOT NULL,
+    desconto NUMERIC NOT NULL,
+    FOREIGN KEY (orcamento_id) REFERENCES orcamentos (id) ON DELETE CASCADE,
+    FOREIGN KEY (produto_id) REFERENCES produtos (id) ON DELETE CASCADE
+);
+"""
+
+
+@pytest.fixture
+def banco_original(tmp_path):
+    caminho = str(tmp_path / "original.db")
+    conn = sqlite3.connect(caminho)
+    conn.executescript(ESQUEMA_ORIGINAL)
+    conn.executemany(
+        "INSERT INTO clientes (nome) VALUES (?)", [("Castro Alves",), ("Olavo Bilac",)]
+    )
+    conn.executemany(
+        "INSERT INTO vendedores (nome) VALUES (?)", [("Will Smith",), ("Johnny Depp",)]
+    )
+    conn.executemany(
+        "INSERT INTO produtos (descricao, preco) VALUES (?, ?)",
+        [("Engov", 7.0), ("Doralgina", 8.9), ("Bala", 0.29), ("Neosoro", 4.35)],
+    )
+    conn.execute(
+        "INSERT INTO ofertas (produto_id, quantidade_levar, quantidade_pagar) "
+        "VALUES (2, 2, 1)"
+    )
+    conn.executemany(
+        "INSERT INTO orcamentos (cliente_id, vendedor_id, data_criacao) VALUES (?, ?, ?)",
+        [
+            (1, 1, "2024-03-15 10:20:30"),
+            (2, 2, "2024-04-01 23:59:59"),
+            # Órfão: o cliente 99 não existe.
+            (99, 1, "2024-04-02 08:00:00"),
+        ],
+    )
+    # Valores em reais gravados como ponto flutuante pela versão original (ex: 0.29 * 3).
+    conn.executemany(
+        "INSERT INTO orcamento_itens "
+        "(orcamento_id, produto_id, quantidade, preco_unitario, desconto) "
+        "VALUES (?, ?, ?, ?, ?)",
+        [
+            (1, 2, 2, 8.9, 8.9),
+            (1, 3, 3, 0.29, 0.29 * 3),
+            (2, 4, 3, 4.35, 0.0),
+            (2, 3, 10, 0.29, 0.1 + 0.2),
+            # Órfãos: o produto 99 e o orçamento 3 não existem depois da migração.
+            (2, 99, 1, 1.0, 0.0),
+            (3, 1, 1, 7.0, 0.0),
+        ],
+    )
+    conn.commit()
+    conn.close()
+
+    anterior = banco_de_dados.CAMINHO_BANCO
+    banco_de_dados.configurar_banco(caminho)
+    yield caminho
+    banco_de_dados.configurar_banco(anterior)
+
+
+def _consultar(sql: str, parametros=()) -> list:
+    with conectar() as conn:
+        return [tuple(linha) for linha in conn.execute(sql, parametros).fetchall()]
+
+
+def test_migracao_do_esquema_original(banco_original):
+    assert criar_banco_de_dados()
+
+    assert _consultar("PRAGMA user_version") == [(len(MIGRACOES),)]
+    assert _consultar("PRAGMA foreign_key_check") == []
+    for tabela in ("ofertas", "orcamentos", "orcamento_itens"):
+        # A quinta coluna de `foreign_key_list` é a coluna referenciada.
+        assert {
+            chave[4] for chave in _consultar(f"PRAGMA foreign_key_list({tabela})")
+        } == {"codigo"}
+
+
+def test_valores_convertidos_para_centavos(banco_original):
+    assert criar_banco_de_dados()
+
+    assert _consultar(
+        "SELECT descricao, preco_centavos FROM produtos ORDER BY codigo"
+    ) == [
+        ("Engov", 700),
+        ("Doralgina", 890),
+        ("Bala", 29),
+        ("Neosoro", 435),
+    ]
+    assert _consultar(
+        "SELECT orcamento_id, produto_id, quantidade, preco_unitario_centavos, "
+        "desconto_centavos FROM orcamento_itens ORDER BY codigo"
+    ) == [
+        (1, 2, 2, 890, 890),
+        (1, 3, 3, 29, 87),
+        (2, 4, 3, 435, 0),
+        (2, 3, 10, 29, 30),
+    ]
+    assert _consultar(
+        "SELECT typeof(preco_unitario_centavos), typeof(desconto_centavos) "
+        "FROM orcamento_itens GROUP BY 1, 2"
+    ) == [("integer", "integer")]
+
+
+def test_orfaos_descartados_e_dados_mantidos(banco_original):
+    assert criar_banco_de_dados()
+
+    assert _consultar("SELECT codigo, dia_criacao FROM orcamentos ORDER BY codigo") == [
+        (1, dia_epoch("2024-03-15")),
+        (2, dia_epoch("2024-04-01")),
+    ]
+    assert _consultar(
+        "SELECT produto_id, quantidade_levar, quantidade_pagar FROM ofertas"
+    ) == [(2, 2, 1)]
+    # Novos registros continuam a numeração anterior.
+    with conectar() as conn:
+        conn.execute(
+            "INSERT INTO orcamentos (cliente_id, vendedor_id, data_criacao) "
+            "VALUES (1, 1, '2024-05-01 12:00:00')"
+        )
+        assert conn.execute("SELECT MAX(codigo) FROM orcamentos").fetchone()[0] == 4
+
+
+def test_tabelas_derivadas_preenchidas(banco_original):
+    assert criar_banco_de_dados()
+
+    assert verificar_totais_orcamentos() == []
+    assert verificar_vendas_diarias() == []
+    assert verificar_cubo_vendas() == []
+    assert _consultar(
+        "SELECT orcamento_id, quantidade_itens, valor_itens_centavos, desconto_centavos "
+        "FROM orcamento_totais ORDER BY orcamento_id"
+    ) == [(1, 2, 1780 + 87, 890 + 87), (2, 2, 1305 + 290, 30)]
+    assert _consultar(
+        "SELECT mes, SUM(valor_liquido_centavos) FROM cubo_vendas GROUP BY mes"
+    ) == [(202403, 1780 - 890), (202404, 1305 + 290 - 30)]
+    assert [cliente["nome"] for cliente in buscar_clientes("castro")] == [
+        "Castro Alves"
+    ]
+
+
+def test_remocao_em_cascata_apos_migracao(banco_original):
+    assert criar_banco_de_dados()
+
+    with conectar() as conn:
+        conn.execute("DELETE FROM clientes WHERE codigo = 1")
+
+    assert _consultar("SELECT codigo FROM orcamentos") == [(2,)]
+    assert _consultar("SELECT DISTINCT orcamento_id FROM orcamento_itens") == [(2,)]
+    assert verificar_cubo_vendas() == []
+
+
+def test_migracao_repetida_nao_altera_o_banco(banco_original):
+    assert criar_banco_de_dados()
+    antes = _consultar("SELECT * FROM orcamento_itens ORDER BY codigo")
+
+    assert criar_banco_de_dados()
+
+    assert _consultar("SELECT * FROM orcamento_itens ORDER BY codigo") == antes
+    assert _consultar("PRAGMA user_version") == [(len(MIGRACOES),)]
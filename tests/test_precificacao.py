@@ -0,0 +1,91 @@
+import random
+
+import pytest
+
+from services.dinheiro import para_centavos
+from services.precificacao import calcular_item, calcular_lote
+
+
+def _comparar(precos: list, quantidades: list, levar: list, pagar: list) -> None:
+    totais, descontos = calcular_lote(precos, quantidades, levar, pagar)
+
+    assert len(totais) == len(descontos) == len(precos)
+    for posicao, item in enumerate(zip(precos, quantidades, levar, pagar)):
+        assert (int(totais[posicao]), int(descontos[posicao])) == calcular_item(*item)
+
+
+@pytest.mark.parametrize("semente", range(20))
+def test_calcular_lote_igual_a_calcular_item(semente):
+    aleatorio = random.Random(semente)
+    precos, quantidades, levar, pagar = [], [], [], []
+    for _ in range(1_000):
+        precos.append(aleatorio.randint(1, 500_000))
+        quantidades.append(aleatorio.randint(0, 200))
+        if aleatorio.random() < 0.3:
+            levar.append(0)
+            pagar.append(0)
+        else:
+            levar.append(aleatorio.randint(2, 12))
+            pagar.append(aleatorio.randint(1, levar[-1] - 1))
+
+    _comparar(precos, quantidades, levar, pagar)
+
+
+def test_calcular_lote_nos_limites_dos_grupos():
+    # Quantidades zero, abaixo, igual e logo acima de um grupo completo, e múltiplos exatos.
+    casos = [
+        (quantidade, levar, pagar)
+        for levar, pagar in ((0, 0), (2, 1), (3, 2), (4, 1), (6, 3), (10, 9))
+        for quantidade in (0, 1, levar - 1, levar, levar + 1, 2 * levar, 7 * levar + 1)
+        if quantidade >= 0
+    ]
+
+    _comparar(
+        [133] * len(casos),
+        [caso[0] for caso in casos],
+        [caso[1] for caso in casos],
+        [caso[2] for caso in casos],
+    )
+
+
+@pytest.mark.parametrize(
+    "reais, centavos",
+    [
+        ("0.01", 1),
+        ("0.07", 7),
+        ("0.29", 29),
+        (0.29, 29),
+        (4.35, 435),
+        ("19.99", 1999),
+        # Meio centavo é arredondado para cima.
+        ("1.005", 101),
+        ("2.675", 268),
+        ("0.125", 13),
+    ],
+)
+def test_calcular_lote_com_precos_convertidos_de_reais(reais, centavos):
+    # Valores como 0.29 ou 4.35 não são exatos em ponto flutuante; convertidos por
+    # `para_centavos()`, os dois cálculos seguem em centavos inteiros, sem arredondamento.
+    preco = para_centavos(reais)
+    quantidades = list(range(50))
+    precos, levar, pagar = [preco] * 50, [3] * 50, [2] * 50
+
+    assert preco == centavos
+    _comparar(precos, quantidades, levar, pagar)
+    totais, descontos = calcular_lote(precos, quantidades, levar, pagar)
+    for quantidade, total, desconto in zip(quantidades, totais, descontos):
+        assert int(total) + int(desconto) == preco * quantidade
+
+
+def test_calcular_lote_com_valores_grandes():
+    # Totais acima de 2**31 centavos continuam exatos (int64).
+    precos = [999_999_999, 2**31 - 1, 123_456_789]
+    quantidades = [1_000, 997, 10_001]
+
+    _comparar(precos, quantidades, [3, 0, 7], [1, 0, 5])
+
+
+def test_calcular_lote_vazio():
+    totais, descontos = calcular_lote([], [], [], [])
+
+    assert len(totais) == len(descontos) == 0
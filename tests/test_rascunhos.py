@@ -0,0 +1,41 @@
+from services import rascunhos
+from services.escrita import executar_escrita
+from services.rascunhos import (
+    adicionar_item,
+    descartar_rascunho,
+    itens_do_rascunho,
+    rascunho_do_vendedor,
+)
+
+
+def _aguardar_gravacoes() -> None:
+    # A thread de escrita atende os pedidos em ordem; este só termina após os anteriores.
+    executar_escrita("DELETE FROM rascunhos WHERE 0", ()).result(timeout=10)
+
+
+def _reiniciar() -> None:
+    # Simula um reinício da aplicação: os rascunhos em memória são perdidos.
+    rascunhos._rascunhos.clear()
+
+
+def test_rascunho_recuperado_apos_reinicio(banco):
+    rascunho = rascunho_do_vendedor(1)
+    adicionar_item(rascunho, 10, 2)
+    adicionar_item(rascunho, 20, 1)
+    adicionar_item(rascunho, 10, 3)
+    _aguardar_gravacoes()
+    _reiniciar()
+
+    assert rascunho_do_vendedor(1) == rascunho
+    assert itens_do_rascunho(rascunho_do_vendedor(1)) == [(10, 5), (20, 1)]
+    assert itens_do_rascunho(rascunho_do_vendedor(2)) == []
+
+
+def test_rascunho_descartado_nao_e_recuperado(banco):
+    rascunho = rascunho_do_vendedor(1)
+    adicionar_item(rascunho, 10, 2)
+    descartar_rascunho(rascunho)
+    _aguardar_gravacoes()
+    _reiniciar()
+
+    assert itens_do_rascunho(rascunho) == []
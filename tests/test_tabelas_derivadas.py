@@ -0,0 +1,191 @@
+from datetime import date
+
+import pytest
+
+from controllers.OrcamentoController import adicionar_orcamento, excluir_orcamento
+from controllers.ProdutoController import excluir_produto
+from services.banco_de_dados import conectar
+from services.dados_fakers import gerar_dados_em_massa
+from services.datas import dia_epoch
+from services.manutencao import (
+    verificar_cubo_vendas,
+    verificar_totais_orcamentos,
+    verificar_vendas_diarias,
+)
+from services.migracoes import CONTADOR_ALTERACOES_ORCAMENTOS
+from services.precificacao import precificar_carrinho
+
+
+@pytest.fixture
+def banco_populado(banco):
+    assert gerar_dados_em_massa(300, semente=7)
+    return banco
+
+
+def _consultar(sql: str, parametros=()) -> list:
+    with conectar() as conn:
+        return conn.execute(sql, parametros).fetchall()
+
+
+def _executar(sql: str, parametros=()) -> None:
+    with conectar() as conn:
+        conn.execute(sql, parametros)
+
+
+def _versoes() -> dict:
+    return dict(_consultar("SELECT tabela, versao FROM versoes_tabelas"))
+
+
+def _orcamento_e_item() -> tuple[int, int]:
+    return tuple(
+        _consultar(
+            "SELECT orcamento_id, codigo FROM orcamento_itens ORDER BY codigo LIMIT 1"
+        )[0]
+    )
+
+
+def _assert_consistente() -> None:
+    assert verificar_totais_orcamentos() == []
+    assert verificar_vendas_diarias() == []
+    assert verificar_cubo_vendas() == []
+
+    # Os verificadores retornam [] também em caso de erro; os totais confirmam que as
+    # tabelas derivadas foram de fato mantidas.
+    itens = _consultar(
+        "SELECT COALESCE(SUM(quantidade * preco_unitario_centavos), 0) FROM orcamento_itens"
+    )[0][0]
+    for tabela, coluna in (
+        ("orcamento_totais", "valor_itens_centavos"),
+        ("vendas_diarias", "valor_bruto_centavos"),
+        ("cubo_vendas", "valor_bruto_centavos"),
+    ):
+        assert (
+            _consultar(f"SELECT COALESCE(SUM({coluna}), 0) FROM {tabela}")[0][0]
+            == itens
+        )
+
+
+def test_dados_gerados_consistentes(banco_populado):
+    _assert_consistente()
+
+
+def test_verificadores_apontam_divergencias(banco_populado):
+    _executar("UPDATE vendas_diarias SET quantidade = quantidade + 1")
+    _executar("UPDATE cubo_vendas SET itens = itens + 1")
+    _executar("UPDATE orcamento_totais SET desconto_centavos = desconto_centavos + 1")
+
+    assert verificar_vendas_diarias()
+    assert verificar_cubo_vendas()
+    assert verificar_totais_orcamentos()
+
+
+def test_inclusao_de_orcamento(banco_populado):
+    versoes = _versoes()
+
+    codigo = adicionar_orcamento(1, 2, precificar_carrinho([(1, 3), (2, 7), (1, 1)]))
+
+    assert codigo is not None
+    _assert_consistente()
+    assert _versoes()["orcamentos"] > versoes["orcamentos"]
+    # Inclusões não alteram linhas já carregadas pelo cache colunar.
+    assert (
+        _versoes()[CONTADOR_ALTERACOES_ORCAMENTOS]
+        == versoes[CONTADOR_ALTERACOES_ORCAMENTOS]
+    )
+
+
+@pytest.mark.parametrize(
+    "sql",
+    [
+        "UPDATE orcamento_itens SET quantidade = quantidade + 5 WHERE codigo = :item",
+        "UPDATE orcamento_itens SET desconto_centavos = 0, preco_unitario_centavos = 1 "
+        "WHERE codigo = :item",
+        "UPDATE orcamento_itens SET produto_id = produto_id % 5 + 1 WHERE codigo = :item",
+        "UPDATE orcamento_itens SET orcamento_id = "
+        "(SELECT MAX(codigo) FROM orcamentos WHERE codigo <> :orcamento) "
+        "WHERE codigo = :item",
+        "DELETE FROM orcamento_itens WHERE codigo = :item",
+        "DELETE FROM orcamento_itens WHERE orcamento_id = :orcamento",
+    ],
+    ids=["quantidade", "preco", "produto", "orcamento", "remocao", "todos_os_itens"],
+)
+def test_alteracao_de_itens(banco_populado, sql):
+    orcamento, item = _orcamento_e_item()
+    versoes = _versoes()
+
+    _executar(sql, {"orcamento": orcamento, "item": item})
+
+    _assert_consistente()
+    assert (
+        _versoes()[CONTADOR_ALTERACOES_ORCAMENTOS]
+        > versoes[CONTADOR_ALTERACOES_ORCAMENTOS]
+    )
+
+
+@pytest.mark.parametrize(
+    "sql",
+    [
+        "UPDATE orcamentos SET dia_criacao = :dia, data_criacao = :data "
+        "WHERE codigo = :orcamento",
+        "UPDATE orcamentos SET cliente_id = cliente_id % 5 + 1 WHERE codigo = :orcamento",
+        "UPDATE orcamentos SET vendedor_id = vendedor_id % 3 + 1 WHERE codigo = :orcamento",
+    ],
+    ids=["dia_de_outro_mes", "cliente", "vendedor"],
+)
+def test_alteracao_de_orcamento(banco_populado, sql):
+    orcamento, _ = _orcamento_e_item()
+    versoes = _versoes()
+    outro_dia = date(2001, 2, 3)
+
+    _executar(
+        sql,
+        {
+            "orcamento": orcamento,
+            "dia": dia_epoch(outro_dia),
+            "data": outro_dia.isoformat(),
+        },
+    )
+
+    _assert_consistente()
+    assert _versoes()["orcamentos"] > versoes["orcamentos"]
+    assert (
+        _versoes()[CONTADOR_ALTERACOES_ORCAMENTOS]
+        > versoes[CONTADOR_ALTERACOES_ORCAMENTOS]
+    )
+
+
+def test_remocao_de_orcamento(banco_populado):
+    orcamento, _ = _orcamento_e_item()
+    versoes = _versoes()
+
+    assert excluir_orcamento(orcamento) == 1
+
+    _assert_consistente()
+    assert (
+        _consultar(
+            "SELECT 1 FROM orcamento_totais WHERE orcamento_id = ?", (orcamento,)
+        )
+        == []
+    )
+    assert _versoes()["orcamentos"] > versoes["orcamentos"]
+
+
+def test_remocao_de_produto_em_cascata(banco_populado):
+    produto = _consultar(
+        "SELECT produto_id FROM orcamento_itens GROUP BY produto_id "
+        "ORDER BY COUNT(*) DESC LIMIT 1"
+    )[0][0]
+    versoes = _versoes()
+
+    assert excluir_produto(produto) == 1
+
+    _assert_consistente()
+    assert (
+        _consultar(
+            "SELECT 1 FROM vendas_diarias WHERE produto_id = ? "
+            "UNION ALL SELECT 1 FROM cubo_vendas WHERE produto_id = ?",
+            (produto, produto),
+        )
+        == []
+    )
+    assert _versoes()["produtos"] > versoes["produtos"]
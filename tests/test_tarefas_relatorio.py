@@ -0,0 +1,30 @@
+import os
+
+import pandas as pd
+
+from services.tarefas_relatorio import (
+    _caminho_resultado,
+    _gravar_resultado,
+    _ler_resultado,
+    _pasta_resultados,
+)
+
+
+def _resultado(total: int) -> dict:
+    return {
+        "resumo": pd.DataFrame({"orcamento_id": [1, 2], "total": [total, 1]}),
+        "produtos": pd.DataFrame({"produto_id": [7], "quantidade": [3]}),
+        "total_geral": total + 1,
+    }
+
+
+def test_resultado_ja_gravado_por_outro_processo(banco):
+    caminho = _caminho_resultado("chave")
+    _gravar_resultado(caminho, _resultado(100))
+
+    # Outro processo calcula a mesma chave: a gravação não falha e o resultado existente é
+    # mantido.
+    _gravar_resultado(caminho, _resultado(100))
+
+    assert _ler_resultado(caminho)["total_geral"] == 101
+    assert os.listdir(_pasta_resultados()) == ["chave"]